@@ -0,0 +1,68 @@
+"""
+Måler en batchkjøring (src/combined/batch.py) med 8 jobber, 4 for Frost og 4 for NILU, på kopier av rådataene
+i data/raw_data: alle jobbene etter hverandre i én prosess, mot prosesspoolen med 1, 2 og 4 prosesser, og en ny
+kjøring der ingenting er endret. Viser også høyeste minnebruk per prosess.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_batch.py
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from combined.batch import load_batch_config, run_batch, run_job, peak_memory_mb
+from common.diagnostics import configure_diagnostics
+
+JOBS = 8
+
+
+def write_config(tmp, output_dir):
+    for name in ("frostAPI_data.parquet", "niluAPI_data.parquet"):
+        shutil.copy(os.path.join("data/raw_data", name), tmp)
+    jobs = []
+    for i in range(JOBS // 2):
+        jobs.append({"name": f"frost_{i}", "source": "frost", "station": "SN18700", "raw_file": "frostAPI_data.parquet"})
+        jobs.append({"name": f"nilu_{i}", "source": "nilu", "latitude": 59.9139, "longitude": 10.7522, "radius": 20,
+                     "raw_file": "niluAPI_data.parquet"})
+    config = {"defaults": {"from_date": "2010-04-02", "to_date": "2016-12-31", "output_dir": output_dir}, "jobs": jobs}
+    file = os.path.join(tmp, f"{output_dir}.json")
+    with open(file, "w", encoding="utf-8") as f:
+        json.dump(config, f)
+    return file
+
+
+def timed(func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{JOBS} jobber, {os.cpu_count()} CPU-kjerner")
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_diagnostics(mode="headless")
+        config = load_batch_config(write_config(tmp, "sekvensielt"))
+        seconds, _ = timed(lambda: [run_job(job) for job in config["jobs"]])
+        print(f"Én prosess, etter hverandre: {seconds * 1000:7.0f} ms, toppminne {peak_memory_mb():6.0f} MB")
+
+        for workers in (1, 2, 4):
+            config_file = write_config(tmp, f"pool_{workers}")
+            seconds, result = timed(lambda: run_batch(config_file, max_workers=workers))
+            print(f"Prosesspool, {workers} prosess(er):  {seconds * 1000:7.0f} ms, "
+                  f"toppminne per prosess {result['Minne_MB'].max():6.0f} MB")
+
+        seconds, result = timed(lambda: run_batch(config_file, max_workers=4))
+        unchanged = (result["Status"] == "uendret").sum()
+        print(f"Ny kjøring uten endringer:   {seconds * 1000:7.0f} ms ({unchanged} av {JOBS} jobber uendret)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Måler minnebruken til Frost-datasett med dagens kolonnetyper og med kompakt skjema (common/compact.py),
+for 200 stasjoner med 20 års døgnverdier, og regner om til antall stasjonsår per GB.
+Viser også minnebruken per trinn for datasettene i data/.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_compact_memory.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+import pandas as pd
+
+from common.compact import memory_report
+from common.storage import load_dataset
+
+STATIONS = 200
+YEARS = 20
+STAGES = {
+    "frost rådata": "data/raw_data/frostAPI_data.parquet",
+    "frost renset": "data/clean_data/frostAPI_clean_data.parquet",
+    "nilu rådata": "data/raw_data/niluAPI_data.parquet",
+    "nilu renset": "data/clean_data/niluAPI_clean_data.parquet",
+}
+
+
+def synthetic_frame():
+    dates = pd.date_range("2000-01-01", periods=365 * YEARS).strftime("%Y-%m-%d")
+    rng = np.random.default_rng(0)
+    n = len(dates) * STATIONS
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), STATIONS),
+        "Stasjon": np.repeat(np.array([f"SN{10000 + i}:0" for i in range(STATIONS)], dtype=object), len(dates)),
+        "Nedbør": rng.gamma(0.5, 4, n),
+        "Temperatur": rng.normal(6, 8, n),
+        "Vindhastighet": rng.gamma(2, 1.5, n),
+        "Interpolert_Nedbør": rng.random(n) < 0.05,
+        "Interpolert_Temperatur": rng.random(n) < 0.05,
+        "Interpolert_Vindhastighet": rng.random(n) < 0.05,
+    })
+
+
+def main():
+    report = memory_report({f"{STATIONS} stasjoner x {YEARS} år": synthetic_frame()})
+    print(report.to_string(index=False, float_format="%.1f"))
+    for label, column in (("i dag", "Byte_per_rad"), ("kompakt", "Kompakt_byte_per_rad")):
+        print(f"Stasjonsår per GB {label}: {1e9 / (report[column].iloc[0] * 365):.0f}")
+
+    print()
+    frames = {stage: load_dataset(file) for stage, file in STAGES.items()}
+    print(memory_report(frames).to_string(index=False, float_format="%.2f"))
+
+
+if __name__ == "__main__":
+    main()
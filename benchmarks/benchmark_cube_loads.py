@@ -0,0 +1,70 @@
+"""
+Måler innlesing av rensede døgnverdier som JSON, Parquet og minnekartlagt kube (common/cube.py),
+for 1, 50 og 200 stasjoner med 20 års døgnverdier. For kuben måles både åpning med gjennomsnitt
+per stasjon rett på matrisene og innlesing til samme DataFrame som de andre formatene.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_cube_loads.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+import pandas as pd
+
+from common.storage import save_dataset, load_dataset
+from common.cube import open_cube
+
+YEARS = 20
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_frame(n_stations):
+    dates = pd.date_range("2000-01-01", periods=365 * YEARS).strftime("%Y-%m-%d")
+    rng = np.random.default_rng(0)
+    n = len(dates) * n_stations
+    return pd.DataFrame({
+        "Dato": np.tile(dates, n_stations),
+        "Stasjon": np.repeat(np.arange(n_stations), len(dates)),
+        "Nedbør": rng.gamma(0.5, 4, n),
+        "Temperatur": rng.normal(6, 8, n),
+        "Vindhastighet": rng.gamma(2, 1.5, n),
+        "Interpolert_Nedbør": rng.random(n) < 0.05,
+        "Interpolert_Temperatur": rng.random(n) < 0.05,
+        "Interpolert_Vindhastighet": rng.random(n) < 0.05,
+    })
+
+
+def cube_station_means(path):
+    return np.nanmean(open_cube(path)["values"]["Temperatur"], axis=1)
+
+
+def main():
+    print(f"{'stasjoner':>9} {'rader':>9} {'json':>10} {'parquet':>10} {'kube→df':>10} {'kube, snitt':>12}")
+    for n_stations in (1, 50, 200):
+        df = synthetic_frame(n_stations)
+        with tempfile.TemporaryDirectory() as tmp:
+            times = []
+            for extension in (".json", ".parquet", ".cube"):
+                path = os.path.join(tmp, f"data{extension}")
+                save_dataset(df, path)
+                repeat = 1 if extension == ".json" and n_stations > 1 else 5
+                times.append(best_of(lambda: load_dataset(path), repeat))
+            times.append(best_of(lambda: cube_station_means(os.path.join(tmp, "data.cube"))))
+        print(f"{n_stations:9} {len(df):9} " + " ".join(f"{t * 1000:7.1f} ms" for t in times[:3]) + f" {times[3] * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
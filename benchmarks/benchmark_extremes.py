@@ -0,0 +1,79 @@
+"""
+Måler henting av de 10 varmeste dagene med full sortering (ORDER BY ... LIMIT i SQLite uten indeks og sort_values
+i pandas) mot delvis utvalg i numpy og indeksoppslag i SQL-lageret (SQL/extremes.py), samt de 10 varmeste dagene
+per år og per stasjon, for 200 stasjoner med 30 års døgnverdier.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_extremes.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+import pandas as pd
+
+from SQL.warehouse import load_table, sql_query, close_connections
+from SQL.extremes import select_extremes, top_n
+
+STATIONS = 200
+YEARS = 30
+N = 10
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_frame():
+    dates = pd.date_range("1990-01-01", periods=365 * YEARS).strftime("%Y-%m-%d")
+    rng = np.random.default_rng(0)
+    n = len(dates) * STATIONS
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), STATIONS),
+        "Stasjon": np.repeat(np.arange(STATIONS), len(dates)),
+        "Nedbør": rng.gamma(0.5, 4, n),
+        "Temperatur": rng.normal(6, 8, n),
+    })
+
+
+def main():
+    df = synthetic_frame()
+    print(f"{len(df)} rader, {STATIONS} stasjoner, {YEARS} år")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "frost.parquet")
+        db = os.path.join(tmp, "lager.sqlite")
+        df.to_parquet(source, index=False)
+        load_table("frost", source, db)
+
+        results = {
+            "SQLite ORDER BY uten indeks": best_of(lambda: sql_query(
+                f"SELECT * FROM frost ORDER BY Temperatur DESC LIMIT {N}", db)),
+            "pandas sort_values": best_of(lambda: df.sort_values("Temperatur", ascending=False).head(N)),
+            "numpy argpartition": best_of(lambda: select_extremes(df, "Temperatur", N)),
+        }
+        start = time.perf_counter()
+        top_n("frost", "Temperatur", N, path=db)
+        index_time = time.perf_counter() - start
+        results["lager med indeks"] = best_of(lambda: top_n("frost", "Temperatur", N, path=db))
+        results["pandas per år (sort + groupby.head)"] = best_of(
+            lambda: df.assign(År=df["Dato"].str[:4]).sort_values("Temperatur", ascending=False).groupby("År").head(N))
+        results["argpartition per år"] = best_of(lambda: select_extremes(df, "Temperatur", N, by="år"))
+        results["argpartition per stasjon"] = best_of(lambda: select_extremes(df, "Temperatur", N, by="Stasjon"))
+        close_connections()
+
+    for label, seconds in results.items():
+        print(f"{label:>36}: {seconds * 1000:8.1f} ms")
+    print(f"Første kall mot lageret (bygger indeksen): {index_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
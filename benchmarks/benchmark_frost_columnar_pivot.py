@@ -0,0 +1,81 @@
+"""
+Måler radvis prosessering (process_weather_data + DataFrame + pivot_table) mot kolonnevis
+prosessering (process_weather_data_columnar + aggregate_mean_columns) for omtrent én million
+syntetiske Frost-observasjoner, og sjekker at resultatene er nøyaktig like.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_frost_columnar_pivot.py
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pandas as pd
+
+from frostAPI.fetch_frostapi import (
+    process_weather_data,
+    process_weather_data_columnar,
+    aggregate_mean_columns)
+
+ELEMENTS = {
+    "mean(air_temperature P1D)": "Temperatur",
+    "sum(precipitation_amount P1D)": "Nedbør",
+    "mean(wind_speed P1D)": "Vindhastighet",
+    "sourceId": "Stasjon"
+}
+VALUE_COLUMNS = ["Temperatur", "Nedbør", "Vindhastighet"]
+INDEX_COLUMNS = ["Dato", "Stasjon"]
+
+
+def synthetic_data(n_observations, n_stations=200):
+    """Lager rådata på Frost-format. Hver tiende tidsserie har et duplikat, og noen elementer mangler."""
+    element_ids = [e for e in ELEMENTS if e != "sourceId"]
+    start = date(1990, 1, 1)
+    n_days = n_observations // (len(element_ids) * n_stations) + 1
+    days = [f"{(start + timedelta(days=d)).isoformat()}T00:00:00.000Z" for d in range(n_days)]
+    data = []
+    count = 0
+    i = 0
+    while count < n_observations:
+        observations = [{"elementId": element, "value": float((i * 7 + k) % 311) / 10}
+                        for k, element in enumerate(element_ids) if (i + k) % 13]
+        data.append({"sourceId": f"SN{i % n_stations}:0",
+                     "referenceTime": days[(i // n_stations) % n_days],
+                     "observations": observations})
+        count += len(observations)
+        i += 1
+    return data
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    data = synthetic_data(1_000_000)
+    n_observations = sum(len(m["observations"]) for m in data)
+    print(f"{len(data)} tidsserier, {n_observations} observasjoner")
+
+    rows, t_rows = timed(process_weather_data, data, ELEMENTS)
+    df, t_df = timed(pd.DataFrame, rows)
+    expected, t_pivot = timed(lambda: df.pivot_table(index=INDEX_COLUMNS, values=VALUE_COLUMNS, aggfunc="mean").reset_index())
+
+    columns, t_columns = timed(process_weather_data_columnar, data, ELEMENTS)
+    result, t_aggregate = timed(aggregate_mean_columns, columns, INDEX_COLUMNS, VALUE_COLUMNS)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+    old_total = t_rows + t_df + t_pivot
+    new_total = t_columns + t_aggregate
+    print(f"radvis:   prosessering {t_rows:5.2f} s, DataFrame {t_df:5.2f} s, pivot_table {t_pivot:5.2f} s, totalt {old_total:5.2f} s")
+    print(f"kolonnevis: prosessering {t_columns:5.2f} s, aggregering {t_aggregate:5.2f} s, totalt {new_total:5.2f} s")
+    print(f"omforming (DataFrame + pivot_table mot aggregering): {(t_df + t_pivot) / t_aggregate:4.1f}x")
+    print(f"totalt: {old_total / new_total:4.1f}x (nøyaktig lik output)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Måler veggklokketid for samlet og vindusvis parallell henting fra Frost API
+mot en lokal stand-in-server som genererer syntetiske observasjoner.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_frost_parallel_fetch.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from frostAPI.fetch_frostapi import fetch_data_from_frostAPI, fetch_data_parallel_frostAPI
+
+# Simulert servertid: fast ventetid per forespørsel + kostnad per dag med data
+REQUEST_LATENCY = 0.05
+LATENCY_PER_DAY = 0.0004
+ELEMENTS = ["mean(air_temperature P1D)", "sum(precipitation_amount P1D)", "mean(wind_speed P1D)"]
+
+
+class FrostStandInHandler(BaseHTTPRequestHandler):
+    """Svarer på /observations/v0.jsonld med én observasjon per dag i referencetime."""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        start_str, end_str = query["referencetime"][0].split("/")
+        start, end = date.fromisoformat(start_str), date.fromisoformat(end_str)
+
+        data = []
+        day = start
+        while day < end:
+            observations = [
+                {"elementId": element, "value": round((day.toordinal() * (i + 7)) % 300 / 10, 1)}
+                for i, element in enumerate(ELEMENTS)
+            ]
+            data.append({
+                "sourceId": "SN18700:0",
+                "referenceTime": f"{day.isoformat()}T00:00:00.000Z",
+                "observations": observations,
+            })
+            day += timedelta(days=1)
+
+        time.sleep(REQUEST_LATENCY + LATENCY_PER_DAY * len(data))
+        body = json.dumps({"data": data}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_call(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FrostStandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/observations/v0.jsonld"
+
+    for referencetime in ["2010-04-02/2016-12-31", "1980-01-01/2016-12-31"]:
+        parameters = {"sources": "SN18700", "elements": ",".join(ELEMENTS), "referencetime": referencetime}
+        single, single_time = time_call(fetch_data_from_frostAPI, endpoint, parameters, "client")
+        print(f"\nreferencetime={referencetime} ({len(single)} rader)")
+        print(f"  samlet henting:            {single_time:6.2f} s")
+
+        for window_days, max_workers in [(365, 4), (365, 8), (182, 8)]:
+            parallel, parallel_time = time_call(
+                fetch_data_parallel_frostAPI, endpoint, parameters, "client",
+                window_days=window_days, max_workers=max_workers)
+            same = "lik" if parallel == single else "ULIK"
+            print(f"  vindu={window_days:3d}d, arbeidere={max_workers}: {parallel_time:6.2f} s "
+                  f"({single_time / parallel_time:4.1f}x, {same} output)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
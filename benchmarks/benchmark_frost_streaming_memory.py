@@ -0,0 +1,91 @@
+"""
+Måler toppminne for samlet parsing (response.json() + process_weather_data + DataFrame)
+mot strømmet parsing rett inn i kolonnebuffere, for syntetiske Frost-responser.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_frost_streaming_memory.py
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pandas as pd
+
+from frostAPI.fetch_frostapi import process_weather_data, pivot_weather_data
+from frostAPI.stream_frostapi import iter_json_array_items, new_observation_columns, append_observation, columns_to_dataframe
+
+ELEMENTS = {
+    "mean(air_temperature P1D)": "Temperatur",
+    "sum(precipitation_amount P1D)": "Nedbør",
+    "mean(wind_speed P1D)": "Vindhastighet",
+    "sourceId": "Stasjon"
+}
+VALUE_COLUMNS = ["Temperatur", "Nedbør", "Vindhastighet"]
+
+
+def response_chunks(n_stations, n_days, items_per_chunk=200):
+    """Genererer en Frost-respons bit for bit, slik en strømmet HTTP-respons ville kommet."""
+    yield b'{"@context": "https://frost.met.no/schema", "data": ['
+    first = True
+    batch = []
+    start = date(2000, 1, 1)
+    for station in range(n_stations):
+        for day in range(n_days):
+            item = {
+                "sourceId": f"SN{18700 + station}:0",
+                "referenceTime": f"{(start + timedelta(days=day)).isoformat()}T00:00:00.000Z",
+                "observations": [
+                    {"elementId": element, "value": round((day * (i + 3) + station) % 250 / 10, 1),
+                     "unit": "degC", "level": {"levelType": "height_above_ground", "unit": "m", "value": 2},
+                     "timeOffset": "PT0H", "timeResolution": "P1D", "qualityCode": 0}
+                    for i, element in enumerate(e for e in ELEMENTS if e != "sourceId")
+                ],
+            }
+            batch.append(("" if first else ",") + json.dumps(item))
+            first = False
+            if len(batch) == items_per_chunk:
+                yield "".join(batch).encode("utf-8")
+                batch = []
+    yield ("".join(batch) + "]}").encode("utf-8")
+
+
+def full_parse(chunks):
+    body = b"".join(chunks)
+    data = json.loads(body)["data"]
+    return pivot_weather_data(process_weather_data(data, ELEMENTS), ["Dato", "Stasjon"], VALUE_COLUMNS)
+
+
+def streamed_parse(chunks):
+    columns = new_observation_columns(ELEMENTS)
+    for item in iter_json_array_items(chunks):
+        append_observation(columns, item)
+    return pivot_weather_data(columns_to_dataframe(columns), ["Dato", "Stasjon"], VALUE_COLUMNS)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1e6, elapsed
+
+
+def main():
+    for n_stations, n_days in [(5, 2000), (20, 2000), (40, 2000)]:
+        full, full_peak, full_time = measure(full_parse, response_chunks(n_stations, n_days))
+        streamed, stream_peak, stream_time = measure(streamed_parse, response_chunks(n_stations, n_days))
+        same = "lik" if full.equals(streamed) else "ULIK"
+        print(f"{n_stations} stasjoner x {n_days} dager ({n_stations * n_days} observasjoner):")
+        print(f"  samlet:  topp {full_peak:8.1f} MB, {full_time:5.2f} s")
+        print(f"  strømmet: topp {stream_peak:7.1f} MB, {stream_time:5.2f} s ({same} output)")
+
+
+if __name__ == "__main__":
+    main()
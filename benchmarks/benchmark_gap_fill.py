@@ -0,0 +1,85 @@
+"""
+Måler utfylling av hull i døgnverdier for 100, 300 og 1000 stasjoner over ca. 7 år (som perioden i data/),
+med tre målinger per dag, 10 % manglende verdier og 5 % manglende datoer. Sammenligner en løkke over
+stasjonene med reindex og interpolate per kolonne (slik interpolate_data gjorde for én stasjon),
+pandas groupby på en (Stasjon, Dato)-MultiIndex, og fill_gaps i common/gap_fill.py.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_gap_fill.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from common.gap_fill import fill_gaps
+
+FROM_DATE = "2010-04-02"
+TO_DATE = "2016-12-31"
+COLUMNS = ["Nedbør", "Temperatur", "Vindhastighet"]
+
+
+def synthetic_frame(stations):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(FROM_DATE, TO_DATE)
+    n = stations * len(dates)
+    df = pd.DataFrame({
+        "Dato": np.tile(dates.to_numpy(), stations),
+        "Stasjon": np.repeat([f"SN{i:05d}:0" for i in range(stations)], len(dates)),
+        **{col: rng.normal(size=n) for col in COLUMNS},
+    })
+    for col in COLUMNS:
+        df.loc[rng.random(n) < 0.10, col] = np.nan
+    return df[rng.random(n) >= 0.05].reset_index(drop=True)
+
+
+def per_station_loop(df):
+    # Én stasjon om gangen med reindex, og én kolonne om gangen med interpolate og flagg
+    all_dates = pd.date_range(FROM_DATE, TO_DATE)
+    frames = []
+    for station, group in df.groupby("Stasjon"):
+        group = group.set_index("Dato").reindex(all_dates)
+        group["Stasjon"] = station
+        for col in COLUMNS:
+            mask = group[col].isna()
+            group[col] = group[col].interpolate(method="linear")
+            group[f"Interpolert_{col}"] = mask & group[col].notna()
+        frames.append(group.rename_axis("Dato").reset_index())
+    return pd.concat(frames, ignore_index=True)
+
+
+def multiindex_groupby(df):
+    index = pd.MultiIndex.from_product([sorted(df["Stasjon"].unique()), pd.date_range(FROM_DATE, TO_DATE)],
+                                       names=["Stasjon", "Dato"])
+    full = df.set_index(["Stasjon", "Dato"]).reindex(index)
+    filled = full.groupby(level="Stasjon")[COLUMNS].transform(lambda s: s.interpolate(method="linear"))
+    flags = full[COLUMNS].isna() & filled.notna()
+    return filled.join(flags.add_prefix("Interpolert_")).reset_index()
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print(f"{'Stasjoner':>9} {'Rader':>10} {'Løkke per stasjon':>18} {'MultiIndex groupby':>19} {'fill_gaps':>10}")
+    for stations in (100, 300, 1000):
+        df = synthetic_frame(stations)
+        repeat = 3 if stations < 1000 else 1
+        loop = best_of(lambda: per_station_loop(df), repeat)
+        grouped = best_of(lambda: multiindex_groupby(df), repeat)
+        engine = best_of(lambda: fill_gaps(df, COLUMNS, FROM_DATE, TO_DATE), repeat)
+        print(f"{stations:>9} {len(df):>10,} {loop * 1000:15.0f} ms {grouped * 1000:16.0f} ms {engine * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Måler rense- og transformasjonstrinnene for Frost og NILU i minnet (run_pipeline_frostAPI og run_pipeline_niluAPI)
+når diagnostikkfigurene tegnes med en gang (modusen "interaktiv", her med Agg-backend så plt.show() ikke blokkerer),
+når de skrives til filer av en bakgrunnstråd ("fil"), og når diagnostikken bare lagres som data ("headless").
+Måler også hvor lang tid det tar å importere pipelinen, og om matplotlib blir importert, i en egen prosess.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_headless.py
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.append(SRC)
+
+import matplotlib
+matplotlib.use("Agg")
+
+from common.diagnostics import diagnostics_mode, clear_diagnostics, wait_for_figures
+from frostAPI import main_frost
+from niluAPI import main_nilu
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        times.append(time.perf_counter() - start)
+        clear_diagnostics()
+    return min(times)
+
+
+def run_stages():
+    main_frost.run_pipeline_frostAPI()
+    main_nilu.run_pipeline_niluAPI(raw_data_file=main_nilu.NILU_RAW_FILE)
+
+
+def import_pipeline():
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import combined.full_pipeline\n"
+        "print(time.perf_counter() - start, 'matplotlib' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True).stdout.split()
+    return float(out[0]), out[1] == "True"
+
+
+def main():
+    main_frost.FROST_RAW_FILE = "data/raw_data/frostAPI_data.parquet"
+    main_nilu.NILU_RAW_FILE = "data/raw_data/niluAPI_data.parquet"
+
+    with diagnostics_mode("interaktiv"):
+        interactive = best_of(run_stages)
+    with tempfile.TemporaryDirectory() as tmp:
+        with diagnostics_mode("fil", tmp):
+            files = best_of(run_stages)
+            start = time.perf_counter()
+            written = wait_for_figures()
+            drain = time.perf_counter() - start
+    with diagnostics_mode("headless"):
+        headless = best_of(run_stages)
+
+    import_time, imported = import_pipeline()
+    print(f"Figurer med en gang:        {interactive * 1000:6.0f} ms")
+    print(f"Figurer i bakgrunnstråd:    {files * 1000:6.0f} ms  (+{drain * 1000:.0f} ms til siste av {len(written)} filer er skrevet)")
+    print(f"Headless:                   {headless * 1000:6.0f} ms")
+    print(f"Import av pipelinen:        {import_time * 1000:6.0f} ms, matplotlib importert: {'ja' if imported else 'nei'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Måler kaldstart for hver inngangsmodul: tiden det tar å importere modulen i en ny Python-prosess
+(fra `python -X importtime`), og hvilke tunge avhengigheter som lastes allerede ved import.
+Plotte- og ML-bibliotekene skal først lastes når en funksjon som trenger dem kalles.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_import_time.py
+"""
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+ENTRY_MODULES = [
+    "common.storage",
+    "frostAPI.fetch_frostapi",
+    "frostAPI.main_frost",
+    "niluAPI.fetch_niluAPI",
+    "niluAPI.main_nilu",
+    "SQL.sql_analysis",
+    "combined.combined_analysis",
+    "combined.full_pipeline",
+]
+HEAVY_PACKAGES = ["matplotlib", "seaborn", "missingno", "scipy", "sklearn", "plotly", "lightgbm"]
+
+
+def import_time(module, repeat=5):
+    # Beste av flere kjøringer, i mikrosekunder, og tunge pakker som ble lastet
+    code = (
+        f"import sys; import {module}\n"
+        f"print(' '.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))\n"
+    )
+    best, loaded = None, ""
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=SRC, capture_output=True, text=True)
+        total = next(int(line.split("|")[1]) for line in reversed(result.stderr.splitlines())
+                     if line.rstrip().endswith(f" {module}"))
+        best = total if best is None else min(best, total)
+        loaded = result.stdout.strip()
+    return best, loaded
+
+
+def main():
+    print(f"{'Modul':<28}{'Import (ms)':>12}  Tunge pakker lastet ved import")
+    for module in ENTRY_MODULES:
+        total, loaded = import_time(module)
+        print(f"{module:<28}{total / 1000:>12.0f}  {loaded or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Måler lagring av timeverdier fra NILU på dagens måte (liste med dicts + DataFrame + JSON med
+indent=4) mot månedsvis skriving til kolonnelageret, og døgnaggregering fra lageret,
+for syntetiske data.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_nilu_hourly_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pandas as pd
+
+from niluAPI.fetch_niluAPI import split_period
+from niluAPI.hourly_niluAPI import process_hourly_data, daily_rollup_store
+from common.column_store import write_chunk
+
+STATIONS = [(f"Stasjon {i}", f"NO00{i:02d}A") for i in range(6)]
+COMPONENTS = ["NO2", "O3", "SO2"]
+
+
+def synthetic_month(start, end):
+    """Lager timeverdier for alle stasjoner og komponenter i én måned, på NILU-format."""
+    first = datetime.fromisoformat(start)
+    hours = int((datetime.fromisoformat(end) - first).total_seconds() // 3600) + 24
+    times = [(first + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M:%S+01:00") for h in range(hours)]
+    return [
+        {"station": station, "eoi": eoi, "component": component,
+         "values": [{"fromTime": t, "dateTime": t, "value": float((h * 7 + i) % 90), "coverage": 100}
+                    for h, t in enumerate(times)]}
+        for i, (station, eoi) in enumerate(STATIONS) for component in COMPONENTS
+    ]
+
+
+def folder_size(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def main():
+    months = split_period("2010-01-01", "2016-12-31", "month")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_time = store_time = 0.0
+        json_size = rows = 0
+        for start, end in months:
+            raw = synthetic_month(start, end)
+            rows += sum(len(record["values"]) for record in raw)
+
+            t = time.perf_counter()
+            json_file = os.path.join(tmp, "month.json")
+            records = [
+                {"Tid": måling["fromTime"], "Stasjon": stasjon["station"], "Komponent": stasjon["component"],
+                 "Verdi": måling["value"], "Dekningsgrad": måling.get("coverage")}
+                for stasjon in raw for måling in stasjon["values"]
+            ]
+            pd.DataFrame(records).to_json(json_file, orient="records", indent=4, force_ascii=False)
+            json_time += time.perf_counter() - t
+            json_size += os.path.getsize(json_file)
+
+            t = time.perf_counter()
+            write_chunk(os.path.join(tmp, "store"), start[:7], process_hourly_data(raw))
+            store_time += time.perf_counter() - t
+
+        t = time.perf_counter()
+        daily = daily_rollup_store(os.path.join(tmp, "store"))
+        rollup_time = time.perf_counter() - t
+        store_size = folder_size(os.path.join(tmp, "store"))
+
+    print(f"{rows} timeverdier i {len(months)} måneder")
+    print(f"  dicts + JSON (indent=4): {json_time:6.2f} s, {json_size / 1e6:7.1f} MB")
+    print(f"  kolonnelager:            {store_time:6.2f} s, {store_size / 1e6:7.1f} MB")
+    print(f"  døgnaggregering:         {rollup_time:6.2f} s, {len(daily)} dager")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Måler outlier-grensene i common/outliers.py (global, glidende vindu, klimatologi, MAD og IQR) for syntetiske
+døgnverdier med 100 og 1000 stasjoner over ca. 27 år (1 og 10 millioner rader), og sammenligner med
+pandas groupby().rolling() og groupby().transform() for de samme statistikkene.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_outliers.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from common.outliers import outlier_mask, METHODS
+
+DAYS = 10_000
+WINDOW = 31
+
+
+def synthetic_frame(stations):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("1990-01-01", periods=DAYS)
+    season = -15 * np.cos(2 * np.pi * dates.dayofyear.to_numpy() / 365.25)
+    return pd.DataFrame({
+        "Stasjon": np.repeat(np.arange(stations), DAYS),
+        "Dato": np.tile(dates.to_numpy(), stations),
+        "Temperatur": np.tile(season, stations) + rng.normal(0, 3, stations * DAYS),
+    })
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def pandas_rolling(df):
+    rolling = df.groupby("Stasjon")["Temperatur"].rolling(WINDOW, center=True, min_periods=WINDOW // 2)
+    return rolling.mean(), rolling.std()
+
+
+def pandas_climatology(df):
+    grouped = df.groupby([df["Stasjon"], df["Dato"].dt.dayofyear])["Temperatur"]
+    return grouped.transform("mean"), grouped.transform("std")
+
+
+def main():
+    for stations in (100, 1000):
+        df = synthetic_frame(stations)
+        repeat = 3 if stations == 100 else 1
+        print(f"{stations} stasjoner, {len(df):,} rader:")
+        for method in METHODS:
+            seconds = best_of(lambda: outlier_mask(df, ["Temperatur"], method, window=WINDOW), repeat)
+            print(f"  {method:<12} {seconds * 1000:8.0f} ms  ({len(df) / seconds / 1e6:5.1f} mill. rader/s)")
+        print(f"  pandas groupby().rolling()     {best_of(lambda: pandas_rolling(df), repeat) * 1000:8.0f} ms")
+        print(f"  pandas groupby(dag i året)     {best_of(lambda: pandas_climatology(df), repeat) * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Måler lesing av én stasjon og én måned fra ett samlet datasett mot et datasett delt opp per stasjon og år,
+for 10, 50 og 200 stasjoner med 20 års døgnverdier hver. Med partisjoner skal lesetiden holde seg flat.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_partitioned_reads.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+import pandas as pd
+
+from common.storage import save_dataset
+from common.partitions import write_partitions, read_partitions
+from SQL.sql_analysis import load_clean_data
+
+YEARS = 20
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_frame(n_stations):
+    dates = pd.date_range("2000-01-01", periods=365 * YEARS).strftime("%Y-%m-%d")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Dato": np.tile(dates, n_stations),
+        "Stasjon": np.repeat([f"SN{10000 + i}:0" for i in range(n_stations)], len(dates)),
+        "Temperatur": rng.normal(6, 8, len(dates) * n_stations),
+        "Nedbør": rng.gamma(0.5, 4, len(dates) * n_stations),
+    })
+
+
+def main():
+    print(f"{'stasjoner':>9} {'rader':>9} {'hele filen':>11} {'partisjoner':>12}")
+    for n_stations in (10, 50, 200):
+        df = synthetic_frame(n_stations)
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, "data.parquet")
+            root = os.path.join(tmp, "frostAPI")
+            save_dataset(df, file)
+            write_partitions(df, root)
+
+            station = ["SN10003:0"]
+            full_time = best_of(lambda: (lambda d: d[d["Stasjon"].isin(station)])(
+                load_clean_data(file, start="2010-06-01", end="2010-06-30")))
+            partition_time = best_of(lambda: read_partitions(root, station, "2010-06-01", "2010-06-30"))
+        print(f"{n_stations:9} {len(df):9} {full_time * 1000:8.1f} ms {partition_time * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
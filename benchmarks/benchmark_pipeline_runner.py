@@ -0,0 +1,51 @@
+"""
+Måler hele dataflyten fra rådata til sammenslåtte Frost- og NILU-data (combined/full_pipeline.py) når trinnene
+kjøres ett og ett (max_workers=1), mot når Frost- og NILU-grenene kjøres samtidig. Rådataene leses fra data/raw_data,
+og ingenting lagres.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_pipeline_runner.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from common.pipeline import run_pipeline
+from combined.full_pipeline import full_pipeline_stages
+from frostAPI import main_frost
+from niluAPI import main_nilu
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        times.append(time.perf_counter() - start)
+        plt.close("all")
+    return min(times), result
+
+
+def main():
+    main_frost.FROST_RAW_FILE = "data/raw_data/frostAPI_data.parquet"
+    main_nilu.NILU_RAW_FILE = "data/raw_data/niluAPI_data.parquet"
+    sequential, _ = best_of(lambda: run_pipeline(full_pipeline_stages(), max_workers=1))
+    parallel, (results, timings) = best_of(lambda: run_pipeline(full_pipeline_stages(), max_workers=2))
+
+    print(timings.to_string(index=False, float_format="%.3f"))
+    print(f"\nKombinert datasett: {results['kombinert'].shape}")
+    print(f"Ett trinn om gangen:   {sequential * 1000:6.0f} ms")
+    print(f"Grenene samtidig:      {parallel * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
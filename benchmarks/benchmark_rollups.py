@@ -0,0 +1,79 @@
+"""
+Måler gjennomsnitt per måned, uke og sesong med SQL-spørring mot hele tabellen i SQL-lageret mot oppslag
+i ferdige aggregater (SQL/rollups.py), og hvor lang tid det tar å legge inn én ny dag for alle stasjoner
+med full omberegning mot oppdatering av bare periodene dagen hører til. 100 stasjoner med 20 års døgnverdier.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_rollups.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+import pandas as pd
+
+from SQL.warehouse import load_table, sql_query, close_connections
+from SQL.rollups import refresh_rollups, add_days, rollup_means
+
+STATIONS = 100
+YEARS = 20
+QUERY = """
+    SELECT strftime('%Y-%m', Dato) AS Måned, AVG(Nedbør) AS Nedbør, AVG(Temperatur) AS Temperatur,
+           AVG(Vindhastighet) AS Vindhastighet
+    FROM frost
+    GROUP BY Måned
+    ORDER BY Måned
+"""
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_frame(dates):
+    rng = np.random.default_rng(0)
+    n = len(dates) * STATIONS
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), STATIONS),
+        "Stasjon": np.repeat(np.arange(STATIONS), len(dates)),
+        "Nedbør": rng.gamma(0.5, 4, n),
+        "Temperatur": rng.normal(6, 8, n),
+        "Vindhastighet": rng.gamma(2, 1.5, n),
+    })
+
+
+def main():
+    dates = pd.date_range("2000-01-01", periods=365 * YEARS).strftime("%Y-%m-%d")
+    df = synthetic_frame(dates)
+    variables = ["Nedbør", "Temperatur", "Vindhastighet"]
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "frost.parquet")
+        db = os.path.join(tmp, "lager.sqlite")
+        df.to_parquet(source, index=False)
+        load_table("frost", source, db)
+
+        full_time = best_of(lambda: refresh_rollups("frost", path=db), repeat=1)
+        print(f"{len(df)} rader, {STATIONS} stasjoner")
+        print(f"{'periode':>8} {'SQL':>10} {'aggregat':>10}")
+        sql_time = best_of(lambda: sql_query(QUERY, db))
+        for period in ("måned", "uke", "sesong"):
+            lookup_time = best_of(lambda: rollup_means("frost", period, variables, path=db))
+            print(f"{period:>8} {sql_time * 1000:7.0f} ms {lookup_time * 1000:7.1f} ms")
+
+        new_day = synthetic_frame(pd.DatetimeIndex([pd.Timestamp(dates[-1]) + pd.Timedelta(days=1)]).strftime("%Y-%m-%d"))
+        incremental_time = best_of(lambda: add_days("frost", new_day, path=db))
+        close_connections()
+    print(f"Ny dag: full omberegning {full_time * 1000:.0f} ms, bare berørte perioder {incremental_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Måler gjennomsnittstemperatur per år med pandasql (ny SQLite-database og full kopi av tabellen for hver spørring)
+mot SQL-lageret i SQL/warehouse.py (tabellen lastes inn én gang, tilkoblingen gjenbrukes), for 1, 20 og 100 stasjoner
+med 20 års døgnverdier. Krever pandasql for sammenligningen.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_sql_warehouse.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+import pandas as pd
+import pandasql as psql
+
+from SQL.warehouse import load_table, sql_query, filtered_view, close_connections
+
+YEARS = 20
+QUERY = """
+    SELECT strftime('%Y', Dato) AS År, AVG(Temperatur) AS Gjennomsnitt_temperatur
+    FROM df
+    GROUP BY År
+    ORDER BY År
+"""
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_frame(n_stations):
+    dates = pd.date_range("2000-01-01", periods=365 * YEARS).strftime("%Y-%m-%d")
+    rng = np.random.default_rng(0)
+    n = len(dates) * n_stations
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), n_stations),
+        "Stasjon": np.repeat(np.arange(n_stations), len(dates)),
+        "Nedbør": rng.gamma(0.5, 4, n),
+        "Temperatur": rng.normal(6, 8, n),
+        "Vindhastighet": rng.gamma(2, 1.5, n),
+    })
+
+
+def main():
+    print(f"{'stasjoner':>9} {'rader':>9} {'pandasql':>10} {'lager':>10} {'lager, ett år':>14} {'første innlasting':>18}")
+    for n_stations in (1, 20, 100):
+        df = synthetic_frame(n_stations)
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "frost.parquet")
+            db = os.path.join(tmp, "lager.sqlite")
+            df.to_parquet(source, index=False)
+
+            pandasql_time = best_of(lambda: psql.sqldf(QUERY, {"df": df}))
+            start = time.perf_counter()
+            table = load_table("frost", source, db)
+            load_time = time.perf_counter() - start
+            warehouse_time = best_of(lambda: sql_query(QUERY, db, df=load_table("frost", source, db)))
+            one_year = filtered_view(table, "2010-01-01", "2010-12-31", path=db)
+            year_time = best_of(lambda: sql_query(QUERY, db, df=one_year))
+            close_connections()
+        print(f"{n_stations:9} {len(df):9} {pandasql_time * 1000:7.0f} ms {warehouse_time * 1000:7.0f} ms "
+              f"{year_time * 1000:11.0f} ms {load_time * 1000:15.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Måler rense- og transformasjonstrinnene for Frost og NILU når alt kjøres på nytt, mot en ny kjøring der ingenting
+er endret og trinnene hoppes over via manifestene i common/stage_cache.py. Kjører på en kopi av rådataene i data/.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_stage_cache.py
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import matplotlib
+matplotlib.use("Agg")
+
+from common.storage import dataset_path
+from frostAPI import main_frost
+from niluAPI import main_nilu
+
+
+def use_directory(tmp):
+    # Peker trinnenes filstier til en kopi av rådataene
+    raw = os.path.join(tmp, "raw_data")
+    shutil.copytree("data/raw_data", raw, ignore=shutil.ignore_patterns("*_stations*", "*_hourly*"))
+    main_frost.FROST_RAW_FILE = dataset_path(os.path.join(raw, "frostAPI_data"))
+    main_frost.FROST_CLEAN_FILE = dataset_path(os.path.join(tmp, "frostAPI_clean_data"))
+    main_frost.FROST_CLEAN_CUBE = dataset_path(os.path.join(tmp, "frostAPI_clean_data"), "cube")
+    main_frost.FROST_CLEAN_PARTITIONS = os.path.join(tmp, "clean", "frostAPI")
+    main_frost.FROST_ANALYZED_FILE = dataset_path(os.path.join(tmp, "frostAPI_analyzed_data"))
+    main_frost.FROST_ANALYZED_PARTITIONS = os.path.join(tmp, "analyzed", "frostAPI")
+    main_nilu.NILU_CLEAN_FILE = dataset_path(os.path.join(tmp, "niluAPI_clean_data"))
+    main_nilu.NILU_CLEAN_CUBE = dataset_path(os.path.join(tmp, "niluAPI_clean_data"), "cube")
+    main_nilu.NILU_CLEAN_PARTITIONS = os.path.join(tmp, "clean", "niluAPI")
+    main_nilu.NILU_ANALYZED_FILE = dataset_path(os.path.join(tmp, "niluAPI_analyzed_data"))
+    main_nilu.NILU_ANALYZED_PARTITIONS = os.path.join(tmp, "analyzed", "niluAPI")
+    return dataset_path(os.path.join(raw, "niluAPI_data"))
+
+
+def run_pipeline(nilu_raw_file, force):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main_frost.clean_data_frostAPI(force=force)
+        main_frost.fix_skewness_data_frostAPI(force=force)
+        main_nilu.clean_raw_data(nilu_raw_file, force=force)
+        main_nilu.fix_skewness_data_niluAPI(force=force)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        nilu_raw_file = use_directory(tmp)
+        first = timed(lambda: run_pipeline(nilu_raw_file, force=True))
+        forced = timed(lambda: run_pipeline(nilu_raw_file, force=True))
+        skipped = timed(lambda: run_pipeline(nilu_raw_file, force=False))
+        os.utime(main_frost.FROST_RAW_FILE)
+        touched = timed(lambda: run_pipeline(nilu_raw_file, force=False))
+
+    print(f"Første kjøring:                         {first * 1000:8.0f} ms")
+    print(f"Alle trinn på nytt:                     {forced * 1000:8.0f} ms")
+    print(f"Ny kjøring uten endringer:              {skipped * 1000:8.1f} ms")
+    print(f"Rådata berørt, men samme innhold:       {touched * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
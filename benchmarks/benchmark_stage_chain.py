@@ -0,0 +1,80 @@
+"""
+Måler rensing og transformasjon av Frost- og NILU-dataene når trinnene skriver og leser filer mellom hvert trinn
+(JSON og Parquet), mot når DataFrame-ene sendes direkte videre i minnet (run_pipeline_frostAPI og run_pipeline_niluAPI).
+Rådataene leses fra data/raw_data.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_stage_chain.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from common.storage import dataset_path, load_dataset, save_dataset
+from frostAPI import main_frost
+from niluAPI import main_nilu
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        times.append(time.perf_counter() - start)
+        plt.close("all")
+    return min(times)
+
+
+def use_directory(tmp, format):
+    # Peker trinnenes filstier til en midlertidig mappe i valgt format
+    frost_raw = dataset_path(os.path.join(tmp, "frostAPI_data"), format)
+    nilu_raw = dataset_path(os.path.join(tmp, "niluAPI_data"), format)
+    save_dataset(load_dataset("data/raw_data/frostAPI_data.parquet"), frost_raw)
+    save_dataset(load_dataset("data/raw_data/niluAPI_data.parquet"), nilu_raw)
+    main_frost.FROST_RAW_FILE = frost_raw
+    main_frost.FROST_CLEAN_FILE = dataset_path(os.path.join(tmp, "frostAPI_clean_data"), format)
+    main_frost.FROST_CLEAN_CUBE = dataset_path(os.path.join(tmp, "frostAPI_clean_data"), "cube")
+    main_frost.FROST_CLEAN_PARTITIONS = os.path.join(tmp, "clean", "frostAPI")
+    main_frost.FROST_ANALYZED_FILE = dataset_path(os.path.join(tmp, "frostAPI_analyzed_data"), format)
+    main_frost.FROST_ANALYZED_PARTITIONS = os.path.join(tmp, "analyzed", "frostAPI")
+    main_nilu.NILU_CLEAN_FILE = dataset_path(os.path.join(tmp, "niluAPI_clean_data"), format)
+    main_nilu.NILU_CLEAN_CUBE = dataset_path(os.path.join(tmp, "niluAPI_clean_data"), "cube")
+    main_nilu.NILU_CLEAN_PARTITIONS = os.path.join(tmp, "clean", "niluAPI")
+    main_nilu.NILU_ANALYZED_FILE = dataset_path(os.path.join(tmp, "niluAPI_analyzed_data"), format)
+    main_nilu.NILU_ANALYZED_PARTITIONS = os.path.join(tmp, "analyzed", "niluAPI")
+    return nilu_raw
+
+
+def via_files(nilu_raw):
+    main_frost.clean_data_frostAPI(force=True)
+    main_frost.fix_skewness_data_frostAPI(force=True)
+    main_nilu.clean_raw_data(nilu_raw, force=True)
+    main_nilu.fix_skewness_data_niluAPI(force=True)
+
+
+def in_memory(nilu_raw):
+    main_frost.run_pipeline_frostAPI()
+    main_nilu.run_pipeline_niluAPI(raw_data_file=nilu_raw)
+
+
+def main():
+    for format in ("json", "parquet"):
+        with tempfile.TemporaryDirectory() as tmp:
+            nilu_raw = use_directory(tmp, format)
+            files_time = best_of(lambda: via_files(nilu_raw))
+            memory_time = best_of(lambda: in_memory(nilu_raw))
+        print(f"{format:>8}: via filer {files_time * 1000:6.0f} ms, i minnet {memory_time * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
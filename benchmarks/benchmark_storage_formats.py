@@ -0,0 +1,56 @@
+"""
+Måler lagring og innlesing av datasettene i data/ som JSON (det tidligere formatet, indent=4),
+Parquet og Arrow IPC, både for filene slik de er og for en 50 ganger større versjon.
+
+Kjøres fra prosjektroten:
+    python benchmarks/benchmark_storage_formats.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import pandas as pd
+
+from common.storage import save_dataset, load_dataset
+
+DATASETS = [
+    "data/raw_data/frostAPI_data.parquet",
+    "data/clean_data/frostAPI_clean_data.parquet",
+    "data/analyzed_data/niluAPI_analyzed_data.parquet",
+]
+FORMATS = [".json", ".parquet", ".arrow"]
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(df, tmp):
+    print(f"  {'format':8} {'lagring':>9} {'innlesing':>10} {'størrelse':>10}")
+    for extension in FORMATS:
+        path = os.path.join(tmp, f"data{extension}")
+        save_time = best_of(lambda: save_dataset(df, path))
+        load_time = best_of(lambda: load_dataset(path))
+        print(f"  {extension[1:]:8} {save_time * 1000:7.1f} ms {load_time * 1000:8.1f} ms {os.path.getsize(path) / 1e3:7.0f} kB")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for file in DATASETS:
+            df = load_dataset(file)
+            for factor in (1, 50):
+                scaled = pd.concat([df] * factor, ignore_index=True) if factor > 1 else df
+                print(f"{file} x{factor} ({len(scaled)} rader)")
+                measure(scaled, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from SQL.warehouse import get_connection
+from SQL.rollups import PERIODS, bucket_keys
+
+
+def top_indices(values, n, largest=True):
+    """
+    Finner posisjonene til de n største eller minste verdiene med delvis utvalg (np.argpartition),
+    slik at bare de n utvalgte verdiene sorteres. NaN hoppes over.
+
+    Args:
+        values (np.ndarray): Verdiene.
+        n (int): Antall verdier som skal velges.
+        largest (bool): True for de største verdiene, False for de minste.
+
+    Returns:
+        np.ndarray: Posisjoner sortert fra mest til minst ekstrem. Like verdier kommer i opprinnelig rekkefølge.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    ranked = -values[valid] if largest else values[valid]
+    if n <= 0:
+        return valid[:0]
+    if n < len(ranked):
+        selected = np.argpartition(ranked, n - 1)[:n]
+    else:
+        selected = np.arange(len(ranked))
+    selected = selected[np.lexsort((selected, ranked[selected]))]
+    return valid[selected]
+
+
+def select_extremes(df, column, n=10, largest=True, by=None, date_col="Dato"):
+    """
+    Velger de n største eller minste radene for en variabel, eventuelt per gruppe, uten å sortere hele datasettet.
+
+    Args:
+        df (pd.DataFrame): Dataene.
+        column (str): Variabelen det rangeres på, f.eks. "Temperatur".
+        n (int): Antall rader per gruppe.
+        largest (bool): True for de største verdiene, False for de minste.
+        by (str, optional): "uke", "måned", "sesong", "år" (periode fra datokolonnen) eller en kolonne, f.eks. "Stasjon".
+        date_col (str): Navn på datokolonnen.
+
+    Returns:
+        pd.DataFrame: De valgte radene sortert fra mest til minst ekstrem, gruppe for gruppe.
+            Grupperes det på en periode, får resultatet kolonnen Periode.
+    """
+    values = df[column].to_numpy(dtype=float)
+    if by is None:
+        return df.iloc[top_indices(values, n, largest)].reset_index(drop=True)
+
+    keys = bucket_keys(df[date_col], by) if by in PERIODS else df[by].to_numpy()
+    groups = pd.Series(np.arange(len(df))).groupby(keys, sort=True).indices
+    positions = [group[top_indices(values[group], n, largest)] for group in groups.values()]
+    selected = np.concatenate(positions) if positions else np.array([], dtype=np.int64)
+    result = df.iloc[selected].reset_index(drop=True)
+    if by in PERIODS:
+        result.insert(0, "Periode", keys[selected])
+    return result
+
+
+def merge_extremes(previous, new_rows, column, n=10, largest=True, by=None, date_col="Dato"):
+    """
+    Oppdaterer et tidligere utvalg når nye rader legges til. De n mest ekstreme radene blant alle radene
+    finnes alltid blant de forrige n og de nye radene, så bare disse trenger å sammenlignes.
+
+    Args:
+        previous (pd.DataFrame): Forrige resultat fra select_extremes (med samme column, n, largest og by).
+        new_rows (pd.DataFrame): Nye rader.
+        column (str): Variabelen det rangeres på.
+        n (int): Antall rader per gruppe.
+        largest (bool): True for de største verdiene, False for de minste.
+        by (str, optional): Gruppering som i select_extremes.
+        date_col (str): Navn på datokolonnen.
+
+    Returns:
+        pd.DataFrame: Oppdatert utvalg.
+    """
+    if by in PERIODS:
+        previous = previous.drop(columns="Periode")
+    combined = pd.concat([previous, new_rows], ignore_index=True)
+    return select_extremes(combined, column, n, largest, by, date_col)
+
+
+def _is_table(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+def top_n(df, column, n=10, largest=True, by=None, columns=None, date_col="Dato", path=None):
+    """
+    Henter de n største eller minste dagene for en variabel, eventuelt per uke, måned, sesong, år eller stasjon.
+
+    For en tabell i SQL-lageret uten gruppering brukes en indeks på variabelen, slik at bare de n første
+    radene i indeksen leses. SQLite holder indeksen oppdatert når rader legges til (se add_days i SQL/rollups.py).
+    Ellers velges radene med delvis utvalg i numpy (select_extremes).
+
+    Args:
+        df (pd.DataFrame or str): Dataene, eller navn på en tabell eller visning i SQL-lageret.
+        column (str): Variabelen det rangeres på, f.eks. "Temperatur".
+        n (int): Antall rader (per gruppe).
+        largest (bool): True for de største verdiene, False for de minste.
+        by (str, optional): "uke", "måned", "sesong", "år" eller en kolonne, f.eks. "Stasjon".
+        columns (list, optional): Kolonnene som skal returneres. Standard er alle.
+        date_col (str): Navn på datokolonnen.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        pd.DataFrame: De valgte radene sortert fra mest til minst ekstrem.
+    """
+    if isinstance(df, str):
+        conn = get_connection(path)
+        if by is None:
+            if _is_table(conn, df):
+                with conn:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{df}_{column}" ON "{df}" ("{column}")')
+            selected = ", ".join(f'"{col}"' for col in columns) if columns else "*"
+            return pd.read_sql_query(
+                f'SELECT {selected} FROM "{df}" WHERE "{column}" IS NOT NULL '
+                f'ORDER BY "{column}" {"DESC" if largest else "ASC"} LIMIT ?', conn, params=(int(n),))
+        df = pd.read_sql_query(f'SELECT * FROM "{df}"', conn)
+
+    result = select_extremes(df, column, n, largest, by, date_col)
+    if columns:
+        result = result[(["Periode"] if by in PERIODS else []) + list(columns)]
+    return result
@@ -0,0 +1,324 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from common.storage import load_dataset
+from SQL.warehouse import get_connection, write_table, load_table, _sql_values, SOURCES_TABLE
+
+# Periodene som aggregeres. Ukene følger '%Y-U%U' (uker som starter på søndag) som i analyze_weekly_avg_data,
+# og sesongene følger get_season i frostAPI/visualization_frost.py (vinter = desember, januar og februar i samme år).
+PERIODS = ("uke", "måned", "sesong", "år")
+SEASONS = {12: "Vinter", 1: "Vinter", 2: "Vinter", 3: "Vår", 4: "Vår", 5: "Vår",
+           6: "Sommer", 7: "Sommer", 8: "Sommer", 9: "Høst", 10: "Høst", 11: "Høst"}
+ROLLUPS_TABLE = "_aggregater"
+ROLLUP_COLUMNS = ["Periode", "Variabel", "Rader", "Antall", "Snitt", "Std", "Min", "Maks"]
+
+
+def rollup_table(table, period):
+    # Navnet på aggregattabellen for en tabell og periode, f.eks. "frost_renset_måned"
+    return f"{table}_{period}"
+
+
+def bucket_keys(dates, period):
+    """
+    Finner perioden hver dato hører til.
+
+    Args:
+        dates (array-like): Datoer som tekst ('YYYY-MM-DD') eller datetime.
+        period (str): "uke", "måned", "sesong" eller "år".
+
+    Returns:
+        np.ndarray: Periodenøkler, f.eks. "2020-U05", "2020-01", "2020-Vinter" eller "2020".
+
+    Raises:
+        ValueError: Hvis perioden er ukjent.
+    """
+    # Nøklene regnes ut én gang per unike dato
+    inverse, uniques = pd.factorize(np.asarray(dates), use_na_sentinel=False)
+    dates = pd.Series(pd.to_datetime(uniques))
+    if period == "uke":
+        keys = dates.dt.strftime("%Y-U%U")
+    elif period == "måned":
+        keys = dates.dt.strftime("%Y-%m")
+    elif period == "år":
+        keys = dates.dt.strftime("%Y")
+    elif period == "sesong":
+        keys = dates.dt.strftime("%Y-") + dates.dt.month.map(SEASONS)
+    else:
+        raise ValueError(f"Ukjent periode: {period}")
+    return keys.to_numpy(dtype=object)[inverse]
+
+
+def compute_rollup(df, period, value_columns, date_col="Dato"):
+    """
+    Aggregerer døgnverdier per periode: antall rader, antall verdier, gjennomsnitt, standardavvik, minimum og maksimum
+    for hver variabel. Standardavviket er utvalgsstandardavviket (ddof=1), som i pandas.
+
+    Args:
+        df (pd.DataFrame): Døgnverdier med datokolonne.
+        period (str): "uke", "måned", "sesong" eller "år".
+        value_columns (list): Variablene som aggregeres.
+        date_col (str): Navn på datokolonnen.
+
+    Returns:
+        pd.DataFrame: Én rad per periode og variabel med kolonnene i ROLLUP_COLUMNS, sortert på periode og variabel.
+    """
+    if df.empty:
+        return pd.DataFrame({col: pd.Series(dtype=float if col not in ("Periode", "Variabel") else object)
+                             for col in ROLLUP_COLUMNS})
+
+    keys = bucket_keys(df[date_col], period)
+    grouped = df[list(value_columns)].groupby(keys)
+    parts = []
+    for col in value_columns:
+        stats = grouped[col].agg(["size", "count", "mean", "std", "min", "max"])
+        stats.columns = ROLLUP_COLUMNS[2:]
+        stats.insert(0, "Variabel", col)
+        parts.append(stats)
+    result = pd.concat(parts).rename_axis("Periode").reset_index()
+    return result.sort_values(["Periode", "Variabel"], kind="stable").reset_index(drop=True)
+
+
+def _value_columns(conn, table):
+    # Alle tallkolonner i tabellen unntatt stasjonskoden
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")') if row[2] == "REAL"]
+
+
+def _span(dates, period):
+    # Datoområdet som dekker alle periodene datoene hører til. Vinteren går over hele kalenderåret (januar–desember).
+    dates = pd.to_datetime(np.asarray(dates))
+    first, last = dates.min(), dates.max()
+    if period == "uke":
+        first, last = first - pd.Timedelta(days=6), last + pd.Timedelta(days=6)
+    elif period == "måned":
+        first, last = first.replace(day=1), last + pd.offsets.MonthEnd(0)
+    else:
+        first, last = first.replace(month=1, day=1), last.replace(month=12, day=31)
+    return first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")
+
+
+def _source_signature(conn, table):
+    return conn.execute(f"SELECT kilde, endret, storrelse FROM {SOURCES_TABLE} WHERE tabell = ?", (table,)).fetchone()
+
+
+def refresh_rollups(table, value_columns=None, dates=None, periods=PERIODS, path=None):
+    """
+    Oppdaterer aggregattabellene for en tabell i SQL-lageret. Uten datoer bygges alle periodene på nytt.
+    Med datoer regnes bare periodene disse datoene hører til ut på nytt fra døgnverdiene, og de andre
+    periodene i aggregattabellene står urørt.
+
+    Args:
+        table (str): Tabellnavn i lageret, f.eks. "frost_renset".
+        value_columns (list, optional): Variablene som aggregeres. Standard er alle tallkolonner unntatt Stasjon.
+        dates (array-like, optional): Datoer som er nye eller endret.
+        periods (tuple): Periodene som oppdateres.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        dict: Periode → antall perioder som ble regnet ut.
+    """
+    conn = get_connection(path)
+    value_columns = list(value_columns or _value_columns(conn, table))
+    selected = ", ".join(f'"{col}"' for col in ["Dato", *value_columns])
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    refreshed = {}
+    all_rows = None
+
+    for period in periods:
+        name = rollup_table(table, period)
+        if dates is None or name not in existing:
+            if all_rows is None:
+                all_rows = pd.read_sql_query(f'SELECT {selected} FROM "{table}"', conn)
+            rows = all_rows
+            rollup = compute_rollup(rows, period, value_columns)
+            write_table(conn, name, rollup, index_columns=("Periode",))
+        else:
+            keys = sorted(set(bucket_keys(dates, period)))
+            start, end = _span(dates, period)
+            rows = pd.read_sql_query(f'SELECT {selected} FROM "{table}" WHERE Dato BETWEEN ? AND ?',
+                                     conn, params=(start, end))
+            rows = rows[np.isin(bucket_keys(rows["Dato"], period), keys)] if not rows.empty else rows
+            rollup = compute_rollup(rows, period, value_columns)
+            with conn:
+                conn.executemany(f'DELETE FROM "{name}" WHERE Periode = ?', [(key,) for key in keys])
+            write_table(conn, name, rollup, replace=False, index_columns=("Periode",))
+        refreshed[period] = rollup["Periode"].nunique()
+
+    _record_rollups(conn, table)
+    return refreshed
+
+
+def _rollup_signature(conn, table):
+    # Versjonen av datasettet aggregatene sist ble oppdatert fra
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {ROLLUPS_TABLE} (tabell TEXT PRIMARY KEY, kilde TEXT, endret REAL, storrelse INTEGER)")
+    return conn.execute(f"SELECT kilde, endret, storrelse FROM {ROLLUPS_TABLE} WHERE tabell = ?", (table,)).fetchone()
+
+
+def _record_rollups(conn, table):
+    # Aggregatene hører nå til samme versjon av datasettet som tabellen
+    with conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {ROLLUPS_TABLE} (tabell TEXT PRIMARY KEY, kilde TEXT, endret REAL, storrelse INTEGER)")
+        conn.execute(f"INSERT OR REPLACE INTO {ROLLUPS_TABLE} VALUES (?, ?, ?, ?)",
+                     (table, *(_source_signature(conn, table) or (None, None, None))))
+
+
+def ensure_rollups(table, value_columns=None, path=None):
+    """
+    Sørger for at aggregattabellene finnes og hører til gjeldende innhold i tabellen. Når tabellen er lest inn
+    på nytt fra et endret datasett (se load_table), bygges aggregatene på nytt.
+
+    Args:
+        table (str): Tabellnavn i lageret.
+        value_columns (list, optional): Variablene som aggregeres. Standard er alle tallkolonner unntatt Stasjon.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        bool: True hvis aggregatene ble bygget på nytt.
+    """
+    conn = get_connection(path)
+    stored = _rollup_signature(conn, table)
+    if stored is not None and stored == (_source_signature(conn, table) or (None, None, None)):
+        return False
+    refresh_rollups(table, value_columns, path=path)
+    return True
+
+
+def add_days(table, df, value_columns=None, key_columns=("Dato", "Stasjon"), path=None):
+    """
+    Legger nye eller rettede døgnverdier inn i en tabell i lageret og oppdaterer bare periodene de hører til.
+    Rader med samme nøkkel (dato og stasjon) erstattes.
+
+    Args:
+        table (str): Tabellnavn i lageret.
+        df (pd.DataFrame): Nye døgnverdier med de samme kolonnene som tabellen.
+        value_columns (list, optional): Variablene som aggregeres. Standard er alle tallkolonner unntatt Stasjon.
+        key_columns (tuple): Kolonnene som identifiserer en rad.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        dict: Periode → antall perioder som ble regnet ut.
+    """
+    if df.empty:
+        return {period: 0 for period in PERIODS}
+
+    conn = get_connection(path)
+    # Nøklene bindes på samme form som i tabellen, f.eks. datoer som 'YYYY-MM-DD'
+    keys = list(zip(*(_sql_values(df[col]) for col in key_columns)))
+    condition = " AND ".join(f'"{col}" = ?' for col in key_columns)
+    with conn:
+        conn.executemany(f'DELETE FROM "{table}" WHERE {condition}', keys)
+    write_table(conn, table, df, replace=False)
+    return refresh_rollups(table, value_columns, dates=df["Dato"], path=path)
+
+
+def _changed_rows(conn, table, df, key_columns):
+    # Radene i df som er nye eller endret sammenlignet med tabellen. None hvis rader er fjernet,
+    # kolonnene er endret eller nøklene ikke er unike, slik at tabellen må lastes inn på nytt.
+    stored = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+    if list(stored.columns) != list(df.columns) or df.duplicated(list(key_columns)).any():
+        return None
+    new = pd.DataFrame({col: _sql_values(df[col]) for col in df.columns}).assign(_rad=np.arange(len(df)))
+    merged = new.merge(stored, on=list(key_columns), how="outer", suffixes=("", "_lagret"), indicator=True)
+    if (merged["_merge"] == "right_only").any():
+        return None
+
+    changed = (merged["_merge"] == "left_only").to_numpy()
+    for col in df.columns.difference(list(key_columns)):
+        new_values, stored_values = merged[col], merged[f"{col}_lagret"]
+        changed |= ~((new_values == stored_values) | (new_values.isna() & stored_values.isna())).to_numpy()
+    rows = np.sort(merged.loc[changed, "_rad"].to_numpy(dtype=np.int64))
+    return df.iloc[rows]
+
+
+def sync_table(name, source_file, value_columns=None, key_columns=("Dato", "Stasjon"), path=None):
+    """
+    Gjør et datasett tilgjengelig som tabell i lageret med aggregater, og tar inn endringer inkrementelt.
+    Er datasettet endret siden forrige innlasting, f.eks. etter en inkrementell henting og ny rensing,
+    sammenlignes det med tabellen, og bare nye eller endrede dager legges inn med add_days. Er rader fjernet
+    eller kolonnene endret, lastes tabellen og aggregatene inn på nytt.
+
+    Args:
+        name (str): Tabellnavn, f.eks. "frost_renset".
+        source_file (str): Filsti til datasettet (Parquet, Arrow, JSON eller kube).
+        value_columns (list, optional): Variablene som aggregeres. Standard er alle tallkolonner unntatt Stasjon.
+        key_columns (tuple): Kolonnene som identifiserer en rad. Kolonner som ikke finnes i datasettet hoppes over.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        str: Tabellnavnet.
+
+    Raises:
+        FileNotFoundError: Hvis kildefilen ikke finnes.
+    """
+    if not os.path.exists(source_file):
+        raise FileNotFoundError(f"Finner ikke fil: {source_file}")
+    stat = os.stat(source_file)
+    signature = (source_file, stat.st_mtime, stat.st_size)
+    conn = get_connection(path)
+    stored = _source_signature(conn, name)
+    # Inkrementelt bare når tabellen og aggregatene hører til samme, eldre versjon av datasettet
+    if stored is not None and stored != signature and _rollup_signature(conn, name) == stored:
+        df = load_dataset(source_file)
+        keys = [col for col in key_columns if col in df.columns]
+        changed = _changed_rows(conn, name, df, keys) if keys else None
+        if changed is not None:
+            with conn:
+                conn.execute(f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?, ?)", (name, *signature))
+            if changed.empty:
+                _record_rollups(conn, name)
+            else:
+                add_days(name, changed, value_columns, keys, path)
+
+    load_table(name, source_file, path)
+    ensure_rollups(name, value_columns, path)
+    return name
+
+
+def lookup_rollup(table, period, variables=None, path=None):
+    """
+    Henter ferdig aggregerte verdier for en tabell og periode.
+
+    Args:
+        table (str): Tabellnavn i lageret.
+        period (str): "uke", "måned", "sesong" eller "år".
+        variables (list, optional): Variablene som skal hentes. Standard er alle.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        pd.DataFrame: Kolonnene i ROLLUP_COLUMNS sortert på periode, eller None hvis tabellen ikke har aggregater.
+    """
+    conn = get_connection(path)
+    name = rollup_table(table, period)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is None:
+        return None
+
+    query = f'SELECT * FROM "{name}"'
+    params = ()
+    if variables is not None:
+        query += f" WHERE Variabel IN ({', '.join('?' * len(variables))})"
+        params = tuple(variables)
+    result = pd.read_sql_query(query + " ORDER BY Periode, Variabel", conn, params=params)
+    return result[ROLLUP_COLUMNS]
+
+
+def rollup_means(table, period, variables, path=None):
+    """
+    Henter gjennomsnittet per periode for flere variabler som én rad per periode.
+
+    Args:
+        table (str): Tabellnavn i lageret.
+        period (str): "uke", "måned", "sesong" eller "år".
+        variables (list): Variablene som skal hentes.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        pd.DataFrame: Kolonnene Periode, Rader og én kolonne per variabel, eller None hvis tabellen ikke har aggregater.
+    """
+    rollup = lookup_rollup(table, period, variables, path)
+    if rollup is None:
+        return None
+    means = rollup.pivot(index="Periode", columns="Variabel", values="Snitt").reindex(columns=list(variables))
+    means.columns.name = None
+    rows = rollup.groupby("Periode")["Rader"].first()
+    return means.reset_index().assign(Rader=rows.to_numpy().astype(np.int64))[["Periode", "Rader", *variables]]
@@ -1,25 +1,81 @@
 import pandas as pd
-import pandasql as psql
-import matplotlib.pyplot as plt
 import json
-import seaborn as sns 
-
-def load_clean_data(filepath="../../data/clean_data/frostAPI_clean_data.json"):
+import os
+from common.storage import dataset_path, load_dataset, current_copy, detect_format
+from common.partitions import read_partitions
+from common.cube import read_cube
+from SQL.warehouse import sql_query, filtered_view
+from SQL.rollups import sync_table, rollup_means
+from SQL.extremes import top_n
+from common.diagnostics import show_plot
+
+FROST_CLEAN_FILE = dataset_path("../../data/clean_data/frostAPI_clean_data")
+NILU_CLEAN_FILE = dataset_path("../../data/clean_data/niluAPI_clean_data")
+# Minnekartlagt utgave av de samme datasettene (stasjon × dag), se common/cube.py
+FROST_CLEAN_CUBE = dataset_path("../../data/clean_data/frostAPI_clean_data", "cube")
+NILU_CLEAN_CUBE = dataset_path("../../data/clean_data/niluAPI_clean_data", "cube")
+
+def load_clean_data(filepath=None, start=None, end=None, stations=None):
     """
-    Leser inn rengjorte værdata fra angitt JSON-fil.
+    Leser inn rengjorte værdata fra angitt datasett (Parquet, Arrow, JSON eller kube) eller partisjonsmappe.
+    For en kube hentes bare dagene i filteret, og for en partisjonsmappe åpnes bare stasjonene og årene som passer.
 
     Args:
-        filepath (str): Filsti til JSON-data.
+        filepath (str, optional): Filsti til datasettet, kube (.cube) eller mappe med partisjoner (<stasjon>/<år>).
+            Standard er de rensede Frost-dataene, fra kuben hvis den er oppdatert.
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        stations (list, optional): Stasjoner som skal tas med. Gjelder kuber og partisjonsmapper.
 
     Returns:
         pd.DataFrame: DataFrame med værdata, eller tom hvis feil oppstår.
     """
+    filepath = filepath or current_copy(FROST_CLEAN_CUBE, FROST_CLEAN_FILE)
     try:
-        df = pd.read_json(filepath)
+        if detect_format(filepath) == "cube":
+            return read_cube(filepath, stations, start, end)
+        if os.path.isdir(filepath):
+            return read_partitions(filepath, stations, start, end)
+
+        df = load_dataset(filepath)
+        if start or end:
+            dates = df["Dato"].astype(str).str[:10]
+            df = df[(dates >= (start or "")) & (dates <= (end or "9999"))].reset_index(drop=True)
         return df
     except Exception as e:
         print(f"Feil ved lesing av fil '{filepath}': {e}")
         return pd.DataFrame()
+
+def clean_table(name, filepath, start=None, end=None, stations=None):
+    """
+    Gjør et renset datasett tilgjengelig som tabell i SQL-lageret (SQL/warehouse.py). Når filen er endret, legges bare
+    nye eller endrede dager inn, og bare periodene de hører til i aggregatene per uke, måned, sesong og år regnes ut
+    på nytt (sync_table i SQL/rollups.py). Dato- og stasjonsfilteret bruker indeksene i lageret.
+
+    Args:
+        name (str): Tabellnavn i lageret, f.eks. "frost_renset".
+        filepath (str): Filsti til datasettet eller kuben.
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        stations (list, optional): Stasjoner som skal tas med. Standard er alle.
+
+    Returns:
+        str: Navnet på tabellen eller visningen, eller None hvis feil oppstår.
+    """
+    try:
+        table = sync_table(name, filepath)
+        return filtered_view(table, start, end, stations)
+    except Exception as e:
+        print(f"Feil ved lesing av fil '{filepath}': {e}")
+        return None
+
+def frost_clean_table(start=None, end=None, stations=None):
+    # Rengjorte data fra Frost API, fra kuben hvis den er oppdatert
+    return clean_table("frost_renset", current_copy(FROST_CLEAN_CUBE, FROST_CLEAN_FILE), start, end, stations)
+
+def nilu_clean_table(start=None, end=None):
+    # Rengjorte data fra NILU API, fra kuben hvis den er oppdatert
+    return clean_table("nilu_renset", current_copy(NILU_CLEAN_CUBE, NILU_CLEAN_FILE), start, end)
     
 def analyze_hottest_days(df, date_col, temp_col, precip_col, n_days):
     """
@@ -27,7 +83,7 @@ def analyze_hottest_days(df, date_col, temp_col, precip_col, n_days):
     med nedbør og lager et kakediagram for fordeling per år.
 
     Args:
-        df (pd.DataFrame): DataFrame med værdata.
+        df (pd.DataFrame or str): DataFrame med værdata, eller navn på en tabell i SQL-lageret.
         date_col (str): Navn på kolonnen som inneholder dato.
         temp_col (str): Navn på kolonnen som inneholder temperaturverdier.
         precip_col (str): Navn på kolonnen som inneholder nedbørverdier.
@@ -37,14 +93,8 @@ def analyze_hottest_days(df, date_col, temp_col, precip_col, n_days):
         pd.DataFrame: DataFrame med de varmeste dagene.
     """
     try:
-        # SQL-spørring for å hente de n varmeste dagene
-        query = f"""
-        SELECT *
-        FROM df
-        ORDER BY {temp_col} DESC
-        LIMIT {n_days}
-        """
-        hottest_days = psql.sqldf(query, locals())
+        # Henter de n varmeste dagene uten å sortere hele datasettet (se SQL/extremes.py)
+        hottest_days = top_n(df, temp_col, n_days, largest=True)
 
         # Legger til kolonne med år basert på datokolonnen
         hottest_days['År'] = pd.to_datetime(hottest_days[date_col]).dt.year
@@ -53,40 +103,39 @@ def analyze_hottest_days(df, date_col, temp_col, precip_col, n_days):
         print(f"Feil under dataanalyse: {e}")
         return pd.DataFrame()  # Returnerer tomt DataFrame ved feil
 
-    # Visualisering: Temperatur og nedbør med scatterplot
-    try:
-        plt.figure(figsize=(6, 3))
-        x = range(len(hottest_days))
-        plt.scatter(x, hottest_days[temp_col], color='red', label=f'{temp_col} (°C)', s=100)
-        plt.scatter(x, hottest_days[precip_col], color='blue', label=f'{precip_col} (mm)', s=100)
-        plt.title(f'{temp_col} (°C) vs {precip_col} (mm) for de {n_days} varmeste dagene')
-        plt.grid(True)
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
-    except Exception as e:
-        print(f"Feil under scatterplot-visualisering: {e}")
-
-    # Visualisering: Kakediagram etter år 
-    try:
-        # Teller antall dager per år
-        year_counts = hottest_days['År'].value_counts()
-
-        plt.figure(figsize=(6, 6))
-        plt.pie(
-            year_counts,
-            labels = year_counts.index,
-            autopct = '%1.1f%%',
-            colors = plt.cm.Set3.colors
-        )
-        plt.title(f"De {n_days} varmeste dagene fordelt på år")
-        plt.axis('equal')
-        plt.show()
-    except Exception as e:
-        print(f"Feil under kakediagram-visualisering: {e}")
+    # Visualisering: Temperatur og nedbør med scatterplot, og kakediagram etter år
+    show_plot("varmeste_dager", _draw_hottest_days, hottest_days, temp_col, precip_col, n_days)
+    show_plot("varmeste_dager_per_år", _draw_year_pie, hottest_days['År'].value_counts(),
+              f"De {n_days} varmeste dagene fordelt på år")
 
     return hottest_days
 
+def _draw_hottest_days(hottest_days, temp_col, precip_col, n_days):
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6, 3))
+    x = range(len(hottest_days))
+    plt.scatter(x, hottest_days[temp_col], color='red', label=f'{temp_col} (°C)', s=100)
+    plt.scatter(x, hottest_days[precip_col], color='blue', label=f'{precip_col} (mm)', s=100)
+    plt.title(f'{temp_col} (°C) vs {precip_col} (mm) for de {n_days} varmeste dagene')
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+
+def _draw_year_pie(year_counts, title):
+    # Kakediagram med antall dager per år
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6, 6))
+    plt.pie(
+        year_counts,
+        labels=year_counts.index,
+        autopct='%1.1f%%',
+        colors=plt.cm.Set3.colors
+    )
+    plt.title(title)
+    plt.axis('equal')
+
 def analyze_frost_api_clean_data():
     """
     Leser inn rengjorte værdata fra Frost API og analyserer de varmeste dagene
@@ -95,9 +144,9 @@ def analyze_frost_api_clean_data():
     Returns:
         pd.DataFrame: DataFrame med de varmeste dagene.
     """
-    df = load_clean_data()
-    if df.empty:
-        return df
+    df = frost_clean_table()
+    if df is None:
+        return pd.DataFrame()
 
     # Kaller analysefunksjonen med relevante kolonnenavn
     return analyze_hottest_days(
@@ -114,7 +163,7 @@ def analyze_coldest_days(df, date_col, temp_col, n_days):
     av disse dagene etter år i et kakediagram.
 
     Args:
-        df (pd.DataFrame): DataFrame med værdata.
+        df (pd.DataFrame or str): DataFrame med værdata, eller navn på en tabell i SQL-lageret.
         date_col (str): Navn på kolonnen med dato.
         temp_col (str): Navn på kolonnen med temperatur.
         n_days (int): Antall kaldeste dager som skal analyseres.
@@ -123,14 +172,8 @@ def analyze_coldest_days(df, date_col, temp_col, n_days):
         pd.DataFrame: DataFrame med de kaldeste dagene og tilhørende år.
     """
     try:
-        # SQL-spørring for å hente de n kaldeste dagene
-        query = f"""
-            SELECT {date_col}, {temp_col}
-            FROM df 
-            ORDER BY {temp_col} ASC 
-            LIMIT {n_days}
-        """
-        coldest_days = psql.sqldf(query, locals())
+        # Henter de n kaldeste dagene uten å sortere hele datasettet (se SQL/extremes.py)
+        coldest_days = top_n(df, temp_col, n_days, largest=False, columns=[date_col, temp_col])
 
         # Legger til kolonne med år fra dato
         coldest_days['År'] = pd.to_datetime(coldest_days[date_col]).dt.year
@@ -140,23 +183,8 @@ def analyze_coldest_days(df, date_col, temp_col, n_days):
         return pd.DataFrame()
 
     # Visualisering: kakediagram som viser fordeling etter år
-    try:
-        # Teller antall dager per år
-        year_counts = coldest_days['År'].value_counts()
-
-        plt.figure(figsize=(6, 6))
-        plt.pie(
-            year_counts,
-            labels=year_counts.index,
-            autopct='%1.1f%%',
-            colors=plt.cm.Set3.colors
-        )
-        plt.title(f"De {n_days} kaldeste dagene fordelt på år")
-        plt.axis('equal')
-        plt.show()
-
-    except Exception as e:
-        print(f"Feil under visualisering: {e}")
+    show_plot("kaldeste_dager_per_år", _draw_year_pie, coldest_days['År'].value_counts(),
+              f"De {n_days} kaldeste dagene fordelt på år")
 
     return coldest_days
 
@@ -168,10 +196,9 @@ def analyze_coldest_frost_api_data():
     Returns:
         pd.DataFrame: DataFrame med de kaldeste dagene og tilhørende år.
     """
-    # Rengjorte data fra Frost API
-    df = load_clean_data()
-    if df.empty:
-        return df
+    df = frost_clean_table()
+    if df is None:
+        return pd.DataFrame()
     
     # Kaller analysefunksjonen med relevante kolonnenavn
     return analyze_coldest_days(
@@ -187,7 +214,7 @@ def analyze_avg_temperature_per_year(df, date_col, temp_col):
     Beregner og visualiserer gjennomsnittlig temperatur per år basert på en DataFrame med værdata.
 
     Args:
-        df (pd.DataFrame): DataFrame med værdata.
+        df (pd.DataFrame or str): DataFrame med værdata, eller navn på en tabell i SQL-lageret.
         date_col (str): Kolonnenavn for dato.
         temp_col (str): Kolonnenavn for temperatur.
 
@@ -195,6 +222,12 @@ def analyze_avg_temperature_per_year(df, date_col, temp_col):
         pd.DataFrame: DataFrame med gjennomsnittlig temperatur per år.
     """
     try:
+        # Ferdige årsaggregater brukes når df er en hel tabell i lageret
+        means = rollup_means(df, "år", [temp_col]) if isinstance(df, str) else None
+        if means is not None:
+            return _plot_avg_temperature_per_year(
+                means.rename(columns={"Periode": "År", temp_col: "Gjennomsnitt_temperatur"})[["År", "Gjennomsnitt_temperatur"]])
+
         # SQL-spørring for å finne gjennomsnittlig temperatur per år
         query = f"""
             SELECT strftime('%Y', {date_col}) AS År,
@@ -203,40 +236,48 @@ def analyze_avg_temperature_per_year(df, date_col, temp_col):
             GROUP BY År
             ORDER BY År
         """
-        result = psql.sqldf(query, locals())
+        result = sql_query(query, df=df)
 
     except Exception as e:
         print(f"Feil under aggregering av temperaturdata: {e}")
         return pd.DataFrame()
 
-    # Visualisering av gjennomsnittstemperatur per år
-    try:
-        plt.figure(figsize=(10, 5))
-        plt.plot(result['År'], result['Gjennomsnitt_temperatur'],
-                 marker='o', color='blue', linestyle='-')
-        plt.title("Gjennomsnittlig temperatur per år")
-        plt.xlabel("År")
-        plt.ylabel("Temperatur (°C)")
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
-
-    except Exception as e:
-        print(f"Feil under visualisering: {e}")
+    return _plot_avg_temperature_per_year(result)
 
+def _plot_avg_temperature_per_year(result):
+    show_plot("snittemperatur_per_år", _draw_avg_temperature_per_year, result)
     return result
 
-def analyze_avg_temp_frost_api_data():
+def _draw_avg_temperature_per_year(result):
+    # Visualisering av gjennomsnittstemperatur per år
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 5))
+    plt.plot(result['År'], result['Gjennomsnitt_temperatur'],
+             marker='o', color='blue', linestyle='-')
+    plt.title("Gjennomsnittlig temperatur per år")
+    plt.xlabel("År")
+    plt.ylabel("Temperatur (°C)")
+    plt.grid(True)
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+
+def analyze_avg_temp_frost_api_data(start=None, end=None, stations=None):
     """
     Leser inn rengjorte værdata fra Frost API og analyserer gjennomsnittstemperatur per år.
+    Med datofilter hentes bare periodens rader via datoindeksen i SQL-lageret.
+
+    Args:
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        stations (list, optional): Stasjoner som skal tas med. Standard er alle.
 
     Returns:
         pd.DataFrame: DataFrame med gjennomsnittlig temperatur per år.
     """
-    df = load_clean_data()
-    if df.empty:
-        return df
+    df = frost_clean_table(start, end, stations)
+    if df is None:
+        return pd.DataFrame()
 
     # Kaller analysefunksjonen med relevante kolonnenavn
     return analyze_avg_temperature_per_year(
@@ -250,7 +291,7 @@ def analyze_weekly_avg_data(df, date, precip, temp, wind):
     Beregner og visualiserer ukentlig gjennomsnitt for nedbør, temperatur og vindhastighet basert på værdata.
 
     Args:
-        df (pd.DataFrame): DataFrame med værdata.
+        df (pd.DataFrame or str): DataFrame med værdata, eller navn på en tabell i SQL-lageret.
         date (str): Kolonnenavn for dato.
         precip (str): Kolonnenavn for nedbør.
         temp (str): Kolonnenavn for temperatur.
@@ -259,14 +300,20 @@ def analyze_weekly_avg_data(df, date, precip, temp, wind):
     Returns:
         pd.DataFrame: DataFrame med ukentlig gjennomsnitt for nedbør, temperatur og vindhastighet.
     """
-    # Legger til en kolonne for uke
-    df['Uke'] = pd.to_datetime(df[date]).dt.strftime('%Y-U%U')
-
     try:
-        # SQL-spørring for å beregne ukentlig gjennomsnitt
+        # Ferdige ukeaggregater brukes når df er en hel tabell i lageret
+        means = rollup_means(df, "uke", [precip, temp, wind]) if isinstance(df, str) else None
+        if means is not None:
+            return _plot_weekly_avg(means.rename(columns={
+                "Periode": "Uke", precip: "Avg_Nedbør", temp: "Avg_Temperatur", wind: "Avg_Vindhastighet"
+            })[["Uke", "Avg_Nedbør", "Avg_Temperatur", "Avg_Vindhastighet"]])
+
+        # SQL-spørring for å beregne ukentlig gjennomsnitt. Uken beregnes som '%Y-U%U' i strftime
+        # (uker som starter på søndag), siden SQLite ikke har %U.
         query = f"""
             SELECT
-                Uke,
+                strftime('%Y', {date}) || '-U' || printf('%02d',
+                    (CAST(strftime('%j', {date}) AS INTEGER) + 6 - CAST(strftime('%w', {date}) AS INTEGER)) / 7) AS Uke,
                 AVG({precip}) AS Avg_Nedbør,
                 AVG({temp}) AS Avg_Temperatur,
                 AVG({wind}) AS Avg_Vindhastighet
@@ -274,31 +321,34 @@ def analyze_weekly_avg_data(df, date, precip, temp, wind):
             GROUP BY Uke
             ORDER BY Uke
         """
-        result = psql.sqldf(query, locals())
+        result = sql_query(query, df=df)
     except Exception as e:
         print(f"Feil under SQL-spørring: {e}")
         return pd.DataFrame()
-    
-    try:
-        # Visualisering av gjennomsnittlig nedbør, temperatur og vindhastighet per uke
-        plt.figure(figsize=(14, 7))
-        plt.plot(result['Uke'], result['Avg_Temperatur'], label='Temperatur (°C)', color='red', marker='o')
-        plt.plot(result['Uke'], result['Avg_Nedbør'], label='Nedbør (mm)', color='blue', marker='s')
-        plt.plot(result['Uke'], result['Avg_Vindhastighet'], label='Vindhastighet (m/s)', color='green', marker='^')
-
-        plt.xlabel('Uke')
-        plt.ylabel('Gjennomsnitt per uke')
-        plt.title('Gjennomsnittlig Nedbør, Temperatur og Vindhastighet per uke')
-        plt.xticks(result['Uke'][::24], rotation=45)
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-    except Exception as e:
-        print(f"Feil ved visualisering: {e}")
 
+    return _plot_weekly_avg(result)
+
+def _plot_weekly_avg(result):
+    show_plot("ukesnitt", _draw_weekly_avg, result)
     return result
 
+def _draw_weekly_avg(result):
+    # Visualisering av gjennomsnittlig nedbør, temperatur og vindhastighet per uke
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(14, 7))
+    plt.plot(result['Uke'], result['Avg_Temperatur'], label='Temperatur (°C)', color='red', marker='o')
+    plt.plot(result['Uke'], result['Avg_Nedbør'], label='Nedbør (mm)', color='blue', marker='s')
+    plt.plot(result['Uke'], result['Avg_Vindhastighet'], label='Vindhastighet (m/s)', color='green', marker='^')
+
+    plt.xlabel('Uke')
+    plt.ylabel('Gjennomsnitt per uke')
+    plt.title('Gjennomsnittlig Nedbør, Temperatur og Vindhastighet per uke')
+    plt.xticks(result['Uke'][::24], rotation=45)
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+
 def analyze_weekly_avg_frost_api_data():
     """
     Leser inn rengjorte værdata fra frostAPI og analyserer ukentlig gjennomsnitt for nedbør, temperatur og vindhastighet 
@@ -307,9 +357,9 @@ def analyze_weekly_avg_frost_api_data():
     Returns:
         pd.DataFrame: DataFrame med ukentlig gjennomsnitt for nedbør, temperatur og vindhastighet.
     """
-    df = load_clean_data()
-    if df.empty:
-        return df
+    df = frost_clean_table()
+    if df is None:
+        return pd.DataFrame()
     
     # Kaller analysefunksjonen med relevante kolonnenavn
     return analyze_weekly_avg_data(
@@ -331,8 +381,8 @@ def analyze_correlation_between_weather_and_air_quality(
     Resultatene visualiseres med scatter plots og korrelasjonskoeffisientene beregnes.
 
     Args:
-        df1 (pd.DataFrame): DataFrame med værdata.
-        df2 (pd.DataFrame): DataFrame med luftkvalitetsdata.
+        df1 (pd.DataFrame or str): DataFrame med værdata, eller navn på en tabell i SQL-lageret.
+        df2 (pd.DataFrame or str): DataFrame med luftkvalitetsdata, eller navn på en tabell i SQL-lageret.
         date (str): Kolonnenavn for dato.
         weather1 (str): Kolonnenavn for første værparameter.
         airquality1 (str): Kolonnenavn for første luftkvalitetsparameter.
@@ -343,9 +393,12 @@ def analyze_correlation_between_weather_and_air_quality(
         tuple: Resultater fra SQL-spørringer og korrelasjonsberegninger.
     """
     
-    # Merger DataFrames på dato
+    # Merger DataFrames på dato. Tabeller i SQL-lageret flettes med en JOIN i lageret.
     try:
-        merged_df = pd.merge(df1, df2, on=date, how="inner")  
+        if isinstance(df1, str) or isinstance(df2, str):
+            merged_df = sql_query(f"SELECT * FROM df1 JOIN df2 USING ({date})", df1=df1, df2=df2)
+        else:
+            merged_df = pd.merge(df1, df2, on=date, how="inner")  
     except Exception as e:
         raise RuntimeError(f"Feil under sammenslåing av DataFrames: {e}")
 
@@ -357,16 +410,16 @@ def analyze_correlation_between_weather_and_air_quality(
         WHERE {weather1} IS NOT NULL AND {airquality1} IS NOT NULL
         ORDER BY {weather1} DESC
         """
-        result1 = psql.sqldf(query1, locals())
+        result1 = sql_query(query1, merged_df=merged_df)
 
-        # SQL-spørring for å undersøke sammenhengen mellom andre par 
+        # SQL-spørring for å undersøke sammenhengen mellom andre par. Den flettede tabellen er allerede i lageret.
         query2 = f"""
         SELECT {weather2}, {airquality2}
         FROM merged_df
         WHERE {weather2} IS NOT NULL AND {airquality2} IS NOT NULL
         ORDER BY {weather2} DESC
         """
-        result2 = psql.sqldf(query2, locals())
+        result2 = sql_query(query2, merged_df=merged_df)
     
     except Exception as e:
         print(f"Feil under SQL-spørringer: {e}")
@@ -387,6 +440,13 @@ def analyze_correlation_between_weather_and_air_quality(
     print(f"Korrelasjon mellom {weather2} og {airquality2}: {korrelasjon_2}")
 
     #Visualisering av korrelasjonen 
+    show_plot("korrelasjon", _draw_correlation, df_analyse, weather1, airquality1, weather2, airquality2)
+
+
+def _draw_correlation(df_analyse, weather1, airquality1, weather2, airquality2):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     plt.figure(figsize = (12, 6))
 
     plt.subplot(1, 2, 1)
@@ -402,7 +462,6 @@ def analyze_correlation_between_weather_and_air_quality(
     plt.ylabel(f"{airquality2}")
 
     plt.tight_layout()
-    plt.show()
 
 
 def analyze_frost_nilu():
@@ -414,12 +473,12 @@ def analyze_frost_nilu():
     Returns:
         tuple: Resultater fra korrelasjonsanalyse.
     """
-    # Leser inn ferdig rensede data ved hjelp av gjenbrukbar funksjon
-    df_frost = load_clean_data("../../data/clean_data/frostAPI_clean_data.json")
-    df_nilu = load_clean_data("../../data/clean_data/niluAPI_clean_data.json")
+    # Rensede data som tabeller i SQL-lageret
+    df_frost = frost_clean_table()
+    df_nilu = nilu_clean_table()
 
     # Sjekk om dataene er lastet inn riktig
-    if df_frost.empty or df_nilu.empty:
+    if df_frost is None or df_nilu is None:
         print("En eller begge DataFrames er tomme. Avbryter analyse.")
         return None, None
 
@@ -439,7 +498,7 @@ def analyze_monthly_avg_pollution_data(df, date_col, no2_col, o3_col, so2_col):
     Beregner og visualiserer månedlig gjennomsnitt for NO2, O3 og SO2 basert på luftkvalitetsdata.
 
     Args:
-        df (pd.DataFrame): DataFrame med luftkvalitetsdata.
+        df (pd.DataFrame or str): DataFrame med luftkvalitetsdata, eller navn på en tabell i SQL-lageret.
         date_col (str): Kolonnenavn for dato.
         no2_col (str): Kolonnenavn for NO2-verdier.
         o3_col (str): Kolonnenavn for O3-verdier.
@@ -449,67 +508,77 @@ def analyze_monthly_avg_pollution_data(df, date_col, no2_col, o3_col, so2_col):
         pd.DataFrame: DataFrame med månedlig gjennomsnitt for NO2, O3 og SO2.
     """
     try:
-        df_copy = df.copy()
-        df_copy["Dato"] = pd.to_datetime(df_copy[date_col])
+        # Ferdige månedsaggregater brukes når df er en hel tabell i lageret
+        means = rollup_means(df, "måned", [no2_col, o3_col, so2_col]) if isinstance(df, str) else None
+        if means is not None:
+            return _plot_monthly_avg_pollution(means.rename(columns={
+                "Periode": "Måned", no2_col: "Snitt_NO2", o3_col: "Snitt_O3", so2_col: "Snitt_SO2", "Rader": "AntallDager"
+            })[["Måned", "Snitt_NO2", "Snitt_O3", "Snitt_SO2", "AntallDager"]])
 
         # SQL-spørring for å gruppere på måned og beregne gjennomsnitt
         query = f"""
         SELECT 
-            strftime('%Y-%m', Dato) AS Måned, 
+            strftime('%Y-%m', {date_col}) AS Måned, 
             AVG({no2_col}) AS Snitt_NO2,
             AVG({o3_col}) AS Snitt_O3,
             AVG({so2_col}) AS Snitt_SO2,
             COUNT(*) AS AntallDager
-        FROM df_copy
+        FROM df
         GROUP BY Måned
         ORDER BY Måned
         """
-        monthly_stats = psql.sqldf(query, locals())
+        monthly_stats = sql_query(query, df=df)
     except Exception as e:
         print(f"Feil ved behandling av data eller SQL-spørring: {e}")
         return None
 
-    try:
-        # Visualisering av månedlig gjennomsnitt
-        sns.set(style="whitegrid")
-        plt.figure(figsize=(14, 7))
-
-        # Plotter linjeplot for hver forurensningstype
-        sns.lineplot(data=monthly_stats, x="Måned", y="Snitt_NO2", label="NO2", marker="o")
-        sns.lineplot(data=monthly_stats, x="Måned", y="Snitt_O3", label="O3", marker="o")
-        sns.lineplot(data=monthly_stats, x="Måned", y="Snitt_SO2", label="SO2", marker="o")
-
-        # Setter tittel og akseetiketter
-        plt.title("Månedlig gjennomsnitt for NO2, O3 og SO2", fontsize=16)
-        plt.xlabel("Måned")
-        plt.ylabel("Gjennomsnittlig verdi (μg/m³)")
-        # Roterer x-aksen for bedre lesbarhet
-        plt.xticks(rotation=45)
-        # Setter x-ticks med jevne mellomrom for bedre oversikt
-        plt.gca().set_xticks(monthly_stats['Måned'][::3])
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
-    except Exception as e:
-        print(f"Feil ved plotting: {e}")
+    return _plot_monthly_avg_pollution(monthly_stats)
 
+def _plot_monthly_avg_pollution(monthly_stats):
+    show_plot("månedssnitt_forurensning", _draw_monthly_avg_pollution, monthly_stats)
     return monthly_stats
 
+def _draw_monthly_avg_pollution(monthly_stats):
+    # Visualisering av månedlig gjennomsnitt
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set(style="whitegrid")
+    plt.figure(figsize=(14, 7))
+
+    # Plotter linjeplot for hver forurensningstype
+    sns.lineplot(data=monthly_stats, x="Måned", y="Snitt_NO2", label="NO2", marker="o")
+    sns.lineplot(data=monthly_stats, x="Måned", y="Snitt_O3", label="O3", marker="o")
+    sns.lineplot(data=monthly_stats, x="Måned", y="Snitt_SO2", label="SO2", marker="o")
+
+    # Setter tittel og akseetiketter
+    plt.title("Månedlig gjennomsnitt for NO2, O3 og SO2", fontsize=16)
+    plt.xlabel("Måned")
+    plt.ylabel("Gjennomsnittlig verdi (μg/m³)")
+    # Roterer x-aksen for bedre lesbarhet
+    plt.xticks(rotation=45)
+    # Setter x-ticks med jevne mellomrom for bedre oversikt
+    plt.gca().set_xticks(monthly_stats['Måned'][::3])
+    plt.legend()
+    plt.tight_layout()
+
 
-def analyze_monthly_avg_nilu_data():
+def analyze_monthly_avg_nilu_data(start=None, end=None):
     """
     Leser inn rengjorte NILU-data og analyserer månedlig gjennomsnitt for NO2, O3 og SO2
     ved å kalle den generelle funksjonen "analyze_monthly_avg_pollution_data".
+    Med datofilter hentes bare periodens rader via datoindeksen i SQL-lageret.
+
+    Args:
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
 
     Returns:
         pd.DataFrame: DataFrame med månedlig gjennomsnitt for NO2, O3 og SO2.
     """
-    # Rengjorte data fra NILU API
-    file_path = "../../data/clean_data/niluAPI_clean_data.json"
-
-    df = load_clean_data(file_path)
-    if df.empty:
-        return df
+    df = nilu_clean_table(start, end)
+    if df is None:
+        return pd.DataFrame()
 
     # Kaller funksjonen for å beregne og visualisere månedlig gjennomsnitt
     return analyze_monthly_avg_pollution_data(
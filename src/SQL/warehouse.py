@@ -0,0 +1,231 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from common.storage import load_dataset
+
+# Lagret SQLite-database med de rensede tabellene. Den bygges fra datasettene og kan slettes når som helst.
+WAREHOUSE_FILE = "../../data/cache/miljodata.sqlite"
+SOURCES_TABLE = "_kilder"
+INDEX_COLUMNS = ("Dato", "Stasjon")
+
+_connections = {}
+_frames = {}
+_lock = threading.Lock()
+
+
+def get_connection(path=None):
+    """
+    Returnerer den delte tilkoblingen til lageret, og oppretter den ved første kall.
+
+    Args:
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        sqlite3.Connection: Tilkobling som gjenbrukes mellom spørringer.
+    """
+    path = path or WAREHOUSE_FILE
+    with _lock:
+        if path not in _connections:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {SOURCES_TABLE} (tabell TEXT PRIMARY KEY, kilde TEXT, endret REAL, storrelse INTEGER)")
+            _connections[path] = conn
+        return _connections[path]
+
+
+def close_connections():
+    """
+    Lukker alle delte tilkoblinger og glemmer registrerte DataFrames.
+    """
+    with _lock:
+        for conn in _connections.values():
+            conn.close()
+        _connections.clear()
+        _frames.clear()
+
+
+def _sql_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _sql_values(series):
+    # Datoer lagres som tekst slik at strftime i SQLite kan brukes direkte, og NaN blir NULL
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        series = series.dt.strftime("%Y-%m-%d %H:%M:%S").str.replace(" 00:00:00", "", regex=False)
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    values = series.to_numpy(dtype=object)
+    values[pd.isna(series).to_numpy()] = None
+    if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+        values = [None if v is None else int(v) for v in values]
+    return values
+
+
+def write_table(conn, name, df, temp=False, replace=True, index_columns=INDEX_COLUMNS):
+    """
+    Skriver en DataFrame til en tabell i lageret. En tabell med samme navn erstattes,
+    og kolonnene i index_columns (Dato og Stasjon) får indeks.
+
+    Args:
+        conn (sqlite3.Connection): Tilkobling til lageret.
+        name (str): Tabellnavn.
+        df (pd.DataFrame): Dataene.
+        temp (bool): Om tabellen bare skal finnes så lenge tilkoblingen er åpen.
+        replace (bool): Om en eksisterende tabell skal erstattes. Hvis False legges radene til i tabellen.
+        index_columns (tuple): Kolonner som får indeks når tabellen opprettes.
+    """
+    columns = ", ".join(f'"{col}" {_sql_type(dtype)}' for col, dtype in df.dtypes.items())
+    names = ", ".join(f'"{col}"' for col in df.columns)
+    placeholders = ", ".join("?" * len(df.columns))
+    rows = zip(*(_sql_values(df[col]) for col in df.columns))
+    with conn:
+        if replace:
+            conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+        conn.execute(f'CREATE {"TEMP " if temp else ""}TABLE IF NOT EXISTS "{name}" ({columns})')
+        conn.executemany(f'INSERT INTO "{name}" ({names}) VALUES ({placeholders})', rows)
+        for col in index_columns:
+            if col in df.columns:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {"temp." if temp else ""}"idx_{name}_{col}" ON "{name}" ("{col}")')
+
+
+def load_table(name, source_file, path=None, schema=None):
+    """
+    Gjør et datasett tilgjengelig som tabell i lageret. Datasettet leses bare inn på nytt
+    hvis kildefilen er endret siden forrige innlasting.
+
+    Args:
+        name (str): Tabellnavn, f.eks. "frost_renset".
+        source_file (str): Filsti til datasettet (Parquet, Arrow, JSON eller kube).
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+        schema (dict, optional): Kolonnetyper som settes etter innlesing.
+
+    Returns:
+        str: Tabellnavnet.
+
+    Raises:
+        FileNotFoundError: Hvis kildefilen ikke finnes.
+    """
+    if not os.path.exists(source_file):
+        raise FileNotFoundError(f"Finner ikke fil: {source_file}")
+    stat = os.stat(source_file)
+    conn = get_connection(path)
+    stored = conn.execute(f"SELECT kilde, endret, storrelse FROM {SOURCES_TABLE} WHERE tabell = ?", (name,)).fetchone()
+    if stored == (source_file, stat.st_mtime, stat.st_size):
+        return name
+
+    write_table(conn, name, load_dataset(source_file, schema=schema))
+    with conn:
+        conn.execute(f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?, ?)",
+                     (name, source_file, stat.st_mtime, stat.st_size))
+    return name
+
+
+def _frame_signature(df):
+    # Kolonnenavn og -typer pluss en hash av alle verdiene (med indeks) i radrekkefølge
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()).hexdigest()
+    return tuple(df.columns), tuple(str(dtype) for dtype in df.dtypes), digest
+
+
+def register_frame(df, path=None):
+    """
+    Legger en DataFrame inn i lageret som midlertidig tabell. Samme DataFrame kopieres bare én gang så lenge
+    den finnes og innholdet er uendret, slik at gjentatte spørringer mot den ikke kopierer dataene på nytt.
+    Innholdet sammenlignes med en hash av verdiene, så endringer på stedet gir en ny kopi.
+
+    Args:
+        df (pd.DataFrame): Dataene.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        str: Navnet på den midlertidige tabellen.
+    """
+    key = (path or WAREHOUSE_FILE, id(df))
+    signature = _frame_signature(df)
+    conn = get_connection(path)
+    with _lock:
+        cached = _frames.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    name = f"ramme_{id(df)}"
+    write_table(conn, name, df, temp=True)
+    with _lock:
+        _frames[key] = (signature, name)
+    weakref.finalize(df, _forget_frame, key, name)
+    return name
+
+
+def _forget_frame(key, name):
+    with _lock:
+        cached = _frames.pop(key, None)
+        conn = _connections.get(key[0])
+    if cached is not None and cached[1] == name and conn is not None:
+        try:
+            conn.execute(f'DROP TABLE IF EXISTS temp."{name}"')
+        except sqlite3.Error:
+            pass
+
+
+def sql_query(query, path=None, **tables):
+    """
+    Kjører en SQL-spørring mot lageret. Navnene i tables blir midlertidige visninger, slik at spørringen
+    kan bruke dem i FROM, f.eks. sql_query("SELECT * FROM df", df=frost_df).
+
+    Args:
+        query (str): SQL-spørringen.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+        **tables: Navn i spørringen → DataFrame eller navn på en tabell i lageret.
+
+    Returns:
+        pd.DataFrame: Resultatet av spørringen.
+    """
+    conn = get_connection(path)
+    for alias, table in tables.items():
+        source = table if isinstance(table, str) else register_frame(table, path)
+        conn.execute(f'DROP VIEW IF EXISTS temp."{alias}"')
+        conn.execute(f'CREATE TEMP VIEW "{alias}" AS SELECT * FROM "{source}"')
+    return pd.read_sql_query(query, conn)
+
+
+def filtered_view(table, start=None, end=None, stations=None, path=None):
+    """
+    Lager en midlertidig visning av en tabell med dato- og stasjonsfilter, som bruker indeksene på Dato og Stasjon.
+
+    Args:
+        table (str): Tabellnavn i lageret.
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        stations (list, optional): Stasjoner som skal tas med. Standard er alle.
+        path (str, optional): Filsti til SQLite-databasen. Standard er WAREHOUSE_FILE.
+
+    Returns:
+        str: Navnet på visningen, eller tabellnavnet hvis ingen filtre er satt.
+    """
+    conditions = []
+    if start:
+        conditions.append(f"Dato >= '{np.datetime64(start[:10], 'D')}'")
+    if end:
+        conditions.append(f"Dato <= '{np.datetime64(end[:10], 'D')}'")
+    if stations is not None:
+        quoted = ", ".join(str(int(s)) if isinstance(s, (int, np.integer)) else "'" + str(s).replace("'", "''") + "'" for s in stations)
+        conditions.append(f"Stasjon IN ({quoted})")
+    if not conditions:
+        return table
+
+    name = f"{table}_utvalg"
+    conn = get_connection(path)
+    conn.execute(f'DROP VIEW IF EXISTS temp."{name}"')
+    conn.execute(f'CREATE TEMP VIEW "{name}" AS SELECT * FROM "{table}" WHERE {" AND ".join(conditions)}')
+    return name
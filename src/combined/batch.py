@@ -0,0 +1,286 @@
+import contextlib
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import pandas as pd
+
+# Nøklene en jobb kan ha i konfigurasjonsfilen. Verdier som mangler hentes fra "defaults".
+JOB_KEYS = {
+    "name", "source", "station", "latitude", "longitude", "radius", "from_date", "to_date",
+    "elements", "components", "threshold", "outlier_method", "outlier_window", "max_gap", "skew_threshold",
+    "raw_file", "output_dir",
+}
+REQUIRED_KEYS = {
+    "frost": {"name", "station", "from_date", "to_date", "output_dir"},
+    "nilu": {"name", "latitude", "longitude", "radius", "from_date", "to_date", "output_dir"},
+}
+# Nøklene som er filstier, og som tolkes relativt til mappen konfigurasjonsfilen ligger i
+PATH_KEYS = ("raw_file", "output_dir")
+SUMMARY_COLUMNS = ["Jobb", "Kilde", "Status", "Nye_rader", "Rader", "Sekunder", "Minne_MB", "Logg"]
+
+
+def load_batch_config(path):
+    """
+    Leser en batchkonfigurasjon (JSON) og fyller inn standardverdier i hver jobb.
+
+    Filen har nøklene "jobs" (liste med jobber), og eventuelt "defaults" (felles verdier for alle jobbene),
+    "workers" (antall prosesser) og "max_memory_mb" (minnegrense per prosess). En jobb har "name", "source"
+    ("frost" eller "nilu") og stasjon ("station") eller område ("latitude", "longitude", "radius"), periode
+    ("from_date", "to_date"), og eventuelt "elements", "components", "threshold", "outlier_method",
+    "outlier_window", "max_gap", "skew_threshold" og "raw_file" (eksisterende rådata i stedet for henting fra API-et).
+    Resultatene skrives til <output_dir>/<name>. Relative filstier tolkes relativt til mappen konfigurasjonsfilen ligger i.
+
+    Args:
+        path (str): Filsti til konfigurasjonsfilen.
+
+    Returns:
+        dict: Konfigurasjonen med "jobs" (komplette jobber), "workers" og "max_memory_mb".
+
+    Raises:
+        ValueError: Hvis en jobb har ukjente nøkler, mangler nøkler, ukjent kilde eller et navn som er brukt før.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = config.get("defaults", {})
+    jobs, names = [], set()
+    for job in config.get("jobs", []):
+        job = {**defaults, **job}
+        unknown = set(job) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"Ukjente nøkler i jobben '{job.get('name')}': {sorted(unknown)}")
+        if job.get("source") not in REQUIRED_KEYS:
+            raise ValueError(f"Jobben '{job.get('name')}' har ukjent kilde '{job.get('source')}'. Gyldige kilder: frost, nilu")
+        missing = REQUIRED_KEYS[job["source"]] - set(job)
+        if missing:
+            raise ValueError(f"Jobben '{job.get('name')}' mangler {sorted(missing)}")
+        if job["name"] in names:
+            raise ValueError(f"Jobbnavnet '{job['name']}' er brukt flere ganger.")
+        names.add(job["name"])
+        for key in PATH_KEYS:
+            if job.get(key):
+                job[key] = os.path.join(base_dir, job[key])
+        jobs.append(job)
+
+    return {"jobs": jobs, "workers": config.get("workers", 2), "max_memory_mb": config.get("max_memory_mb")}
+
+
+def job_directory(job):
+    """
+    Mappen en jobb skriver rådata, renset og transformert data, vannmerker og logg til.
+
+    Args:
+        job (dict): Jobb fra load_batch_config.
+
+    Returns:
+        str: <output_dir>/<name>.
+    """
+    return os.path.join(job["output_dir"], job["name"])
+
+
+def _configure_frost(job, directory):
+    # Peker modulkonstantene i main_frost til jobbens stasjon, periode og mappe
+    from common.storage import dataset_path
+    from frostAPI import main_frost
+
+    main_frost.FROST_SOURCE = job["station"]
+    main_frost.FROST_FROM_DATE = job["from_date"]
+    main_frost.FROST_TO_DATE = job["to_date"]
+    main_frost.FROST_SKEW_THRESHOLD = job.get("skew_threshold", 1.0)
+    main_frost.FROST_OUTLIER_METHOD = job.get("outlier_method", "global")
+    main_frost.FROST_OUTLIER_WINDOW = job.get("outlier_window", 31)
+    main_frost.FROST_MAX_GAP = job.get("max_gap")
+    if job.get("elements"):
+        main_frost.FROST_ELEMENTS = {**job["elements"], "sourceId": "Stasjon"}
+    main_frost.FROST_RAW_FILE = job.get("raw_file") or dataset_path(os.path.join(directory, "raw_data", "frostAPI_data"))
+    main_frost.FROST_CLEAN_FILE = dataset_path(os.path.join(directory, "clean_data", "frostAPI_clean_data"))
+    main_frost.FROST_CLEAN_CUBE = dataset_path(os.path.join(directory, "clean_data", "frostAPI_clean_data"), "cube")
+    main_frost.FROST_CLEAN_PARTITIONS = os.path.join(directory, "clean_data", "frostAPI")
+    main_frost.FROST_STATION_LABELS = os.path.join(directory, "clean_data", "frostAPI_stasjoner.json")
+    main_frost.FROST_ANALYZED_FILE = dataset_path(os.path.join(directory, "analyzed_data", "frostAPI_analyzed_data"))
+    main_frost.FROST_ANALYZED_PARTITIONS = os.path.join(directory, "analyzed_data", "frostAPI")
+    return main_frost
+
+
+def _configure_nilu(job, directory):
+    # Peker modulkonstantene i main_nilu til jobbens område, periode og mappe
+    from common.storage import dataset_path
+    from niluAPI import main_nilu
+
+    main_nilu.NILU_FROM_DATE = job["from_date"]
+    main_nilu.NILU_TO_DATE = job["to_date"]
+    main_nilu.NILU_LATITUDE = job["latitude"]
+    main_nilu.NILU_LONGITUDE = job["longitude"]
+    main_nilu.NILU_RADIUS = job["radius"]
+    main_nilu.NILU_COMPONENTS = tuple(job.get("components", main_nilu.NILU_COMPONENTS))
+    main_nilu.NILU_OUTLIER_THRESHOLD = job.get("threshold", 3)
+    main_nilu.NILU_SKEW_THRESHOLD = job.get("skew_threshold", 1.0)
+    main_nilu.NILU_OUTLIER_METHOD = job.get("outlier_method", "global")
+    main_nilu.NILU_OUTLIER_WINDOW = job.get("outlier_window", 31)
+    main_nilu.NILU_MAX_GAP = job.get("max_gap")
+    main_nilu.NILU_AREA = job["name"]
+    main_nilu.NILU_RAW_FILE = job.get("raw_file") or dataset_path(os.path.join(directory, "raw_data", "niluAPI_data"))
+    main_nilu.NILU_CLEAN_FILE = dataset_path(os.path.join(directory, "clean_data", "niluAPI_clean_data"))
+    main_nilu.NILU_CLEAN_CUBE = dataset_path(os.path.join(directory, "clean_data", "niluAPI_clean_data"), "cube")
+    main_nilu.NILU_CLEAN_PARTITIONS = os.path.join(directory, "clean_data", "niluAPI")
+    main_nilu.NILU_ANALYZED_FILE = dataset_path(os.path.join(directory, "analyzed_data", "niluAPI_analyzed_data"))
+    main_nilu.NILU_ANALYZED_PARTITIONS = os.path.join(directory, "analyzed_data", "niluAPI")
+    return main_nilu
+
+
+def _run_frost(job, directory, client_id):
+    main_frost = _configure_frost(job, directory)
+    new_rows = 0
+    if not job.get("raw_file"):
+        if not client_id:
+            raise ValueError("Mangler klient-ID for Frost API (miljøvariabelen client_id_frost).")
+        new_rows = main_frost.data_frostAPI_incremental(
+            client_id, job["station"], job["from_date"], job["to_date"], file=main_frost.FROST_RAW_FILE,
+            watermark_file=os.path.join(directory, "raw_data", "watermarks.json"))
+
+    clean = main_frost.clean_data_frostAPI(job.get("threshold", 3))
+    transformed = main_frost.fix_skewness_data_frostAPI()
+    return new_rows, clean, transformed
+
+
+def _run_nilu(job, directory):
+    main_nilu = _configure_nilu(job, directory)
+    new_rows = 0
+    if not job.get("raw_file"):
+        new_rows = main_nilu.get_raw_data_niluAPI_incremental(
+            main_nilu.NILU_COMPONENTS, job["from_date"], job["to_date"], job["latitude"], job["longitude"],
+            job["radius"], output_file=main_nilu.NILU_RAW_FILE,
+            watermark_file=os.path.join(directory, "raw_data", "watermarks.json"))
+
+    clean = main_nilu.clean_raw_data(main_nilu.NILU_RAW_FILE)
+    transformed = main_nilu.fix_skewness_data_niluAPI()
+    return new_rows, clean, transformed
+
+
+def run_job(job, client_id=None):
+    """
+    Kjører én jobb: henter nye rådata (eller bruker raw_file), renser og transformerer, og lagrer alt under
+    job_directory(job). Henting er inkrementell og rense- og transformasjonstrinnene hoppes over når
+    inndataene er uendret, så en ny kjøring gjør bare det som er nytt. Utskriftene går til logg.txt i mappen.
+
+    Args:
+        job (dict): Jobb fra load_batch_config.
+        client_id (str, optional): Klient-ID for Frost API.
+
+    Returns:
+        dict: Sammendrag med nøklene i SUMMARY_COLUMNS. Status er "ok", "uendret" (ingen trinn kjørt)
+            eller "feilet".
+    """
+    directory = job_directory(job)
+    os.makedirs(os.path.join(directory, "raw_data"), exist_ok=True)
+    log_file = os.path.join(directory, "logg.txt")
+    summary = {"Jobb": job["name"], "Kilde": job["source"], "Status": "feilet", "Nye_rader": 0,
+               "Rader": None, "Sekunder": None, "Minne_MB": None, "Logg": log_file}
+
+    start = time.perf_counter()
+    with open(log_file, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        try:
+            if job["source"] == "frost":
+                new_rows, clean, transformed = _run_frost(job, directory, client_id)
+            else:
+                new_rows, clean, transformed = _run_nilu(job, directory)
+            summary["Nye_rader"] = new_rows
+            if clean is None and transformed is None:
+                summary["Status"] = "uendret"
+            elif transformed is not None:
+                summary["Status"] = "ok"
+                summary["Rader"] = len(transformed)
+        except MemoryError:
+            print(f"Jobben '{job['name']}' gikk over minnegrensen.")
+        except Exception as e:
+            print(f"Feil i jobben '{job['name']}': {e}")
+
+    summary["Sekunder"] = time.perf_counter() - start
+    summary["Minne_MB"] = peak_memory_mb()
+    return summary
+
+
+def peak_memory_mb():
+    """
+    Høyeste minnebruk (RSS) for prosessen så langt.
+
+    Returns:
+        float: Megabyte, eller None der modulen resource ikke finnes (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss er i kilobyte på Linux og i byte på macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _init_worker(max_memory_mb):
+    # Hver prosess får et tak på adresseområdet, så en jobb som bruker for mye minne får MemoryError
+    # og feiler alene, i stedet for at maskinen begynner å swappe
+    from common.diagnostics import configure_diagnostics
+    # Batchjobbene tegner aldri de utsatte figurene, så de beholdes ikke i minnet
+    configure_diagnostics(mode="headless", max_figures=0)
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        print("Minnegrense støttes ikke på denne plattformen. Kjører uten.")
+        return
+    limit = int(max_memory_mb * 1024 * 1024)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _run_job_args(args):
+    return run_job(*args)
+
+
+def run_batch(config, client_id=None, max_workers=None, max_memory_mb=None):
+    """
+    Kjører alle jobbene i en batchkonfigurasjon i en prosesspool. Hver jobb kjøres i en ny prosess
+    (maxtasksperchild=1), så minnet frigjøres mellom jobbene og en jobb som feiler ikke påvirker de andre.
+    Figurer tegnes ikke (diagnostikken kjøres i modusen "headless").
+
+    Args:
+        config (dict eller str): Konfigurasjon fra load_batch_config, eller filsti til konfigurasjonsfilen.
+        client_id (str, optional): Klient-ID for Frost API. Standard er miljøvariabelen client_id_frost.
+        max_workers (int, optional): Antall prosesser. Standard er "workers" i konfigurasjonen.
+        max_memory_mb (float, optional): Minnegrense per prosess i MB. Standard er "max_memory_mb" i konfigurasjonen.
+
+    Returns:
+        pd.DataFrame: Én rad per jobb med kolonnene i SUMMARY_COLUMNS, i samme rekkefølge som i konfigurasjonen.
+    """
+    if isinstance(config, str):
+        config = load_batch_config(config)
+    client_id = client_id or os.getenv("client_id_frost")
+    max_workers = max_workers or config["workers"]
+    max_memory_mb = max_memory_mb or config["max_memory_mb"]
+
+    jobs = config["jobs"]
+    summaries = {}
+    with Pool(processes=max_workers, initializer=_init_worker, initargs=(max_memory_mb,), maxtasksperchild=1) as pool:
+        for summary in pool.imap_unordered(_run_job_args, [(job, client_id) for job in jobs]):
+            print(f"{summary['Jobb']}: {summary['Status']} ({summary['Sekunder']:.1f} s)")
+            summaries[summary["Jobb"]] = summary
+
+    return pd.DataFrame([summaries[job["name"]] for job in jobs], columns=SUMMARY_COLUMNS)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    parser = argparse.ArgumentParser(description="Kjører alle jobbene i en batchkonfigurasjon.")
+    parser.add_argument("config", help="Filsti til konfigurasjonsfilen (JSON)")
+    parser.add_argument("--workers", type=int, help="Antall prosesser")
+    parser.add_argument("--max-memory-mb", type=float, help="Minnegrense per prosess i MB")
+    args = parser.parse_args()
+
+    result = run_batch(args.config, max_workers=args.workers, max_memory_mb=args.max_memory_mb)
+    print(result.to_string(index=False, float_format="%.1f"))
@@ -1,14 +1,8 @@
 import json
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import r2_score, mean_squared_error
-from sklearn.linear_model import LinearRegression
-from sklearn.base import clone
-from lightgbm import LGBMRegressor
-import plotly.graph_objects as go
+from common.storage import dataset_path, load_dataset, current_copy
+from common.compact import compact_dtypes
 
 def prepare_dataframe(df, date_col):
     """
@@ -58,7 +52,9 @@ def create_dual_axis_plot(df, date_col, y1_col, y2_col, y1_label, y2_label, y1_c
     for col in [y1_col, y2_col]:
         if col not in df.columns:
             raise ValueError(f"Mangler kolonne: '{col}'")
-        
+
+    # matplotlib importeres først når det faktisk skal plottes, så pipelinen kan kjøres uten
+    import matplotlib.pyplot as plt
     fig, ax1 = plt.subplots(figsize=(14, 6))
 
     ax1.set_xlabel("Dato")
@@ -95,6 +91,9 @@ def plot_dual_time_series(df, date_col, y1_col, y2_col, y1_label, y2_label, titl
         None: Visulaiserer graf.
     """
 
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+
     df = prepare_dataframe(df, date_col)
     fig, ax1 = create_dual_axis_plot(df, date_col, y1_col, y2_col, y1_label, y2_label, y1_color, y2_color)
     
@@ -135,12 +134,14 @@ def plot_temperature_no2(df):
 
 def load_merge_and_plot_no2_temp():
     """
-    Leser inn frost- og NILU-data fra JSON-filer, slår sammen på 'Dato',
+    Leser inn rensede frost- og NILU-data, slår sammen på 'Dato',
     og plotter NO₂ og temperatur over tid.
     """
+    frost_file = dataset_path("../../data/clean_data/frostAPI_clean_data")
+    nilu_file = dataset_path("../../data/clean_data/niluAPI_clean_data")
     merged_df = combine_df(
-        "../../data/clean_data/frostAPI_clean_data.json",
-        "../../data/clean_data/niluAPI_clean_data.json",
+        current_copy(dataset_path(frost_file, "cube"), frost_file),
+        current_copy(dataset_path(nilu_file, "cube"), nilu_file),
         "Dato"
     )
     if merged_df is not None and not merged_df.empty:
@@ -151,32 +152,46 @@ def load_merge_and_plot_no2_temp():
 
 def combine_df(file1_path, file2_path, combining_point):
     """
-    Leser og slår sammen to JSON-filer, og returnerer et kombinert flat DataFrame.
+    Leser og slår sammen to datasett (Parquet, Arrow, JSON eller kube), og returnerer et kombinert flat DataFrame.
     
     Argumenter:
-    - file1_path: sti til første JSON-fil
-    - file2_path: sti til andre JSON-fil
+    - file1_path: sti til første datasett
+    - file2_path: sti til andre datasett
     - combining_point: kolonnenavn for å merge (f.eks. 'Dato')
 
     Return:
     - pd.DataFrame: Kombinert DataFrame med flat struktur
     """
     try:
-        with open(file1_path, "r", encoding="utf-8") as f1:
-            df1 = pd.json_normalize(json.load(f1))
-        with open(file2_path, "r", encoding="utf-8") as f2:
-            df2 = pd.json_normalize(json.load(f2))
+        df1 = load_dataset(file1_path)
+        df2 = load_dataset(file2_path)
     except FileNotFoundError as e:
         raise FileNotFoundError(f"Finner ikke fil: {e.filename}")
-    except json.JSONDecodeError as e:
-        raise ValueError(f"JSON-feil i en av filene: {e}")
+    except ValueError as e:
+        raise ValueError(f"Feil ved lesing av en av filene: {e}")
+
+    return combine_frames(df1, df2, combining_point)
+
 
+def combine_frames(df1, df2, combining_point):
+    """
+    Slår sammen to DataFrames, f.eks. transformerte Frost- og NILU-data rett fra pipelinen, uten å gå via filer.
+    Begge får kompakte kolonnetyper først (common/compact.py), så det sammenslåtte datasettet tar mindre minne.
+
+    Argumenter:
+    - df1: første DataFrame
+    - df2: andre DataFrame
+    - combining_point: kolonnenavn for å merge (f.eks. 'Dato')
+
+    Return:
+    - pd.DataFrame: Kombinert DataFrame med flat struktur
+    """
     if combining_point not in df1.columns or combining_point not in df2.columns:
         raise KeyError(f"Kolonnen '{combining_point}' finnes ikke i en av filene.")
 
-    df_combined = pd.merge(df1, df2, on=combining_point, how="inner")
-    df_combined[combining_point] = pd.to_datetime(df_combined[combining_point])
-    return df_combined
+    df1 = compact_dtypes(df1, date_col=combining_point)
+    df2 = compact_dtypes(df2, date_col=combining_point)
+    return pd.merge(df1, df2, on=combining_point, how="inner")
 
     
 
@@ -308,6 +323,7 @@ def plot_prediksjon_interaktiv(y_train, y_test, y_pred, df_future, target_col, c
     x_test = list(range(len(y_train), len(y_train) + len(y_test)))
     x_fut = list(range(len(y_train) + len(y_test), total_len))
 
+    import plotly.graph_objects as go
     fig = go.Figure()
 
     # Treningsdata
@@ -371,6 +387,8 @@ def evaluate_and_train_model(df, target_col, features, model_object, test_size=0
     Returns:
         tuple: (model, X_train, X_test, y_train, y_test, y_pred)
     """
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import r2_score, mean_squared_error
    
     X = df[features]
     y = df[target_col]
@@ -414,8 +432,10 @@ def prediction_with_futurevalues(df, target_col, features, model_object,
     df = df.copy()
     df = add_seasonal_features(df)
 
-    #fjerner overflødig informasjon fra LGBMRegressor, om brukt
-    if isinstance(model_object, LGBMRegressor):
+    #fjerner overflødig informasjon fra LGBMRegressor, om brukt. Sjekkes via modulnavnet, så lightgbm
+    #(som også importerer matplotlib) ikke lastes når en annen modell brukes.
+    from sklearn.base import clone
+    if type(model_object).__module__.startswith("lightgbm"):
         model_object.set_params(verbose=-1)
 
 
@@ -446,7 +466,8 @@ def plot_linear_model_coefficients(df, features, target_cols, date_col="Dato"):
     Returns:
         None: Viser et stolpediagram for hver target-kolonne med koeffisienter.
     """
-
+    import matplotlib.pyplot as plt
+    from sklearn.linear_model import LinearRegression
 
     df = add_seasonal_features(df, date_col)
 
@@ -473,6 +494,8 @@ def plot_polynomial_regression(X, y, level, feature, target_col):
     Returns:
         None. Viser en matplotlib-figur med scatterplot og regresjonslinjer.
     """
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import r2_score
    
     # Lag en jevn fordeling av X-verdier til prediksjonslinjene
     x_range = np.linspace(X.min(), X.max(), 300)
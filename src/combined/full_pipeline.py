@@ -0,0 +1,84 @@
+from common.pipeline import stage, run_pipeline
+from common.storage import load_dataset
+from frostAPI import main_frost
+from niluAPI import main_nilu
+from combined.combined_analysis import combine_frames
+
+
+def frost_raw_stage(client_id=None, save=False):
+    # Henter rådata fra Frost API, eller leser dem fra FROST_RAW_FILE uten klient-ID
+    if client_id:
+        return main_frost.data_frostAPI(client_id, save=save)
+    return load_dataset(main_frost.FROST_RAW_FILE, schema=main_frost.schema())
+
+
+def nilu_raw_stage(fetch=False, save=False):
+    # Henter døgnverdier fra NILU API, eller leser dem fra NILU_RAW_FILE
+    if fetch:
+        return main_nilu.get_raw_data_niluAPI(save=save)
+    return load_dataset(main_nilu.NILU_RAW_FILE)
+
+
+def frost_clean_stage(raw, threshold=3, save=False):
+    # Fjerner outliers og duplikater, interpolerer og koder stasjoner (clean_data_frostAPI)
+    return main_frost.clean_data_frostAPI(threshold, df=raw, save=save)
+
+
+def nilu_clean_stage(raw, save=False):
+    # Fjerner outliers og interpolerer (clean_raw_data)
+    return main_nilu.clean_raw_data(df=raw, save=save)
+
+
+def frost_transform_stage(clean, save=False):
+    return main_frost.fix_skewness_data_frostAPI(df=clean, save=save)
+
+
+def nilu_transform_stage(clean, save=False):
+    return main_nilu.fix_skewness_data_niluAPI(df=clean, save=save)
+
+
+def full_pipeline_stages(client_id=None, fetch_nilu=False, threshold=3, save=False):
+    """
+    Beskriver hele dataflyten som en graf: henting → rensing (duplikater, outliers og interpolering) →
+    transformasjon for Frost og NILU hver for seg, og til slutt sammenslåing på dato.
+    Frost- og NILU-grenene er uavhengige frem til sammenslåingen. Alle Frost-stasjonene går i samme gren, siden
+    stasjonskodene (label_station) og skjevhetstransformasjonen beregnes over alle stasjonene samlet. Flere
+    stasjoner, byer og perioder kjøres parallelt som egne jobber med combined/batch.py.
+
+    Args:
+        client_id (str, optional): Klient-ID for Frost API. Uten klient-ID leses rådataene fra fil.
+        fetch_nilu (bool, optional): Om NILU-dataene skal hentes fra API-et. Ellers leses de fra fil.
+        threshold (float, optional): Antall standardavvik for outliers i Frost-dataene.
+        save (bool, optional): Om resultatet av hvert trinn også skal lagres. Default er False.
+
+    Returns:
+        list: Trinn for common.pipeline.run_pipeline.
+    """
+    return [
+        stage("frost_rådata", frost_raw_stage, client_id=client_id, save=save),
+        stage("frost_renset", frost_clean_stage, ("frost_rådata",), threshold=threshold, save=save),
+        stage("frost_transformert", frost_transform_stage, ("frost_renset",), save=save),
+        stage("nilu_rådata", nilu_raw_stage, fetch=fetch_nilu, save=save),
+        stage("nilu_renset", nilu_clean_stage, ("nilu_rådata",), save=save),
+        stage("nilu_transformert", nilu_transform_stage, ("nilu_renset",), save=save),
+        stage("kombinert", combine_frames, ("frost_transformert", "nilu_transformert"), combining_point="Dato"),
+    ]
+
+
+def run_full_pipeline(client_id=None, fetch_nilu=False, threshold=3, save=False, max_workers=2):
+    """
+    Kjører hele dataflyten med Frost- og NILU-grenene samtidig, og skriver ut tiden for hvert trinn.
+
+    Args:
+        client_id (str, optional): Klient-ID for Frost API. Uten klient-ID leses rådataene fra fil.
+        fetch_nilu (bool, optional): Om NILU-dataene skal hentes fra API-et.
+        threshold (float, optional): Antall standardavvik for outliers i Frost-dataene.
+        save (bool, optional): Om resultatet av hvert trinn også skal lagres.
+        max_workers (int, optional): Maks antall trinn som kjøres samtidig.
+
+    Returns:
+        tuple: (results, timings) fra common.pipeline.run_pipeline. results["kombinert"] er det sammenslåtte datasettet.
+    """
+    results, timings = run_pipeline(full_pipeline_stages(client_id, fetch_nilu, threshold, save), max_workers)
+    print(timings.to_string(index=False, float_format="%.3f"))
+    return results, timings
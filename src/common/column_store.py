@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+
+
+def write_columns(directory, df):
+    """
+    Lagrer en DataFrame kolonnevis i en mappe: én .npy-fil per kolonne og en meta.json.
+    Tekst- og kategorikolonner lagres som heltallskoder og en liste med etiketter.
+    Mappen skrives først under et midlertidig navn og flyttes på plass til slutt,
+    slik at et avbrudd aldri etterlater en halvskrevet bit.
+
+    Args:
+        directory (str): Mappen bitene skal lagres i.
+        df (pd.DataFrame): Data som skal lagres.
+    """
+    tmp_dir = f"{directory}.tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, (name, series) in enumerate(df.items()):
+        file = f"c{i}.npy"
+        if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+            codes, labels = pd.factorize(series, sort=True)
+            np.save(os.path.join(tmp_dir, file), codes.astype(np.int32))
+            columns.append({"name": name, "file": file, "kind": "dictionary",
+                            "categorical": isinstance(series.dtype, pd.CategoricalDtype),
+                            "labels": [str(label) for label in labels]})
+        else:
+            np.save(os.path.join(tmp_dir, file), series.to_numpy())
+            columns.append({"name": name, "file": file, "kind": "array"})
+
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "columns": columns}, f, ensure_ascii=False)
+
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.replace(tmp_dir, directory)
+
+
+def read_columns(directory, columns=None, mmap=False):
+    """
+    Leser en mappe skrevet av write_columns.
+
+    Args:
+        directory (str): Mappen som skal leses.
+        columns (list, optional): Kolonner som skal leses. Standard er alle.
+        mmap (bool): Om talkolonner skal minnekartlegges i stedet for å leses inn.
+
+    Returns:
+        pd.DataFrame: De lagrede dataene med samme kolonnetyper som ved lagring.
+    """
+    with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    data = {}
+    for column in meta["columns"]:
+        if columns is not None and column["name"] not in columns:
+            continue
+        values = np.load(os.path.join(directory, column["file"]), mmap_mode="r" if mmap else None)
+        if column["kind"] == "dictionary":
+            categories = pd.Categorical.from_codes(values, categories=column["labels"])
+            data[column["name"]] = categories if column["categorical"] else np.asarray(categories, dtype=object)
+        else:
+            data[column["name"]] = values
+    return pd.DataFrame(data, columns=[c["name"] for c in meta["columns"] if columns is None or c["name"] in columns])
+
+
+def list_chunks(store_dir):
+    """
+    Finner ferdigskrevne biter i et kolonnelager.
+
+    Args:
+        store_dir (str): Rotmappen for lageret.
+
+    Returns:
+        list: Navn på bitene, sortert.
+    """
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(store_dir)
+        if os.path.exists(os.path.join(store_dir, name, META_FILE)) and not name.endswith(".tmp")
+    )
+
+
+def write_chunk(store_dir, chunk_name, df):
+    """
+    Lagrer én bit i et kolonnelager. En bit med samme navn erstattes.
+
+    Args:
+        store_dir (str): Rotmappen for lageret.
+        chunk_name (str): Navn på biten, f.eks. "2010-04".
+        df (pd.DataFrame): Data for biten.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    write_columns(os.path.join(store_dir, chunk_name), df)
+
+
+def iter_chunks(store_dir, columns=None, chunks=None):
+    """
+    Leser bitene i et kolonnelager én om gangen, slik at minnebruken holdes til én bit.
+
+    Args:
+        store_dir (str): Rotmappen for lageret.
+        columns (list, optional): Kolonner som skal leses. Standard er alle.
+        chunks (list, optional): Navn på bitene som skal leses. Standard er alle.
+
+    Yields:
+        tuple: (navn på biten, pd.DataFrame).
+    """
+    for chunk_name in list_chunks(store_dir):
+        if chunks is None or chunk_name in chunks:
+            yield chunk_name, read_columns(os.path.join(store_dir, chunk_name), columns)
+
+
+def read_store(store_dir, columns=None, chunks=None):
+    """
+    Leser alle (eller utvalgte) biter i et kolonnelager til én DataFrame.
+    Kategorikolonner får felles kategorier på tvers av bitene.
+
+    Args:
+        store_dir (str): Rotmappen for lageret.
+        columns (list, optional): Kolonner som skal leses. Standard er alle.
+        chunks (list, optional): Navn på bitene som skal leses. Standard er alle.
+
+    Returns:
+        pd.DataFrame: Dataene fra bitene i sortert rekkefølge, eller tom DataFrame.
+    """
+    frames = [df for _, df in iter_chunks(store_dir, columns, chunks)]
+    if not frames:
+        return pd.DataFrame()
+
+    categorical = [name for name, dtype in frames[0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    df = pd.concat(frames, ignore_index=True)
+    for name in categorical:
+        df[name] = df[name].astype("category")
+    return df
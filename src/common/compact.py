@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Felles kompakt skjema for datasettene i pipelinen, per kolonnetype
+COMPACT_DATE_DTYPE = "datetime64[s]"
+COMPACT_FLOAT_DTYPE = "float32"
+COMPACT_FLAG_PREFIXES = ("Interpolert_",)
+
+
+def compact_dtypes(df, date_col="Dato", station_col="Stasjon"):
+    """
+    Gir en kopi av datasettet med kompakte kolonnetyper:
+    datokolonnen som datetime64[s], stasjoner som kategori (tekst) eller minste heltallstype (etiketter),
+    måleverdier og dekningsgrad som float32, Interpolert_*-flagg som bool og øvrige tekstkolonner
+    med få unike verdier som kategori.
+
+    Args:
+        df (pd.DataFrame): Datasettet.
+        date_col (str): Datokolonne. Hoppes over hvis den ikke finnes.
+        station_col (str): Stasjonskolonne. Hoppes over hvis den ikke finnes.
+
+    Returns:
+        pd.DataFrame: Datasett med samme verdier og kompakte kolonnetyper.
+    """
+    df = df.copy()
+    for name, series in df.items():
+        if name == date_col:
+            df[name] = pd.to_datetime(series).astype(COMPACT_DATE_DTYPE)
+        elif name.startswith(COMPACT_FLAG_PREFIXES):
+            df[name] = series.astype(bool)
+        elif pd.api.types.is_float_dtype(series.dtype):
+            df[name] = series.astype(COMPACT_FLOAT_DTYPE)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            df[name] = pd.to_numeric(series, downcast="integer")
+        elif series.dtype == object and (name == station_col or series.nunique() <= len(series) // 2):
+            df[name] = series.astype("category")
+    return df
+
+
+def memory_usage(df):
+    """
+    Beregner minnebruken til et datasett, inkludert tekstverdiene i objektkolonner.
+
+    Args:
+        df (pd.DataFrame): Datasettet.
+
+    Returns:
+        int: Antall byte.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(frames, date_col="Dato", station_col="Stasjon"):
+    """
+    Lager en oversikt over minnebruken per trinn i pipelinen, slik datasettet er i dag og med kompakte kolonnetyper.
+
+    Args:
+        frames (dict): Navn på trinn → DataFrame, f.eks. {"rådata": df_raw, "renset": df_clean}.
+        date_col (str): Datokolonne.
+        station_col (str): Stasjonskolonne.
+
+    Returns:
+        pd.DataFrame: Én rad per trinn med antall rader, minnebruk i dag og kompakt (MB),
+            byte per rad og besparelse i prosent.
+    """
+    rows = []
+    for stage, df in frames.items():
+        current = memory_usage(df)
+        compact = memory_usage(compact_dtypes(df, date_col, station_col))
+        rows.append({
+            "Trinn": stage,
+            "Rader": len(df),
+            "Minne_MB": current / 1e6,
+            "Kompakt_MB": compact / 1e6,
+            "Byte_per_rad": current / max(len(df), 1),
+            "Kompakt_byte_per_rad": compact / max(len(df), 1),
+            "Besparelse_prosent": 100 * (1 - compact / current) if current else np.nan,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+ROWS_BITMAP = "rows.npy"
+
+
+def epoch_day(value):
+    """
+    Gjør en dato om til dagnummer (antall dager siden 1970-01-01).
+
+    Args:
+        value (str): Dato ('YYYY-MM-DD').
+
+    Returns:
+        int: Dagnummeret.
+    """
+    return int(np.datetime64(str(value)[:10], "D").astype(np.int64))
+
+
+def write_cube(df, directory, station_col="Stasjon", date_col="Dato"):
+    """
+    Lagrer et datasett som en tidsseriekube: hver tallkolonne blir en (stasjon × dag)-matrise med fast dtype
+    i en egen .npy-fil, og hver boolsk kolonne (f.eks. Interpolert_*) blir en bitmap med én bit per stasjon og dag.
+    En egen bitmap markerer hvilke stasjon/dag-kombinasjoner som fantes i datasettet.
+    Mappen skrives først under et midlertidig navn og flyttes på plass til slutt.
+
+    Args:
+        df (pd.DataFrame): Datasettet, med høyst én rad per stasjon og dato.
+        directory (str): Mappen kuben skal lagres i.
+        station_col (str): Kolonne med stasjons-ID. Datasett uten kolonnen lagres som én stasjon.
+        date_col (str): Datokolonne ('YYYY-MM-DD').
+
+    Raises:
+        ValueError: Hvis datasettet er tomt, har doble stasjon/dato-rader eller tekstkolonner som ikke kan lagres.
+    """
+    if df.empty:
+        raise ValueError("Kan ikke lagre et tomt datasett som kube.")
+
+    days = pd.to_datetime(df[date_col]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    start_day = int(days.min())
+    n_days = int(days.max()) - start_day + 1
+    has_station = station_col in df.columns
+    if has_station:
+        codes, labels = pd.factorize(df[station_col], sort=True)
+        labels = np.asarray(labels).tolist()
+    else:
+        codes, labels = np.zeros(len(df), dtype=np.int64), [None]
+    rows, cols = codes, days - start_day
+
+    present = np.zeros((len(labels), n_days), dtype=bool)
+    present[rows, cols] = True
+    if present.sum() != len(df):
+        raise ValueError("Kuben kan bare ha én rad per stasjon og dato.")
+
+    tmp_dir = f"{directory}.tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, ROWS_BITMAP), np.packbits(present, axis=1, bitorder="little"))
+
+    columns = []
+    for i, (name, series) in enumerate(df.items()):
+        if name in (date_col, station_col):
+            columns.append({"name": name, "kind": "date" if name == date_col else "station"})
+            continue
+        file = f"c{i}.npy"
+        if series.dtype == bool:
+            flags = np.zeros((len(labels), n_days), dtype=bool)
+            flags[rows, cols] = series.to_numpy()
+            np.save(os.path.join(tmp_dir, file), np.packbits(flags, axis=1, bitorder="little"))
+            columns.append({"name": name, "file": file, "kind": "bitmap"})
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            values = np.full((len(labels), n_days), np.nan if series.dtype.kind == "f" else 0, dtype=series.dtype)
+            values[rows, cols] = series.to_numpy()
+            np.save(os.path.join(tmp_dir, file), values)
+            columns.append({"name": name, "file": file, "kind": "array"})
+        else:
+            shutil.rmtree(tmp_dir)
+            raise ValueError(f"Kolonnen '{name}' har typen {series.dtype} og kan ikke lagres i kuben.")
+
+    meta = {"start_day": start_day, "days": n_days, "stations": labels, "has_station": has_station,
+            "date_col": date_col, "station_col": station_col, "columns": columns}
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.replace(tmp_dir, directory)
+
+
+def open_cube(directory):
+    """
+    Åpner en kube skrevet av write_cube uten å lese dataene: matrisene minnekartlegges (numpy.memmap),
+    slik at flere prosesser kan dele dem uten parsing og uten egne kopier i minnet.
+
+    Args:
+        directory (str): Mappen kuben ligger i.
+
+    Returns:
+        dict: "start_day", "days", "stations", "dates" (datetime64[D]), "values" (navn → memmap med form
+            (stasjoner, dager)), "bitmaps" (navn → pakket bitmap) og "meta".
+    """
+    with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    values, bitmaps = {}, {}
+    for column in meta["columns"]:
+        if column["kind"] == "array":
+            values[column["name"]] = np.load(os.path.join(directory, column["file"]), mmap_mode="r")
+        elif column["kind"] == "bitmap":
+            bitmaps[column["name"]] = np.load(os.path.join(directory, column["file"]), mmap_mode="r")
+    bitmaps[ROWS_BITMAP] = np.load(os.path.join(directory, ROWS_BITMAP), mmap_mode="r")
+
+    return {
+        "start_day": meta["start_day"],
+        "days": meta["days"],
+        "stations": meta["stations"],
+        "dates": np.arange(meta["start_day"], meta["start_day"] + meta["days"]).astype("datetime64[D]"),
+        "values": values,
+        "bitmaps": bitmaps,
+        "meta": meta,
+    }
+
+
+def cube_flags(cube, name=None, stations=None, start=0, stop=None):
+    """
+    Pakker ut en bitmap fra kuben til en boolsk matrise.
+
+    Args:
+        cube (dict): Kube fra open_cube.
+        name (str, optional): Navn på den boolske kolonnen. Standard er bitmapen over hvilke rader som finnes.
+        stations (list, optional): Stasjonsindekser. Standard er alle.
+        start (int): Første dagindeks.
+        stop (int, optional): Dagindeks det stoppes før. Standard er siste dag.
+
+    Returns:
+        np.ndarray: Boolsk matrise med form (stasjoner, dager).
+    """
+    packed = cube["bitmaps"][name or ROWS_BITMAP]
+    if stations is not None:
+        packed = packed[stations]
+    flags = np.unpackbits(packed, axis=1, count=cube["days"], bitorder="little")
+    return flags[:, start:stop].astype(bool)
+
+
+def read_cube(directory, stations=None, start=None, end=None, columns=None):
+    """
+    Leser en kube tilbake til samme lange tabell som ble lagret, sortert på dato og stasjon.
+    Bare dagene og stasjonene i filteret hentes fra disk.
+
+    Args:
+        directory (str): Mappen kuben ligger i.
+        stations (list, optional): Stasjons-ID-er. Standard er alle.
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        columns (list, optional): Kolonner som skal leses. Standard er alle.
+
+    Returns:
+        pd.DataFrame: Radene som passer filteret.
+    """
+    cube = open_cube(directory)
+    meta = cube["meta"]
+
+    lo = 0 if start is None else min(max(epoch_day(start) - cube["start_day"], 0), cube["days"])
+    hi = cube["days"] if end is None else min(max(epoch_day(end) - cube["start_day"] + 1, lo), cube["days"])
+    if stations is None:
+        index = np.arange(len(cube["stations"]))
+    else:
+        wanted = {str(station) for station in stations}
+        index = np.array([i for i, label in enumerate(cube["stations"]) if str(label) in wanted], dtype=np.int64)
+
+    present = cube_flags(cube, stations=index, start=lo, stop=hi)
+    day_idx, station_idx = np.nonzero(present.T)
+
+    data = {}
+    for column in meta["columns"]:
+        name = column["name"]
+        if columns is not None and name not in columns:
+            continue
+        if column["kind"] == "date":
+            # Datostrengene lages én gang per dag og deles av alle stasjonene
+            data[name] = np.datetime_as_string(cube["dates"][lo:hi], unit="D").astype(object)[day_idx]
+        elif column["kind"] == "station":
+            data[name] = np.asarray(cube["stations"])[index][station_idx]
+        elif column["kind"] == "bitmap":
+            data[name] = cube_flags(cube, name, index, lo, hi)[station_idx, day_idx]
+        else:
+            data[name] = np.asarray(cube["values"][name][index, lo:hi])[station_idx, day_idx]
+    return pd.DataFrame(data)
@@ -0,0 +1,240 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+
+# "interaktiv": figurer vises med plt.show() med en gang (som i notatbøkene).
+# "headless": ingenting tegnes. Diagnostikken lagres som data, og figurene kan tegnes senere med render_figures.
+# "fil": figurene tegnes og lagres som PNG i en bakgrunnstråd, mens pipelinen fortsetter.
+MODES = ("interaktiv", "headless", "fil")
+
+# Standardmodus kan settes med miljøvariabelen MILJODATA_PLOT, f.eks. MILJODATA_PLOT=headless i batchjobber.
+# I headless-modus holdes argumentene til de utsatte figurene (ofte hele DataFrames) i minnet til render_figures,
+# så bare de max_figures siste figurene og max_records siste registreringene beholdes. 0 beholder ingen figurer.
+_config = {
+    "mode": os.environ.get("MILJODATA_PLOT", "interaktiv"),
+    "directory": os.environ.get("MILJODATA_PLOT_DIR", "figurer"),
+    "max_figures": 20,
+    "max_records": 1000,
+}
+
+_lock = threading.Lock()
+# pyplot har én felles "gjeldende figur", så figurer fra trinn som kjøres samtidig må tegnes etter tur
+_plot_lock = threading.Lock()
+_records = []
+_pending = []
+_counter = {"records": 0}
+_renderer = {"executor": None, "futures": [], "count": 0}
+
+
+def configure_diagnostics(**settings):
+    """
+    Endrer hvordan diagnostikk og figurer håndteres.
+
+    Args:
+        **settings: mode (en av MODES), directory (mappe for figurer i modusen "fil"), max_figures (antall utsatte
+            figurer som beholdes i headless-modus) og/eller max_records (antall registreringer som beholdes).
+
+    Returns:
+        dict: Gjeldende innstillinger etter endringen.
+
+    Raises:
+        ValueError: Ved ukjente innstillinger eller ukjent modus.
+    """
+    unknown = set(settings) - set(_config)
+    if unknown:
+        raise ValueError(f"Ukjente innstillinger: {sorted(unknown)}")
+    if settings.get("mode", _config["mode"]) not in MODES:
+        raise ValueError(f"Ukjent modus '{settings['mode']}'. Gyldige moduser: {', '.join(MODES)}")
+    for key in ("max_figures", "max_records"):
+        if key in settings and not (isinstance(settings[key], int) and settings[key] >= 0):
+            raise ValueError(f"{key} må være et heltall større enn eller lik 0, fikk {settings[key]!r}")
+
+    with _lock:
+        _config.update(settings)
+        _trim(_pending, _config["max_figures"])
+        _trim(_records, _config["max_records"])
+    return dict(_config)
+
+
+def _trim(items, limit):
+    # Fjerner de eldste elementene utover grensen
+    del items[:max(len(items) - limit, 0)]
+
+
+@contextmanager
+def diagnostics_mode(mode, directory=None):
+    """
+    Kjører en blokk i en gitt modus, f.eks. `with diagnostics_mode("headless"):` rundt en batchkjøring,
+    og setter den forrige modusen tilbake etterpå.
+
+    Args:
+        mode (str): En av MODES.
+        directory (str, optional): Mappe for figurer i modusen "fil".
+    """
+    previous = dict(_config)
+    configure_diagnostics(mode=mode, **({"directory": directory} if directory else {}))
+    try:
+        yield
+    finally:
+        configure_diagnostics(**previous)
+
+
+def record(kind, data):
+    """
+    Lagrer diagnostikk som data, uavhengig av modus. Bare de max_records siste registreringene beholdes.
+
+    Args:
+        kind (str): Type diagnostikk, f.eks. "outliers" eller "manglende".
+        data (pd.DataFrame): Diagnostikken, én rad per kolonne eller variabel.
+    """
+    with _lock:
+        _records.append((_counter["records"], kind, data))
+        _counter["records"] += 1
+        _trim(_records, _config["max_records"])
+
+
+def get_diagnostics(kind):
+    """
+    Henter diagnostikken av en gitt type som er lagret siden forrige clear_diagnostics.
+
+    Args:
+        kind (str): Type diagnostikk.
+
+    Returns:
+        pd.DataFrame: Alle lagrede rader, med kolonnen Nr for hvilken registrering raden kom fra.
+            Tom DataFrame hvis ingenting er lagret.
+    """
+    with _lock:
+        frames = [data.assign(Nr=nr) for nr, k, data in _records if k == kind]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def clear_diagnostics():
+    """Fjerner lagret diagnostikk og figurer som ikke er tegnet."""
+    with _lock:
+        _records.clear()
+        _pending.clear()
+        _counter["records"] = 0
+
+
+def show_plot(name, draw, *args, **kwargs):
+    """
+    Viser, lagrer eller utsetter en figur avhengig av modus. draw tegner figuren med pyplot,
+    men kaller ikke plt.show(), og matplotlib importeres først når figuren faktisk tegnes.
+    I headless-modus beholdes bare de max_figures siste utsatte figurene, og eldre figurer forkastes.
+
+    Args:
+        name (str): Navn på figuren, brukes i filnavnet i modusen "fil".
+        draw (callable): Funksjon som tegner figuren.
+        *args, **kwargs: Argumenter til draw.
+
+    Returns:
+        Future eller None: I modusen "fil" en Future med filstiene som skrives.
+    """
+    mode = _config["mode"]
+    if mode == "headless":
+        with _lock:
+            _pending.append((name, draw, args, kwargs))
+            _trim(_pending, _config["max_figures"])
+        return None
+    if mode == "fil":
+        return _submit(name, draw, args, kwargs, _config["directory"])
+
+    import matplotlib.pyplot as plt
+    with _plot_lock:
+        try:
+            draw(*args, **kwargs)
+            plt.show()
+        except Exception as e:
+            print(f"Feil under visualisering av {name}: {e}")
+    return None
+
+
+def render_figures(directory=None):
+    """
+    Tegner figurene som ble utsatt i modusen "headless".
+
+    Args:
+        directory (str, optional): Mappe figurene lagres i. Standard er å vise dem med plt.show().
+
+    Returns:
+        list: Filstiene som ble skrevet (tom når figurene vises).
+    """
+    with _lock:
+        pending = list(_pending)
+        _pending.clear()
+
+    if directory is None:
+        for name, draw, args, kwargs in pending:
+            with diagnostics_mode("interaktiv"):
+                show_plot(name, draw, *args, **kwargs)
+        return []
+
+    futures = [_submit(name, draw, args, kwargs, directory, track=False) for name, draw, args, kwargs in pending]
+    return [file for future in futures for file in future.result()]
+
+
+def _submit(name, draw, args, kwargs, directory, track=True):
+    # Én bakgrunnstråd tegner alle figurene etter tur, siden pyplot ikke er trådsikkert
+    with _lock:
+        if _renderer["executor"] is None:
+            _renderer["executor"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="figurer")
+        _renderer["count"] += 1
+        nr = _renderer["count"]
+        future = _renderer["executor"].submit(_render_to_files, nr, name, draw, args, kwargs, directory)
+        if track:
+            _renderer["futures"].append(future)
+    return future
+
+
+def _render_to_files(nr, name, draw, args, kwargs, directory):
+    import matplotlib.pyplot as plt
+
+    with _plot_lock:
+        # Vindusbaserte backends kan ikke brukes utenfor hovedtråden
+        if plt.get_backend().lower() in _interactive_backends():
+            plt.switch_backend("Agg")
+        files = []
+        try:
+            draw(*args, **kwargs)
+            os.makedirs(directory, exist_ok=True)
+            base = re.sub(r"[^\w.-]+", "_", name)
+            for i, number in enumerate(plt.get_fignums()):
+                suffix = f"_{i + 1}" if i else ""
+                file = os.path.join(directory, f"{nr:03d}_{base}{suffix}.png")
+                plt.figure(number).savefig(file)
+                files.append(file)
+        except Exception as e:
+            print(f"Feil under visualisering av {name}: {e}")
+        finally:
+            plt.close("all")
+    return files
+
+
+def _interactive_backends():
+    try:
+        from matplotlib.backends import backend_registry, BackendFilter
+        names = backend_registry.list_builtin(BackendFilter.INTERACTIVE)
+    except ImportError:
+        # matplotlib eldre enn 3.9
+        from matplotlib.rcsetup import interactive_bk as names
+    return {name.lower() for name in names}
+
+
+def wait_for_figures():
+    """
+    Venter til bakgrunnstråden har skrevet alle figurene fra modusen "fil".
+
+    Returns:
+        list: Filstiene som ble skrevet, i den rekkefølgen figurene ble sendt inn.
+    """
+    with _lock:
+        futures = list(_renderer["futures"])
+        _renderer["futures"].clear()
+    return [file for future in futures for file in future.result()]
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import time
+
+
+def cache_key(endpoint, params=None):
+    """
+    Lager en stabil nøkkel for et API-kall basert på endepunkt og parametere.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        params (dict, optional): Parametere for kallet. Rekkefølgen har ingen betydning.
+
+    Returns:
+        str: Heksadesimal SHA-256-nøkkel.
+    """
+    payload = json.dumps([endpoint, params or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_file(cache_dir, endpoint, params):
+    return os.path.join(cache_dir, f"{cache_key(endpoint, params)}.json")
+
+
+def cache_get(endpoint, params, ttl, cache_dir):
+    """
+    Leser et bufret svar fra disk hvis det finnes og ikke er eldre enn ttl.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        params (dict or None): Parametere for kallet.
+        ttl (float): Maks alder i sekunder.
+        cache_dir (str): Mappe for bufrede svar.
+
+    Returns:
+        Bufrede data, eller None hvis de mangler, er utløpt eller ikke kan leses.
+    """
+    file = _cache_file(cache_dir, endpoint, params)
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if time.time() - entry.get("stored_at", 0) > ttl:
+        return None
+    return entry.get("data")
+
+
+def cache_set(endpoint, params, data, cache_dir):
+    """
+    Lagrer et svar på disk. Filen skrives atomisk slik at samtidige lesere aldri ser en halv fil.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        params (dict or None): Parametere for kallet.
+        data: JSON-serialiserbare data som skal bufres.
+        cache_dir (str): Mappe for bufrede svar.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    file = _cache_file(cache_dir, endpoint, params)
+    entry = {"endpoint": endpoint, "params": params or {}, "stored_at": time.time(), "data": data}
+
+    tmp_file = f"{file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_file, file)
+
+
+def invalidate_cache(cache_dir, endpoint=None, params=None):
+    """
+    Sletter bufrede svar. Uten endepunkt slettes hele bufferet, med endepunkt alle svar
+    for det endepunktet, og med både endepunkt og parametere bare det ene svaret.
+
+    Args:
+        cache_dir (str): Mappe for bufrede svar.
+        endpoint (str, optional): Endepunktet som skal slettes.
+        params (dict, optional): Parametere for det ene svaret som skal slettes.
+
+    Returns:
+        int: Antall slettede oppføringer.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    if endpoint is not None and params is not None:
+        file = _cache_file(cache_dir, endpoint, params)
+        if os.path.exists(file):
+            os.remove(file)
+            return 1
+        return 0
+
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".json"):
+            continue
+        file = os.path.join(cache_dir, name)
+        if endpoint is not None:
+            try:
+                with open(file, "r", encoding="utf-8") as f:
+                    if json.load(f).get("endpoint") != endpoint:
+                        continue
+            except ValueError:
+                pass
+        os.remove(file)
+        removed += 1
+    return removed
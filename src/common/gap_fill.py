@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+# "linear": lineært mellom nabomålingene etter radnummer (som pandas interpolate(method="linear")).
+# "time": vektet etter tid mellom nabomålingene. Gir det samme som "linear" på et fast datorutenett,
+#     men riktig vekting når radene ikke ligger med fast avstand (freq=None).
+METHODS = ("linear", "time")
+
+
+def fill_gaps(df, cols, from_date=None, to_date=None, freq="D", method="time", max_gap=None,
+              station_column="Stasjon", date_column="Dato", flag_prefix="Interpolert_"):
+    """
+    Fyller hull i måleseriene for alle stasjoner og kolonner samtidig. Dataene legges på et fullt rutenett
+    (stasjon × dato) med én rad per stasjon og dag, og hull fylles vektorisert: forrige og neste måling for
+    hver rad finnes med np.maximum.accumulate/np.minimum.accumulate over alle kolonnene på én gang, uten å
+    krysse over til en annen stasjon. Hull i starten av en serie fylles ikke, hull på slutten får siste måling
+    (som pandas interpolate).
+
+    Args:
+        df (pd.DataFrame): Dataene, én rad per stasjon og dato (duplikater bør fjernes først, ellers brukes den siste).
+        cols (list): Kolonnene som skal fylles. Kolonner som ikke finnes hoppes over.
+        from_date (str, optional): Første dato i rutenettet. Standard er første dato i dataene.
+        to_date (str, optional): Siste dato i rutenettet. Standard er siste dato i dataene.
+        freq (str, optional): Avstanden i rutenettet, f.eks. "D" eller "h". Med None beholdes radene som de er,
+            og bare manglende verdier fylles.
+        method (str, optional): En av METHODS.
+        max_gap (int, optional): Lengste hull (antall manglende rader på rad) som fylles. Lengre hull blir
+            stående tomme i sin helhet. Standard er å fylle alle hull.
+        station_column (str, optional): Stasjonskolonnen. Uten den behandles alle radene som én serie.
+        date_column (str): Datokolonnen.
+        flag_prefix (str, optional): Prefiks for kolonnene som markerer fylte verdier, f.eks. "Interpolert_".
+            Med None lages ingen slike kolonner.
+
+    Returns:
+        pd.DataFrame: Sortert på stasjon og dato, med datokolonnen som datetime, de andre kolonnene i samme
+            rekkefølge som i df (tomme for nye rader), og <flag_prefix><kolonne> for hver kolonne i cols.
+
+    Raises:
+        ValueError: Ved ukjent metode.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Ukjent metode '{method}'. Gyldige metoder: {', '.join(METHODS)}")
+
+    cols = [col for col in cols if col in df.columns]
+    dates = pd.to_datetime(df[date_column]).to_numpy(dtype="datetime64[ns]")
+    has_station = station_column in df.columns
+    if has_station:
+        codes, stations = pd.factorize(df[station_column], sort=True, use_na_sentinel=False)
+    else:
+        codes, stations = np.zeros(len(df), dtype=np.int64), np.array([None])
+
+    if freq:
+        source, out_codes, out_dates = _grid_positions(dates, codes, len(stations), from_date, to_date, freq)
+    else:
+        source = np.lexsort((dates, codes))
+        out_codes, out_dates = codes[source], dates[source]
+
+    n = len(source)
+    present = source >= 0
+    values = np.full((n, len(cols)), np.nan)
+    if cols:
+        values[present] = df[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")[source[present]]
+
+    starts = np.flatnonzero(np.r_[True, out_codes[1:] != out_codes[:-1]]) if n else np.array([], dtype=np.int64)
+    lengths = np.diff(np.r_[starts, n])
+    first = np.repeat(starts, lengths)
+    end = first + np.repeat(lengths, lengths)
+    positions = out_dates.astype(np.int64) if method == "time" else np.arange(n)
+    filled, was_filled = interpolate_columns(values, positions, first, end, max_gap)
+
+    result = {}
+    for col in df.columns:
+        if col == date_column:
+            continue
+        if col == station_column:
+            result[col] = pd.Series(stations).take(out_codes).to_numpy() if n else df[col].to_numpy()[:0]
+        elif col in cols:
+            result[col] = filled[:, cols.index(col)]
+        else:
+            result[col] = pd.api.extensions.take(df[col].to_numpy(), source, allow_fill=True)
+    if flag_prefix:
+        for i, col in enumerate(cols):
+            result[f"{flag_prefix}{col}"] = was_filled[:, i]
+
+    return pd.DataFrame({date_column: out_dates, **result})
+
+
+def interpolate_columns(values, positions, first, end, max_gap=None):
+    """
+    Fyller NaN i en matrise med én kolonne per variabel og rader sortert på serie og tid.
+
+    Args:
+        values (np.ndarray): Verdier med form (rader, kolonner).
+        positions (np.ndarray): Tidspunkt eller radnummer for hver rad, brukes som vekt mellom nabomålingene.
+        first (np.ndarray): For hver rad, indeksen til første rad i samme serie.
+        end (np.ndarray): For hver rad, indeksen etter siste rad i samme serie.
+        max_gap (int, optional): Lengste hull som fylles.
+
+    Returns:
+        tuple: (filled, was_filled) med samme form som values.
+    """
+    n = len(values)
+    index_type = np.int32 if n < np.iinfo(np.int32).max else np.int64
+    rows = np.arange(n, dtype=index_type)
+    # Én rad per variabel, så akkumuleringen går langs sammenhengende minne
+    columns = np.ascontiguousarray(values.T)
+    valid = ~np.isnan(columns)
+
+    # Indeksen til forrige og neste gyldige måling, for alle kolonnene samtidig
+    previous = np.maximum.accumulate(np.where(valid, rows, -1).astype(index_type), axis=1)
+    following = np.minimum.accumulate(np.where(valid, rows, n).astype(index_type)[:, ::-1], axis=1)[:, ::-1]
+
+    # Bare de manglende verdiene regnes ut. Treff i en annen serie forkastes.
+    col, row = np.nonzero(~valid)
+    p, q = previous[col, row], following[col, row]
+    has_previous = p >= first[row]
+    has_following = q < end[row]
+    col, row, p, q, has_following = (a[has_previous] for a in (col, row, p, q, has_following))
+
+    before = columns[col, p]
+    after = np.where(has_following, columns[col, np.where(has_following, q, p)], before)
+    t, tp = positions[row], positions[p]
+    tq = np.where(has_following, positions[np.where(has_following, q, p)], tp)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        interpolated = np.where(has_following, before + (after - before) * ((t - tp) / (tq - tp)), before)
+
+    if max_gap is not None:
+        gap = np.where(has_following, q, end[row]) - p - 1
+        keep = gap <= max_gap
+        col, row, interpolated = col[keep], row[keep], interpolated[keep]
+
+    filled = columns
+    filled[col, row] = interpolated
+    was_filled = np.zeros(filled.shape, dtype=bool)
+    was_filled[col, row] = True
+    return filled.T, was_filled.T
+
+
+def _grid_positions(dates, codes, nstations, from_date, to_date, freq):
+    # For hver rad i rutenettet (stasjon × dato): raden i df som hører dit, eller -1
+    start = pd.Timestamp(from_date) if from_date else pd.Timestamp(dates.min()) if len(dates) else None
+    stop = pd.Timestamp(to_date) if to_date else pd.Timestamp(dates.max()) if len(dates) else None
+    grid = pd.date_range(start, stop, freq=freq) if start is not None else pd.DatetimeIndex([])
+
+    ndates = len(grid)
+    on_grid = grid.get_indexer(dates) if ndates else np.full(len(dates), -1)
+    keep = on_grid >= 0
+    source = np.full(nstations * ndates, -1, dtype=np.int64)
+    source[codes[keep] * ndates + on_grid[keep]] = np.flatnonzero(keep)
+
+    out_codes = np.repeat(np.arange(nstations), ndates)
+    out_dates = np.tile(grid.to_numpy(dtype="datetime64[ns]"), nstations)
+    return source, out_codes, out_dates
@@ -0,0 +1,204 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuskoder som regnes som midlertidige feil og prøves på nytt
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_config = {
+    "timeout": (5, 60),         # (tilkobling, lesing) i sekunder
+    "max_retries": 3,
+    "backoff_factor": 0.5,
+    "max_backoff": 30,
+    "pool_size": 16,
+    "max_per_host": 4,
+}
+
+
+class IncompleteFetchError(RuntimeError):
+    """
+    Kastes når en oppdelt henting er ferdig, men noen deler feilet etter alle forsøk.
+    Dataene er da ufullstendige og skal verken lagres eller flytte vannmerker.
+
+    Attributes:
+        failed (list): Delene som feilet, f.eks. referencetime-vinduer eller perioder.
+        data: Det som ble hentet for de andre delene.
+    """
+
+    def __init__(self, message, failed, data=None):
+        super().__init__(message)
+        self.failed = failed
+        self.data = data
+
+
+_session = None
+_lock = threading.Lock()
+_host_limits = {}
+_stats = {"requests": 0, "retries": 0, "errors": 0, "bytes": 0, "latency_total": 0.0, "latency_max": 0.0}
+
+
+def configure_http_client(**settings):
+    """
+    Endrer innstillingene til den delte HTTP-klienten.
+    Endringer i pool_size eller max_per_host gjelder fra neste gang en sesjon opprettes.
+
+    Args:
+        **settings: En eller flere av timeout, max_retries, backoff_factor, max_backoff,
+            pool_size og max_per_host.
+
+    Returns:
+        dict: Gjeldende innstillinger etter endringen.
+    """
+    global _session
+    unknown = set(settings) - set(_config)
+    if unknown:
+        raise ValueError(f"Ukjente innstillinger: {sorted(unknown)}")
+
+    with _lock:
+        _config.update(settings)
+        if {"pool_size", "max_per_host"} & set(settings):
+            if _session is not None:
+                _session.close()
+            _session = None
+            _host_limits.clear()
+    return dict(_config)
+
+
+def get_session():
+    """
+    Returnerer den delte requests.Session med tilkoblingspool, og oppretter den ved første kall.
+
+    Returns:
+        requests.Session: Sesjon som gjenbruker TCP/TLS-tilkoblinger mellom kall.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=_config["pool_size"], pool_maxsize=_config["pool_size"])
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _host_limit(url):
+    """Returnerer semaforen som begrenser antall samtidige forespørsler mot én vert."""
+    host = urlparse(url).netloc
+    with _lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(_config["max_per_host"])
+        return _host_limits[host]
+
+
+def retry_delay(attempt, response=None, backoff_factor=None, max_backoff=None):
+    """
+    Beregner ventetid før neste forsøk. Retry-After fra serveren brukes hvis den finnes,
+    ellers eksponentiell backoff.
+
+    Args:
+        attempt (int): Nummeret på forsøket som feilet (0 for første).
+        response (requests.Response, optional): Responsen som feilet, hvis noen.
+        backoff_factor (float, optional): Grunnlag for eksponentiell backoff.
+        max_backoff (float, optional): Øvre grense for ventetiden i sekunder.
+
+    Returns:
+        float: Antall sekunder å vente.
+    """
+    backoff_factor = _config["backoff_factor"] if backoff_factor is None else backoff_factor
+    max_backoff = _config["max_backoff"] if max_backoff is None else max_backoff
+
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), max_backoff)
+        except ValueError:
+            try:
+                wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(max(wait, 0.0), max_backoff)
+            except (TypeError, ValueError):
+                pass
+
+    return min(backoff_factor * (2 ** attempt), max_backoff)
+
+
+def _record(latency, size=0, retried=False, failed=False):
+    """Oppdaterer tellerne for forespørsler, forsøk, bytes og ventetid."""
+    with _lock:
+        _stats["requests"] += 1
+        _stats["retries"] += int(retried)
+        _stats["errors"] += int(failed)
+        _stats["bytes"] += size
+        _stats["latency_total"] += latency
+        _stats["latency_max"] = max(_stats["latency_max"], latency)
+
+
+def http_get(url, params=None, auth=None, timeout=None, max_retries=None, stream=False):
+    """
+    Sender en GET-forespørsel gjennom den delte sesjonen med tidsavbrudd, begrenset
+    samtidighet per vert og nye forsøk ved nettverksfeil, 429 og 5xx.
+
+    Args:
+        url (str): Adressen som skal hentes.
+        params (dict, optional): Query-parametere.
+        auth (tuple, optional): Brukernavn og passord for basic auth.
+        timeout (float or tuple, optional): Tidsavbrudd. Standard er innstillingen i klienten.
+        max_retries (int, optional): Antall nye forsøk. Standard er innstillingen i klienten.
+        stream (bool): Om responsen skal leses strømmende i stedet for å lastes inn med en gang.
+
+    Returns:
+        requests.Response: Siste respons. Kalleren må selv sjekke status med raise_for_status().
+
+    Raises:
+        requests.RequestException: Hvis alle forsøk feiler med nettverksfeil.
+    """
+    timeout = _config["timeout"] if timeout is None else timeout
+    max_retries = _config["max_retries"] if max_retries is None else max_retries
+    session = get_session()
+    limit = _host_limit(url)
+
+    for attempt in range(max_retries + 1):
+        is_last = attempt == max_retries
+        start = time.perf_counter()
+        try:
+            with limit:
+                response = session.get(url, params=params, auth=auth, timeout=timeout, stream=stream)
+                size = int(response.headers.get("Content-Length", 0)) if stream else len(response.content)
+        except (requests.ConnectionError, requests.Timeout):
+            _record(time.perf_counter() - start, retried=not is_last, failed=True)
+            if is_last:
+                raise
+            time.sleep(retry_delay(attempt))
+            continue
+
+        retry = response.status_code in RETRY_STATUS_CODES and not is_last
+        _record(time.perf_counter() - start, size, retried=retry, failed=response.status_code >= 400)
+        if not retry:
+            return response
+        response.close()
+        time.sleep(retry_delay(attempt, response))
+
+
+def get_http_stats():
+    """
+    Returnerer en kopi av tellerne til HTTP-klienten.
+
+    Returns:
+        dict: Antall forespørsler, nye forsøk, feil, overførte bytes, samlet og maks ventetid,
+            og gjennomsnittlig ventetid per forespørsel.
+    """
+    with _lock:
+        stats = dict(_stats)
+    stats["latency_avg"] = stats["latency_total"] / stats["requests"] if stats["requests"] else 0.0
+    return stats
+
+
+def reset_http_stats():
+    """Nullstiller tellerne til HTTP-klienten."""
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0.0 if key.startswith("latency") else 0
@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+
+# "global": gjennomsnitt ± threshold · standardavvik over hele serien (som remove_outliers har gjort hele tiden).
+# "rolling": z-verdi mot et glidende vindu på `window` målinger rundt hver dag, uten dagen selv.
+# "climatology": z-verdi mot samme tid på året (dag i året ± window/2) over alle år, så vanlige sommer- og
+#     vinterverdier ikke flagges.
+# "mad": median ± threshold · 1.4826 · MAD (medianavviket), robust mot outliers som trekker i snittet.
+# "iqr": nedre og øvre kvartil ± threshold · IQR.
+METHODS = ("global", "rolling", "climatology", "mad", "iqr")
+
+# Skalerer MAD slik at den tilsvarer standardavviket for normalfordelte data
+MAD_SCALE = 1.4826
+
+
+def outlier_limits(df, col, method="global", threshold=3, window=31, group_column="Stasjon", date_column="Dato",
+                   min_periods=None):
+    """
+    Beregner nedre og øvre outlier-grense for hver rad i en kolonne, per stasjon (group_column) når kolonnen finnes.
+    Alle metodene er vektoriserte: gjennomsnitt og varians regnes med np.bincount og kumulative summer over
+    verdiene minus stasjonssnittet, så summene holder seg små og numerisk stabile også for titalls millioner rader.
+
+    Args:
+        df (pd.DataFrame): Dataene. Radene trenger ikke være sortert.
+        col (str): Kolonnen som skal sjekkes.
+        method (str): En av METHODS.
+        threshold (float): Antall standardavvik (eller MAD/IQR) fra midten som regnes som outlier.
+        window (int): Antall målinger i det glidende vinduet ("rolling"), eller antall dager rundt
+            dagen i året ("climatology").
+        group_column (str, optional): Kolonnen grensene beregnes separat for. Ignoreres hvis den ikke finnes.
+        date_column (str): Datokolonnen, brukes av "rolling" og "climatology".
+        min_periods (int, optional): Minste antall målinger bak en grense. Færre gir ingen grense (NaN).
+            Standard er halve vinduet for "rolling" og "climatology", ellers 2.
+
+    Returns:
+        tuple: (lower, upper) som np.ndarray i samme rekkefølge som radene i df. NaN der grensen ikke kan beregnes.
+
+    Raises:
+        ValueError: Ved ukjent metode.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Ukjent metode '{method}'. Gyldige metoder: {', '.join(METHODS)}")
+
+    values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+    if len(values) == 0:
+        return values.copy(), values.copy()
+    codes, ngroups = _group_codes(df, group_column)
+    if min_periods is None:
+        min_periods = max(window // 2, 2) if method in ("rolling", "climatology") else 2
+
+    if method == "global":
+        center, spread, count = _group_stats(values, codes, ngroups)
+        center, spread, count = center[codes], spread[codes], count[codes]
+    elif method == "rolling":
+        center, spread, count = _rolling_stats(values, codes, ngroups, _dates(df, date_column), window)
+    elif method == "climatology":
+        center, spread, count = _climatology_stats(values, codes, ngroups, _dates(df, date_column), window)
+    elif method == "mad":
+        center, spread, count = _mad_stats(values, codes)
+    else:
+        lower_q, upper_q, count = _quartiles(values, codes)
+        iqr = np.where(upper_q > lower_q, upper_q - lower_q, np.nan)
+        too_few = count < min_periods
+        return np.where(too_few, np.nan, lower_q - threshold * iqr), np.where(too_few, np.nan, upper_q + threshold * iqr)
+
+    # Spredning 0 (f.eks. nedbør med mest tørre dager) gir ingen grense i stedet for å flagge alt som avviker
+    spread = np.where(spread > 0, spread, np.nan)
+    too_few = count < min_periods
+    lower = np.where(too_few, np.nan, center - threshold * spread)
+    upper = np.where(too_few, np.nan, center + threshold * spread)
+    return lower, upper
+
+
+def outlier_mask(df, cols, method="global", threshold=3, window=31, group_column="Stasjon", date_column="Dato",
+                 min_periods=None):
+    """
+    Finner outliers i flere kolonner med outlier_limits.
+
+    Args:
+        df (pd.DataFrame): Dataene.
+        cols (list): Kolonnene som skal sjekkes. Kolonner som ikke finnes hoppes over.
+        method, threshold, window, group_column, date_column, min_periods: Se outlier_limits.
+
+    Returns:
+        pd.DataFrame: True der verdien ligger utenfor grensene, med samme indeks som df og én kolonne per kolonne i cols.
+    """
+    mask = {}
+    for col in cols:
+        if col not in df.columns:
+            continue
+        lower, upper = outlier_limits(df, col, method, threshold, window, group_column, date_column, min_periods)
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+        with np.errstate(invalid="ignore"):
+            mask[col] = (values < lower) | (values > upper)
+    return pd.DataFrame(mask, index=df.index)
+
+
+def _group_codes(df, group_column):
+    # Heltallskode 0..ngroups-1 per rad. Uten stasjonskolonne er alle radene én gruppe.
+    if not group_column or group_column not in df.columns:
+        return np.zeros(len(df), dtype=np.int64), 1
+    codes, uniques = pd.factorize(df[group_column])
+    codes = codes.astype(np.int64)
+    ngroups = len(uniques)
+    if (codes < 0).any():
+        codes[codes < 0] = ngroups
+        ngroups += 1
+    return codes, max(ngroups, 1)
+
+
+def _dates(df, date_column):
+    return pd.to_datetime(df[date_column]).to_numpy(dtype="datetime64[D]")
+
+
+def _group_stats(values, codes, ngroups):
+    # Antall, gjennomsnitt og standardavvik (n - 1, som pandas) per gruppe i to omganger over dataene
+    valid = ~np.isnan(values)
+    c, v = codes[valid], values[valid]
+    count = np.bincount(c, minlength=ngroups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(c, v, ngroups) / count
+        deviation = v - mean[c]
+        std = np.sqrt(np.bincount(c, deviation * deviation, ngroups) / (count - 1))
+    return mean, std, count
+
+
+def _window_stats(count, total, squares):
+    # Gjennomsnitt og standardavvik fra antall, sum og kvadratsum (alle sentrert rundt gruppesnittet)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = (squares - count * mean * mean) / (count - 1)
+    return mean, np.sqrt(np.maximum(variance, 0))
+
+
+def _rolling_stats(values, codes, ngroups, dates, window):
+    # Sorterer på stasjon og dato bare hvis dataene ikke allerede er sortert
+    sorted_already = len(codes) < 2 or (
+        np.all(codes[1:] >= codes[:-1]) and np.all((codes[1:] != codes[:-1]) | (dates[1:] >= dates[:-1])))
+    order = None if sorted_already else np.lexsort((dates, codes))
+    v = values if order is None else values[order]
+    c = codes if order is None else codes[order]
+
+    offset, _, _ = _group_stats(values, codes, ngroups)
+    offset = np.nan_to_num(offset)[c]
+    valid = ~np.isnan(v)
+    d = np.where(valid, v - offset, 0.0)
+
+    # Kumulative summer med en ledende null, så summen over [lo, hi) er cs[hi] - cs[lo]
+    n = len(v)
+    cs_count = np.concatenate(([0], np.cumsum(valid)))
+    cs_sum = np.concatenate(([0.0], np.cumsum(d)))
+    cs_squares = np.concatenate(([0.0], np.cumsum(d * d)))
+
+    starts = np.flatnonzero(np.r_[True, c[1:] != c[:-1]]) if n else np.array([], dtype=np.int64)
+    lengths = np.diff(np.r_[starts, n])
+    first = np.repeat(starts, lengths)
+    end = first + np.repeat(lengths, lengths)
+
+    position = np.arange(n)
+    half = window // 2
+    lo = np.maximum(position - half, first)
+    hi = np.minimum(position + half + 1, end)
+
+    # Dagen selv holdes utenfor vinduet, så en enkelt ekstremverdi ikke blåser opp sitt eget standardavvik
+    count = cs_count[hi] - cs_count[lo] - valid
+    mean, std = _window_stats(count, cs_sum[hi] - cs_sum[lo] - d, cs_squares[hi] - cs_squares[lo] - d * d)
+    center = offset + mean
+
+    if order is None:
+        return center, std, count
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(n)
+    return center[inverse], std[inverse], count[inverse]
+
+
+def _climatology_stats(values, codes, ngroups, dates, window):
+    # Summer per stasjon og dag i året (0–365) med bincount, glattet over ±window/2 dager rundt året
+    day = (dates - dates.astype("datetime64[Y]")).astype(np.int64)
+    key = codes * 366 + day
+
+    offset, _, _ = _group_stats(values, codes, ngroups)
+    offset = np.nan_to_num(offset)
+    valid = ~np.isnan(values)
+    d = values[valid] - offset[codes[valid]]
+    k = key[valid]
+    size = ngroups * 366
+
+    half = window // 2
+    sums = [np.bincount(k, weights, size).reshape(ngroups, 366) for weights in (None, d, d * d)]
+    smoothed = [_circular_window_sum(s.astype("float64"), half) for s in sums]
+    mean, std = _window_stats(*smoothed)
+
+    return offset[codes] + mean.ravel()[key], std.ravel()[key], smoothed[0].ravel()[key]
+
+
+def _circular_window_sum(table, half):
+    # Sum over ±half kolonner med omløp fra 31. desember til 1. januar
+    if half == 0:
+        return table
+    half = min(half, table.shape[1] // 2)
+    padded = np.concatenate((table[:, -half:], table, table[:, :half]), axis=1)
+    cs = np.concatenate((np.zeros((table.shape[0], 1)), np.cumsum(padded, axis=1)), axis=1)
+    width = 2 * half + 1
+    return cs[:, width:] - cs[:, :-width]
+
+
+def _mad_stats(values, codes):
+    series = pd.Series(values)
+    grouped = series.groupby(codes)
+    median = grouped.transform("median").to_numpy()
+    mad = (series - median).abs().groupby(codes).transform("median").to_numpy()
+    count = grouped.transform("count").to_numpy()
+    return median, MAD_SCALE * mad, count
+
+
+def _quartiles(values, codes):
+    grouped = pd.Series(values).groupby(codes)
+    quartiles = grouped.quantile([0.25, 0.75]).unstack()
+    lower_q = quartiles[0.25].to_numpy()
+    upper_q = quartiles[0.75].to_numpy()
+    # Gruppene kommer sortert på kode fra groupby, så koden er posisjonen i resultatet
+    positions = np.searchsorted(quartiles.index.to_numpy(), codes)
+    return lower_q[positions], upper_q[positions], grouped.transform("count").to_numpy()
@@ -0,0 +1,160 @@
+import os
+
+import pandas as pd
+
+from common.storage import dataset_path, save_dataset, load_dataset
+
+
+def partition_name(value):
+    """
+    Gjør en stasjons-ID om til et gyldig mappenavn, f.eks. "SN18700:0" → "SN18700_0".
+
+    Args:
+        value: Stasjons-ID.
+
+    Returns:
+        str: Mappenavn for stasjonen.
+    """
+    return str(value).replace(":", "_").replace("/", "_")
+
+
+def partition_file(source_dir, station, year, format=None):
+    """
+    Gir filstien til partisjonen for én stasjon og ett år: <source_dir>/<stasjon>/<år>.<endelse>.
+
+    Args:
+        source_dir (str): Mappen for datakilden, f.eks. "../../data/clean_data/frostAPI".
+        station: Stasjons-ID.
+        year (int): Årstall.
+        format (str, optional): Lagringsformat. Standard er DATASET_FORMAT.
+
+    Returns:
+        str: Filsti til partisjonen.
+    """
+    return dataset_path(os.path.join(source_dir, partition_name(station), str(year)), format)
+
+
+def write_partitions(df, source_dir, station_col="Stasjon", station=None, date_col="Dato", schema=None,
+                     format=None, merge=True):
+    """
+    Lagrer et datasett delt opp per stasjon og år. Finnes partisjonen fra før og merge er satt, slås radene
+    sammen og nye rader vinner ved lik dato og stasjon, slik at inkrementelle skriv ikke mister historikk.
+    Uten merge er df hele datasettet, og partisjoner fra tidligere skriv som ikke finnes i df slettes.
+
+    Args:
+        df (pd.DataFrame): Datasettet.
+        source_dir (str): Mappen for datakilden.
+        station_col (str): Kolonne med stasjons-ID. Brukes hvis station ikke er satt.
+        station (str or pd.Series, optional): Fast stasjonsnavn for datasett uten stasjonskolonne, f.eks.
+            "oslo_20km", eller stasjons-ID per rad når stasjonskolonnen ikke er ID-en (f.eks. etter label encoding).
+        date_col (str): Datokolonne ('YYYY-MM-DD').
+        schema (dict, optional): Kolonnetyper som settes ved lagring.
+        format (str, optional): Lagringsformat. Standard er DATASET_FORMAT.
+        merge (bool): Om eksisterende partisjoner skal slås sammen med de nye radene i stedet for å erstattes.
+
+    Returns:
+        list: Filstiene som ble skrevet.
+    """
+    written = []
+    if not df.empty:
+        years = pd.to_datetime(df[date_col]).dt.year
+        if station is None:
+            stations, key_cols = df[station_col], [date_col, station_col]
+        else:
+            # Én stasjon per partisjon, så datoen alene identifiserer en rad
+            stations = station if isinstance(station, pd.Series) else pd.Series(station, index=df.index)
+            key_cols = [date_col]
+
+        for (station_value, year), part in df.groupby([stations, years], sort=True):
+            file = partition_file(source_dir, station_value, year, format)
+            if merge and os.path.exists(file):
+                part = pd.concat([load_dataset(file), part], ignore_index=True).drop_duplicates(subset=key_cols, keep="last")
+            save_dataset(part.sort_values(key_cols).reset_index(drop=True), file, format, schema)
+            written.append(file)
+
+    if not merge:
+        _remove_stale_partitions(source_dir, written, format)
+    return written
+
+
+def _remove_stale_partitions(source_dir, keep, format=None):
+    # Sletter partisjoner som ikke ble skrevet nå, og stasjonsmapper som blir tomme
+    keep = {os.path.normpath(file) for file in keep}
+    for file in list_partitions(source_dir, format=format):
+        if os.path.normpath(file) not in keep:
+            os.remove(file)
+            station_dir = os.path.dirname(file)
+            if not os.listdir(station_dir):
+                os.rmdir(station_dir)
+
+
+def list_partitions(source_dir, stations=None, start=None, end=None, format=None):
+    """
+    Finner partisjonene som kan inneholde rader for de valgte stasjonene og datoene,
+    uten å åpne noen filer (bare mappe- og filnavn brukes).
+
+    Args:
+        source_dir (str): Mappen for datakilden.
+        stations (list, optional): Stasjons-ID-er. Standard er alle.
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        format (str, optional): Lagringsformat. Standard er DATASET_FORMAT.
+
+    Returns:
+        list: Filstier sortert på stasjon og år.
+    """
+    if not os.path.isdir(source_dir):
+        return []
+
+    extension = dataset_path("", format)
+    wanted = None if stations is None else {partition_name(station) for station in stations}
+    first_year = int(start[:4]) if start else None
+    last_year = int(end[:4]) if end else None
+
+    files = []
+    for station_dir in sorted(os.listdir(source_dir)):
+        station_path = os.path.join(source_dir, station_dir)
+        if not os.path.isdir(station_path) or (wanted is not None and station_dir not in wanted):
+            continue
+        for name in sorted(os.listdir(station_path)):
+            year = name[:-len(extension)]
+            if not name.endswith(extension) or not year.isdigit():
+                continue
+            if (first_year and int(year) < first_year) or (last_year and int(year) > last_year):
+                continue
+            files.append(os.path.join(station_path, name))
+    return files
+
+
+def read_partitions(source_dir, stations=None, start=None, end=None, columns=None, date_col="Dato", schema=None, format=None):
+    """
+    Leser bare partisjonene som passer stasjons- og datofilteret, og filtrerer radene på dato.
+
+    Args:
+        source_dir (str): Mappen for datakilden.
+        stations (list, optional): Stasjons-ID-er. Standard er alle.
+        start (str, optional): Første dato ('YYYY-MM-DD'), inkludert.
+        end (str, optional): Siste dato ('YYYY-MM-DD'), inkludert.
+        columns (list, optional): Kolonner som skal leses. Datokolonnen tas alltid med.
+        date_col (str): Datokolonne ('YYYY-MM-DD').
+        schema (dict, optional): Kolonnetyper som settes etter innlesing.
+        format (str, optional): Lagringsformat. Standard er DATASET_FORMAT.
+
+    Returns:
+        pd.DataFrame: Radene som passer filteret, eller tom DataFrame.
+    """
+    if columns is not None and date_col not in columns:
+        columns = [date_col] + list(columns)
+
+    frames = [load_dataset(file, format, schema, columns) for file in list_partitions(source_dir, stations, start, end, format)]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    dates = df[date_col].astype(str).str[:10]
+    mask = pd.Series(True, index=df.index)
+    if start:
+        mask &= dates >= start[:10]
+    if end:
+        mask &= dates <= end[:10]
+    return df[mask].reset_index(drop=True)
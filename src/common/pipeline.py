@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+
+def stage(name, func, deps=(), **kwargs):
+    """
+    Beskriver ett trinn i en pipeline.
+
+    Args:
+        name (str): Navn på trinnet, f.eks. "frost_renset".
+        func (callable): Funksjonen som kjøres. Resultatene fra deps sendes inn som posisjonsargumenter, i samme rekkefølge.
+        deps (tuple): Navn på trinnene som må være ferdige først.
+        **kwargs: Faste nøkkelordargumenter til func.
+
+    Returns:
+        dict: Trinnet, med nøklene name, func, deps og kwargs.
+    """
+    return {"name": name, "func": func, "deps": tuple(deps), "kwargs": kwargs}
+
+
+def topological_order(stages):
+    """
+    Sorterer trinnene slik at hvert trinn kommer etter trinnene det avhenger av.
+
+    Args:
+        stages (list): Trinn fra stage().
+
+    Returns:
+        list: Navnene på trinnene i kjørbar rekkefølge.
+
+    Raises:
+        ValueError: Hvis et navn er brukt to ganger, et trinn avhenger av et ukjent trinn, eller avhengighetene går i ring.
+    """
+    by_name = {}
+    for s in stages:
+        if s["name"] in by_name:
+            raise ValueError(f"Trinnet '{s['name']}' er definert flere ganger.")
+        by_name[s["name"]] = s
+    for s in stages:
+        for dep in s["deps"]:
+            if dep not in by_name:
+                raise ValueError(f"Trinnet '{s['name']}' avhenger av ukjent trinn '{dep}'.")
+
+    order, done = [], set()
+    remaining = [s["name"] for s in stages]
+    while remaining:
+        ready = [name for name in remaining if all(dep in done for dep in by_name[name]["deps"])]
+        if not ready:
+            raise ValueError(f"Avhengighetene går i ring: {', '.join(remaining)}")
+        order.extend(ready)
+        done.update(ready)
+        remaining = [name for name in remaining if name not in done]
+    return order
+
+
+def run_pipeline(stages, max_workers=4):
+    """
+    Kjører trinnene i en pipeline. Et trinn starter så snart trinnene det avhenger av er ferdige, og uavhengige
+    grener (f.eks. Frost og NILU, eller én stasjon mot en annen) kjøres samtidig i en trådpool.
+    Feiler et trinn, hoppes trinnene som avhenger av det over, mens de andre grenene kjøres ferdig.
+
+    Args:
+        stages (list): Trinn fra stage().
+        max_workers (int): Maks antall trinn som kjøres samtidig.
+
+    Returns:
+        tuple: (results, timings)
+            - results (dict): Navn → resultatet av trinnet, for trinnene som ble fullført.
+            - timings (pd.DataFrame): Én rad per trinn med kolonnene Trinn, Start_s, Varighet_s, Status og Tråd,
+              i den rekkefølgen trinnene ble ferdige.
+
+    Raises:
+        ValueError: Hvis avhengighetene er ugyldige (se topological_order).
+    """
+    order = topological_order(stages)
+    by_name = {s["name"]: s for s in stages}
+    results, timings, failed = {}, [], set()
+    t0 = time.perf_counter()
+
+    def run(name):
+        s = by_name[name]
+        start = time.perf_counter()
+        value = s["func"](*(results[dep] for dep in s["deps"]), **s["kwargs"])
+        return value, start - t0, time.perf_counter() - start, threading.current_thread().name
+
+    pending = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trinn") as executor:
+        while pending or running:
+            for name in list(pending):
+                deps = by_name[name]["deps"]
+                if any(dep in failed for dep in deps):
+                    pending.remove(name)
+                    failed.add(name)
+                    timings.append({"Trinn": name, "Start_s": None, "Varighet_s": None, "Status": "hoppet over", "Tråd": None})
+                elif all(dep in results for dep in deps):
+                    pending.remove(name)
+                    running[executor.submit(run, name)] = name
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    value, start, duration, thread = future.result()
+                except Exception as e:
+                    print(f"Feil i trinnet '{name}': {e}")
+                    failed.add(name)
+                    timings.append({"Trinn": name, "Start_s": None, "Varighet_s": None, "Status": "feilet", "Tråd": None})
+                    continue
+                results[name] = value
+                timings.append({"Trinn": name, "Start_s": start, "Varighet_s": duration, "Status": "ok", "Tråd": thread})
+
+    return results, pd.DataFrame(timings, columns=["Trinn", "Start_s", "Varighet_s", "Status", "Tråd"])
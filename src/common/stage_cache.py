@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import time
+
+# Manifestet ligger ved siden av hovedutdataene til et trinn, f.eks. frostAPI_clean_data.parquet.manifest.json
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def content_digest(path):
+    """
+    Lager en SHA-256-sjekksum av innholdet i en fil, eller av alle filene i en mappe (f.eks. en kube eller partisjoner).
+
+    Args:
+        path (str): Filsti til en fil eller mappe.
+
+    Returns:
+        str: Heksadesimal sjekksum.
+    """
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        files = [path]
+    for file in files:
+        digest.update(os.path.relpath(file, path).encode("utf-8"))
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _stat(path):
+    # Endringstid og størrelse. For en mappe brukes siste endringstid, samlet størrelse og antall filer.
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return [stat.st_mtime, stat.st_size]
+    stats = [os.stat(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names]
+    return [max((s.st_mtime for s in stats), default=0), sum(s.st_size for s in stats), len(stats)]
+
+
+def file_state(path, known=None):
+    """
+    Finner sjekksum, endringstid og størrelse for en fil eller mappe. Sjekksummen regnes bare ut på nytt
+    hvis endringstid eller størrelse er endret siden den kjente tilstanden.
+
+    Args:
+        path (str): Filsti.
+        known (dict, optional): Tidligere tilstand fra et manifest.
+
+    Returns:
+        dict: {"digest", "stat"}, eller None hvis filen ikke finnes.
+    """
+    if not os.path.exists(path):
+        return None
+    stat = _stat(path)
+    if known and known.get("stat") == stat:
+        return known
+    return {"digest": content_digest(path), "stat": stat}
+
+
+def stage_key(input_states, params):
+    """
+    Lager nøkkelen til et trinn ut fra innholdet i inndataene og parameterne.
+
+    Args:
+        input_states (dict): Filsti → tilstand fra file_state.
+        params (dict): Parametere for trinnet, f.eks. terskel, datoer og kolonner.
+
+    Returns:
+        str: Heksadesimal SHA-256-nøkkel.
+    """
+    digests = {path: state and state["digest"] for path, state in input_states.items()}
+    payload = json.dumps([digests, params], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def manifest_file(output):
+    # Manifestet til trinnet som skriver output
+    return f"{output}{MANIFEST_SUFFIX}"
+
+
+def load_manifest(manifest):
+    """
+    Leser et manifest.
+
+    Args:
+        manifest (str): Filsti til manifestet.
+
+    Returns:
+        dict: Manifestet, eller None hvis det mangler eller ikke kan leses.
+    """
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def stage_is_current(manifest, inputs, params, outputs):
+    """
+    Sjekker om et trinn allerede er kjørt med de samme inndataene og parameterne, og at utdataene er urørt siden.
+
+    Args:
+        manifest (str): Filsti til manifestet.
+        inputs (list): Filstier til inndataene.
+        params (dict): Parametere for trinnet.
+        outputs (list): Filstier til utdataene.
+
+    Returns:
+        bool: True hvis trinnet kan hoppes over.
+    """
+    entry = load_manifest(manifest)
+    if entry is None:
+        return False
+
+    input_states = {path: file_state(path, entry["inputs"].get(path)) for path in inputs}
+    if stage_key(input_states, params) != entry["key"]:
+        return False
+    for path in outputs:
+        known = entry["outputs"].get(path)
+        state = file_state(path, known)
+        if state is None or known is None or state["digest"] != known["digest"]:
+            return False
+    return True
+
+
+def record_stage(manifest, stage, inputs, params, outputs):
+    """
+    Skriver manifestet for et trinn som nettopp er kjørt. Manifestet skrives atomisk.
+
+    Args:
+        manifest (str): Filsti til manifestet.
+        stage (str): Navn på trinnet.
+        inputs (list): Filstier til inndataene.
+        params (dict): Parametere for trinnet.
+        outputs (list): Filstier til utdataene.
+    """
+    input_states = {path: file_state(path) for path in inputs}
+    entry = {
+        "stage": stage,
+        "key": stage_key(input_states, params),
+        "params": params,
+        "inputs": input_states,
+        "outputs": {path: file_state(path) for path in outputs},
+        "created": time.time(),
+    }
+    directory = os.path.dirname(manifest)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_file = f"{manifest}.{os.getpid()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False, indent=4, default=str)
+    os.replace(tmp_file, manifest)
@@ -0,0 +1,214 @@
+import errno
+import os
+
+import pandas as pd
+
+# Standardformat for datasett i pipelinen. JSON er fortsatt tilgjengelig som eksportformat.
+DATASET_FORMAT = "parquet"
+
+_EXTENSIONS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".json": "json", ".cube": "cube"}
+
+
+def _save_parquet(df, path):
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+
+
+def _load_parquet(path, columns=None):
+    return pd.read_parquet(path, engine="pyarrow", columns=columns)
+
+
+def _save_arrow(df, path):
+    df.reset_index(drop=True).to_feather(path, compression="zstd")
+
+
+def _load_arrow(path, columns=None):
+    return pd.read_feather(path, columns=columns)
+
+
+def _save_json(df, path):
+    df.to_json(path, orient="records", indent=4, force_ascii=False)
+
+
+def _load_json(path, columns=None):
+    df = pd.read_json(path, orient="records", encoding="utf-8", dtype={"Dato": str})
+    return df if columns is None else df[columns]
+
+
+def _save_cube(df, path):
+    from common.cube import write_cube
+    write_cube(df, path)
+
+
+def _load_cube(path, columns=None):
+    from common.cube import read_cube
+    return read_cube(path, columns=columns)
+
+
+_BACKENDS = {
+    "parquet": (_save_parquet, _load_parquet),
+    "arrow": (_save_arrow, _load_arrow),
+    "json": (_save_json, _load_json),
+    "cube": (_save_cube, _load_cube),
+}
+
+
+def register_backend(name, save, load, extensions=()):
+    """
+    Legger til et nytt lagringsformat.
+
+    Args:
+        name (str): Navn på formatet, f.eks. "csv".
+        save (callable): Funksjon save(df, path).
+        load (callable): Funksjon load(path, columns=None) som returnerer en DataFrame.
+        extensions (tuple): Filendelser som skal gjenkjennes som dette formatet, f.eks. (".csv",).
+    """
+    _BACKENDS[name] = (save, load)
+    for extension in extensions:
+        _EXTENSIONS[extension] = name
+
+
+def detect_format(path, format=None):
+    """
+    Finner lagringsformatet for en fil ut fra filendelsen.
+
+    Args:
+        path (str): Filsti.
+        format (str, optional): Format som overstyrer filendelsen.
+
+    Returns:
+        str: Navn på formatet. Filer uten kjent endelse får DATASET_FORMAT.
+
+    Raises:
+        ValueError: Hvis formatet ikke er registrert.
+    """
+    format = format or _EXTENSIONS.get(os.path.splitext(path)[1].lower(), DATASET_FORMAT)
+    if format not in _BACKENDS:
+        raise ValueError(f"Ukjent lagringsformat: {format}")
+    return format
+
+
+def dataset_path(path, format=None):
+    """
+    Gir filstien til et datasett med filendelsen til ønsket format.
+
+    Args:
+        path (str): Filsti med eller uten endelse, f.eks. "../../data/raw_data/frostAPI_data".
+        format (str, optional): Format. Standard er DATASET_FORMAT.
+
+    Returns:
+        str: Filsti med riktig endelse, f.eks. "../../data/raw_data/frostAPI_data.parquet".
+    """
+    format = format or DATASET_FORMAT
+    extension = next((ext for ext, name in _EXTENSIONS.items() if name == format), f".{format}")
+    root, old_extension = os.path.splitext(path)
+    return (root if old_extension.lower() in _EXTENSIONS else path) + extension
+
+
+def current_copy(copy, source):
+    """
+    Velger en avledet kopi av et datasett, f.eks. kuben, bare når den finnes og ikke er eldre enn kildefilen.
+    Ellers brukes kildefilen, slik at en utdatert kopi aldri leses i stedet for de riktige dataene.
+
+    Args:
+        copy (str): Filsti eller mappe for kopien.
+        source (str): Filsti til kildefilen kopien lages fra.
+
+    Returns:
+        str: copy hvis den er oppdatert, ellers source.
+    """
+    if os.path.exists(copy) and (not os.path.exists(source) or os.path.getmtime(copy) >= os.path.getmtime(source)):
+        return copy
+    return source
+
+
+def apply_schema(df, schema):
+    """
+    Setter kolonnetyper etter et eksplisitt skjema. Kolonner som ikke finnes i datasettet hoppes over,
+    og kolonner som ikke står i skjemaet beholder typen de har.
+
+    Args:
+        df (pd.DataFrame): Datasettet.
+        schema (dict): Kolonnenavn → dtype, f.eks. {"Dato": "object", "Temperatur": "float64"}.
+
+    Returns:
+        pd.DataFrame: Datasettet med kolonnetypene fra skjemaet.
+    """
+    if not schema:
+        return df
+    present = {col: dtype for col, dtype in schema.items() if col in df.columns}
+    return df.astype(present) if present else df
+
+
+def save_dataset(df, path, format=None, schema=None):
+    """
+    Lagrer et datasett. Formatet bestemmes av filendelsen (.parquet, .arrow/.feather, .json eller .cube)
+    eller av format-argumentet. Filen skrives atomisk, slik at lesere aldri ser en halvskrevet fil.
+
+    Args:
+        df (pd.DataFrame): Datasettet som skal lagres.
+        path (str): Filsti.
+        format (str, optional): Format som overstyrer filendelsen.
+        schema (dict, optional): Kolonnetyper som settes før lagring.
+    """
+    format = detect_format(path, format)
+    save, _ = _BACKENDS[format]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if format == "cube":
+        # Kuben er en mappe og skrives atomisk av write_cube
+        save(apply_schema(df, schema), path)
+        return
+
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    try:
+        save(apply_schema(df, schema), tmp_file)
+        if os.path.exists(tmp_file):
+            os.replace(tmp_file, path)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def load_dataset(path, format=None, schema=None, columns=None, compact=False):
+    """
+    Leser et datasett lagret med save_dataset (eller en eksisterende JSON-fil med orient="records").
+
+    Args:
+        path (str): Filsti.
+        format (str, optional): Format som overstyrer filendelsen.
+        schema (dict, optional): Kolonnetyper som settes etter innlesing.
+        columns (list, optional): Kolonner som skal leses. Standard er alle.
+        compact (bool): Om kolonnetypene skal gjøres kompakte etter innlesing (se common/compact.py).
+
+    Returns:
+        pd.DataFrame: Datasettet.
+
+    Raises:
+        FileNotFoundError: Hvis filen ikke finnes.
+        ValueError: Hvis filen ikke kan leses i det angitte formatet.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(errno.ENOENT, "Finner ikke fil", path)
+    _, load = _BACKENDS[detect_format(path, format)]
+    df = apply_schema(load(path, columns), schema)
+    if compact:
+        from common.compact import compact_dtypes
+        df = compact_dtypes(df)
+    return df
+
+
+def export_json(path, json_path=None):
+    """
+    Eksporterer et lagret datasett til JSON (orient="records", indent=4), f.eks. for deling.
+
+    Args:
+        path (str): Filsti til datasettet.
+        json_path (str, optional): Filsti for JSON-filen. Standard er samme navn med endelsen .json.
+
+    Returns:
+        str: Filstien JSON-filen ble lagret under.
+    """
+    json_path = json_path or dataset_path(path, "json")
+    save_dataset(load_dataset(path), json_path, format="json")
+    return json_path
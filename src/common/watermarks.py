@@ -0,0 +1,138 @@
+import json
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from common.storage import load_dataset
+
+# Antall dager et element kan publiseres senere enn de andre før dagene uten måling regnes som hentet
+WATERMARK_LAG_DAYS = 7
+
+
+def watermark_key(*parts):
+    """
+    Lager en nøkkel for et vannmerke av kilde, stasjon, element o.l.
+
+    Args:
+        *parts: Deler av nøkkelen, f.eks. "frost", "SN18700", "mean(air_temperature P1D)".
+
+    Returns:
+        str: Nøkkel på formen "del1|del2|...".
+    """
+    return "|".join(str(part) for part in parts)
+
+
+def load_watermarks(watermark_file):
+    """
+    Leser lagrede vannmerker (siste hentede dato per nøkkel).
+
+    Args:
+        watermark_file (str): Filsti til JSON-filen med vannmerker.
+
+    Returns:
+        dict: Nøkkel → siste dato ('YYYY-MM-DD'). Tom ordbok hvis filen ikke finnes.
+    """
+    if not os.path.exists(watermark_file):
+        return {}
+    try:
+        with open(watermark_file, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except ValueError as e:
+        print(f"Feil ved lesing av vannmerker, starter uten: {e}")
+        return {}
+
+
+def save_watermarks(watermarks, watermark_file):
+    """
+    Lagrer vannmerker atomisk, slik at et avbrutt kall ikke etterlater en halvskrevet fil.
+
+    Args:
+        watermarks (dict): Nøkkel → siste dato ('YYYY-MM-DD').
+        watermark_file (str): Filsti til JSON-filen med vannmerker.
+    """
+    directory = os.path.dirname(watermark_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_file = f"{watermark_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump(dict(sorted(watermarks.items())), file, indent=4, ensure_ascii=False)
+    os.replace(tmp_file, watermark_file)
+
+
+def next_start_date(watermarks, keys, default_start):
+    """
+    Finner første dato som må hentes for at alle nøklene skal bli oppdatert.
+    Mangler en nøkkel vannmerke, brukes default_start.
+
+    Args:
+        watermarks (dict): Nøkkel → siste hentede dato.
+        keys (list): Nøklene som hentes i samme forespørsel.
+        default_start (str): Startdato ('YYYY-MM-DD') når ingenting er hentet fra før.
+
+    Returns:
+        str: Første dato som skal hentes ('YYYY-MM-DD').
+    """
+    starts = []
+    for key in keys:
+        if key not in watermarks:
+            return default_start
+        starts.append(date.fromisoformat(watermarks[key]) + timedelta(days=1))
+    return min(starts).isoformat() if starts else default_start
+
+
+def update_watermarks(watermarks, df, key_columns, date_col="Dato", fetched_to=None, lag_days=WATERMARK_LAG_DAYS):
+    """
+    Flytter vannmerkene frem til siste dato med en faktisk måling i hver kolonne.
+    Skal bare kalles når hele perioden er hentet uten feil, ellers hoppes hull over for godt.
+
+    Args:
+        watermarks (dict): Nøkkel → siste dato. Endres på stedet.
+        df (pd.DataFrame): Nylig hentede data.
+        key_columns (dict): Nøkkel → kolonnenavn i df med målingene for nøkkelen.
+        date_col (str): Navnet på datokolonnen.
+        fetched_to (str, optional): Siste dato ('YYYY-MM-DD') i perioden som ble hentet. Nøkler uten noen
+            måling i df flyttes til lag_days dager før denne datoen hvis vannmerket er eldre enn det, slik at
+            et element stasjonen ikke måler (lenger) ikke holder neste startdato tilbake. Uten fetched_to
+            står slike nøkler urørt.
+        lag_days (int): Hvor mange dager et element kan komme senere enn de andre. Dager innenfor denne
+            grensen hentes på nytt til målingene er publisert, så et forsinket element ikke mister dager.
+
+    Returns:
+        dict: De oppdaterte vannmerkene.
+    """
+    dates = pd.to_datetime(df[date_col]) if date_col in df.columns else pd.Series(dtype="datetime64[ns]")
+    settled = (date.fromisoformat(fetched_to[:10]) - timedelta(days=lag_days)).isoformat() if fetched_to else None
+    for key, col in key_columns.items():
+        measured = dates[df[col].notna()] if col in df.columns else dates.iloc[:0]
+        if not measured.empty:
+            latest = measured.max().date().isoformat()
+        elif settled:
+            latest = settled
+        else:
+            continue
+        if key not in watermarks or latest > watermarks[key]:
+            watermarks[key] = latest
+    return watermarks
+
+
+def merge_into_store(store_file, new_df, key_cols):
+    """
+    Slår nye rader sammen med eksisterende rådata-fil. Ved overlapp vinner de nye radene.
+
+    Args:
+        store_file (str): Filsti til eksisterende rådata (Parquet, Arrow eller JSON).
+        new_df (pd.DataFrame): Nye rader.
+        key_cols (list): Kolonner som identifiserer en rad, f.eks. ["Dato", "Stasjon"].
+
+    Returns:
+        pd.DataFrame: Sammenslått og sortert DataFrame.
+    """
+    if os.path.exists(store_file):
+        existing = load_dataset(store_file)
+        combined = pd.concat([existing, new_df], ignore_index=True)
+    else:
+        combined = new_df
+
+    combined = combined.drop_duplicates(subset=key_cols, keep="last")
+    return combined.sort_values(key_cols).reset_index(drop=True)
@@ -1,23 +1,15 @@
-import requests
 import pandas as pd
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from scipy.stats import pearsonr
-from sklearn.preprocessing import PowerTransformer
-import seaborn as sns
-from sklearn.preprocessing import PowerTransformer, StandardScaler
-import missingno as msno
-from sklearn.preprocessing import LabelEncoder
+from common.storage import load_dataset
 
 
 def analyse_skewness(clean_data_file, cols=None):
     """
-    Leser data fra JSON og skriver ut skjevhet for kolonner.
+    Leser datasett (Parquet, Arrow eller JSON) og skriver ut skjevhet for kolonner.
 
     Args:
-        clean_data_file (str): Filsti for input-data (renset).
+        clean_data_file (str or pd.DataFrame): Filsti for input-data (renset), eller rensede data fra forrige trinn i minnet.
         cols (list): Kolonner som skal analyseres. Hvis None, analyseres alle numeriske.
     
     Returns:
@@ -25,7 +17,7 @@ def analyse_skewness(clean_data_file, cols=None):
         list: Liste over kolonner som analyseres.
     """
     try:
-        df = pd.read_json(clean_data_file, orient="records", encoding="utf-8")
+        df = clean_data_file if isinstance(clean_data_file, pd.DataFrame) else load_dataset(clean_data_file)
     except (ValueError, FileNotFoundError) as e:
         print(f"Feil ved lesing av fil: {e}")
         return None, None
@@ -54,6 +46,9 @@ def fix_skewness(df, threshold, cols):
     Returns:
         pd.DataFrame: Transformert DataFrame.
     """
+    # scikit-learn importeres først når transformasjonen kjøres
+    from sklearn.preprocessing import PowerTransformer, StandardScaler
+
     yeo_transformer = PowerTransformer(method='yeo-johnson')
     scaler = StandardScaler()
 
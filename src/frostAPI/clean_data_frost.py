@@ -1,15 +1,9 @@
-import requests
 import pandas as pd
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from scipy.stats import pearsonr
-from sklearn.preprocessing import PowerTransformer
-import seaborn as sns
-from sklearn.preprocessing import PowerTransformer, StandardScaler
-import missingno as msno
-from sklearn.preprocessing import LabelEncoder
+from common.storage import save_dataset, load_dataset
+from common.gap_fill import fill_gaps
+from common.diagnostics import record, show_plot
 
 
 def calculate_outlier_limits(df, variable, threshold=3):
@@ -34,6 +28,7 @@ def calculate_outlier_limits(df, variable, threshold=3):
 def plot_outlier_distribution(df, variable, lower_limit, upper_limit):
     """
     Plotter distribusjonen til en variabel med markerte outlier-grenser.
+    Figuren vises, lagres eller utsettes etter modusen i common/diagnostics.py.
 
     Args:
         df (pd.DataFrame): DataFrame med data.
@@ -41,6 +36,12 @@ def plot_outlier_distribution(df, variable, lower_limit, upper_limit):
         lower_limit (float): Nedre grense for outlier.
         upper_limit (float): Øvre grense for outlier.
     """
+    show_plot(f"fordeling_{variable}", _draw_outlier_distribution, df, variable, lower_limit, upper_limit)
+
+
+def _draw_outlier_distribution(df, variable, lower_limit, upper_limit):
+    import seaborn as sns
+
     plot = sns.displot(data=df, x=variable, kde=True)
     plot.set(title=f"Distribusjon av {variable}", xlabel=variable)
 
@@ -49,27 +50,56 @@ def plot_outlier_distribution(df, variable, lower_limit, upper_limit):
         ax.axvline(upper_limit, color='r', linestyle='--', label='Upper Limit')
         ax.legend()
 
-    plt.show()
+
+def missing_value_summary(df):
+    """
+    Teller manglende verdier per kolonne, som data i stedet for en figur.
+
+    Args:
+        df (pd.DataFrame): DataFrame som skal sjekkes.
+
+    Returns:
+        pd.DataFrame: Én rad per kolonne med Kolonne, Mangler (antall) og Andel (0–1).
+    """
+    missing = df.isna().sum()
+    return pd.DataFrame({
+        "Kolonne": missing.index,
+        "Mangler": missing.to_numpy(),
+        "Andel": missing.to_numpy() / len(df) if len(df) else 0.0,
+    })
 
 
 def visualize_missing_data_missingno(df_or_path):
     """
-    Visualiserer manglende verdier i værdata med missingno.
+    Visualiserer manglende verdier i værdata med missingno. Antall manglende verdier per kolonne
+    lagres også som diagnostikk ("manglende"), og figuren vises, lagres eller utsettes etter
+    modusen i common/diagnostics.py.
 
     Args:
-        df_or_path (str eller pd.DataFrame): Filsti til JSON-data ELLER en DataFrame.
+        df_or_path (str eller pd.DataFrame): Filsti til datasett (Parquet, Arrow eller JSON) ELLER en DataFrame.
+
+    Returns:
+        pd.DataFrame: Manglende verdier per kolonne (se missing_value_summary).
     """
     if isinstance(df_or_path, str):
-        df = pd.read_json(df_or_path, orient="records", encoding="utf-8")
+        df = load_dataset(df_or_path)
     elif isinstance(df_or_path, pd.DataFrame):
         df = df_or_path.copy()
     else:
         raise ValueError("Input må være en filsti (str) eller en pandas DataFrame.")
 
+    summary = missing_value_summary(df)
+    record("manglende", summary)
+    show_plot("manglende_data", _draw_missing_matrix, df)
+    return summary
+
+
+def _draw_missing_matrix(df):
+    import matplotlib.pyplot as plt
+    import missingno as msno
 
     msno.matrix(df)
     plt.title("Visualisering av manglende data (missingno.matrix)")
-    plt.show()
 
     
 
@@ -114,66 +144,69 @@ def remove_duplicate_dates(df, subset):
 
 
 def label_station(df):
-    # Label encoding
+    # Label encoding, med minste heltallstype som rommer etikettene
+    from sklearn.preprocessing import LabelEncoder
     encoder = LabelEncoder()
-    df["Stasjon"] = encoder.fit_transform(df["Stasjon"]).astype(int)
+    df["Stasjon"] = pd.to_numeric(encoder.fit_transform(df["Stasjon"]), downcast="integer")
     return df
 
 
 def analyze_and_plot_outliers(df, variables, threshold=3):
     """
     Analyserer outlier-grenser for gitte variabler og plotter resultatene.
+    Grensene og antall outliers lagres også som diagnostikk ("outliers").
 
     Args:
         df (pd.DataFrame): Datasettet.
         variables (list): Liste over kolonnenavn som skal analyseres.
         threshold (float): Antall standardavvik som definerer outlier.
+
+    Returns:
+        pd.DataFrame: Én rad per variabel med Kolonne, Outliers, Gjennomsnitt, Standardavvik, Nedre og Øvre.
     """
+    rows = []
     for var in variables:
         lower_limit, upper_limit = calculate_outlier_limits(df, var, threshold)
         outliers = df[df[var].notna() & ~df[var].between(lower_limit, upper_limit)]
         print(f"\nOutliers for {var}: {outliers.shape[0]}")
+        rows.append({"Kolonne": var, "Outliers": outliers.shape[0], "Gjennomsnitt": df[var].mean(),
+                     "Standardavvik": df[var].std(), "Nedre": lower_limit, "Øvre": upper_limit})
 
         plot_outlier_distribution(df, var, lower_limit, upper_limit)
 
+    summary = pd.DataFrame(rows, columns=["Kolonne", "Outliers", "Gjennomsnitt", "Standardavvik", "Nedre", "Øvre"])
+    record("outliers", summary)
+    return summary
 
-def interpolate_data(pivot_df, from_date, to_date, interpolate_columns):
+
+def interpolate_data(pivot_df, from_date, to_date, interpolate_columns, max_gap=None):
     """
-    Setter verdiene som mangler målinger til Nan, og interpolerer alle NaN-verdier med linær metode. 
-    Lagre den rensede dataen som en JSON-fil.
+    Legger dataene på et fullt rutenett med én rad per stasjon og dag fra from_date til to_date, og fyller
+    manglende verdier lineært innenfor hver stasjon (common/gap_fill.py). Alle kolonnene fylles samtidig, og
+    fylte verdier markeres i "Interpolert_<kolonne>".
 
     Args:
-        pivot_df (pd.DataFrame): DataFrame med værdata med fjernet outliers.
-        clean_data_file (str): Filsti for lagring av renset data.
+        pivot_df (pd.DataFrame): DataFrame med værdata med fjernet outliers, med én eller flere stasjoner.
         from_date (str): Startdato for interpolering i formatet 'YYYY-MM-DD'.
         to_date (str): Sluttdato for interpolering i formatet 'YYYY-MM-DD'.
+        interpolate_columns (list): Kolonnene som skal interpoleres.
+        max_gap (int, optional): Lengste hull (antall dager på rad) som fylles. Standard er alle hull.
 
+    Returns:
+        pd.DataFrame: Dataene sortert på stasjon og dato, med Dato som 'YYYY-MM-DD'.
     """
-    # Konverterer datoer
-    all_dates = pd.date_range(start=from_date, end=to_date).strftime('%Y-%m-%d')
-    pivot_df["Dato"] = pd.to_datetime(pivot_df["Dato"])
-
-    pivot_df.set_index("Dato", inplace=True)
-    pivot_df = pivot_df.reindex(all_dates)
-    pivot_df.reset_index(inplace=True)
-    pivot_df.rename(columns={"index": "Dato"}, inplace=True)
+    filled = fill_gaps(pivot_df, interpolate_columns, from_date, to_date, max_gap=max_gap)
+    filled["Dato"] = filled["Dato"].dt.strftime('%Y-%m-%d')
 
     print("\nInterpolering av NaN-verdier:")
     for col in interpolate_columns:
         if col in pivot_df.columns:
-            interpolated_mask = pivot_df[col].isna()
-            null_values = pivot_df[col].isna().sum()
-            pivot_df[col] = pivot_df[col].interpolate(method='linear')
-
-            interpolated_col_name = f"Interpolert_{col}"
-            pivot_df[interpolated_col_name] = interpolated_mask.fillna(False)
-
-            print(f"{col}: {null_values} verdier ble interpolert")
-    return pivot_df
+            print(f"{col}: {filled[f'Interpolert_{col}'].sum()} verdier ble interpolert")
+    return filled
 
 def save_data_json(pivot_df, data_file):
-    """Lagrer data som en JSON-fil."""
+    """Lagrer data i formatet gitt av filendelsen (.parquet, .arrow eller .json)."""
 
-    pivot_df.to_json(data_file, orient="records", indent=4, force_ascii=False)
+    save_dataset(pivot_df, data_file)
     print(f"\nGruppert data er lagret under {data_file}")
 
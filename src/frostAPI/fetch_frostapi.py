@@ -1,18 +1,38 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from operator import itemgetter
 import pandas as pd
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from scipy.stats import pearsonr
-from sklearn.preprocessing import PowerTransformer
-import seaborn as sns
-from sklearn.preprocessing import PowerTransformer, StandardScaler
-import missingno as msno
-from sklearn.preprocessing import LabelEncoder
+from common.http_client import http_get, IncompleteFetchError
+from common.storage import save_dataset, apply_schema
 
+FROST_VALUE_COLUMNS = ["Nedbør", "Temperatur", "Vindhastighet"]
 
-def get_info_frostAPI(endpoint, parameters, client_id):
+
+def frost_schema(value_columns=FROST_VALUE_COLUMNS):
+    """
+    Lager de eksplisitte kolonnetypene for Frost-datasettene (rå, renset og analysert).
+
+    Args:
+        value_columns (list): Kolonnenavnene for måleverdiene.
+
+    Returns:
+        dict: Kolonnenavn → dtype.
+    """
+    return {
+        "Dato": "object",
+        **{col: "float64" for col in value_columns},
+        **{f"Interpolert_{col}": "bool" for col in value_columns},
+    }
+
+
+# Kolonnetypene for standardelementene. Med andre elementer brukes frost_schema(value_columns).
+FROST_SCHEMA = frost_schema()
+
+
+def get_info_frostAPI(endpoint, parameters, client_id, verbose=True):
     """
     Henter informasjon fra Frost API og printer ID og navn for hvert element.
 
@@ -20,12 +40,13 @@ def get_info_frostAPI(endpoint, parameters, client_id):
         endpoint (str): API-endepunktet.
         parameters (dict or None): Parametere for API-kallet.
         client_id (str): Client ID for autentisering.
+        verbose (bool): Om ID og navn skal skrives ut for hvert element.
 
     Returns:
         list or None: Liste med hentet data, eller None ved feil.
     """
     try:
-        response = requests.get(endpoint, params=parameters or {}, auth=(client_id, ''))
+        response = http_get(endpoint, params=parameters or {}, auth=(client_id, ''))
         response.raise_for_status()
         data = response.json()
     except requests.RequestException as e:
@@ -36,8 +57,9 @@ def get_info_frostAPI(endpoint, parameters, client_id):
         return None
 
     elements = data.get("data", [])
-    for element in elements:
-        print(f"ID: {element['id']}, Navn: {element.get('name', 'Ingen navn')}")
+    if verbose:
+        for element in elements:
+            print(f"ID: {element['id']}, Navn: {element.get('name', 'Ingen navn')}")
     
     return elements
 
@@ -55,7 +77,7 @@ def fetch_data_from_frostAPI(endpoint, parameters, client_id):
         list: Liste med data fra API-et, eller en tom liste hvis noe går galt.
     """
     try:
-        response = requests.get(endpoint, params=parameters, auth=(client_id, ""))
+        response = http_get(endpoint, params=parameters, auth=(client_id, ""))
         response.raise_for_status()  # Kaster exception hvis status != 200
         return response.json().get("data", [])
     
@@ -68,6 +90,104 @@ def fetch_data_from_frostAPI(endpoint, parameters, client_id):
         return []
     
 
+def split_reference_time(referencetime, window_days=365):
+    """
+    Deler et referencetime-intervall på formen 'YYYY-MM-DD/YYYY-MM-DD' i sammenhengende vinduer.
+    Sluttdatoen i hvert vindu er eksklusiv, slik som i Frost API, så vinduene overlapper ikke.
+
+    Args:
+        referencetime (str): Tidsintervall for hele hentingen, f.eks. "2010-04-02/2016-12-31".
+        window_days (int): Antall dager per vindu.
+
+    Returns:
+        list: Liste med referencetime-strenger, ett per vindu, i kronologisk rekkefølge.
+    """
+    if window_days < 1:
+        raise ValueError("window_days må være minst 1.")
+
+    start_str, end_str = referencetime.split("/")
+    start = date.fromisoformat(start_str[:10])
+    end = date.fromisoformat(end_str[:10])
+    if end <= start:
+        raise ValueError(f"Ugyldig tidsintervall: {referencetime}")
+
+    windows = []
+    while start < end:
+        window_end = min(start + timedelta(days=window_days), end)
+        windows.append(f"{start.isoformat()}/{window_end.isoformat()}")
+        start = window_end
+    return windows
+
+
+def fetch_window_frostAPI(endpoint, parameters, client_id, retries=2):
+    """
+    Henter ett tidsvindu fra Frost API. Nye forsøk ved midlertidige feil håndteres av HTTP-klienten.
+    Et vindu uten data (HTTP 404 fra Frost) regnes som tomt, ikke som feil.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        parameters (dict): Parametere for API-kallet, inkludert referencetime for vinduet.
+        client_id (str): Client ID for autentisering.
+        retries (int): Antall nye forsøk etter første feilede forespørsel.
+
+    Returns:
+        list: Liste med data for vinduet.
+
+    Raises:
+        requests.RequestException: Hvis alle forsøk feiler.
+        ValueError: Hvis responsen ikke er gyldig JSON.
+    """
+    response = http_get(endpoint, params=parameters, auth=(client_id, ""), max_retries=retries)
+    if response.status_code == 404:
+        return []
+    response.raise_for_status()
+    return response.json().get("data", [])
+
+
+def fetch_data_parallel_frostAPI(endpoint, parameters, client_id, window_days=365, max_workers=4, retries=2):
+    """
+    Henter rådata fra Frost API ved å dele referencetime i vinduer som hentes samtidig.
+    Resultatene settes sammen i kronologisk rekkefølge, slik at de tilsvarer én samlet henting.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        parameters (dict): Parametere for API-kallet. Må inneholde "referencetime".
+        client_id (str): Client ID for autentisering.
+        window_days (int): Antall dager per vindu.
+        max_workers (int): Maks antall samtidige forespørsler.
+        retries (int): Antall nye forsøk per vindu ved feil.
+
+    Returns:
+        list: Liste med data fra API-et.
+
+    Raises:
+        IncompleteFetchError: Hvis ett eller flere vinduer feiler etter alle forsøk. Feilede vinduer ligger i
+            failed, og dataene fra de andre vinduene i data. Dataene er ufullstendige og skal ikke lagres.
+    """
+    windows = split_reference_time(parameters["referencetime"], window_days)
+
+    def fetch(window):
+        window_parameters = {**parameters, "referencetime": window}
+        try:
+            return fetch_window_frostAPI(endpoint, window_parameters, client_id, retries)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Feil ved henting av vindu {window} fra Frost API:\n→ {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(fetch, windows))
+
+    data = []
+    for result in results:
+        if result:
+            data.extend(result)
+
+    failed = [window for window, result in zip(windows, results) if result is None]
+    if failed:
+        raise IncompleteFetchError(f"{len(failed)} av {len(windows)} vinduer feilet: {failed}", failed, data)
+    return data
+
+
 def process_weather_data(data, elements):
     """
     Prosesserer rådata fra Frost API til en liste med dictionaries.
@@ -95,26 +215,151 @@ def process_weather_data(data, elements):
     return målinger
 
 
-def save_data_as_json(data, file, index_columns, value_columns, aggfunc="mean"):
+def process_weather_data_columnar(data, elements):
     """
-    Lagrer data som JSON-fil med fleksible kolonner og aggregeringsfunksjon.
+    Prosesserer rådata fra Frost API til kolonner (NumPy-arrays) i stedet for én dict per rad.
+    Gir samme innhold som process_weather_data: manglende elementer blir NaN, og hvis samme
+    element forekommer flere ganger i én observasjon, er det siste verdien som gjelder.
 
     Args:
-        data (list): Liste med prosesserte data.
-        file (str): Filsti for lagring av data.
+        data (list): Liste med rådata fra API-et.
+        elements (dict): Mapping av elementId til kolonnenavn.
+
+    Returns:
+        dict: Kolonnenavn → np.ndarray med "Dato", "Stasjon" og én kolonne per element som forekommer.
+    """
+    names = list(dict.fromkeys(name for element_id, name in elements.items() if element_id != "sourceId"))
+    buffers = {name: [np.nan] * len(data) for name in names}
+    lookup = {element_id: buffers[name] for element_id, name in elements.items() if element_id != "sourceId"}.get
+
+    # Én gjennomgang: hver verdi skrives rett på sin rad i elementets buffer, så siste verdi vinner
+    for row, måling in enumerate(data):
+        for observasjon in måling.get("observations", ()):
+            buffer = lookup(observasjon["elementId"])
+            if buffer is not None:
+                buffer[row] = observasjon["value"]
+
+    columns = {
+        "Dato": np.array([måling["referenceTime"][:10] for måling in data], dtype=object),
+        "Stasjon": np.array(list(map(itemgetter("sourceId"), data)), dtype=object),
+    }
+    for name in names:
+        values = np.array(buffers[name], dtype=np.float64)
+        if not np.isnan(values).all():
+            columns[name] = values
+    return columns
+
+
+def aggregate_mean_columns(columns, index_columns, value_columns):
+    """
+    Beregner gjennomsnitt per unik kombinasjon av indekskolonnene med grupperte reduksjoner
+    (np.bincount). Gir samme resultat som pivot_table(aggfunc="mean").reset_index():
+    sortert indeks, verdikolonner i alfabetisk rekkefølge og uten rader der alle verdier mangler.
+
+    Args:
+        columns (dict or pd.DataFrame): Kolonnenavn → verdier.
+        index_columns (list): Kolonner som definerer en gruppe, f.eks. ["Dato", "Stasjon"].
+        value_columns (list): Kolonner som skal aggregeres.
+
+    Returns:
+        pd.DataFrame: Aggregert tabell med indekskolonnene som vanlige kolonner.
+
+    Raises:
+        KeyError: Hvis en av kolonnene mangler.
+    """
+    for col in list(index_columns) + list(value_columns):
+        if col not in columns:
+            raise KeyError(col)
+
+    # Kombinerer sorterte koder for hver indekskolonne til én gruppenøkkel
+    key = np.zeros(len(columns[index_columns[0]]), dtype=np.int64)
+    valid = np.ones(len(key), dtype=bool)
+    uniques = []
+    for col in index_columns:
+        codes, labels = pd.factorize(np.asarray(columns[col]), sort=True)
+        valid &= codes >= 0
+        key = key * max(len(labels), 1) + codes
+        uniques.append(labels)
+
+    key = key[valid]
+    key_space = int(key.max()) + 1 if len(key) else 0
+    if key_space <= 4 * len(key):
+        # Tett nøkkelrom (vanlig for dato x stasjon): gruppering i lineær tid uten sortering
+        occupied = np.bincount(key, minlength=key_space) > 0
+        groups = np.flatnonzero(occupied)
+        group_of_row = (np.cumsum(occupied) - 1)[key]
+    else:
+        groups, group_of_row = np.unique(key, return_inverse=True)
+    n_groups = len(groups)
+
+    result = {}
+    remainder = groups
+    for col, labels in reversed(list(zip(index_columns, uniques))):
+        size = max(len(labels), 1)
+        result[col] = np.asarray(labels)[remainder % size] if n_groups else np.asarray(labels)[:0]
+        remainder = remainder // size
+    result = {col: result[col] for col in index_columns}
+
+    any_value = np.zeros(n_groups, dtype=bool)
+    for col in sorted(value_columns):
+        values = np.asarray(columns[col], dtype=np.float64)[valid]
+        measured = ~np.isnan(values)
+        sums = np.bincount(group_of_row[measured], weights=values[measured], minlength=n_groups)
+        counts = np.bincount(group_of_row[measured], minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[col] = np.where(counts > 0, sums / counts, np.nan)
+        any_value |= counts > 0
+
+    df = pd.DataFrame(result)
+    return df[any_value].reset_index(drop=True)
+
+
+def pivot_weather_data(data, index_columns, value_columns, aggfunc="mean"):
+    """
+    Gjør prosesserte værdata om til en pivot-tabell med én rad per indeks.
+
+    Args:
+        data (list, dict or pd.DataFrame): Liste med prosesserte data, eller kolonner fra
+            process_weather_data_columnar / en DataFrame. Kolonner med aggfunc="mean" går via
+            den vektoriserte aggregate_mean_columns.
         index_columns (list): Kolonner som skal brukes som indeks i pivot-tabellen.
         value_columns (list): Kolonner som skal aggregeres.
         aggfunc (str or function): Aggregeringsfunksjon (f.eks. "mean", "sum").
+
+    Returns:
+        pd.DataFrame: Pivot-tabell med indekskolonnene som vanlige kolonner.
     """
+    if aggfunc == "mean" and not isinstance(data, list):
+        return aggregate_mean_columns(data, index_columns, value_columns)
 
     df = pd.DataFrame(data)
-    
-    pivot_df = df.pivot_table(
-        index=index_columns,  
-        values=value_columns,  
-        aggfunc=aggfunc       
+
+    return df.pivot_table(
+        index=index_columns,
+        values=value_columns,
+        aggfunc=aggfunc
     ).reset_index()
+
+
+def save_data_as_json(data, file, index_columns, value_columns, aggfunc="mean"):
+    """
+    Lagrer data som pivot-tabell med fleksible kolonner og aggregeringsfunksjon.
+    Formatet bestemmes av filendelsen (.parquet, .arrow eller .json).
+
+    Args:
+        data (list, dict or pd.DataFrame): Liste med prosesserte data, eller kolonner fra
+            process_weather_data_columnar / en DataFrame.
+        file (str): Filsti for lagring av data.
+        index_columns (list): Kolonner som skal brukes som indeks i pivot-tabellen.
+        value_columns (list): Kolonner som skal aggregeres.
+        aggfunc (str or function): Aggregeringsfunksjon (f.eks. "mean", "sum").
+
+    Returns:
+        pd.DataFrame: Pivot-tabellen med kolonnetypene fra frost_schema, slik den ble lagret.
+    """
+
+    pivot_df = apply_schema(pivot_weather_data(data, index_columns, value_columns, aggfunc), frost_schema(value_columns))
     
-    # Lagre pivot-tabellen som en JSON-fil
-    pivot_df.to_json(file, orient="records", indent=4, force_ascii=False)
-    print(f"Gruppert data er lagret under {file}")
\ No newline at end of file
+    save_dataset(pivot_df, file)
+    print(f"Gruppert data er lagret under {file}")
+    return pivot_df
\ No newline at end of file
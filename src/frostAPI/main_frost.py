@@ -1,39 +1,160 @@
-import requests
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 import pandas as pd
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from scipy.stats import pearsonr
-from sklearn.preprocessing import PowerTransformer
-import seaborn as sns
-from sklearn.preprocessing import PowerTransformer, StandardScaler
-import missingno as msno
-from sklearn.preprocessing import LabelEncoder
-from .fetch_frostapi import get_info_frostAPI, fetch_data_from_frostAPI, process_weather_data, save_data_as_json
-from .clean_data_frost import print_duplicate_rows, remove_duplicate_dates, interpolate_data, save_data_json, analyze_and_plot_outliers
+from .fetch_frostapi import get_info_frostAPI, fetch_data_from_frostAPI, fetch_window_frostAPI, fetch_data_parallel_frostAPI, process_weather_data_columnar, pivot_weather_data, save_data_as_json, frost_schema
+from .clean_data_frost import print_duplicate_rows, remove_duplicate_dates, interpolate_data, save_data_json, analyze_and_plot_outliers, visualize_missing_data_missingno, label_station
 from .analyze_data_frost import analyse_skewness, fix_skewness
-from .visualization_frost import calculate_seasonal_stats, plot_seasonal_bars
+from .visualization_frost import calculate_seasonal_stats, seasonal_stats_from_rollup, plot_seasonal_bars
+from .stream_frostapi import stream_data_from_frostAPI, columns_to_dataframe
+from common.disk_cache import cache_get, cache_set, invalidate_cache
+from common.storage import dataset_path, save_dataset, load_dataset, current_copy, apply_schema
+from common.partitions import write_partitions
+from common.compact import memory_report
+from common.stage_cache import manifest_file, stage_is_current, record_stage
+from common.http_client import IncompleteFetchError
+from common.watermarks import watermark_key, load_watermarks, save_watermarks, next_start_date, update_watermarks, merge_into_store, WATERMARK_LAG_DAYS
+from SQL.sql_analysis import frost_clean_table
+from SQL.rollups import lookup_rollup
+
+FROST_OBSERVATIONS_ENDPOINT = "https://frost.met.no/observations/v0.jsonld"
+FROST_RAW_FILE = dataset_path("../../data/raw_data/frostAPI_data")
+FROST_CLEAN_FILE = dataset_path("../../data/clean_data/frostAPI_clean_data")
+FROST_ANALYZED_FILE = dataset_path("../../data/analyzed_data/frostAPI_analyzed_data")
+# Minnekartlagt kube (stasjon × dag) med de rensede dataene, for rask innlesing i notatbøker og analyser
+FROST_CLEAN_CUBE = dataset_path("../../data/clean_data/frostAPI_clean_data", "cube")
+# Samme datasett delt opp per stasjon og år (<mappe>/<stasjon>/<år>), for lesing av utvalgte perioder
+FROST_CLEAN_PARTITIONS = "../../data/clean_data/frostAPI"
+FROST_ANALYZED_PARTITIONS = "../../data/analyzed_data/frostAPI"
+# Stasjonskode (fra label_station) → stasjons-ID, slik at partisjonene kan navngis etter ID-en
+FROST_STATION_LABELS = "../../data/clean_data/frostAPI_stasjoner.json"
+FROST_ELEMENTS = {
+    "mean(air_temperature P1D)": "Temperatur",
+    "sum(precipitation_amount P1D)": "Nedbør",
+    "mean(wind_speed P1D)": "Vindhastighet",
+    "sourceId": "Stasjon"
+}
+# Stasjonen og perioden standardkjøringen gjelder. Batchkjøringer (combined/batch.py) setter disse per jobb.
+FROST_SOURCE = "SN18700"
+FROST_FROM_DATE = "2010-04-02"
+FROST_TO_DATE = "2016-12-31"
+FROST_SKEW_THRESHOLD = 1.0
+# Metode og vindu for outlier-grensene, se common/outliers.py. "climatology" sammenligner med samme tid på året.
+FROST_OUTLIER_METHOD = "global"
+FROST_OUTLIER_WINDOW = 31
+# Lengste hull (dager på rad) som interpoleres. None fyller alle hull.
+FROST_MAX_GAP = None
+# Vannmerkene for inkrementell henting (se common/watermarks.py)
+FROST_WATERMARK_FILE = "../../data/raw_data/watermarks.json"
+METADATA_CACHE_DIR = "../../data/cache/frostAPI"
+METADATA_CACHE_TTL = 7 * 24 * 3600  # Element- og stasjonskatalogene endres sjelden
+
+
+def element_record(element):
+    """
+    Gjør et element fra /elements/v0.jsonld om til en flat oppføring.
+
+    Args:
+        element (dict): Element fra Frost API.
+
+    Returns:
+        dict: Oppføring med id, navn, enhet, kategori og beskrivelse.
+    """
+    return {
+        "id": element.get("id"),
+        "navn": element.get("name"),
+        "enhet": element.get("unit"),
+        "kategori": element.get("category"),
+        "beskrivelse": element.get("description"),
+    }
+
+
+def station_record(station):
+    """
+    Gjør en kilde fra /sources/v0.jsonld om til en flat oppføring.
+
+    Args:
+        station (dict): Stasjon fra Frost API.
+
+    Returns:
+        dict: Oppføring med id, navn, koordinater, høyde over havet, kommune og startdato.
+    """
+    coordinates = (station.get("geometry") or {}).get("coordinates") or [None, None]
+    return {
+        "id": station.get("id"),
+        "navn": station.get("name"),
+        "lengdegrad": coordinates[0],
+        "breddegrad": coordinates[1],
+        "moh": station.get("masl"),
+        "kommune": station.get("municipality"),
+        "gyldig_fra": station.get("validFrom"),
+    }
+
+
+def get_metadata_frostAPI(endpoint, parameters, client_id, to_record, use_cache=True,
+                          ttl=METADATA_CACHE_TTL, cache_dir=METADATA_CACHE_DIR):
+    """
+    Henter metadata fra Frost API som strukturerte oppføringer, via et lokalt diskbuffer med utløpstid.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        parameters (dict or None): Parametere for API-kallet.
+        client_id (str): Client ID for autentisering.
+        to_record (function): Funksjon som gjør ett element fra API-et om til en oppføring.
+        use_cache (bool): Om bufferet skal brukes.
+        ttl (float): Maks alder på bufrede svar i sekunder.
+        cache_dir (str): Mappe for bufrede svar.
+
+    Returns:
+        list: Liste med oppføringer (dict), tom liste ved feil.
+    """
+    if use_cache:
+        records = cache_get(endpoint, parameters, ttl, cache_dir)
+        if records is not None:
+            return records
 
+    elements = get_info_frostAPI(endpoint, parameters, client_id, verbose=False)
+    records = [to_record(element) for element in elements or []]
 
-def get_elements_frostAPI(client_id):
+    if use_cache and records:
+        cache_set(endpoint, parameters, records, cache_dir)
+    return records
+
+
+def get_elements_frostAPI(client_id, use_cache=True, ttl=METADATA_CACHE_TTL, cache_dir=METADATA_CACHE_DIR):
     """
     Bruker get_info_frostAPI til å hente elementer fra Frost API.
+    Svaret bufres på disk, så gjentatte oppslag ikke går mot API-et.
 
     Args:
         client_id (str): Client ID for autentisering.
+        use_cache (bool): Om bufferet skal brukes.
+        ttl (float): Maks alder på bufrede svar i sekunder.
+        cache_dir (str): Mappe for bufrede svar.
+
+    Returns:
+        list: Liste med elementer som oppføringer (se element_record).
     """
     parameters = None
     endpoint = 'https://frost.met.no/elements/v0.jsonld'
-    get_info_frostAPI(endpoint, parameters, client_id)
+    return get_metadata_frostAPI(endpoint, parameters, client_id, element_record, use_cache, ttl, cache_dir)
 
 
-def get_stations_frostAPI(client_id):
+def get_stations_frostAPI(client_id, use_cache=True, ttl=METADATA_CACHE_TTL, cache_dir=METADATA_CACHE_DIR):
     """
     Bruker get_info_frostAPI til å hente stasjoner fra Frost API.
+    Svaret bufres på disk, så gjentatte oppslag ikke går mot API-et.
 
     Args:
         client_id (str): Client ID for autentisering.
+        use_cache (bool): Om bufferet skal brukes.
+        ttl (float): Maks alder på bufrede svar i sekunder.
+        cache_dir (str): Mappe for bufrede svar.
+
+    Returns:
+        list: Liste med stasjoner som oppføringer (se station_record).
     """
     
     parameters = {
@@ -42,78 +163,347 @@ def get_stations_frostAPI(client_id):
     }
 
     endpoint = 'https://frost.met.no/sources/v0.jsonld'
-    get_info_frostAPI(endpoint, parameters, client_id)
+    return get_metadata_frostAPI(endpoint, parameters, client_id, station_record, use_cache, ttl, cache_dir)
+
+
+def invalidate_metadata_cache_frostAPI(cache_dir=METADATA_CACHE_DIR):
+    """
+    Tømmer diskbufferet for Frost-metadata, slik at neste oppslag henter fra API-et.
+
+    Args:
+        cache_dir (str): Mappe for bufrede svar.
 
-def data_frostAPI(client_id):
+    Returns:
+        int: Antall slettede oppføringer.
+    """
+    return invalidate_cache(cache_dir)
+
+def data_frostAPI(client_id, window_days=None, max_workers=4, stream=False, save=True):
     """
     Henter, prosesserer og lagrer værdata fra Frost API.
 
     Argumenter:
         client_id (str): En streng som representerer klient-ID-en som brukes for autentisering mot Frost API.
+        window_days (int, optional): Hvis satt, deles perioden i vinduer på så mange dager som hentes parallelt.
+        max_workers (int): Maks antall samtidige forespørsler ved parallell henting.
+        stream (bool): Om responsen skal leses som en strøm rett inn i kolonnebuffere (lavere minnebruk).
+            Kan ikke kombineres med window_days.
+        save (bool): Om rådataene skal lagres (FROST_RAW_FILE). Med False returneres de bare.
 
     Returnerer:
-        list: Liste med prosesserte værdata, eller None hvis ingen data ble hentet.
+        pd.DataFrame: Rådataene gruppert på dato og stasjon, eller None hvis ingen data ble hentet
+            eller noen av vinduene feilet.
+
+    Raises:
+        ValueError: Hvis både stream og window_days er satt.
     """
+    if stream and window_days:
+        raise ValueError("stream=True henter hele perioden i én strøm og kan ikke kombineres med window_days.")
 
-    endpoint = "https://frost.met.no/observations/v0.jsonld"
+    endpoint = FROST_OBSERVATIONS_ENDPOINT
     parameters = {
-        "sources": "SN18700",
-        "elements": "mean(air_temperature P1D),sum(precipitation_amount P1D),mean(wind_speed P1D)",
-        "referencetime": "2010-04-02/2016-12-31",
+        "sources": FROST_SOURCE,
+        "elements": ",".join(k for k in FROST_ELEMENTS if k != "sourceId"),
+        "referencetime": f"{FROST_FROM_DATE}/{FROST_TO_DATE}",
     }
 
-    file = "../../data/raw_data/frostAPI_data.json"
-    elements = {
-        "mean(air_temperature P1D)": "Temperatur",
-        "sum(precipitation_amount P1D)": "Nedbør",
-        "mean(wind_speed P1D)": "Vindhastighet",
-        "sourceId": "Stasjon"
+    file = FROST_RAW_FILE
+    elements = FROST_ELEMENTS
+
+    if stream:
+        columns = stream_data_from_frostAPI(endpoint, parameters, client_id, elements)
+        processed_data = columns_to_dataframe(columns) if columns is not None else pd.DataFrame()
+        if processed_data.empty:
+            print("Ingen data hentet.")
+            return
+    else:
+        if window_days:
+            try:
+                raw_data = fetch_data_parallel_frostAPI(endpoint, parameters, client_id, window_days, max_workers)
+            except IncompleteFetchError as e:
+                print(f"Hentingen er ufullstendig, ingenting er lagret:\n→ {e}")
+                return
+        else:
+            raw_data = fetch_data_from_frostAPI(endpoint, parameters, client_id)
+        if not raw_data:
+            print("Ingen data hentet.")
+            return
+
+        processed_data = process_weather_data_columnar(raw_data, elements)
+
+    index_columns = ["Dato", "Stasjon"]
+    value_columns = [v for v in elements.values() if v != "Stasjon"]
+    if not save:
+        return apply_schema(pivot_weather_data(processed_data, index_columns, value_columns, "mean"), frost_schema(value_columns))
+
+    return save_data_as_json(
+        data=processed_data,
+        file=file,
+        index_columns=index_columns,
+        value_columns=value_columns,
+        aggfunc="mean"
+    )
+
+def data_frostAPI_incremental(client_id, source=None, from_date=None, to_date=None, file=None, watermark_file=None,
+                             window_days=None, max_workers=4, lag_days=WATERMARK_LAG_DAYS):
+    """
+    Henter bare nye værdata fra Frost API og slår dem sammen med eksisterende rådata.
+    Et vannmerke per stasjon og element lagrer siste dato med måling, og neste henting starter dagen etter
+    det eldste. Elementer uten målinger i perioden regnes som hentet til og med lag_days dager før to_date.
+
+    Args:
+        client_id (str): Client ID for autentisering.
+        source (str, optional): Frost-kilde-ID. Standard er FROST_SOURCE.
+        from_date (str, optional): Startdato ('YYYY-MM-DD') hvis ingenting er hentet fra før. Standard er FROST_FROM_DATE.
+        to_date (str, optional): Siste dato som skal hentes ('YYYY-MM-DD'). Standard er i dag.
+        file (str, optional): Filsti til rådata som nye rader slås sammen med. Standard er FROST_RAW_FILE.
+        watermark_file (str, optional): Filsti til vannmerkene. Standard er FROST_WATERMARK_FILE.
+        window_days (int, optional): Hvis satt, hentes perioden vindusvis og parallelt.
+        max_workers (int): Maks antall samtidige forespørsler ved vindusvis henting.
+        lag_days (int): Hvor mange dager et element kan publiseres senere enn de andre (se update_watermarks).
+
+    Returns:
+        int: Antall nye eller oppdaterte rader.
+
+    Raises:
+        IncompleteFetchError: Hvis noen av vinduene feiler. Verken rådataene eller vannmerkene oppdateres da.
+    """
+    source = source or FROST_SOURCE
+    from_date = from_date or FROST_FROM_DATE
+    file = file or FROST_RAW_FILE
+    watermark_file = watermark_file or FROST_WATERMARK_FILE
+    element_ids = [k for k in FROST_ELEMENTS if k != "sourceId"]
+    keys = {watermark_key("frost", source, element_id): FROST_ELEMENTS[element_id] for element_id in element_ids}
+
+    watermarks = load_watermarks(watermark_file)
+    start = next_start_date(watermarks, keys, from_date)
+    end = date.fromisoformat(to_date) if to_date else date.today()
+    if date.fromisoformat(start) > end:
+        print(f"Ingen nye datoer å hente for {source} (hentet til og med {date.fromisoformat(start) - timedelta(days=1)}).")
+        return 0
+
+    # Sluttdatoen i referencetime er eksklusiv
+    parameters = {
+        "sources": source,
+        "elements": ",".join(element_ids),
+        "referencetime": f"{start}/{(end + timedelta(days=1)).isoformat()}",
     }
+    if window_days:
+        raw_data = fetch_data_parallel_frostAPI(FROST_OBSERVATIONS_ENDPOINT, parameters, client_id, window_days, max_workers)
+    else:
+        raw_data = fetch_data_from_frostAPI(FROST_OBSERVATIONS_ENDPOINT, parameters, client_id)
+    if not raw_data:
+        print(f"Ingen nye data hentet for {source} fra {start}.")
+        return 0
+
+    processed_data = process_weather_data_columnar(raw_data, FROST_ELEMENTS)
+    measured = processed_data.keys()
+    new_df = pivot_weather_data(
+        processed_data,
+        index_columns=["Dato", "Stasjon"],
+        value_columns=[v for v in FROST_ELEMENTS.values() if v != "Stasjon" and v in measured],
+    )
+
+    merged_df = merge_into_store(file, new_df, ["Dato", "Stasjon"])
+    save_dataset(merged_df, file, schema=schema())
+
+    # Vannmerkene lagres først når dataene er skrevet, så et avbrudd gir ny henting neste gang
+    save_watermarks(update_watermarks(watermarks, new_df, keys, fetched_to=end.isoformat(), lag_days=lag_days),
+                    watermark_file)
+    print(f"{len(new_df)} nye rader for {source} fra {start} er slått sammen med {file}")
+    return len(new_df)
+
+
+def station_partition_file(output_dir, source):
+    """
+    Returnerer filstien til partisjonen for én Frost-stasjon.
+
+    Args:
+        output_dir (str): Mappe med én fil per stasjon.
+        source (str): Frost-kilde-ID, f.eks. "SN18700".
+
+    Returns:
+        str: Filsti på formen <output_dir>/<source>.<endelse for standardformatet>.
+    """
+    return dataset_path(os.path.join(output_dir, source.replace(':', '_')))
+
+
+def station_marker_file(output_dir, source):
+    """
+    Returnerer filstien til fullføringsmerket for én Frost-stasjon. Merket skrives etter at hele perioden
+    er hentet og lagret, og inneholder perioden (referencetime) partisjonen gjelder.
+
+    Args:
+        output_dir (str): Mappe med én fil per stasjon.
+        source (str): Frost-kilde-ID, f.eks. "SN18700".
+
+    Returns:
+        str: Filsti på formen <output_dir>/<source>.done.
+    """
+    return os.path.join(output_dir, f"{source.replace(':', '_')}.done")
+
 
-    raw_data = fetch_data_from_frostAPI(endpoint, parameters, client_id)
+def station_is_complete(output_dir, source, referencetime):
+    """
+    Sjekker om stasjonen er hentet komplett for perioden, dvs. at partisjonen og fullføringsmerket finnes
+    og at merket gjelder samme referencetime.
+
+    Args:
+        output_dir (str): Mappe med én fil per stasjon.
+        source (str): Frost-kilde-ID.
+        referencetime (str): Tidsintervall på formen "YYYY-MM-DD/YYYY-MM-DD".
+
+    Returns:
+        bool: True hvis stasjonen kan hoppes over.
+    """
+    marker = station_marker_file(output_dir, source)
+    if not (os.path.exists(marker) and os.path.exists(station_partition_file(output_dir, source))):
+        return False
+    try:
+        with open(marker, "r", encoding="utf-8") as file:
+            return json.load(file).get("referencetime") == referencetime
+    except ValueError:
+        return False
+
+
+def ingest_station_frostAPI(client_id, source, file, referencetime, window_days=None):
+    """
+    Henter, prosesserer og lagrer værdata for én Frost-stasjon i sin egen partisjon.
+
+    Args:
+        client_id (str): Client ID for autentisering.
+        source (str): Frost-kilde-ID, f.eks. "SN18700".
+        file (str): Filsti for stasjonens partisjon.
+        referencetime (str): Tidsintervall på formen "YYYY-MM-DD/YYYY-MM-DD".
+        window_days (int, optional): Hvis satt, hentes perioden vindusvis i stedet for i ett kall.
+
+    Returns:
+        bool: True hvis data ble hentet og lagret, False hvis Frost svarte uten data (tomt svar eller HTTP 404).
+
+    Raises:
+        IncompleteFetchError: Hvis noen av vinduene feiler. Partisjonen skrives da ikke.
+        requests.RequestException: Hvis hentingen uten vinduer feiler.
+        ValueError: Hvis responsen ikke er gyldig JSON.
+    """
+    parameters = {
+        "sources": source,
+        "elements": ",".join(k for k in FROST_ELEMENTS if k != "sourceId"),
+        "referencetime": referencetime,
+    }
+
+    if window_days:
+        raw_data = fetch_data_parallel_frostAPI(FROST_OBSERVATIONS_ENDPOINT, parameters, client_id, window_days, max_workers=1)
+    else:
+        # fetch_window_frostAPI kaster ved feil, så en feilet stasjon ikke rapporteres som "ingen data"
+        raw_data = fetch_window_frostAPI(FROST_OBSERVATIONS_ENDPOINT, parameters, client_id)
     if not raw_data:
-        print("Ingen data hentet.")
-        return
+        print(f"Ingen data hentet for {source}.")
+        return False
 
-    processed_data = process_weather_data(raw_data, elements)
+    processed_data = process_weather_data_columnar(raw_data, FROST_ELEMENTS)
 
+    # Ikke alle stasjoner måler alle elementer, så bare kolonner som finnes aggregeres
+    measured = processed_data.keys()
     save_data_as_json(
         data=processed_data,
         file=file,
         index_columns=["Dato", "Stasjon"],
-        value_columns=[v for v in elements.values() if v != "Stasjon"],
+        value_columns=[v for v in FROST_ELEMENTS.values() if v != "Stasjon" and v in measured],
         aggfunc="mean"
     )
+    return True
 
-def visualize_missing_data_missingno(df_or_path):
+
+def data_frostAPI_stations(client_id, sources, output_dir="../../data/raw_data/frostAPI_stations",
+                           referencetime="2010-04-02/2016-12-31", max_workers=4, overwrite=False, window_days=None):
     """
-    Visualiserer manglende verdier i værdata med missingno.
+    Henter værdata for flere Frost-stasjoner samtidig og lagrer én partisjon per stasjon.
+    Stasjoner som allerede er hentet komplett for samme periode (se station_is_complete) hoppes over,
+    med mindre overwrite=True. En partisjon uten fullføringsmerke, f.eks. etter et avbrudd, hentes på nytt.
+    For å hente én stasjon på nytt sendes bare den stasjonen inn med overwrite=True.
+    Feiler én stasjon, fortsetter de andre, og stasjonen får status "feilet".
 
     Args:
-        df_or_path (str eller pd.DataFrame): Filsti til JSON-data ELLER en DataFrame.
+        client_id (str): Client ID for autentisering.
+        sources (list): Liste med Frost-kilde-ID-er, f.eks. ["SN18700", "SN18950"].
+        output_dir (str): Mappe for stasjonspartisjonene.
+        referencetime (str): Tidsintervall på formen "YYYY-MM-DD/YYYY-MM-DD".
+        max_workers (int): Maks antall stasjoner som hentes samtidig.
+        overwrite (bool): Om eksisterende partisjoner skal hentes og skrives på nytt.
+        window_days (int, optional): Hvis satt, hentes hver stasjon vindusvis.
+
+    Returns:
+        dict: Status per stasjon: "lagret", "hoppet over", "ingen data" eller "feilet".
     """
-    if isinstance(df_or_path, str):
-        df = pd.read_json(df_or_path, orient="records", encoding="utf-8")
-    elif isinstance(df_or_path, pd.DataFrame):
-        df = df_or_path.copy()
-    else:
-        raise ValueError("Input må være en filsti (str) eller en pandas DataFrame.")
+    os.makedirs(output_dir, exist_ok=True)
+
+    status = {}
+    pending = []
+    for source in dict.fromkeys(sources):
+        if not overwrite and station_is_complete(output_dir, source, referencetime):
+            status[source] = "hoppet over"
+        else:
+            # Merket fjernes før hentingen, så et avbrudd gir ny henting neste gang
+            marker = station_marker_file(output_dir, source)
+            if os.path.exists(marker):
+                os.remove(marker)
+            pending.append((source, station_partition_file(output_dir, source)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            source: executor.submit(ingest_station_frostAPI, client_id, source, file, referencetime, window_days)
+            for source, file in pending
+        }
+        for source, future in futures.items():
+            try:
+                stored = future.result()
+            except Exception as e:
+                print(f"Feil ved henting av {source}:\n→ {e}")
+                status[source] = "feilet"
+                continue
+            if stored:
+                with open(station_marker_file(output_dir, source), "w", encoding="utf-8") as file:
+                    json.dump({"referencetime": referencetime}, file)
+            status[source] = "lagret" if stored else "ingen data"
+
+    for source, result in status.items():
+        print(f"{source}: {result}")
+    return status
+
+
+def load_station_partitions(output_dir="../../data/raw_data/frostAPI_stations", sources=None):
+    """
+    Leser stasjonspartisjoner fra data_frostAPI_stations og slår dem sammen til én DataFrame.
+
+    Args:
+        output_dir (str): Mappe med stasjonspartisjonene.
+        sources (list, optional): Stasjoner som skal leses. Hvis None, leses alle partisjoner i mappen.
 
+    Returns:
+        pd.DataFrame: Samlet DataFrame med kolonnene fra partisjonene, eller tom DataFrame hvis ingen finnes.
+    """
+    if sources is None:
+        files = sorted(
+            os.path.join(output_dir, name) for name in os.listdir(output_dir) if name.endswith(dataset_path(""))
+        ) if os.path.isdir(output_dir) else []
+    else:
+        files = [station_partition_file(output_dir, source) for source in sources]
 
-    msno.matrix(df)
-    plt.title("Visualisering av manglende data (missingno.matrix)")
-    plt.show()
+    frames = [load_dataset(file, schema=schema()) for file in files if os.path.exists(file)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
 
 
 def check_and_clean_frost_duplicates():
     """
-    Leser data fra Frost API JSON-fil, viser duplikater, fjerner dem og returnerer en renset DataFrame.
+    Leser data fra Frost API-datasettet, viser duplikater, fjerner dem og returnerer en renset DataFrame.
 
     Returns:
         pd.DataFrame: Renset DataFrame uten duplikat-datoer.
     """
-    filepath = "../../data/raw_data/frostAPI_data.json"
-    df = pd.read_json(filepath)
+    filepath = FROST_RAW_FILE
+    df = load_dataset(filepath, schema=schema())
     subset = ["Dato", "Stasjon"]
 
     print("Før opprydding:")
@@ -129,41 +519,106 @@ def check_and_clean_frost_duplicates():
     else:
         print(f"Rader igjen i datasettet: {cleaned_len} (fjernet {original_len - cleaned_len} duplikat(er))")
 
-def label_station(df):
-    # Label encoding
-    encoder = LabelEncoder()
-    df["Stasjon"] = encoder.fit_transform(df["Stasjon"]).astype(int)
-    return df
+def value_columns():
+    """
+    Måleverdiene som hentes, sortert på navn. Leses fra FROST_ELEMENTS ved hvert kall, så elementer
+    en batchjobb legger til også blir renset, interpolert og analysert.
+
+    Returns:
+        list: Kolonnenavnene for elementene i FROST_ELEMENTS, f.eks. ["Nedbør", "Temperatur", "Vindhastighet"].
+    """
+    return sorted(col for col in FROST_ELEMENTS.values() if col != "Stasjon")
+
+
+def schema():
+    """
+    Kolonnetypene for Frost-datasettene med elementene i FROST_ELEMENTS (se frost_schema).
+
+    Returns:
+        dict: Kolonnenavn → dtype.
+    """
+    return frost_schema(value_columns())
+
 
 def analyze_frost_data():
     """
-    Leser Frost API-data fra en JSON-fil, analyserer og visualiserer outliers.
+    Leser Frost API-data fra datasettet, analyserer og visualiserer outliers.
     """
-    df_frost = pd.read_json("../../data/raw_data/frostAPI_data.json")
-    variables = ['Nedbør', 'Temperatur', 'Vindhastighet']
+    df_frost = load_dataset(FROST_RAW_FILE, schema=schema())
+    variables = value_columns()
     threshold = 3
 
     analyze_and_plot_outliers(df_frost, variables, threshold)
 
-def clean_data_frostAPI(threshold=3):
+def save_station_labels(codes, sources, file):
+    """
+    Lagrer hvilken stasjons-ID hver stasjonskode fra label_station står for.
+
+    Args:
+        codes (pd.Series): Stasjonskodene etter label_station.
+        sources (pd.Series): Stasjons-ID-ene før label_station, med samme indeks.
+        file (str): Filsti til JSON-filen.
+    """
+    labels = {str(code): source for code, source in zip(codes, sources) if pd.notna(source)}
+    directory = os.path.dirname(file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(labels.items())), f, indent=4, ensure_ascii=False)
+
+
+def load_station_labels(file):
+    """
+    Leser stasjonskodene lagret av save_station_labels.
+
+    Args:
+        file (str): Filsti til JSON-filen.
+
+    Returns:
+        dict: Stasjonskode (int) → stasjons-ID, eller None hvis filen ikke finnes.
+    """
+    if not os.path.exists(file):
+        return None
+    with open(file, "r", encoding="utf-8") as f:
+        return {int(code): source for code, source in json.load(f).items()}
+
+
+def clean_data_frostAPI(threshold=3, force=False, df=None, save=True):
     """
-        Leser rådata fra Frost API, fjerner outliers og lagrer renset data i en JSON-fil.
+        Leser rådata fra Frost API, fjerner outliers og lagrer renset data (FROST_CLEAN_FILE).
         Bruker funksjonene "remove_outliers" og "interpolate_and_save_clean_data".
+        Trinnet hoppes over hvis rådataene og parameterne er de samme som ved forrige kjøring (se common/stage_cache.py).
+        Med df renses rådataene fra forrige trinn direkte i minnet, og med save=False lagres ingenting.
 
         Args:
         threshold (float, optional): Antall standardavvik for å definere outliers. Default er 3.
+        force (bool, optional): Kjør trinnet selv om utdataene er oppdatert.
+        df (pd.DataFrame, optional): Rådata fra data_frostAPI. Standard er å lese FROST_RAW_FILE.
+        save (bool, optional): Om renset data skal lagres. Default er True.
+
+        Returns:
+        pd.DataFrame: Renset data, eller None hvis trinnet ble hoppet over.
     """
     
-    raw_data_file = "../../data/raw_data/frostAPI_data.json"
-    clean_data_file = "../../data/clean_data/frostAPI_clean_data.json"
-    cols = ["Nedbør", "Temperatur", "Vindhastighet"]
-    from_date = "2010-04-02"
-    to_date = "2016-12-31"
+    raw_data_file = FROST_RAW_FILE
+    clean_data_file = FROST_CLEAN_FILE
+    cols = value_columns()
+    from_date = FROST_FROM_DATE
+    to_date = FROST_TO_DATE
+
+    manifest = manifest_file(clean_data_file)
+    params = {"threshold": threshold, "cols": cols, "from_date": from_date, "to_date": to_date,
+              "method": FROST_OUTLIER_METHOD, "window": FROST_OUTLIER_WINDOW, "max_gap": FROST_MAX_GAP}
+    outputs = [clean_data_file, FROST_CLEAN_CUBE, FROST_CLEAN_PARTITIONS, FROST_STATION_LABELS]
+    if df is None and save and not force and stage_is_current(manifest, [raw_data_file], params, outputs):
+        print(f"Renset data er oppdatert ({clean_data_file}). Hopper over rensing.")
+        return None
     
 
     # Fjern outliers fra rådataene
     from niluAPI.clean_data_nilu import remove_outliers
-    pivot_df = remove_outliers(raw_data_file, cols, threshold=threshold)
+    pivot_df = remove_outliers(raw_data_file if df is None else df, cols, threshold=threshold,
+                               method=FROST_OUTLIER_METHOD, window=FROST_OUTLIER_WINDOW)
 
     #Sjekker og fjerner duplikater
     pivot_df= remove_duplicate_dates(pivot_df, subset=["Dato", "Stasjon"])
@@ -171,46 +626,123 @@ def clean_data_frostAPI(threshold=3):
     # Sjekk om dataen ble lastet inn riktig og ikke er tom
     if pivot_df is not None and not pivot_df.empty:
         
-        pivot_df=interpolate_data(pivot_df, from_date, to_date, cols)
+        pivot_df=interpolate_data(pivot_df, from_date, to_date, cols, max_gap=FROST_MAX_GAP)
     else:
         print("Data kunne ikke leses eller er tom. Avbryter prosesseringen.")
 
-    # Label encoding av stasjoner
+    # Label encoding av stasjoner. Stasjons-ID-ene tas vare på for partisjonene.
+    sources = pivot_df["Stasjon"].copy()
     pivot_df=label_station(pivot_df)
 
-    # Lagre den rensede dataen som en JSON-fil
-    save_data_json(pivot_df, clean_data_file)
+    # Lagre den rensede dataen. Manifestet skrives bare når rådataene ble lest fra fil.
+    if save:
+        save_data_json(pivot_df, clean_data_file)
+        write_partitions(pivot_df, FROST_CLEAN_PARTITIONS, station=sources, schema=schema(), merge=False)
+        save_station_labels(pivot_df["Stasjon"], sources, FROST_STATION_LABELS)
+        save_dataset(pivot_df, FROST_CLEAN_CUBE, schema=schema())
+        if df is None:
+            record_stage(manifest, "frost_renset", [raw_data_file], params, outputs)
+    return pivot_df
 
 
-def fix_skewness_data_frostAPI():
+def fix_skewness_data_frostAPI(force=False, df=None, save=True):
     """
     Henter renset data fra Frost API, analyserer og fikser skjevhet.
-    Lagrer transformert data til fil.
-    """
-    clean_data_file = "../../data/clean_data/frostAPI_clean_data.json"
-    analyzed_data_file = "../../data/analyzed_data/frostAPI_analyzed_data.json"
-    threshold = 1.0
-    cols = ["Nedbør", "Temperatur", "Vindhastighet"]
+    Lagrer transformert data til fil, og partisjonert per stasjons-ID fra FROST_STATION_LABELS. Trinnet hoppes over hvis de rensede dataene og parameterne
+    er de samme som ved forrige kjøring.
+
+    Args:
+        force (bool, optional): Kjør trinnet selv om utdataene er oppdatert.
+        df (pd.DataFrame, optional): Renset data fra clean_data_frostAPI. Standard er å lese FROST_CLEAN_FILE.
+        save (bool, optional): Om transformert data skal lagres. Default er True.
 
-    df, cols = analyse_skewness(clean_data_file, cols)
+    Returns:
+        pd.DataFrame: Transformert data, eller None hvis trinnet ble hoppet over eller feilet.
+    """
+    clean_data_file = FROST_CLEAN_FILE
+    analyzed_data_file = FROST_ANALYZED_FILE
+    threshold = FROST_SKEW_THRESHOLD
+    cols = value_columns()
+
+    manifest = manifest_file(analyzed_data_file)
+    params = {"threshold": threshold, "cols": cols}
+    outputs = [analyzed_data_file, FROST_ANALYZED_PARTITIONS]
+    if df is None and save and not force and stage_is_current(manifest, [clean_data_file], params, outputs):
+        print(f"Transformert data er oppdatert ({analyzed_data_file}). Hopper over transformasjon.")
+        return None
+
+    from_file = df is None
+    df, cols = analyse_skewness(clean_data_file if from_file else df, cols)
     if df is None:
         print("Avslutter pga. feil i innlasting.")
-        return
+        return None
 
     df_transformed = fix_skewness(df, threshold, cols)
-    df_transformed.to_json(analyzed_data_file, orient="records", indent=4, force_ascii=False)
-    print(f"\nTransformert data lagret i {analyzed_data_file}")
+    if save:
+        save_dataset(df_transformed, analyzed_data_file, schema=schema())
+        labels = load_station_labels(FROST_STATION_LABELS)
+        if labels is None:
+            print(f"Fant ikke stasjonskodene ({FROST_STATION_LABELS}). Lagrer ikke partisjoner.")
+        else:
+            stations = df_transformed["Stasjon"].map(labels)
+            write_partitions(df_transformed, FROST_ANALYZED_PARTITIONS, station=stations, schema=schema(), merge=False)
+        if from_file:
+            record_stage(manifest, "frost_transformert", [clean_data_file], params, outputs)
+        print(f"\nTransformert data lagret i {analyzed_data_file}")
+    return df_transformed
+
+
+def run_pipeline_frostAPI(client_id=None, threshold=3, save=False):
+    """
+    Kjører henting, rensing og transformasjon av Frost-data etter hverandre i minnet. Hvert trinn får
+    DataFrame-en fra forrige trinn direkte, uten å skrive og lese filer mellom trinnene.
+
+    Args:
+        client_id (str, optional): Klient-ID for Frost API. Uten klient-ID leses rådataene fra FROST_RAW_FILE.
+        threshold (float, optional): Antall standardavvik for å definere outliers. Default er 3.
+        save (bool, optional): Om resultatet av hvert trinn også skal lagres. Default er False.
 
+    Returns:
+        dict: Trinn ("rådata", "renset", "transformert") → DataFrame. Tom hvis ingen data ble hentet.
+    """
+    if client_id:
+        raw = data_frostAPI(client_id, save=save)
+    else:
+        raw = load_dataset(FROST_RAW_FILE, schema=schema())
+    if raw is None:
+        return {}
 
+    clean = clean_data_frostAPI(threshold, df=raw, save=save)
+    transformed = fix_skewness_data_frostAPI(df=clean, save=save)
+    return {"rådata": raw, "renset": clean, "transformert": transformed}
 
-def load_and_plot_frost_seasonal_data():
+
+
+def memory_report_frostAPI():
     """
-    Leser inn meteorologiske data fra en JSON-fil og visualiserer gjennomsnittlig
-    temperatur og nedbør per sesong per år.
+    Viser minnebruken for rådata, rensede og transformerte Frost-data, slik de leses i dag og med kompakte kolonnetyper.
+
+    Returns:
+        pd.DataFrame: Én rad per trinn, se common.compact.memory_report.
     """
-    with open("../../data/clean_data/frostAPI_clean_data.json", "r", encoding="utf-8") as file:
-        data = json.load(file)
+    stages = {"rådata": FROST_RAW_FILE, "renset": FROST_CLEAN_FILE, "transformert": FROST_ANALYZED_FILE}
+    frames = {stage: load_dataset(file, schema=schema()) for stage, file in stages.items() if os.path.exists(file)}
+    report = memory_report(frames)
+    print(report.to_string(index=False, float_format="%.2f"))
+    return report
+
 
-    df = pd.DataFrame(data)
-    stats = calculate_seasonal_stats(df)
+def load_and_plot_frost_seasonal_data():
+    """
+    Leser inn meteorologiske data fra det rensede datasettet og visualiserer gjennomsnittlig
+    temperatur og nedbør per sesong per år. Sesongaggregatene hentes ferdig beregnet fra SQL-lageret
+    (SQL/rollups.py), og beregnes fra døgnverdiene bare hvis lageret ikke er tilgjengelig.
+    """
+    table = frost_clean_table()
+    rollup = lookup_rollup(table, "sesong", ["Temperatur", "Nedbør"]) if table is not None else None
+    if rollup is not None:
+        stats = seasonal_stats_from_rollup(rollup)
+    else:
+        df = load_dataset(current_copy(FROST_CLEAN_CUBE, FROST_CLEAN_FILE), schema=schema())
+        stats = calculate_seasonal_stats(df)
     plot_seasonal_bars(stats)
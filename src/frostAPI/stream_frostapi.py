@@ -0,0 +1,177 @@
+import codecs
+import json
+import re
+from array import array
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import requests
+
+from common.http_client import http_get
+
+# Starten på data-listen i en Frost-respons, f.eks. '"data" : ['
+_DATA_START = re.compile(r'"data"\s*:\s*\[')
+_WHITESPACE = re.compile(r"[\s,]*")
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array_items(chunks, key="data", trim_size=1 << 16):
+    """
+    Leser elementene i en JSON-liste fortløpende fra en strøm av byte-biter,
+    uten å laste hele responsen inn i minnet.
+
+    Args:
+        chunks (iterable): Byte-biter av JSON-responsen, f.eks. fra response.iter_content().
+        key (str): Navnet på listen som skal leses.
+        trim_size (int): Hvor mange tegn som kan være lest før bufferet kortes ned.
+
+    Yields:
+        dict: Ett element fra listen om gangen.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    start_pattern = _DATA_START if key == "data" else re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+    buffer = ""
+    pos = None
+    finished = False
+    chunks = iter(chunks)
+
+    while True:
+        if pos is None:
+            match = start_pattern.search(buffer)
+            if match:
+                pos = match.end()
+        if pos is not None:
+            while True:
+                pos = _WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer) and buffer[pos] == "]":
+                    return
+                try:
+                    item, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # Elementet er ikke ferdig mottatt ennå
+                yield item
+                pos = end
+            if pos > trim_size:
+                buffer = buffer[pos:]
+                pos = 0
+
+        if finished:
+            if pos is None:
+                return
+            raise ValueError(f"Uventet slutt på JSON-strømmen i listen '{key}'.")
+        try:
+            buffer += utf8.decode(next(chunks))
+        except StopIteration:
+            buffer += utf8.decode(b"", final=True)
+            finished = True
+
+
+def new_observation_columns(elements):
+    """
+    Lager tomme kolonnebuffere for observasjoner: datoer som dagnummer, stasjoner som koder
+    og én flyttallsliste per element.
+
+    Args:
+        elements (dict): Mapping av elementId til kolonnenavn. "sourceId" hoppes over.
+
+    Returns:
+        dict: Kolonnebuffere som fylles med append_observation.
+    """
+    return {
+        "elements": {element_id: name for element_id, name in elements.items() if element_id != "sourceId"},
+        "dato": array("i"),
+        "stasjon": array("i"),
+        "stasjoner": {},
+        "verdier": {name: array("d") for element_id, name in elements.items() if element_id != "sourceId"},
+        "_siste_dato": (None, 0),
+    }
+
+
+def append_observation(columns, item):
+    """
+    Legger én observasjon fra Frost direkte inn i kolonnebufferne.
+    Elementer som mangler i observasjonen lagres som NaN.
+
+    Args:
+        columns (dict): Kolonnebuffere fra new_observation_columns.
+        item (dict): Ett element fra data-listen i Frost-responsen.
+    """
+    day_str = item["referenceTime"][:10]
+    last_str, last_day = columns["_siste_dato"]
+    if day_str != last_str:
+        last_day = date.fromisoformat(day_str).toordinal()
+        columns["_siste_dato"] = (day_str, last_day)
+    columns["dato"].append(last_day)
+
+    stations = columns["stasjoner"]
+    columns["stasjon"].append(stations.setdefault(item["sourceId"], len(stations)))
+
+    row = {}
+    for observation in item.get("observations", []):
+        name = columns["elements"].get(observation["elementId"])
+        if name is not None:
+            row[name] = observation["value"]
+    for name, values in columns["verdier"].items():
+        values.append(row.get(name, np.nan))
+
+
+def columns_to_dataframe(columns):
+    """
+    Gjør kolonnebufferne om til en DataFrame med samme kolonner som process_weather_data gir.
+    Elementer uten en eneste måling utelates, slik som i den radvise varianten.
+
+    Args:
+        columns (dict): Kolonnebuffere fra new_observation_columns.
+
+    Returns:
+        pd.DataFrame: DataFrame med kolonnene Dato, Stasjon og ett navn per element.
+    """
+    days = np.frombuffer(columns["dato"], dtype=np.int32)
+    # Dagnummer fra date.toordinal() regnes om til datoer via epoken 1970-01-01
+    epoch = date(1970, 1, 1).toordinal()
+    dates = (days - epoch).astype("datetime64[D]")
+
+    station_names = np.array(list(columns["stasjoner"]), dtype=object)
+    station_codes = np.frombuffer(columns["stasjon"], dtype=np.int32)
+
+    data = {
+        "Dato": np.datetime_as_string(dates, unit="D").astype(object),
+        "Stasjon": station_names[station_codes] if len(station_codes) else np.array([], dtype=object),
+    }
+    for name, values in columns["verdier"].items():
+        values = np.frombuffer(values, dtype=np.float64)
+        if not np.isnan(values).all():
+            data[name] = values
+    return pd.DataFrame(data)
+
+
+def stream_data_from_frostAPI(endpoint, parameters, client_id, elements, chunk_size=1 << 16):
+    """
+    Henter observasjoner fra Frost API som en strøm og fyller kolonnebuffere fortløpende,
+    slik at verken hele responsen eller en liste med dicts må ligge i minnet.
+
+    Args:
+        endpoint (str): API-endepunktet.
+        parameters (dict): Parametere for API-kallet.
+        client_id (str): Client ID for autentisering.
+        elements (dict): Mapping av elementId til kolonnenavn.
+        chunk_size (int): Antall bytes som leses fra nettverket om gangen.
+
+    Returns:
+        dict or None: Kolonnebuffere (se new_observation_columns), eller None ved feil.
+    """
+    columns = new_observation_columns(elements)
+    try:
+        response = http_get(endpoint, params=parameters, auth=(client_id, ""), stream=True)
+        with response:
+            response.raise_for_status()
+            for item in iter_json_array_items(response.iter_content(chunk_size=chunk_size)):
+                append_observation(columns, item)
+    except requests.exceptions.RequestException as e:
+        print(f"Feil ved henting av data fra Frost API:\n→ {e}")
+        return None
+    except ValueError as e:
+        print(f"Feil ved parsing av JSON-respons:\n→ {e}")
+        return None
+    return columns
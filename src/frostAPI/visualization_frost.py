@@ -1,15 +1,7 @@
-import requests
 import pandas as pd
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from scipy.stats import pearsonr
-from sklearn.preprocessing import PowerTransformer
-import seaborn as sns
-from sklearn.preprocessing import PowerTransformer, StandardScaler
-import missingno as msno
-from sklearn.preprocessing import LabelEncoder
+from common.diagnostics import show_plot
 
 
 def get_season(date):
@@ -59,9 +51,33 @@ def calculate_seasonal_stats(data):
     return stats
 
 
+def seasonal_stats_from_rollup(rollup):
+    """
+    Gjør sesongaggregatene fra SQL-lageret (SQL/rollups.py) om til samme tabell som calculate_seasonal_stats.
+
+    Args:
+    - rollup (DataFrame): Aggregater per sesong med kolonnene 'Periode' ('ÅÅÅÅ-Sesong'), 'Variabel', 'Snitt' og 'Std'.
+
+    Returns:
+    - DataFrame: Aggregert statistikk per sesong og år.
+    """
+    wide = rollup.pivot(index='Periode', columns='Variabel', values=['Snitt', 'Std'])
+    periods = wide.index.to_series().str.split('-', n=1, expand=True)
+    stats = pd.DataFrame({
+        'År': periods[0].astype(int).to_numpy(),
+        'Sesong': periods[1].to_numpy(),
+        'Temperatur_Gjennomsnitt': wide[('Snitt', 'Temperatur')].to_numpy(),
+        'Temperatur_Std': wide[('Std', 'Temperatur')].to_numpy(),
+        'Nedbør_Gjennomsnitt': wide[('Snitt', 'Nedbør')].to_numpy(),
+        'Nedbør_Std': wide[('Std', 'Nedbør')].to_numpy(),
+    })
+    return stats.sort_values(['År', 'Sesong']).reset_index(drop=True)
+
+
 def plot_seasonal_bars(stats_df):
     """
-    Visualiserer gjennomsnittlig temperatur og nedbør per sesong per år.
+    Visualiserer gjennomsnittlig temperatur og nedbør per sesong per år. Figurene vises, lagres eller
+    utsettes etter modusen i common/diagnostics.py.
 
     Args:
     - stats_df (DataFrame): Dataframe med kolonner som inneholder aggregerte verdier per sesong og år.
@@ -75,30 +91,24 @@ def plot_seasonal_bars(stats_df):
             print(f"Ingen data for sesongen: {sesong}")
             continue
 
-        # Temperatur søylediagram
-        plt.figure(figsize=(10, 5))
-        plt.bar(data_sesong['År'], data_sesong['Temperatur_Gjennomsnitt'],
-                yerr=data_sesong['Temperatur_Std'], capsize=5,
-                color='salmon', label='Temperatur')
-        plt.title(f"Gjennomsnittstemperatur per år – {sesong}")
-        plt.xlabel("År")
-        plt.ylabel("Temperatur (°C)")
-        plt.grid(axis='y', linestyle='--', alpha=0.6)
-        plt.tight_layout()
-        plt.show()
-
-        # Nedbør søylediagram
-        plt.figure(figsize=(10, 5))
-        plt.bar(data_sesong['År'], data_sesong['Nedbør_Gjennomsnitt'],
-                yerr=data_sesong['Nedbør_Std'], capsize=5,
-                color='skyblue', label='Nedbør')
-        plt.title(f"Gjennomsnittsnedbør per år – {sesong}")
-        plt.xlabel("År")
-        plt.ylabel("Nedbør (mm)")
-        plt.grid(axis='y', linestyle='--', alpha=0.6)
-        plt.tight_layout()
-        plt.show()
-
+        show_plot(f"temperatur_{sesong}", _draw_seasonal_bar, data_sesong, sesong, "Temperatur")
+        show_plot(f"nedbør_{sesong}", _draw_seasonal_bar, data_sesong, sesong, "Nedbør")
 
 
+def _draw_seasonal_bar(data_sesong, sesong, variable):
+    import matplotlib.pyplot as plt
 
+    if variable == "Temperatur":
+        color, title, ylabel = 'salmon', f"Gjennomsnittstemperatur per år – {sesong}", "Temperatur (°C)"
+    else:
+        color, title, ylabel = 'skyblue', f"Gjennomsnittsnedbør per år – {sesong}", "Nedbør (mm)"
+
+    plt.figure(figsize=(10, 5))
+    plt.bar(data_sesong['År'], data_sesong[f'{variable}_Gjennomsnitt'],
+            yerr=data_sesong[f'{variable}_Std'], capsize=5,
+            color=color, label=variable)
+    plt.title(title)
+    plt.xlabel("År")
+    plt.ylabel(ylabel)
+    plt.grid(axis='y', linestyle='--', alpha=0.6)
+    plt.tight_layout()
@@ -1,5 +1,4 @@
 import pandas as pd
-from sklearn.preprocessing import PowerTransformer, StandardScaler
 
 def analyse_skewness(df, cols):
     """
@@ -33,6 +32,9 @@ def fix_skewness(df, skewness_dict, threshold):
     Returns:
         pd.DataFrame: DataFrame med transformerte kolonner lagt til.
     """
+    # scikit-learn importeres først når transformasjonen kjøres
+    from sklearn.preprocessing import PowerTransformer, StandardScaler
+
     yeo = PowerTransformer(method='yeo-johnson')
     scaler = StandardScaler()
     df_transformed = df.copy()
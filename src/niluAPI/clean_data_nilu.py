@@ -1,42 +1,65 @@
 import pandas as pd
 import numpy as np
+from common.storage import save_dataset, load_dataset
+from common.diagnostics import record
+from common.outliers import outlier_limits
+from common.gap_fill import fill_gaps
 
-def remove_outliers(raw_data_file, cols, threshold=3):
+# Kolonnene i diagnostikken "outliers" (én rad per kolonne som er sjekket). Nedre og Øvre er de laveste
+# og høyeste grensene når de varierer per stasjon eller dag.
+OUTLIER_COLUMNS = ["Kolonne", "Outliers", "Gjennomsnitt", "Standardavvik", "Nedre", "Øvre"]
+
+def remove_outliers(raw_data_file, cols, threshold=3, method="global", window=31):
     """
-    Leser JSON-fil og finner outliers som ligger mer enn `threshold` standardavvik fra gjennomsnittet.
-    Fjerner outliers ved å sette dem til NaN.
+    Leser datasett og finner outliers som ligger mer enn `threshold` standardavvik fra gjennomsnittet.
+    Fjerner outliers ved å sette dem til NaN. Antall outliers per kolonne lagres som diagnostikk ("outliers"),
+    og manglende verdier etter fjerningen visualiseres én gang (se common/diagnostics.py for headless-modus).
+    Grensene beregnes per stasjon når dataene har kolonnen Stasjon, med en av metodene i common/outliers.py.
 
     Args:
-        raw_data_file (str): Filsti for rådata.
+        raw_data_file (str or pd.DataFrame): Filsti for rådata, eller rådata fra forrige trinn i minnet.
+            En DataFrame kopieres og endres ikke.
         cols (list): Liste over kolonnenavn som skal sjekkes for outliers.
         threshold (int, optional): Antall standardavvik som definerer outlier (default 3).
+        method (str, optional): "global" (gjennomsnitt ± threshold · standardavvik over hele serien), "rolling",
+            "climatology", "mad" eller "iqr". Se common.outliers.METHODS.
+        window (int, optional): Vindusbredden for "rolling" og "climatology".
 
     Returns:
         pd.DataFrame: DataFrame med fjernet outliers (NaN), eller tom DataFrame ved feil.
     """
     from frostAPI.clean_data_frost import visualize_missing_data_missingno
     try:
-        pivot_df = pd.read_json(raw_data_file, orient="records", encoding="utf-8")
-    except ValueError as e:
+        if isinstance(raw_data_file, pd.DataFrame):
+            pivot_df = raw_data_file.copy()
+        else:
+            pivot_df = load_dataset(raw_data_file)
+    except (ValueError, FileNotFoundError) as e:
         print(f"Feil ved lesing av rådata-fil: {e}")
         return pd.DataFrame()
     
     x = threshold
     
     print("Fjerning av outliers:")
-    print(f"Outliers er mer enn {x} standardavvik unna gjennomsnittet\n")
+    if method == "global":
+        print(f"Outliers er mer enn {x} standardavvik unna gjennomsnittet\n")
+    else:
+        print(f"Outliers er mer enn {x} spredningsenheter unna midten (metode: {method}, vindu: {window})\n")
     
+    rows = []
     for col in cols:
         if col not in pivot_df.columns:
             print(f"Kolonnen '{col}' finnes ikke i dataene.")
             continue
 
-        # Beregn gjennomsnitt og standardavvik for kolonnen
         mean = pivot_df[col].mean()
         std = pivot_df[col].std()
-        
-        # Finn rader som er outliers
-        is_outlier = (pivot_df[col] > mean + x * std) | (pivot_df[col] < mean - x * std)
+
+        # Finn rader som er outliers. Grensene kan variere fra rad til rad (per stasjon, vindu eller årstid).
+        lower, upper = outlier_limits(pivot_df, col, method, threshold=x, window=window)
+        values = pivot_df[col].to_numpy(dtype="float64")
+        with np.errstate(invalid="ignore"):
+            is_outlier = (values < lower) | (values > upper)
 
         outlier_count = is_outlier.sum()
         print(f"{col}:")
@@ -46,37 +69,37 @@ def remove_outliers(raw_data_file, cols, threshold=3):
         
         # Sett outliers til NaN
         pivot_df.loc[is_outlier, col] = np.nan
+        rows.append({"Kolonne": col, "Outliers": int(outlier_count), "Gjennomsnitt": mean, "Standardavvik": std,
+                     "Nedre": np.nanmin(lower) if np.isfinite(lower).any() else np.nan,
+                     "Øvre": np.nanmax(upper) if np.isfinite(upper).any() else np.nan})
 
-        visualize_missing_data_missingno(pivot_df)
+    record("outliers", pd.DataFrame(rows, columns=OUTLIER_COLUMNS))
+    visualize_missing_data_missingno(pivot_df)
 
     return pivot_df
 
-def interpolate_data(pivot_df, from_date, to_date):
+def interpolate_data(pivot_df, from_date, to_date, max_gap=None):
     """
-    Interpolerer manglende verdier i en DataFrame for et gitt datointervall.
+    Interpolerer manglende verdier i en DataFrame for et gitt datointervall (common/gap_fill.py).
     Marker interpolerte verdier ved å sette tilhørende dekningsgrad til False.
 
     Args:
         pivot_df (pd.DataFrame): DataFrame med rådata med outliers fjernet.
         from_date (str): Startdato for interpolering i format 'YYYY-MM-DD'.
         to_date (str): Sluttdato for interpolering i format 'YYYY-MM-DD'.
+        max_gap (int, optional): Lengste hull (antall dager på rad) som fylles. Standard er alle hull.
 
     Returns:
         pd.DataFrame: DataFrame med interpolerte verdier.
     """
-    all_dates = pd.date_range(start=from_date, end=to_date).strftime('%Y-%m-%d')
-
-    # Setter dato som indeks og fyller inn manglende datoer med NaN
-    pivot_df.set_index("Dato", inplace=True)
-    pivot_df = pivot_df.reindex(all_dates).reset_index()
-    pivot_df = pivot_df.rename(columns={'index': 'Dato'})
+    value_columns = [col for col in pivot_df.columns if "Verdi" in col]
+    pivot_df = fill_gaps(pivot_df, value_columns, from_date, to_date, max_gap=max_gap)
+    pivot_df["Dato"] = pivot_df["Dato"].dt.strftime('%Y-%m-%d')
 
+    # NILU-dataene markerer interpolerte dager med dekningsgraden, så flaggkolonnene trengs bare til utskriften
     print("\nInterpolering av NaN-verdier:")
-    for col in pivot_df.columns:
-        if "Verdi" in col:
-            null_values = pivot_df[col].isna().sum()
-            pivot_df[col] = pivot_df[col].interpolate(method='linear')
-            print(f"{col}: {null_values} verdier ble interpolert")
+    for col in value_columns:
+        print(f"{col}: {pivot_df.pop(f'Interpolert_{col}').sum()} verdier ble interpolert")
 
     # Setter Dekningsgrad til False hvis verdien er interpolert
     for col in pivot_df.columns:
@@ -87,7 +110,7 @@ def interpolate_data(pivot_df, from_date, to_date):
 
 def save_clean_data(df, clean_data_file):
     """
-    Lagrer en DataFrame som en JSON-fil.
+    Lagrer en DataFrame i formatet gitt av filendelsen (.parquet, .arrow eller .json).
 
     Args:
         df (pd.DataFrame): DataFrame som skal lagres.
@@ -97,7 +120,7 @@ def save_clean_data(df, clean_data_file):
         None
     """
     try:
-        df.to_json(clean_data_file, orient="records", indent=4, force_ascii=False)
+        save_dataset(df, clean_data_file)
         print(f"\nRenset data er lagret under {clean_data_file}")
     except Exception as e:
         print(f"Feil ved lagring av fil: {e}")
@@ -1,6 +1,13 @@
 import requests
+import numpy as np
 import pandas as pd
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from common.http_client import http_get, IncompleteFetchError
+from common.storage import save_dataset, load_dataset
+
+NILU_STATS_URL = "https://api.nilu.no/stats/day"
 
 def fetch_raw_data_niluAPI(endpoint):
     """
@@ -13,7 +20,7 @@ def fetch_raw_data_niluAPI(endpoint):
         list: Liste med data fra API-et, eller tom liste ved feil.
     """
     try:
-        response = requests.get(endpoint)
+        response = http_get(endpoint)
         response.raise_for_status()  # Sjekker statuskode
     except requests.RequestException as e:
         print(f"Feil ved henting av data: {e}")
@@ -31,48 +38,297 @@ def fetch_raw_data_niluAPI(endpoint):
 
     return data
 
-def process_raw_data(data):
+def build_stats_endpoint(from_date, to_date, latitude, longitude, radius, components=None, base_url=NILU_STATS_URL):
     """
-    Prosesserer rådata til en pandas DataFrame.
+    Lager URL for døgnstatistikk fra NILU API for et område og en periode.
 
     Args:
-        data (list): Liste med rådata fra API-et.
+        from_date (str): Startdato ('YYYY-MM-DD').
+        to_date (str): Sluttdato ('YYYY-MM-DD'), inkludert.
+        latitude (float): Breddegrad for sentrum av søket.
+        longitude (float): Lengdegrad for sentrum av søket.
+        radius (int): Søkeradius i km.
+        components (list, optional): Komponenter som skal hentes. Standard er alle.
+        base_url (str): Grunn-URL for statistikk-endepunktet.
 
     Returns:
-        pd.DataFrame: Prosessert data i DataFrame-format.
+        str: Ferdig endepunkt.
+    """
+    endpoint = f"{base_url}/{from_date}/{to_date}/{latitude}/{longitude}/{radius}"
+    if components:
+        endpoint += f"?components={';'.join(components)}"
+    return endpoint
+
+def split_period(from_date, to_date, chunk="year"):
+    """
+    Deler en periode i sammenhengende biter som følger kalenderår eller kalendermåneder.
+    Begge datoene i hver bit er inkludert, slik som i NILU API, så bitene overlapper ikke.
+
+    Args:
+        from_date (str): Startdato ('YYYY-MM-DD').
+        to_date (str): Sluttdato ('YYYY-MM-DD'), inkludert.
+        chunk (str): "year" eller "month".
+
+    Returns:
+        list: Liste med (fra, til)-par som strenger, i kronologisk rekkefølge.
+    """
+    if chunk not in ("year", "month"):
+        raise ValueError(f"Ukjent inndeling: {chunk}. Bruk 'year' eller 'month'.")
+
+    start = date.fromisoformat(from_date[:10])
+    end = date.fromisoformat(to_date[:10])
+    if end < start:
+        raise ValueError(f"Ugyldig periode: {from_date}/{to_date}")
+
+    chunks = []
+    while start <= end:
+        if chunk == "year":
+            next_start = date(start.year + 1, 1, 1)
+        else:
+            next_start = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        chunk_end = min(next_start - timedelta(days=1), end)
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = next_start
+    return chunks
+
+def fetch_chunk_niluAPI(endpoint, retries=2):
+    """
+    Henter én periode fra NILU API. Nye forsøk ved midlertidige feil håndteres av HTTP-klienten.
+
+    Args:
+        endpoint (str): API-endepunktet for perioden.
+        retries (int): Antall nye forsøk etter første feilede forespørsel.
+
+    Returns:
+        list: Liste med data for perioden (tom hvis perioden ikke har målinger).
+
+    Raises:
+        requests.RequestException: Hvis alle forsøk feiler.
+        ValueError: Hvis responsen ikke er gyldig JSON.
+    """
+    response = http_get(endpoint, max_retries=retries)
+    if response.status_code == 404:
+        return []
+    response.raise_for_status()
+    return response.json() or []
+
+def merge_station_records(results):
+    """
+    Slår sammen resultater fra flere perioder til én post per stasjon og komponent,
+    med målingene sortert på dato. Samme tidspunkt fra to perioder telles bare én gang.
+
+    Args:
+        results (list): Liste med resultater (lister med stasjonsposter) fra hver periode.
+
+    Returns:
+        list: Sammenslåtte stasjonsposter på samme format som én samlet henting.
+    """
+    merged = {}
+    for result in results:
+        for record in result:
+            key = (record.get("eoi") or record.get("station"), record.get("component"))
+            if key not in merged:
+                merged[key] = {**record, "values": {}}
+            for måling in record.get("values", []):
+                merged[key]["values"][måling.get("dateTime")] = måling
+
+    for record in merged.values():
+        record["values"] = [record["values"][tid] for tid in sorted(record["values"], key=str)]
+    return list(merged.values())
+
+def fetch_raw_data_parallel_niluAPI(from_date, to_date, latitude, longitude, radius, components=None,
+                                    chunk="year", max_workers=4, retries=2, retry_rounds=1):
+    """
+    Henter rådata fra NILU API ved å dele perioden i år eller måneder som hentes samtidig.
+    Perioder som feiler, hentes på nytt hver for seg før resultatene slås sammen på dato.
+
+    Args:
+        from_date (str): Startdato ('YYYY-MM-DD').
+        to_date (str): Sluttdato ('YYYY-MM-DD'), inkludert.
+        latitude (float): Breddegrad for sentrum av søket.
+        longitude (float): Lengdegrad for sentrum av søket.
+        radius (int): Søkeradius i km.
+        components (list, optional): Komponenter som skal hentes. Standard er alle.
+        chunk (str): "year" eller "month".
+        max_workers (int): Maks antall samtidige forespørsler.
+        retries (int): Antall nye forsøk per forespørsel i HTTP-klienten.
+        retry_rounds (int): Antall ekstra runder der bare perioder som feilet, hentes på nytt.
+
+    Returns:
+        list: Sammenslåtte stasjonsposter.
+
+    Raises:
+        IncompleteFetchError: Hvis noen perioder feiler i alle runder. Feilede perioder ligger i failed, og de
+            sammenslåtte postene for resten i data. Dataene er ufullstendige og skal ikke lagres.
+    """
+    periods = split_period(from_date, to_date, chunk)
+    results = {}
+
+    def fetch(period):
+        endpoint = build_stats_endpoint(*period, latitude, longitude, radius, components)
+        try:
+            return fetch_chunk_niluAPI(endpoint, retries)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Feil ved henting av {period[0]}–{period[1]} fra NILU API:\n→ {e}")
+            return None
+
+    pending = periods
+    for _ in range(retry_rounds + 1):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for period, result in zip(pending, executor.map(fetch, pending)):
+                if result is not None:
+                    results[period] = result
+        pending = [period for period in pending if period not in results]
+        if not pending:
+            break
+
+    data = merge_station_records(results[period] for period in periods if period in results)
+    if pending:
+        raise IncompleteFetchError(f"{len(pending)} av {len(periods)} perioder feilet: {pending}", pending, data)
+    return data
+
+NILU_COMPONENTS = ["NO2", "O3", "SO2"]
+
+# Eksplisitte kolonnetyper for de brede NILU-datasettene (rå, renset og analysert)
+NILU_SCHEMA = {
+    "Dato": "object",
+    **{f"{prefix}_{component}": "float64" for prefix in ("Verdi", "Dekningsgrad") for component in NILU_COMPONENTS},
+    **{f"Verdi_{component}_Trans": "float64" for component in NILU_COMPONENTS},
+}
+
+NILU_LONG_DTYPES = {
+    "Dato": "object",
+    "Stasjon": "category",
+    "EoI": "category",
+    "Breddegrad": "float64",
+    "Lengdegrad": "float64",
+    "Komponent": "category",
+    "Enhet": "category",
+    "Verdi": "float64",
+    "Dekningsgrad": "float64",
+}
+
+def process_raw_data_long(data):
+    """
+    Prosesserer rådata til en lang tabell med én rad per stasjon, komponent og dato.
+    Stasjonen som målte verdien beholdes, slik at enkeltstasjoner kan hentes ut uten ny henting.
+
+    Args:
+        data (list): Liste med rådata fra API-et (én post per stasjon og komponent).
+
+    Returns:
+        pd.DataFrame: Kolonnene i NILU_LONG_DTYPES, med kategoriske stasjons- og komponentkolonner.
+    """
+    dates, values, coverage, counts = [], [], [], []
+    for stasjon in data:
+        målinger = [måling for måling in stasjon.get("values", []) if "dateTime" in måling and "value" in måling]
+        counts.append(len(målinger))
+        dates.extend(måling["dateTime"][:10] for måling in målinger)
+        values.extend(måling["value"] for måling in målinger)
+        coverage.extend(måling.get("coverage") for måling in målinger)
+
+    # Stasjonsinformasjon lagres én gang per post og gjentas for hver måling
+    def repeat(key):
+        return np.repeat(np.array([stasjon.get(key) for stasjon in data], dtype=object), counts)
+
+    df = pd.DataFrame({
+        "Dato": np.array(dates, dtype=object),
+        "Stasjon": repeat("station"),
+        "EoI": repeat("eoi"),
+        "Breddegrad": repeat("latitude"),
+        "Lengdegrad": repeat("longitude"),
+        "Komponent": repeat("component"),
+        "Enhet": repeat("unit"),
+        "Verdi": np.array(values, dtype=np.float64),
+        "Dekningsgrad": np.array(coverage, dtype=np.float64),
+    })
+    return df.astype(NILU_LONG_DTYPES)
+
+def radius_average_view(long_df, components=None):
     """
-    målinger = [
-        {
-            "Dato": måling["dateTime"][:10],
-            "Komponent": stasjon["component"],
-            "Verdi": måling["value"],
-            "Dekningsgrad": måling.get("coverage", None)
-        }
-        for stasjon in data for måling in stasjon.get("values", [])
-        if "dateTime" in måling and "value" in måling
-    ]
-    df = pd.DataFrame(målinger)
-
-    pivot_df = df.pivot_table(
+    Lager gjennomsnittet over alle stasjoner i radiusen per dato og komponent fra den lange tabellen.
+    Gir samme brede format som process_raw_data: Dato, Verdi_<komponent> og Dekningsgrad_<komponent>.
+
+    Args:
+        long_df (pd.DataFrame): Lang tabell fra process_raw_data_long.
+        components (list, optional): Komponenter som skal tas med. Standard er alle.
+
+    Returns:
+        pd.DataFrame: Bred tabell med én rad per dato, eller tom DataFrame hvis det ikke finnes data.
+    """
+    if components is not None:
+        long_df = long_df[long_df["Komponent"].isin(components)]
+    if long_df.empty:
+        return pd.DataFrame()
+
+    pivot_df = long_df.pivot_table(
         index="Dato",
         columns="Komponent",
         values=["Verdi", "Dekningsgrad"],
-        aggfunc="mean"
+        aggfunc="mean",
+        observed=True
     ).reset_index()
 
     pivot_df.columns = [f"{col[0]}_{col[1]}" if col[1] else col[0] for col in pivot_df.columns]
     return pivot_df
 
+def select_stations(long_df, stations=None, components=None):
+    """
+    Henter ut målinger for utvalgte stasjoner og komponenter fra den lange tabellen.
+
+    Args:
+        long_df (pd.DataFrame): Lang tabell fra process_raw_data_long.
+        stations (list, optional): Stasjonsnavn eller EoI-koder. Standard er alle.
+        components (list, optional): Komponenter som skal tas med. Standard er alle.
+
+    Returns:
+        pd.DataFrame: Radene som passer filteret.
+    """
+    mask = np.ones(len(long_df), dtype=bool)
+    if stations is not None:
+        mask &= long_df["Stasjon"].isin(stations).to_numpy() | long_df["EoI"].isin(stations).to_numpy()
+    if components is not None:
+        mask &= long_df["Komponent"].isin(components).to_numpy()
+    return long_df[mask].reset_index(drop=True)
+
+def process_raw_data(data):
+    """
+    Prosesserer rådata til en pandas DataFrame med gjennomsnitt over alle stasjoner i radiusen.
+
+    Args:
+        data (list): Liste med rådata fra API-et.
+
+    Returns:
+        pd.DataFrame: Prosessert data i DataFrame-format.
+    """
+    return radius_average_view(process_raw_data_long(data))
+
+def load_long_table(input_file):
+    """
+    Leser en lagret lang NILU-tabell og gjenoppretter kolonnetypene.
+
+    Args:
+        input_file (str): Filsti til tabellen (Parquet, Arrow eller JSON).
+
+    Returns:
+        pd.DataFrame: Lang tabell med kolonnene i NILU_LONG_DTYPES.
+    """
+    df = load_dataset(input_file)
+    if df.empty:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in NILU_LONG_DTYPES.items()})
+    return df.astype(NILU_LONG_DTYPES)
+
 def save_to_json(df, output_file):
     """
-    Lagrer DataFrame som JSON-fil.
+    Lagrer DataFrame i formatet gitt av filendelsen. Med endelsen .json eksporteres
+    filen som JSON (orient="records", indent=4), ellers som Parquet eller Arrow.
 
     Args:
         df (pd.DataFrame): DataFrame som skal lagres.
-        output_file (str): Filsti for JSON-filen.
+        output_file (str): Filsti for filen.
     """
     try:
-        df.to_json(output_file, orient="records", indent=4, force_ascii=False)
+        save_dataset(df, output_file)
         print(f"Gruppert data er lagret under {output_file}")
     except Exception as e:
         print(f"Feil ved lagring av fil: {e}")
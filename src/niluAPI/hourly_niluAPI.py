@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from .fetch_niluAPI import split_period, build_stats_endpoint, fetch_chunk_niluAPI
+from common.column_store import list_chunks, write_chunk, iter_chunks
+
+NILU_HOURLY_URL = "https://api.nilu.no/obs/historical"
+
+NILU_HOURLY_DTYPES = {
+    "Tid": "datetime64[s]",
+    "Stasjon": "category",
+    "EoI": "category",
+    "Komponent": "category",
+    "Verdi": "float64",
+    "Dekningsgrad": "float64",
+}
+
+
+def process_hourly_data(data):
+    """
+    Gjør rådata med timeverdier fra NILU API om til en lang, kolonnevis tabell.
+    Tidspunktet er lokal tid fra fromTime, slik at datoen stemmer med døgnstatistikken.
+
+    Args:
+        data (list): Liste med stasjonsposter fra API-et, hver med en liste "values".
+
+    Returns:
+        pd.DataFrame: Kolonnene i NILU_HOURLY_DTYPES, én rad per stasjon, komponent og time.
+    """
+    times, values, coverage, counts = [], [], [], []
+    for stasjon in data:
+        målinger = [måling for måling in stasjon.get("values", []) if "fromTime" in måling and "value" in måling]
+        counts.append(len(målinger))
+        times.extend(måling["fromTime"][:19] for måling in målinger)
+        values.extend(måling["value"] for måling in målinger)
+        coverage.extend(måling.get("coverage") for måling in målinger)
+
+    def repeat(key):
+        return np.repeat(np.array([stasjon.get(key) for stasjon in data], dtype=object), counts)
+
+    df = pd.DataFrame({
+        "Tid": np.array(times, dtype="datetime64[s]"),
+        "Stasjon": repeat("station"),
+        "EoI": repeat("eoi"),
+        "Komponent": repeat("component"),
+        "Verdi": np.array(values, dtype=np.float64),
+        "Dekningsgrad": np.array(coverage, dtype=np.float64),
+    })
+    return df.astype(NILU_HOURLY_DTYPES)
+
+
+def ingest_hourly_niluAPI(from_date, to_date, latitude, longitude, radius, store_dir, components=None,
+                          max_workers=4, retries=2, overwrite=False):
+    """
+    Henter timeverdier fra NILU API måned for måned og skriver hver måned rett til et kolonnelager.
+    Bare max_workers måneder holdes i minnet samtidig, og måneder som allerede er lagret hoppes over.
+    Avsluttede måneder uten data lagres som en tom bit, så de heller ikke etterspørres på nytt.
+    Måneder som ikke er over ennå lagres ikke når de er tomme, siden dataene kan komme senere.
+
+    Args:
+        from_date (str): Startdato ('YYYY-MM-DD').
+        to_date (str): Sluttdato ('YYYY-MM-DD'), inkludert.
+        latitude (float): Breddegrad for sentrum av søket.
+        longitude (float): Lengdegrad for sentrum av søket.
+        radius (int): Søkeradius i km.
+        store_dir (str): Rotmappen for kolonnelageret.
+        components (list, optional): Komponenter som skal hentes. Standard er alle.
+        max_workers (int): Maks antall samtidige forespørsler.
+        retries (int): Antall nye forsøk per forespørsel i HTTP-klienten.
+        overwrite (bool): Om måneder som allerede er lagret skal hentes på nytt.
+
+    Returns:
+        dict: Måned ('YYYY-MM') → status ("lagret", "hoppet over", "ingen data" eller "feilet").
+    """
+    stored = set(list_chunks(store_dir))
+    status = {}
+    pending = []
+    today = date.today().isoformat()
+    finished = {}
+    for period in split_period(from_date, to_date, "month"):
+        name = period[0][:7]
+        if name in stored and not overwrite:
+            status[name] = "hoppet over"
+        else:
+            pending.append((name, period))
+            finished[name] = period[1] < today
+
+    def fetch(item):
+        name, (start, end) = item
+        endpoint = build_stats_endpoint(start, end, latitude, longitude, radius, components, base_url=NILU_HOURLY_URL)
+        try:
+            return fetch_chunk_niluAPI(endpoint, retries)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Feil ved henting av timeverdier for {name} fra NILU API:\n→ {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i in range(0, len(pending), max_workers):
+            batch = pending[i:i + max_workers]
+            for (name, _), raw_data in zip(batch, executor.map(fetch, batch)):
+                if raw_data is None:
+                    status[name] = "feilet"
+                    continue
+                df = process_hourly_data(raw_data)
+                if not df.empty or finished[name]:
+                    write_chunk(store_dir, name, df)
+                status[name] = "ingen data" if df.empty else "lagret"
+
+    return dict(sorted(status.items()))
+
+
+def daily_rollup(hourly_df):
+    """
+    Lager døgnverdier fra timeverdier på samme brede format som process_raw_data.
+    Først beregnes døgnmiddel og dekningsgrad (andel av 24 timer med måling) per stasjon,
+    deretter gjennomsnittet over stasjonene i radiusen.
+
+    Args:
+        hourly_df (pd.DataFrame): Lang tabell fra process_hourly_data.
+
+    Returns:
+        pd.DataFrame: Dato, Dekningsgrad_<komponent> og Verdi_<komponent>, én rad per dato.
+    """
+    measured = hourly_df[hourly_df["Verdi"].notna()]
+    if measured.empty:
+        return pd.DataFrame()
+
+    dates = measured["Tid"].to_numpy().astype("datetime64[D]")
+    per_station = measured.groupby([dates, measured["Stasjon"], measured["Komponent"]], observed=True)["Verdi"].agg(["mean", "count"])
+    per_station.index.names = ["Dato", "Stasjon", "Komponent"]
+    per_station = per_station.rename(columns={"mean": "Verdi", "count": "Dekningsgrad"})
+    per_station["Dekningsgrad"] = per_station["Dekningsgrad"].clip(upper=24) / 24 * 100
+
+    daily = per_station.groupby(level=["Dato", "Komponent"], observed=True)[["Dekningsgrad", "Verdi"]].mean()
+    pivot_df = daily.unstack("Komponent")
+    pivot_df.columns = [f"{col[0]}_{col[1]}" for col in pivot_df.columns]
+    pivot_df = pivot_df.reset_index()
+    pivot_df["Dato"] = pivot_df["Dato"].dt.strftime("%Y-%m-%d")
+    return pivot_df
+
+
+def daily_rollup_store(store_dir, chunks=None):
+    """
+    Lager døgnverdier fra et kolonnelager med timeverdier, én måned om gangen.
+
+    Args:
+        store_dir (str): Rotmappen for kolonnelageret.
+        chunks (list, optional): Måneder ('YYYY-MM') som skal tas med. Standard er alle.
+
+    Returns:
+        pd.DataFrame: Døgnverdier på samme format som process_raw_data, sortert på dato.
+    """
+    columns = ["Tid", "Stasjon", "Komponent", "Verdi"]
+    frames = [daily_rollup(df) for _, df in iter_chunks(store_dir, columns, chunks)]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+    value_columns = sorted(col for col in df.columns if col != "Dato")
+    return df[["Dato"] + value_columns].sort_values("Dato").reset_index(drop=True)
@@ -1,43 +1,258 @@
 import pandas as pd
 import json
-from datetime import datetime
-from .fetch_niluAPI import fetch_raw_data_niluAPI, process_raw_data, save_to_json
+from datetime import datetime, date, timedelta
+from .fetch_niluAPI import NILU_STATS_URL, fetch_raw_data_niluAPI, fetch_raw_data_parallel_niluAPI, build_stats_endpoint, process_raw_data, process_raw_data_long, radius_average_view, select_stations, load_long_table, save_to_json, NILU_SCHEMA, NILU_LONG_DTYPES
+from .hourly_niluAPI import ingest_hourly_niluAPI, daily_rollup_store
 from .clean_data_nilu import remove_outliers, interpolate_data, save_clean_data
 from .analyze_data_nilu import analyse_skewness, fix_skewness
 from .visualization_nilu import plot_air_quality
+from common.storage import dataset_path, save_dataset, load_dataset, current_copy, apply_schema
+from common.partitions import write_partitions
+from common.compact import memory_report
+from common.stage_cache import manifest_file, stage_is_current, record_stage
+from common.http_client import IncompleteFetchError
+from common.watermarks import watermark_key, load_watermarks, save_watermarks, next_start_date, update_watermarks, merge_into_store, WATERMARK_LAG_DAYS
 
-def get_raw_data_niluAPI():
+NILU_RAW_FILE = dataset_path("../../data/raw_data/niluAPI_data")
+NILU_STATIONS_FILE = dataset_path("../../data/raw_data/niluAPI_stations")
+NILU_HOURLY_DAILY_FILE = dataset_path("../../data/raw_data/niluAPI_hourly_daily")
+NILU_CLEAN_FILE = dataset_path("../../data/clean_data/niluAPI_clean_data")
+NILU_ANALYZED_FILE = dataset_path("../../data/analyzed_data/niluAPI_analyzed_data")
+# Minnekartlagt kube (dag for dag) med de rensede dataene, for rask innlesing i notatbøker og analyser
+NILU_CLEAN_CUBE = dataset_path("../../data/clean_data/niluAPI_clean_data", "cube")
+# Samme datasett delt opp per år (<mappe>/<område>/<år>). Døgnverdiene er snitt over radiusen,
+# så området brukes som stasjonsnavn.
+NILU_CLEAN_PARTITIONS = "../../data/clean_data/niluAPI"
+NILU_ANALYZED_PARTITIONS = "../../data/analyzed_data/niluAPI"
+NILU_AREA = "oslo_20km"
+# Området, perioden og komponentene standardkjøringen gjelder. Batchkjøringer (combined/batch.py) setter disse per jobb.
+NILU_FROM_DATE = "2010-04-02"
+NILU_TO_DATE = "2016-12-31"
+NILU_LATITUDE = 59.9139
+NILU_LONGITUDE = 10.7522
+NILU_RADIUS = 20
+NILU_COMPONENTS = ("NO2", "O3", "SO2")
+# Vannmerkene for inkrementell henting (se common/watermarks.py) og kolonnelageret for timeverdier
+NILU_WATERMARK_FILE = "../../data/raw_data/watermarks.json"
+NILU_HOURLY_DIR = "../../data/raw_data/niluAPI_hourly"
+NILU_OUTLIER_THRESHOLD = 3
+# Metode og vindu for outlier-grensene, se common/outliers.py
+NILU_OUTLIER_METHOD = "global"
+NILU_OUTLIER_WINDOW = 31
+# Lengste hull (dager på rad) som interpoleres. None fyller alle hull.
+NILU_MAX_GAP = None
+NILU_SKEW_THRESHOLD = 1.0
+
+def _area(latitude=None, longitude=None, radius=None):
+    # Søkeområdet, med NILU_LATITUDE/NILU_LONGITUDE/NILU_RADIUS for verdiene som ikke er gitt
+    return (NILU_LATITUDE if latitude is None else latitude,
+            NILU_LONGITUDE if longitude is None else longitude,
+            NILU_RADIUS if radius is None else radius)
+
+
+def get_raw_data_niluAPI(chunk=None, max_workers=4, save=True):
     """
-    Henter og prosesserer rådata fra NILU API for Oslo og lagrer det i JSON-fil.
+    Henter og prosesserer rådata fra NILU API for området NILU_LATITUDE/NILU_LONGITUDE/NILU_RADIUS
+    og lagrer det som datasett (NILU_RAW_FILE).
 
+    Args:
+        chunk (str, optional): "year" eller "month" for å hente perioden i biter samtidig.
+            Standard er én samlet forespørsel.
+        max_workers (int): Maks antall samtidige forespørsler ved oppdelt henting.
+        save (bool): Om rådataene skal lagres. Med False returneres de bare.
+
+    Returns:
+        pd.DataFrame: Døgnverdiene, eller tom DataFrame hvis ingen data ble hentet eller noen perioder feilet.
     """
-    base_url = "https://api.nilu.no/stats/day"
-    from_date = "2010-04-02"
-    to_date = "2016-12-31"
-    latitude = 59.9139
-    longitude = 10.7522
-    radius = 20
+    from_date = NILU_FROM_DATE
+    to_date = NILU_TO_DATE
+    latitude = NILU_LATITUDE
+    longitude = NILU_LONGITUDE
+    radius = NILU_RADIUS
 
-    endpoint = f"{base_url}/{from_date}/{to_date}/{latitude}/{longitude}/{radius}"
-    output_file = "../../data/raw_data/niluAPI_data.json"
+    output_file = NILU_RAW_FILE
 
-    raw_data = fetch_raw_data_niluAPI(endpoint)
+    if chunk:
+        try:
+            raw_data = fetch_raw_data_parallel_niluAPI(from_date, to_date, latitude, longitude, radius,
+                                                       chunk=chunk, max_workers=max_workers)
+        except IncompleteFetchError as e:
+            print(f"Hentingen er ufullstendig, ingenting er lagret:\n→ {e}")
+            return pd.DataFrame()
+    else:
+        raw_data = fetch_raw_data_niluAPI(build_stats_endpoint(from_date, to_date, latitude, longitude, radius, base_url=NILU_STATS_URL))
     if not raw_data:
         return pd.DataFrame()
 
     processed_data = process_raw_data(raw_data)
-    save_to_json(processed_data, output_file=output_file)
+    if save:
+        save_to_json(processed_data, output_file=output_file)
+    return processed_data
+
+def get_raw_data_niluAPI_stations(from_date=None, to_date=None, latitude=None, longitude=None, radius=None,
+                                  output_file=NILU_STATIONS_FILE, average_file=None, chunk=None, max_workers=4):
+    """
+    Henter døgnverdier fra NILU API og lagrer dem per stasjon i en lang tabell
+    (Dato, Stasjon, EoI, koordinater, Komponent, Enhet, Verdi, Dekningsgrad).
+    Radiusgjennomsnittet kan i tillegg lagres som et avledet, bredt datasett.
+
+    Args:
+        from_date (str, optional): Startdato ('YYYY-MM-DD'). Standard er NILU_FROM_DATE.
+        to_date (str, optional): Sluttdato ('YYYY-MM-DD'). Standard er NILU_TO_DATE.
+        latitude (float, optional): Breddegrad for sentrum av søket. Standard er NILU_LATITUDE.
+        longitude (float, optional): Lengdegrad for sentrum av søket. Standard er NILU_LONGITUDE.
+        radius (int, optional): Søkeradius i km. Standard er NILU_RADIUS.
+        output_file (str): Filsti for den lange tabellen.
+        average_file (str, optional): Filsti for radiusgjennomsnittet, f.eks. NILU_RAW_FILE.
+        chunk (str, optional): "year" eller "month" for å hente perioden i biter samtidig.
+        max_workers (int): Maks antall samtidige forespørsler ved oppdelt henting.
+
+    Returns:
+        pd.DataFrame: Lang tabell med én rad per stasjon, komponent og dato. Tom hvis ingen data ble hentet
+            eller noen perioder feilet.
+    """
+    from_date, to_date = from_date or NILU_FROM_DATE, to_date or NILU_TO_DATE
+    latitude, longitude, radius = _area(latitude, longitude, radius)
+    if chunk:
+        try:
+            raw_data = fetch_raw_data_parallel_niluAPI(from_date, to_date, latitude, longitude, radius,
+                                                       chunk=chunk, max_workers=max_workers)
+        except IncompleteFetchError as e:
+            print(f"Hentingen er ufullstendig, ingenting er lagret:\n→ {e}")
+            return pd.DataFrame()
+    else:
+        raw_data = fetch_raw_data_niluAPI(build_stats_endpoint(from_date, to_date, latitude, longitude, radius))
+    if not raw_data:
+        return pd.DataFrame()
+
+    long_df = process_raw_data_long(raw_data)
+    save_to_json(long_df, output_file=output_file)
+    if average_file:
+        save_to_json(radius_average_view(long_df), output_file=average_file)
+    return long_df
+
+def load_nilu_stations(stations=None, components=None, input_file=NILU_STATIONS_FILE):
+    """
+    Leser lagrede NILU-målinger per stasjon, uten ny henting fra API-et.
+
+    Args:
+        stations (list, optional): Stasjonsnavn eller EoI-koder. Standard er alle.
+        components (list, optional): Komponenter som skal tas med. Standard er alle.
+        input_file (str): Filsti til den lange tabellen.
+
+    Returns:
+        pd.DataFrame: Lang tabell filtrert på stasjoner og komponenter.
+    """
+    return select_stations(load_long_table(input_file), stations, components)
+
+def get_raw_data_niluAPI_incremental(components=None, from_date=None, to_date=None, latitude=None, longitude=None,
+                                     radius=None, output_file=None, watermark_file=None, lag_days=WATERMARK_LAG_DAYS):
+    """
+    Henter bare nye døgnverdier fra NILU API og slår dem sammen med eksisterende rådata.
+    Et vannmerke per komponent lagrer siste dato med måling, og neste henting starter dagen etter
+    det eldste. Komponenter uten målinger i perioden regnes som hentet til og med lag_days dager før to_date.
+
+    Args:
+        components (tuple, optional): Komponentene som skal holdes oppdatert. Standard er NILU_COMPONENTS.
+        from_date (str, optional): Startdato ('YYYY-MM-DD') hvis ingenting er hentet fra før. Standard er NILU_FROM_DATE.
+        to_date (str, optional): Siste dato som skal hentes ('YYYY-MM-DD'). Standard er i dag.
+        latitude (float, optional): Breddegrad for sentrum av søket. Standard er NILU_LATITUDE.
+        longitude (float, optional): Lengdegrad for sentrum av søket. Standard er NILU_LONGITUDE.
+        radius (int, optional): Søkeradius i km. Standard er NILU_RADIUS.
+        output_file (str, optional): Filsti til rådata som nye rader slås sammen med. Standard er NILU_RAW_FILE.
+        watermark_file (str, optional): Filsti til vannmerkene. Standard er NILU_WATERMARK_FILE.
+        lag_days (int): Hvor mange dager en komponent kan publiseres senere enn de andre (se update_watermarks).
+
+    Returns:
+        int: Antall nye eller oppdaterte rader.
+    """
+    components = components or NILU_COMPONENTS
+    from_date = from_date or NILU_FROM_DATE
+    latitude, longitude, radius = _area(latitude, longitude, radius)
+    output_file = output_file or NILU_RAW_FILE
+    watermark_file = watermark_file or NILU_WATERMARK_FILE
+    keys = {
+        watermark_key("nilu", latitude, longitude, radius, component): f"Verdi_{component}"
+        for component in components
+    }
+
+    watermarks = load_watermarks(watermark_file)
+    start = next_start_date(watermarks, keys, from_date)
+    end = to_date or date.today().isoformat()
+    if start > end:
+        print(f"Ingen nye datoer å hente (hentet til og med {date.fromisoformat(start) - timedelta(days=1)}).")
+        return 0
+
+    raw_data = fetch_raw_data_niluAPI(build_stats_endpoint(start, end, latitude, longitude, radius, components))
+    if not raw_data:
+        return 0
+
+    new_df = process_raw_data(raw_data)
+    merged_df = merge_into_store(output_file, new_df, ["Dato"])
+    save_dataset(merged_df, output_file, schema=NILU_SCHEMA)
+
+    # Vannmerkene lagres først når dataene er skrevet, så et avbrudd gir ny henting neste gang
+    save_watermarks(update_watermarks(watermarks, new_df, keys, fetched_to=end, lag_days=lag_days), watermark_file)
+    print(f"{len(new_df)} nye rader fra {start} er slått sammen med {output_file}")
+    return len(new_df)
+
+def get_hourly_data_niluAPI(from_date=None, to_date=None, latitude=None, longitude=None, radius=None,
+                            components=None, store_dir=None, max_workers=4, overwrite=False):
+    """
+    Henter timeverdier fra NILU API og lagrer dem månedsvis i et kolonnelager.
+
+    Args:
+        from_date (str, optional): Startdato ('YYYY-MM-DD'). Standard er NILU_FROM_DATE.
+        to_date (str, optional): Sluttdato ('YYYY-MM-DD'). Standard er NILU_TO_DATE.
+        latitude (float, optional): Breddegrad for sentrum av søket. Standard er NILU_LATITUDE.
+        longitude (float, optional): Lengdegrad for sentrum av søket. Standard er NILU_LONGITUDE.
+        radius (int, optional): Søkeradius i km. Standard er NILU_RADIUS.
+        components (tuple, optional): Komponentene som skal hentes. Standard er NILU_COMPONENTS.
+        store_dir (str, optional): Rotmappen for kolonnelageret. Standard er NILU_HOURLY_DIR.
+        max_workers (int): Maks antall samtidige forespørsler.
+        overwrite (bool): Om måneder som allerede er lagret skal hentes på nytt.
+
+    Returns:
+        dict: Måned → status for hentingen.
+    """
+    from_date, to_date = from_date or NILU_FROM_DATE, to_date or NILU_TO_DATE
+    latitude, longitude, radius = _area(latitude, longitude, radius)
+    store_dir = store_dir or NILU_HOURLY_DIR
+    status = ingest_hourly_niluAPI(from_date, to_date, latitude, longitude, radius, store_dir,
+                                   components=components or NILU_COMPONENTS, max_workers=max_workers, overwrite=overwrite)
+    counts = pd.Series(status, dtype=object).value_counts()
+    print(", ".join(f"{count} {state}" for state, count in counts.items()) or "Ingen måneder å hente.")
+    return status
+
+def rollup_hourly_niluAPI(store_dir=None, output_file=NILU_HOURLY_DAILY_FILE):
+    """
+    Lager døgnverdier fra lagrede timeverdier og lagrer dem på samme format som døgnstatistikken,
+    slik at de kan renses med clean_raw_data(raw_data_file=output_file).
+
+    Args:
+        store_dir (str, optional): Rotmappen for kolonnelageret med timeverdier. Standard er NILU_HOURLY_DIR.
+        output_file (str): Filsti for døgnverdiene.
+
+    Returns:
+        pd.DataFrame: Døgnverdiene.
+    """
+    daily_df = daily_rollup_store(store_dir or NILU_HOURLY_DIR)
+    if daily_df.empty:
+        print("Ingen timeverdier å lage døgnverdier av.")
+        return daily_df
+    save_to_json(daily_df, output_file=output_file)
+    return daily_df
 
 def check_and_clean_nilu_duplicates():
     """
-    Leser data fra NILU API JSON-fil, viser duplikater, fjerner dem og returnerer en renset DataFrame.
+    Leser data fra NILU API-datasettet, viser duplikater, fjerner dem og returnerer en renset DataFrame.
 
     Returns:
         pd.DataFrame: Renset DataFrame uten duplikat-datoer.
     """
     from frostAPI.clean_data_frost import print_duplicate_rows, remove_duplicate_dates
-    filepath = "../../data/raw_data/niluAPI_data.json"
-    df = pd.read_json(filepath)
+    filepath = NILU_RAW_FILE
+    df = load_dataset(filepath, schema=NILU_SCHEMA)
     subset = ["Dato"]
 
     print("Før opprydding:")
@@ -55,82 +270,170 @@ def check_and_clean_nilu_duplicates():
 
 def analyze_outliers_nilu():
     """
-    Leser Frost API-data fra en JSON-fil, analyserer og visualiserer outliers.
+    Leser NILU API-data fra datasettet, analyserer og visualiserer outliers.
     """
     from frostAPI.clean_data_frost import analyze_and_plot_outliers
-    df_frost = pd.read_json("../../data/raw_data/niluAPI_data.json")
+    df_frost = load_dataset(NILU_RAW_FILE, schema=NILU_SCHEMA)
     variables = ['Verdi_NO2', 'Verdi_SO2', 'Verdi_O3']
     threshold = 3
 
     analyze_and_plot_outliers(df_frost, variables, threshold)  
 
-def clean_raw_data():
+def clean_raw_data(raw_data_file=NILU_RAW_FILE, force=False, df=None, save=True):
     """
     Henter rådata fra NILU API, fjerner outliers og interpolerer manglende verdier.
-    Lagrer deretter renset data i en JSON-fil.
+    Lagrer deretter renset data (NILU_CLEAN_FILE). Trinnet hoppes over hvis rådataene og parameterne
+    er de samme som ved forrige kjøring (se common/stage_cache.py). Med df renses rådataene fra forrige
+    trinn direkte i minnet, og med save=False lagres ingenting.
+
+    Args:
+        raw_data_file (str): Filsti til døgnverdiene, f.eks. fra rollup_hourly_niluAPI.
+        force (bool, optional): Kjør trinnet selv om utdataene er oppdatert.
+        df (pd.DataFrame, optional): Døgnverdier fra get_raw_data_niluAPI. Brukes i stedet for raw_data_file.
+        save (bool, optional): Om renset data skal lagres. Default er True.
+
+    Returns:
+        pd.DataFrame: Renset data, eller None hvis trinnet ble hoppet over eller feilet.
     """
-    raw_data_file = "../../data/raw_data/niluAPI_data.json"
-    clean_data_file = "../../data/clean_data/niluAPI_clean_data.json"
-    cols = ["Verdi_NO2", "Verdi_O3", "Verdi_SO2"]
-    from_date = "2010-04-02"
-    to_date = "2016-12-31"
+    clean_data_file = NILU_CLEAN_FILE
+    cols = [f"Verdi_{component}" for component in NILU_COMPONENTS]
+    threshold = NILU_OUTLIER_THRESHOLD
+    from_date = NILU_FROM_DATE
+    to_date = NILU_TO_DATE
+
+    manifest = manifest_file(clean_data_file)
+    params = {"threshold": threshold, "cols": cols, "from_date": from_date, "to_date": to_date,
+              "method": NILU_OUTLIER_METHOD, "window": NILU_OUTLIER_WINDOW, "max_gap": NILU_MAX_GAP}
+    outputs = [clean_data_file, NILU_CLEAN_CUBE, NILU_CLEAN_PARTITIONS]
+    if df is None and save and not force and stage_is_current(manifest, [raw_data_file], params, outputs):
+        print(f"Renset data er oppdatert ({clean_data_file}). Hopper over rensing.")
+        return None
 
     try:
         # Fjerner outliers
-        pivot_df = remove_outliers(raw_data_file, cols, threshold=3)
+        pivot_df = remove_outliers(raw_data_file if df is None else df, cols, threshold=threshold,
+                                   method=NILU_OUTLIER_METHOD, window=NILU_OUTLIER_WINDOW)
         if pivot_df.empty:
             print("Ingen data tilgjengelig etter outlier-fjerning.")
-            return
+            return None
 
-        # Interpolerer og lagrer renset data
-        interpolated_df = interpolate_data(pivot_df, from_date, to_date)
-        save_clean_data(interpolated_df, clean_data_file)
+        # Interpolerer og lagrer renset data. Manifestet skrives bare når rådataene ble lest fra fil.
+        interpolated_df = interpolate_data(pivot_df, from_date, to_date, max_gap=NILU_MAX_GAP)
+        if save:
+            save_clean_data(interpolated_df, clean_data_file)
+            write_partitions(interpolated_df, NILU_CLEAN_PARTITIONS, station=NILU_AREA, schema=NILU_SCHEMA, merge=False)
+            save_dataset(interpolated_df, NILU_CLEAN_CUBE, schema=NILU_SCHEMA)
+            if df is None:
+                record_stage(manifest, "nilu_renset", [raw_data_file], params, outputs)
+        return interpolated_df
 
     except Exception as e:
         print(f"Feil i renseprosessen: {e}")
+        return None
 
-def fix_skewness_data_niluAPI():
+def fix_skewness_data_niluAPI(force=False, df=None, save=True):
     """
     Henter renset data fra NILU API, analyserer og fikser skjevhet i måleverdiene.
-    Lagrer kun relevante kolonner (transformerte verdier, dato og dekningsgrad).
+    Lagrer kun relevante kolonner (transformerte verdier, dato og dekningsgrad). Trinnet hoppes over
+    hvis de rensede dataene og parameterne er de samme som ved forrige kjøring.
+
+    Args:
+        force (bool, optional): Kjør trinnet selv om utdataene er oppdatert.
+        df (pd.DataFrame, optional): Renset data fra clean_raw_data. Standard er å lese NILU_CLEAN_FILE.
+        save (bool, optional): Om transformert data skal lagres. Default er True.
+
+    Returns:
+        pd.DataFrame: Transformert data, eller None hvis trinnet ble hoppet over eller feilet.
     """
-    clean_data_file = "../../data/clean_data/niluAPI_clean_data.json"
-    analyzed_data_file = "../../data/analyzed_data/niluAPI_analyzed_data.json"
-    threshold = 1.0
-    cols = ["Verdi_NO2", "Verdi_O3", "Verdi_SO2"]
+    clean_data_file = NILU_CLEAN_FILE
+    analyzed_data_file = NILU_ANALYZED_FILE
+    threshold = NILU_SKEW_THRESHOLD
+    cols = [f"Verdi_{component}" for component in NILU_COMPONENTS]
+
+    manifest = manifest_file(analyzed_data_file)
+    params = {"threshold": threshold, "cols": cols}
+    outputs = [analyzed_data_file, NILU_ANALYZED_PARTITIONS]
+    from_file = df is None
+    if from_file and save and not force and stage_is_current(manifest, [clean_data_file], params, outputs):
+        print(f"Transformert data er oppdatert ({analyzed_data_file}). Hopper over transformasjon.")
+        return None
 
     try:
-        df = pd.read_json(clean_data_file, orient="records", encoding="utf-8")
-    except ValueError as e:
+        df = load_dataset(clean_data_file, schema=NILU_SCHEMA) if from_file else apply_schema(df, NILU_SCHEMA)
+    except (ValueError, FileNotFoundError) as e:
         print(f"Feil ved lesing av fil: {e}")
-        return
+        return None
 
     skewness_dict = analyse_skewness(df, cols)
     df_transformed = fix_skewness(df, skewness_dict, threshold)
 
     if df_transformed.empty:
         print("Ingen data å lagre.")
-        return
+        return None
 
     transformed_columns = [f"{col}_Trans" for col in cols]
-    final_columns = ['Dato', 'Dekningsgrad_NO2', 'Dekningsgrad_O3', 'Dekningsgrad_SO2'] + transformed_columns
+    final_columns = ['Dato'] + [f"Dekningsgrad_{component}" for component in NILU_COMPONENTS] + transformed_columns
     df_final = df_transformed[final_columns]
+    if not save:
+        return df_final
 
     try:
-        df_final.to_json(analyzed_data_file, orient="records", indent=4, force_ascii=False)
+        save_dataset(df_final, analyzed_data_file, schema=NILU_SCHEMA)
+        write_partitions(df_final, NILU_ANALYZED_PARTITIONS, station=NILU_AREA, schema=NILU_SCHEMA, merge=False)
+        if from_file:
+            record_stage(manifest, "nilu_transformert", [clean_data_file], params, outputs)
         print(f"\nTransformert data lagret i: {analyzed_data_file}")
     except Exception as e:
         print(f"Feil ved lagring av transformert data: {e}")
+    return df_final
+
+def run_pipeline_niluAPI(fetch=False, raw_data_file=NILU_RAW_FILE, save=False):
+    """
+    Kjører henting, rensing og transformasjon av NILU-data etter hverandre i minnet. Hvert trinn får
+    DataFrame-en fra forrige trinn direkte, uten å skrive og lese filer mellom trinnene.
+
+    Args:
+        fetch (bool, optional): Om rådataene skal hentes fra NILU API. Ellers leses de fra raw_data_file.
+        raw_data_file (str, optional): Filsti til døgnverdiene når de ikke hentes.
+        save (bool, optional): Om resultatet av hvert trinn også skal lagres. Default er False.
+
+    Returns:
+        dict: Trinn ("rådata", "renset", "transformert") → DataFrame. Tom hvis ingen data ble hentet.
+    """
+    raw = get_raw_data_niluAPI(save=save) if fetch else load_dataset(raw_data_file)
+    if raw is None or raw.empty:
+        return {}
+
+    clean = clean_raw_data(raw_data_file, df=raw, save=save)
+    transformed = fix_skewness_data_niluAPI(df=clean, save=save) if clean is not None else None
+    return {"rådata": raw, "renset": clean, "transformert": transformed}
+
+def memory_report_niluAPI():
+    """
+    Viser minnebruken for NILU-dataene per trinn (stasjonstabell, rådata, renset og transformert),
+    slik de leses i dag og med kompakte kolonnetyper.
+
+    Returns:
+        pd.DataFrame: Én rad per trinn, se common.compact.memory_report.
+    """
+    stages = {"stasjoner": NILU_STATIONS_FILE, "rådata": NILU_RAW_FILE, "renset": NILU_CLEAN_FILE,
+              "transformert": NILU_ANALYZED_FILE}
+    frames = {}
+    for stage, file in stages.items():
+        try:
+            frames[stage] = load_dataset(file, schema=NILU_LONG_DTYPES if stage == "stasjoner" else NILU_SCHEMA)
+        except FileNotFoundError:
+            continue
+    report = memory_report(frames)
+    print(report.to_string(index=False, float_format="%.2f"))
+    return report
 
 def load_and_plot_air_quality():
     """
     Leser luftkvalitetsdata og kaller `plot_air_quality` med riktige parametere.
     Ansvarlig for å bestemme fargekoding basert på datakvalitet.
     """
-    with open("../../data/clean_data/niluAPI_clean_data.json", "r", encoding="utf-8") as file:
-        data = json.load(file)
-
-    df = pd.DataFrame(data)
+    df = load_dataset(current_copy(NILU_CLEAN_CUBE, NILU_CLEAN_FILE), schema=NILU_SCHEMA)
 
     verdi_kolonner = ['Verdi_NO2', 'Verdi_O3', 'Verdi_SO2']
     dekningsgrad_kolonner = ['Dekningsgrad_NO2', 'Dekningsgrad_O3', 'Dekningsgrad_SO2']
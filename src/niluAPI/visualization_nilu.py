@@ -1,7 +1,8 @@
 import pandas as pd
-import plotly.graph_objects as go
 
 def plot_air_quality(df, verdi_kolonner, titler, fargekolonne, tidskolonne="Dato"):
+    import plotly.graph_objects as go
+
     df[tidskolonne] = pd.to_datetime(df[tidskolonne])
 
     fig = go.Figure()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from SQL.warehouse import close_connections, get_connection, load_table
+from SQL.rollups import add_days
+from SQL.extremes import top_indices, select_extremes, merge_extremes, top_n
+
+
+def sample_frame(start="2018-01-01", end="2020-12-31", stations=3, seed=2):
+    dates = pd.date_range(start, end).strftime("%Y-%m-%d")
+    n = stations * len(dates)
+    rng = np.random.default_rng(seed)
+    temperature = rng.normal(5, 8, n).round(1)
+    temperature[::11] = np.nan
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), stations),
+        "Stasjon": np.repeat(np.arange(stations), len(dates)),
+        "Temperatur": temperature,
+    })
+
+
+def sorted_reference(df, column, n, largest):
+    # De n mest ekstreme radene med full sortering, til sammenligning
+    return df.dropna(subset=[column]).sort_values(column, ascending=not largest, kind="stable").head(n)
+
+
+class TestExtremes(unittest.TestCase):
+
+    def test_top_indices(self):
+        # Tester at delvis utvalg gir samme rekkefølge som full sortering, uten NaN og med like verdier i opprinnelig rekkefølge
+        values = np.array([3.0, np.nan, 7.0, 7.0, -1.0, 5.0])
+        self.assertEqual(top_indices(values, 3).tolist(), [2, 3, 5])
+        self.assertEqual(top_indices(values, 2, largest=False).tolist(), [4, 0])
+        self.assertEqual(top_indices(values, 10).tolist(), [2, 3, 5, 0, 4])
+        self.assertEqual(top_indices(values, 0).tolist(), [])
+
+    def test_select_extremes_matches_sort(self):
+        # Tester utvalget mot full sortering, både samlet og per år og per stasjon
+        df = sample_frame()
+        for largest in (True, False):
+            result = select_extremes(df, "Temperatur", 10, largest)
+            expected = sorted_reference(df, "Temperatur", 10, largest)
+            self.assertEqual(result["Temperatur"].tolist(), expected["Temperatur"].tolist())
+
+        per_year = select_extremes(df, "Temperatur", 5, by="år")
+        self.assertEqual(per_year["Periode"].unique().tolist(), ["2018", "2019", "2020"])
+        for year, group in per_year.groupby("Periode"):
+            expected = sorted_reference(df[df["Dato"].str[:4] == year], "Temperatur", 5, True)
+            self.assertEqual(group["Temperatur"].tolist(), expected["Temperatur"].tolist())
+
+        per_station = select_extremes(df, "Temperatur", 3, largest=False, by="Stasjon")
+        self.assertEqual(per_station.groupby("Stasjon").size().tolist(), [3, 3, 3])
+
+    def test_merge_extremes_after_append(self):
+        # Tester at et utvalg som oppdateres med nye rader er det samme som et nytt utvalg over alle radene
+        old = sample_frame("2018-01-01", "2019-12-31")
+        new = sample_frame("2020-01-01", "2020-12-31", seed=3)
+        previous = select_extremes(old, "Temperatur", 5, by="sesong")
+        merged = merge_extremes(previous, new, "Temperatur", 5, by="sesong")
+        expected = select_extremes(pd.concat([old, new], ignore_index=True), "Temperatur", 5, by="sesong")
+        pd.testing.assert_frame_equal(merged, expected)
+
+    def test_top_n_in_warehouse(self):
+        # Tester at tabeller i lageret bruker en indeks på variabelen, og at indeksen følger nye dager
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "lager.sqlite")
+            source = os.path.join(tmp, "frost.parquet")
+            df = sample_frame()
+            df.to_parquet(source, index=False)
+            load_table("frost", source, db)
+
+            result = top_n("frost", "Temperatur", 5, columns=["Dato", "Temperatur"], path=db)
+            self.assertEqual(result["Temperatur"].tolist(), sorted_reference(df, "Temperatur", 5, True)["Temperatur"].tolist())
+            plan = " ".join(row[3] for row in get_connection(db).execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM frost ORDER BY Temperatur DESC LIMIT 5"))
+            self.assertIn("idx_frost_Temperatur", plan)
+
+            add_days("frost", pd.DataFrame({"Dato": ["2021-01-01"], "Stasjon": [0], "Temperatur": [99.0]}), path=db)
+            self.assertEqual(top_n("frost", "Temperatur", 1, path=db)["Dato"].item(), "2021-01-01")
+            per_year = top_n("frost", "Temperatur", 2, largest=False, by="år", path=db)
+            self.assertEqual(per_year["Periode"].tolist(), ["2018", "2018", "2019", "2019", "2020", "2020", "2021"])
+            close_connections()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from SQL import rollups
+from SQL.warehouse import close_connections, load_table
+from SQL.rollups import bucket_keys, compute_rollup, refresh_rollups, ensure_rollups, add_days, sync_table, lookup_rollup, rollup_means
+from frostAPI.visualization_frost import get_season, calculate_seasonal_stats, seasonal_stats_from_rollup
+
+
+def sample_frame(start="2019-11-20", end="2020-03-10"):
+    dates = pd.date_range(start, end).strftime("%Y-%m-%d")
+    n = 2 * len(dates)
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), 2),
+        "Stasjon": np.repeat([0, 1], len(dates)),
+        "Temperatur": rng.normal(0, 5, n),
+        "Nedbør": np.where(np.arange(n) % 7 == 0, np.nan, rng.gamma(0.5, 4, n)),
+    })
+
+
+class TestRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "lager.sqlite")
+        self.source = os.path.join(self.tmp.name, "frost.parquet")
+        sample_frame().to_parquet(self.source, index=False)
+        load_table("frost", self.source, self.db)
+
+    def tearDown(self):
+        close_connections()
+        self.tmp.cleanup()
+
+    def test_bucket_keys(self):
+        # Tester periodenøklene, også at sesongene følger get_season
+        dates = pd.Series(["2019-12-31", "2020-01-01", "2020-06-15"])
+        self.assertEqual(bucket_keys(dates, "uke").tolist(), pd.to_datetime(dates).dt.strftime("%Y-U%U").tolist())
+        self.assertEqual(bucket_keys(dates, "måned").tolist(), ["2019-12", "2020-01", "2020-06"])
+        self.assertEqual(bucket_keys(dates, "år").tolist(), ["2019", "2020", "2020"])
+        seasons = [f"{d.year}-{get_season(d)}" for d in pd.to_datetime(dates)]
+        self.assertEqual(bucket_keys(dates, "sesong").tolist(), seasons)
+        with self.assertRaises(ValueError):
+            bucket_keys(dates, "time")
+
+    def test_compute_rollup_matches_pandas(self):
+        # Tester at aggregatene er de samme som groupby i pandas, med NaN utelatt fra antall og snitt
+        df = sample_frame()
+        result = compute_rollup(df, "måned", ["Temperatur", "Nedbør"])
+        months = df["Dato"].str[:7]
+        expected = df.groupby(months)["Nedbør"].agg(["size", "count", "mean", "std", "min", "max"])
+        rain = result[result["Variabel"] == "Nedbør"].set_index("Periode")
+        np.testing.assert_array_equal(rain["Rader"], expected["size"])
+        np.testing.assert_array_equal(rain["Antall"], expected["count"])
+        np.testing.assert_allclose(rain[["Snitt", "Std", "Min", "Maks"]], expected[["mean", "std", "min", "max"]])
+
+    def test_incremental_refresh_matches_full_rebuild(self):
+        # Tester at nye og rettede dager gir de samme aggregatene som en full omberegning,
+        # og at bare periodene de nye dagene hører til blir regnet ut
+        refresh_rollups("frost", path=self.db)
+        new_days = sample_frame("2020-03-08", "2020-03-20")
+        new_days["Temperatur"] += 100
+        with patch("SQL.rollups.compute_rollup", wraps=rollups.compute_rollup) as mock_compute:
+            add_days("frost", new_days, path=self.db)
+        months = {call.args[0]["Dato"].str[:7].max() for call in mock_compute.call_args_list if call.args[1] == "måned"}
+        self.assertEqual(months, {"2020-03"})
+
+        combined = pd.concat([sample_frame(), new_days]).drop_duplicates(["Dato", "Stasjon"], keep="last")
+        for period in rollups.PERIODS:
+            expected = compute_rollup(combined, period, ["Nedbør", "Temperatur"])
+            result = lookup_rollup("frost", period, ["Nedbør", "Temperatur"], path=self.db)
+            self.assertEqual(result["Periode"].tolist(), expected["Periode"].tolist())
+            np.testing.assert_allclose(result[["Rader", "Antall", "Snitt", "Std", "Min", "Maks"]].to_numpy(float),
+                                       expected[["Rader", "Antall", "Snitt", "Std", "Min", "Maks"]].to_numpy(float))
+
+    def test_add_days_with_datetime_dates(self):
+        # Tester at nye dager med Dato som datetime erstatter radene med samme dato og stasjon
+        refresh_rollups("frost", path=self.db)
+        new_days = sample_frame("2020-03-01", "2020-03-10")
+        new_days["Dato"] = pd.to_datetime(new_days["Dato"])
+        new_days["Temperatur"] = 50.0
+        add_days("frost", new_days, path=self.db)
+        result = lookup_rollup("frost", "måned", ["Temperatur"], path=self.db).set_index("Periode")
+        self.assertEqual(result.loc["2020-03", "Rader"], 20)
+        self.assertEqual(result.loc["2020-03", "Snitt"], 50.0)
+
+    def test_sync_table_adds_only_changed_days(self):
+        # Tester at et endret datasett bare gir nye og endrede dager til add_days, med samme resultat som full innlasting
+        sync_table("frost", self.source, path=self.db)
+        updated = pd.concat([sample_frame(), sample_frame("2020-03-11", "2020-03-15")], ignore_index=True)
+        updated.loc[0, "Temperatur"] = 100.0
+        updated.to_parquet(self.source, index=False)
+        os.utime(self.source, (0, 0))
+        with patch("SQL.rollups.add_days", wraps=rollups.add_days) as mock_add:
+            sync_table("frost", self.source, path=self.db)
+        self.assertEqual(len(mock_add.call_args.args[1]), 11)
+
+        expected = compute_rollup(updated, "måned", ["Nedbør", "Temperatur"])
+        result = lookup_rollup("frost", "måned", ["Nedbør", "Temperatur"], path=self.db)
+        np.testing.assert_allclose(result[["Rader", "Antall", "Snitt", "Std", "Min", "Maks"]].to_numpy(float),
+                                   expected[["Rader", "Antall", "Snitt", "Std", "Min", "Maks"]].to_numpy(float))
+
+        updated.iloc[10:].to_parquet(self.source, index=False)
+        os.utime(self.source, (1, 1))
+        with patch("SQL.rollups.add_days") as mock_add:
+            sync_table("frost", self.source, path=self.db)
+            mock_add.assert_not_called()
+        self.assertEqual(lookup_rollup("frost", "år", ["Temperatur"], path=self.db)["Rader"].sum(), len(updated) - 10)
+
+    def test_ensure_rollups_follows_source(self):
+        # Tester at aggregatene bygges én gang, og på nytt når tabellen er lest inn fra et endret datasett
+        self.assertTrue(ensure_rollups("frost", path=self.db))
+        self.assertFalse(ensure_rollups("frost", path=self.db))
+        sample_frame("2021-01-01", "2021-01-31").to_parquet(self.source, index=False)
+        os.utime(self.source, (0, 0))
+        load_table("frost", self.source, self.db)
+        self.assertTrue(ensure_rollups("frost", path=self.db))
+        self.assertEqual(rollup_means("frost", "år", ["Temperatur"], path=self.db)["Periode"].tolist(), ["2021"])
+        self.assertIsNone(rollup_means("ukjent", "år", ["Temperatur"], path=self.db))
+
+    def test_seasonal_stats_from_rollup(self):
+        # Tester at sesongaggregatene gir samme tabell som calculate_seasonal_stats
+        refresh_rollups("frost", path=self.db)
+        result = seasonal_stats_from_rollup(lookup_rollup("frost", "sesong", path=self.db))
+        expected = calculate_seasonal_stats(sample_frame())
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from SQL import warehouse
+from SQL.warehouse import get_connection, close_connections, load_table, register_frame, sql_query, filtered_view
+from SQL.sql_analysis import analyze_weekly_avg_data
+from common.diagnostics import diagnostics_mode
+
+
+def sample_frame():
+    dates = pd.date_range("2019-12-25", "2020-01-20").strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "Dato": np.tile(np.array(dates, dtype=object), 2),
+        "Stasjon": np.repeat([0, 1], len(dates)),
+        "Temperatur": np.arange(2 * len(dates), dtype=float),
+        "Nedbør": np.where(np.arange(2 * len(dates)) % 5 == 0, np.nan, 1.0),
+        "Vindhastighet": np.full(2 * len(dates), 3.0),
+        "Interpolert_Temperatur": np.arange(2 * len(dates)) % 2 == 0,
+    })
+
+
+class TestWarehouse(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "lager.sqlite")
+        self.source = os.path.join(self.tmp.name, "frost.parquet")
+        sample_frame().to_parquet(self.source, index=False)
+
+    def tearDown(self):
+        close_connections()
+        self.tmp.cleanup()
+
+    def test_table_is_loaded_once_and_indexed(self):
+        # Tester at datasettet bare leses inn igjen når filen er endret, og at Dato og Stasjon har indeks
+        with patch("SQL.warehouse.load_dataset", wraps=warehouse.load_dataset) as mock_load:
+            load_table("frost", self.source, self.db)
+            load_table("frost", self.source, self.db)
+            self.assertEqual(mock_load.call_count, 1)
+            sample_frame().head(10).to_parquet(self.source, index=False)
+            os.utime(self.source, (0, 0))
+            load_table("frost", self.source, self.db)
+            self.assertEqual(mock_load.call_count, 2)
+
+        indexes = {row[1] for row in get_connection(self.db).execute("PRAGMA index_list('frost')")}
+        self.assertEqual(indexes, {"idx_frost_Dato", "idx_frost_Stasjon"})
+        self.assertEqual(sql_query("SELECT COUNT(*) AS n FROM frost", self.db)["n"].item(), 10)
+
+    def test_connection_is_reused(self):
+        # Tester at samme tilkobling brukes for alle spørringer mot samme database
+        self.assertIs(get_connection(self.db), get_connection(self.db))
+
+    def test_frame_is_copied_once(self):
+        # Tester at samme DataFrame bare kopieres inn i lageret én gang, og at NaN blir NULL
+        df = sample_frame()
+        with patch("SQL.warehouse.write_table", wraps=warehouse.write_table) as mock_write:
+            first = sql_query("SELECT SUM(Temperatur) AS s FROM df", self.db, df=df)
+            second = sql_query("SELECT COUNT(Nedbør) AS n FROM df", self.db, df=df)
+            self.assertEqual(mock_write.call_count, 1)
+        self.assertEqual(first["s"].item(), df["Temperatur"].sum())
+        self.assertEqual(second["n"].item(), df["Nedbør"].count())
+        self.assertEqual(register_frame(df, self.db), register_frame(df, self.db))
+
+    def test_frame_changed_in_place_is_copied_again(self):
+        # Tester at en DataFrame som endres på stedet ikke gir svar fra den gamle kopien
+        df = pd.DataFrame({"x": [1, 2, 3]})
+        self.assertEqual(sql_query("SELECT SUM(x) AS s FROM df", self.db, df=df)["s"].item(), 6)
+        df["x"] = [10, 20, 30]
+        self.assertEqual(sql_query("SELECT SUM(x) AS s FROM df", self.db, df=df)["s"].item(), 60)
+        df.loc[0, "x"] = 0
+        self.assertEqual(sql_query("SELECT SUM(x) AS s FROM df", self.db, df=df)["s"].item(), 50)
+
+    def test_filtered_view(self):
+        # Tester dato- og stasjonsfilteret mot samme filter i pandas
+        load_table("frost", self.source, self.db)
+        view = filtered_view("frost", start="2020-01-01", end="2020-01-05", stations=[1], path=self.db)
+        result = sql_query("SELECT Dato, Temperatur FROM v ORDER BY Dato", self.db, v=view)
+        df = sample_frame()
+        expected = df[(df["Dato"] >= "2020-01-01") & (df["Dato"] <= "2020-01-05") & (df["Stasjon"] == 1)]
+        self.assertEqual(result["Temperatur"].tolist(), expected["Temperatur"].tolist())
+        self.assertEqual(filtered_view("frost", path=self.db), "frost")
+
+    def test_weekly_average_matches_pandas_weeks(self):
+        # Tester at ukenummeret fra SQLite er det samme som strftime('%Y-U%U') i pandas, også rundt nyttår
+        df = sample_frame()
+        with patch("SQL.warehouse.WAREHOUSE_FILE", self.db), diagnostics_mode("headless"):
+            result = analyze_weekly_avg_data(df, "Dato", "Nedbør", "Temperatur", "Vindhastighet")
+        weeks = pd.to_datetime(df["Dato"]).dt.strftime("%Y-U%U")
+        expected = df.groupby(weeks)["Temperatur"].mean()
+        self.assertEqual(result["Uke"].tolist(), expected.index.tolist())
+        np.testing.assert_allclose(result["Avg_Temperatur"], expected.to_numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from combined.batch import load_batch_config, run_batch, job_directory, SUMMARY_COLUMNS
+
+RAW_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../data/raw_data"))
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        # Jobbene bruker kopier av rådataene i data/raw_data, så ingenting hentes fra API-ene
+        self.tmp = tempfile.mkdtemp()
+        for name in ("frostAPI_data.parquet", "niluAPI_data.parquet"):
+            shutil.copy(os.path.join(RAW_DIR, name), self.tmp)
+        self.config_file = os.path.join(self.tmp, "jobs.json")
+        self.write_config([
+            {"name": "frost_oslo", "source": "frost", "station": "SN18700", "raw_file": "frostAPI_data.parquet"},
+            {"name": "nilu_oslo", "source": "nilu", "latitude": 59.9139, "longitude": 10.7522, "radius": 20,
+             "raw_file": "niluAPI_data.parquet"},
+            {"name": "nilu_no2", "source": "nilu", "latitude": 59.9139, "longitude": 10.7522, "radius": 20,
+             "components": ["NO2"], "raw_file": "niluAPI_data.parquet"},
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_config(self, jobs, **settings):
+        config = {"defaults": {"from_date": "2010-04-02", "to_date": "2016-12-31", "output_dir": "ut"},
+                  "jobs": jobs, **settings}
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+    def test_load_batch_config(self):
+        # Standardverdier fylles inn, og filstier tolkes relativt til konfigurasjonsfilen
+        config = load_batch_config(self.config_file)
+        self.assertEqual(len(config["jobs"]), 3)
+        job = config["jobs"][0]
+        self.assertEqual(job["from_date"], "2010-04-02")
+        self.assertEqual(job["raw_file"], os.path.join(self.tmp, "frostAPI_data.parquet"))
+        self.assertEqual(job_directory(job), os.path.join(self.tmp, "ut", "frost_oslo"))
+
+    def test_load_batch_config_invalid(self):
+        # Ukjente nøkler, ukjent kilde, manglende nøkler og like navn gir ValueError
+        invalid = [
+            [{"name": "a", "source": "frost", "station": "SN18700", "stasjon": "SN18700"}],
+            [{"name": "a", "source": "met", "station": "SN18700"}],
+            [{"name": "a", "source": "nilu", "latitude": 59.9}],
+            [{"name": "a", "source": "frost", "station": "SN18700"}, {"name": "a", "source": "frost", "station": "SN50540"}],
+        ]
+        for jobs in invalid:
+            self.write_config(jobs)
+            with self.assertRaises(ValueError):
+                load_batch_config(self.config_file)
+
+    def test_run_batch(self):
+        # Alle jobbene kjøres i egne prosesser og lagrer resultatene i hver sin mappe
+        result = run_batch(self.config_file, max_workers=2, max_memory_mb=2048)
+        self.assertEqual(list(result.columns), SUMMARY_COLUMNS)
+        self.assertEqual(list(result["Jobb"]), ["frost_oslo", "nilu_oslo", "nilu_no2"])
+        self.assertEqual(list(result["Status"]), ["ok", "ok", "ok"])
+        self.assertTrue((result["Rader"] > 0).all())
+        for name, file in [("frost_oslo", "frostAPI_analyzed_data.parquet"), ("nilu_oslo", "niluAPI_analyzed_data.parquet")]:
+            self.assertTrue(os.path.exists(os.path.join(self.tmp, "ut", name, "analyzed_data", file)))
+            self.assertTrue(os.path.exists(os.path.join(self.tmp, "ut", name, "logg.txt")))
+
+        # En ny kjøring uten endringer hopper over alle trinnene
+        result = run_batch(self.config_file, max_workers=2)
+        self.assertEqual(list(result["Status"]), ["uendret", "uendret", "uendret"])
+
+    def test_run_batch_failed_job(self):
+        # En jobb som feiler stopper ikke de andre
+        self.write_config([
+            {"name": "mangler", "source": "frost", "station": "SN18700", "raw_file": "finnes_ikke.parquet"},
+            {"name": "frost_oslo", "source": "frost", "station": "SN18700", "raw_file": "frostAPI_data.parquet"},
+        ])
+        result = run_batch(self.config_file, max_workers=2)
+        self.assertEqual(list(result["Status"]), ["feilet", "ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,14 @@ import json
 import os
 import sys
 import pandas as pd
+from unittest.mock import patch
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
 
 from combined.combined_analysis import (
     combine_df,
+    combine_frames,
     prepare_dataframe)
+from combined import full_pipeline
 
 class TestCombineDF(unittest.TestCase):
 
@@ -69,6 +72,37 @@ class TestPrepareDataFrame(unittest.TestCase):
         with self.assertRaises(ValueError):
             prepare_dataframe(df, "Dato")
 
+class TestFullPipeline(unittest.TestCase):
+
+    def test_combine_frames(self):
+        # Tester at to DataFrames slås sammen på 'Dato' uten å gå via filer
+        df1 = pd.DataFrame({"Dato": ["2023-01-01", "2023-01-02"], "A": [1, 2]})
+        df2 = pd.DataFrame({"Dato": ["2023-01-02"], "B": [10]})
+        df = combine_frames(df1, df2, "Dato")
+        self.assertEqual(df["A"].tolist(), [2])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["Dato"]))
+        with self.assertRaises(KeyError):
+            combine_frames(df1, df2, "FeilKolonne")
+
+    def test_full_pipeline_combines_both_branches(self):
+        # Tester at Frost- og NILU-grenene kjøres hver for seg og slås sammen til slutt
+        frost = pd.DataFrame({"Dato": ["2023-01-01", "2023-01-02"], "Temperatur": [1.0, 2.0]})
+        nilu = pd.DataFrame({"Dato": ["2023-01-01", "2023-01-02"], "NO2": [10.0, 20.0]})
+        with patch.object(full_pipeline, "frost_raw_stage", return_value=frost), \
+                patch.object(full_pipeline, "nilu_raw_stage", return_value=nilu), \
+                patch.object(full_pipeline, "frost_clean_stage", side_effect=lambda raw, **kw: raw), \
+                patch.object(full_pipeline, "nilu_clean_stage", side_effect=lambda raw, **kw: raw), \
+                patch.object(full_pipeline, "frost_transform_stage", side_effect=lambda clean, **kw: clean), \
+                patch.object(full_pipeline, "nilu_transform_stage", side_effect=lambda clean, **kw: clean):
+            results, timings = full_pipeline.run_full_pipeline()
+
+        self.assertEqual(list(results["kombinert"].columns), ["Dato", "Temperatur", "NO2"])
+        self.assertEqual(results["kombinert"]["NO2"].dtype, "float32")
+        self.assertEqual(results["kombinert"]["Dato"].dtype, "datetime64[s]")
+        self.assertEqual(len(timings), 7)
+        self.assertTrue((timings["Status"] == "ok").all())
+        self.assertEqual(timings["Trinn"].iloc[-1], "kombinert")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
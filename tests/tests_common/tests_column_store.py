@@ -0,0 +1,62 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.column_store import write_columns, read_columns, list_chunks, write_chunk, read_store
+
+
+def sample_frame(stations, start="2020-01-01"):
+    n = len(stations)
+    return pd.DataFrame({
+        "Tid": np.arange(np.datetime64(start, "s"), np.datetime64(start, "s") + n * 3600, 3600),
+        "Stasjon": pd.Categorical(stations),
+        "Navn": np.array([f"Målestasjon {s}" for s in stations], dtype=object),
+        "Verdi": np.linspace(0, 1, n),
+    })
+
+
+class TestColumnStore(unittest.TestCase):
+
+    def test_roundtrip_keeps_values_and_types(self):
+        # Tester at tall, tidspunkt, kategorier og tekst leses inn igjen uendret
+        df = sample_frame(["B", "A", "B"])
+        with tempfile.TemporaryDirectory() as tmp:
+            write_columns(os.path.join(tmp, "bit"), df)
+            loaded = read_columns(os.path.join(tmp, "bit"))
+        pd.testing.assert_frame_equal(loaded, df, check_categorical=False)
+        self.assertIsInstance(loaded["Stasjon"].dtype, pd.CategoricalDtype)
+        self.assertEqual(loaded["Navn"].dtype, object)
+
+    def test_read_selected_columns(self):
+        # Tester at bare valgte kolonner leses, i lagret rekkefølge
+        with tempfile.TemporaryDirectory() as tmp:
+            write_columns(os.path.join(tmp, "bit"), sample_frame(["A"]))
+            loaded = read_columns(os.path.join(tmp, "bit"), columns=["Verdi", "Tid"])
+        self.assertEqual(list(loaded.columns), ["Tid", "Verdi"])
+
+    def test_unfinished_chunk_is_ignored(self):
+        # Tester at en midlertidig mappe fra et avbrutt skriv ikke regnes som en bit
+        with tempfile.TemporaryDirectory() as tmp:
+            write_chunk(tmp, "2020-02", sample_frame(["A"]))
+            write_chunk(tmp, "2020-01", sample_frame(["B"]))
+            os.makedirs(os.path.join(tmp, "2020-03.tmp"))
+            self.assertEqual(list_chunks(tmp), ["2020-01", "2020-02"])
+
+    def test_read_store_unions_categories(self):
+        # Tester at biter med ulike kategorier slås sammen til én kategorikolonne
+        with tempfile.TemporaryDirectory() as tmp:
+            write_chunk(tmp, "2020-01", sample_frame(["A", "B"]))
+            write_chunk(tmp, "2020-02", sample_frame(["C"], start="2020-02-01"))
+            df = read_store(tmp)
+            self.assertTrue(read_store(os.path.join(tmp, "mangler")).empty)
+        self.assertEqual(list(df["Stasjon"]), ["A", "B", "C"])
+        self.assertIsInstance(df["Stasjon"].dtype, pd.CategoricalDtype)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.compact import compact_dtypes, memory_usage, memory_report
+from common.storage import save_dataset, load_dataset
+
+
+def sample_frame(n=1000):
+    dates = pd.date_range("2010-01-01", periods=n).strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "Dato": np.array(dates, dtype=object),
+        "Stasjon": np.array(["SN18700:0", "SN50540:0"] * (n // 2), dtype=object),
+        "Temperatur": np.linspace(-10, 20, n),
+        "Dekningsgrad_NO2": np.full(n, 100.0),
+        "Interpolert_Temperatur": np.zeros(n, dtype=bool),
+        "Antall": np.arange(n, dtype=np.int64) % 24,
+    })
+
+
+class TestCompactDtypes(unittest.TestCase):
+
+    def test_canonical_types(self):
+        # Tester at hver kolonnetype får sin kompakte dtype
+        df = compact_dtypes(sample_frame())
+        self.assertEqual(str(df["Dato"].dtype), "datetime64[s]")
+        self.assertIsInstance(df["Stasjon"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["Temperatur"].dtype, np.float32)
+        self.assertEqual(df["Dekningsgrad_NO2"].dtype, np.float32)
+        self.assertEqual(df["Interpolert_Temperatur"].dtype, bool)
+        self.assertEqual(df["Antall"].dtype, np.int8)
+
+    def test_values_are_kept(self):
+        # Tester at datoer og verdier er de samme innenfor float32-presisjon, og at originalen ikke endres
+        original = sample_frame()
+        df = compact_dtypes(original)
+        self.assertEqual(df["Dato"].dt.strftime("%Y-%m-%d").tolist(), original["Dato"].tolist())
+        np.testing.assert_allclose(df["Temperatur"], original["Temperatur"], rtol=1e-6)
+        self.assertEqual(original["Temperatur"].dtype, np.float64)
+
+    def test_memory_report(self):
+        # Tester at rapporten viser lavere minnebruk med kompakte typer
+        df = sample_frame()
+        report = memory_report({"renset": df})
+        self.assertEqual(report["Trinn"].tolist(), ["renset"])
+        self.assertEqual(report["Minne_MB"].iloc[0], memory_usage(df) / 1e6)
+        self.assertLess(report["Kompakt_MB"].iloc[0], report["Minne_MB"].iloc[0] / 3)
+        self.assertGreater(report["Besparelse_prosent"].iloc[0], 60)
+
+    def test_load_dataset_compact(self):
+        # Tester at load_dataset kan gi kompakte typer direkte
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.parquet")
+            save_dataset(sample_frame(), path)
+            self.assertEqual(load_dataset(path)["Temperatur"].dtype, np.float64)
+            self.assertEqual(load_dataset(path, compact=True)["Temperatur"].dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.cube import write_cube, open_cube, cube_flags, read_cube, epoch_day
+from common.storage import save_dataset, load_dataset
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "Dato": ["2020-01-01", "2020-01-01", "2020-01-02", "2020-01-04"],
+        "Stasjon": [0, 1, 0, 1],
+        "Temperatur": [1.5, np.nan, -3.0, 4.0],
+        "Interpolert_Temperatur": [False, True, False, True],
+    })
+
+
+class TestCube(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "data.cube")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_keeps_rows_and_types(self):
+        # Tester at kuben gir tilbake de samme radene og kolonnetypene, også via save_dataset/load_dataset
+        df = sample_frame()
+        save_dataset(df, self.path)
+        pd.testing.assert_frame_equal(load_dataset(self.path), df)
+
+    def test_arrays_are_memory_mapped_per_day(self):
+        # Tester at verdiene ligger i en minnekartlagt (stasjon × dag)-matrise med tomme dager som NaN
+        write_cube(sample_frame(), self.path)
+        cube = open_cube(self.path)
+        temperature = cube["values"]["Temperatur"]
+        self.assertIsInstance(temperature, np.memmap)
+        self.assertEqual(temperature.shape, (2, 4))
+        self.assertEqual(cube["start_day"], epoch_day("2020-01-01"))
+        self.assertTrue(np.isnan(temperature[0, 3]))
+        self.assertEqual(cube_flags(cube, "Interpolert_Temperatur")[1].tolist(), [True, False, False, True])
+        self.assertEqual(cube_flags(cube)[0].tolist(), [True, True, False, False])
+
+    def test_read_filters_days_and_stations(self):
+        # Tester at dato- og stasjonsfilteret gir samme rader som filtrering av hele tabellen
+        write_cube(sample_frame(), self.path)
+        df = read_cube(self.path, stations=[1], start="2020-01-02", end="2030-01-01")
+        self.assertEqual(df["Dato"].tolist(), ["2020-01-04"])
+        self.assertEqual(df["Temperatur"].tolist(), [4.0])
+        self.assertTrue(read_cube(self.path, start="2021-01-01").empty)
+
+    def test_dataset_without_station_column(self):
+        # Tester at datasett uten stasjonskolonne lagres som én stasjon
+        df = sample_frame().drop(columns="Stasjon").drop_duplicates("Dato").reset_index(drop=True)
+        write_cube(df, self.path)
+        self.assertEqual(open_cube(self.path)["stations"], [None])
+        pd.testing.assert_frame_equal(read_cube(self.path), df)
+
+    def test_invalid_input(self):
+        # Forventer ValueError ved doble stasjon/dato-rader eller tekstkolonner
+        with self.assertRaises(ValueError):
+            write_cube(pd.concat([sample_frame()] * 2), self.path)
+        with self.assertRaises(ValueError):
+            write_cube(sample_frame().assign(Navn="Blindern"), self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.diagnostics import (
+    configure_diagnostics, diagnostics_mode, record, get_diagnostics, clear_diagnostics,
+    show_plot, render_figures, wait_for_figures)
+from niluAPI.clean_data_nilu import remove_outliers
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+
+
+def sample_frame():
+    values = np.zeros(50)
+    values[10] = 100.0
+    values[20] = np.nan
+    return pd.DataFrame({"Dato": pd.date_range("2020-01-01", periods=50).strftime("%Y-%m-%d"), "Verdi_NO2": values})
+
+
+def draw_line(values):
+    import matplotlib.pyplot as plt
+    plt.figure()
+    plt.plot(values)
+
+
+class TestDiagnostics(unittest.TestCase):
+
+    def setUp(self):
+        clear_diagnostics()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        clear_diagnostics()
+        self.tmp.cleanup()
+
+    def test_headless_records_data_instead_of_plotting(self):
+        # Tester at outliers og manglende verdier lagres som data, og at figuren utsettes i headless-modus
+        with diagnostics_mode("headless"):
+            remove_outliers(sample_frame(), ["Verdi_NO2"], threshold=3)
+        outliers = get_diagnostics("outliers")
+        self.assertEqual(outliers.loc[0, "Kolonne"], "Verdi_NO2")
+        self.assertEqual(outliers.loc[0, "Outliers"], 1)
+        missing = get_diagnostics("manglende").set_index("Kolonne")
+        self.assertEqual(missing.loc["Verdi_NO2", "Mangler"], 2)
+
+        # Figuren tegnes først på forespørsel
+        files = render_figures(self.tmp.name)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(os.path.exists(files[0]))
+        self.assertEqual(render_figures(self.tmp.name), [])
+
+    def test_file_mode_renders_in_background(self):
+        # Tester at figurene skrives som PNG av bakgrunnstråden i modusen "fil"
+        with diagnostics_mode("fil", self.tmp.name):
+            show_plot("linje", draw_line, [1, 2, 3])
+            show_plot("linje", draw_line, [3, 2, 1])
+        files = wait_for_figures()
+        self.assertEqual([os.path.basename(f)[3:] for f in files], ["_linje.png", "_linje.png"])
+        self.assertEqual(len(set(files)), 2)
+
+    def test_headless_keeps_only_latest_figures_and_records(self):
+        # Tester at headless-modus ikke holder på flere utsatte figurer og registreringer enn grensene
+        # diagnostics_mode setter også grensene tilbake etterpå
+        with diagnostics_mode("headless"):
+            configure_diagnostics(max_figures=2, max_records=3)
+            for i in range(5):
+                show_plot(f"linje{i}", draw_line, [i, i + 1])
+                record("test", pd.DataFrame({"A": [i]}))
+            self.assertEqual(get_diagnostics("test")["Nr"].tolist(), [2, 3, 4])
+            files = render_figures(self.tmp.name)
+            self.assertEqual([os.path.basename(f)[4:] for f in files], ["linje3.png", "linje4.png"])
+
+            configure_diagnostics(max_figures=0)
+            show_plot("linje", draw_line, [1, 2])
+            self.assertEqual(render_figures(self.tmp.name), [])
+            with self.assertRaises(ValueError):
+                configure_diagnostics(max_records=-1)
+
+    def test_configure_and_records(self):
+        # Tester at ukjente moduser avvises, og at registreringene nummereres
+        with self.assertRaises(ValueError):
+            configure_diagnostics(mode="vindu")
+        record("test", pd.DataFrame({"A": [1]}))
+        record("test", pd.DataFrame({"A": [2]}))
+        self.assertEqual(get_diagnostics("test")["Nr"].tolist(), [0, 1])
+        self.assertTrue(get_diagnostics("ukjent").empty)
+
+    def test_pipeline_does_not_import_matplotlib(self):
+        # Tester i en egen prosess at rensing og transformasjon kjøres uten å importere plottebibliotekene
+        code = (
+            "import sys, numpy as np, pandas as pd\n"
+            "from common.diagnostics import diagnostics_mode\n"
+            "from combined.full_pipeline import nilu_clean_stage, nilu_transform_stage\n"
+            "df = pd.DataFrame({'Dato': pd.date_range('2010-04-02', '2016-12-31').strftime('%Y-%m-%d')})\n"
+            "for c in ('NO2', 'O3', 'SO2'):\n"
+            "    df['Verdi_' + c] = np.random.default_rng(0).gamma(2.0, 10.0, len(df))\n"
+            "    df['Dekningsgrad_' + c] = 99.0\n"
+            "with diagnostics_mode('headless'):\n"
+            "    nilu_transform_stage(nilu_clean_stage(df))\n"
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'seaborn', 'missingno'}))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
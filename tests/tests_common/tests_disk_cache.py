@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+from io import StringIO
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.disk_cache import cache_get, cache_set, cache_key, invalidate_cache
+from frostAPI.main_frost import get_elements_frostAPI
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_roundtrip(self):
+        # Tester at lagrede data kan leses tilbake
+        cache_set("url", {"a": 1}, [{"id": "x"}], self.cache_dir)
+        self.assertEqual(cache_get("url", {"a": 1}, 60, self.cache_dir), [{"id": "x"}])
+
+    def test_key_ignores_parameter_order(self):
+        # Tester at rekkefølgen på parametere ikke gir ny nøkkel
+        self.assertEqual(cache_key("url", {"a": 1, "b": 2}), cache_key("url", {"b": 2, "a": 1}))
+        self.assertNotEqual(cache_key("url", {"a": 1}), cache_key("url", {"a": 2}))
+
+    def test_expired_entry_is_ignored(self):
+        # Tester at utløpte oppføringer ikke returneres
+        cache_set("url", None, [1], self.cache_dir)
+        with patch("common.disk_cache.time.time", return_value=10**12):
+            self.assertIsNone(cache_get("url", None, 60, self.cache_dir))
+
+    def test_invalidate_single_endpoint(self):
+        # Tester at invalidering av ett endepunkt lar de andre stå
+        cache_set("url1", None, [1], self.cache_dir)
+        cache_set("url2", None, [2], self.cache_dir)
+        self.assertEqual(invalidate_cache(self.cache_dir, endpoint="url1"), 1)
+        self.assertIsNone(cache_get("url1", None, 60, self.cache_dir))
+        self.assertEqual(cache_get("url2", None, 60, self.cache_dir), [2])
+
+    @patch("frostAPI.main_frost.get_info_frostAPI")
+    def test_elements_are_cached_as_records(self, mock_info):
+        # Tester at andre oppslag kommer fra bufferet og at ingenting skrives ut
+        mock_info.return_value = [{"id": "e1", "name": "Element1", "unit": "degC"}]
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            first = get_elements_frostAPI("client", cache_dir=self.cache_dir)
+            second = get_elements_frostAPI("client", cache_dir=self.cache_dir)
+            self.assertEqual(fake_out.getvalue(), "")
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["id"], "e1")
+        self.assertEqual(first[0]["enhet"], "degC")
+        mock_info.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
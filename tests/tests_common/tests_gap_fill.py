@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.gap_fill import fill_gaps
+
+
+def station_frame():
+    # To stasjoner med ulike hull, og radene i tilfeldig rekkefølge
+    rng = np.random.default_rng(0)
+    frames = []
+    for station in ("SN50540:0", "SN18700:0"):
+        df = pd.DataFrame({
+            "Dato": pd.date_range("2020-01-01", periods=40).strftime("%Y-%m-%d"),
+            "Stasjon": station,
+            "Temperatur": rng.normal(0, 5, 40),
+            "Nedbør": rng.gamma(1, 2, 40),
+        })
+        df.loc[rng.random(40) < 0.3, "Temperatur"] = np.nan
+        df.loc[rng.random(40) < 0.3, "Nedbør"] = np.nan
+        frames.append(df.drop(index=rng.choice(np.arange(1, 39), 6, replace=False)))
+    return pd.concat(frames).sample(frac=1, random_state=1)
+
+
+class TestFillGaps(unittest.TestCase):
+
+    def test_matches_pandas_per_station(self):
+        # Tester at hver stasjon fylles som med reindex og interpolate for én stasjon om gangen
+        df = station_frame()
+        result = fill_gaps(df, ["Temperatur", "Nedbør"], "2020-01-01", "2020-02-15")
+        grid = pd.date_range("2020-01-01", "2020-02-15")
+        self.assertEqual(len(result), 2 * len(grid))
+        for station, group in df.groupby("Stasjon"):
+            expected = (group.assign(Dato=pd.to_datetime(group["Dato"])).set_index("Dato")
+                        .reindex(grid)[["Temperatur", "Nedbør"]].interpolate())
+            actual = result[result["Stasjon"] == station].set_index("Dato")[["Temperatur", "Nedbør"]]
+            np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy())
+
+    def test_new_rows_keep_station_and_flags(self):
+        # Tester at nye datoer får riktig stasjon, og at bare fylte verdier markeres
+        df = station_frame()
+        result = fill_gaps(df, ["Temperatur"], "2020-01-01", "2020-02-15")
+        self.assertFalse(result["Stasjon"].isna().any())
+        missing = result["Temperatur"].isna()
+        self.assertFalse(result.loc[missing, "Interpolert_Temperatur"].any())
+        original = df.assign(Dato=pd.to_datetime(df["Dato"])).set_index(["Stasjon", "Dato"])["Temperatur"]
+        measured = result.set_index(["Stasjon", "Dato"]).index.isin(original.dropna().index)
+        self.assertFalse(result.loc[measured, "Interpolert_Temperatur"].any())
+        self.assertTrue(result.loc[~measured & ~missing.to_numpy(), "Interpolert_Temperatur"].all())
+
+    def test_max_gap(self):
+        # Tester at hull lengre enn max_gap blir stående tomme i sin helhet
+        df = pd.DataFrame({"Dato": pd.date_range("2020-01-01", periods=10),
+                           "Temperatur": [1, np.nan, 3, np.nan, np.nan, np.nan, 7, np.nan, np.nan, 10]})
+        result = fill_gaps(df, ["Temperatur"], max_gap=2)
+        np.testing.assert_allclose(result["Temperatur"], [1, 2, 3, np.nan, np.nan, np.nan, 7, 8, 9, 10])
+
+    def test_time_weighted(self):
+        # Uten rutenett vektes verdiene etter tid, mens "linear" vekter etter radnummer
+        df = pd.DataFrame({"Dato": pd.to_datetime(["2020-01-01", "2020-01-02", "2020-01-10"]),
+                           "Temperatur": [0.0, np.nan, 9.0]})
+        self.assertAlmostEqual(fill_gaps(df, ["Temperatur"], freq=None)["Temperatur"][1], 1.0)
+        self.assertAlmostEqual(fill_gaps(df, ["Temperatur"], freq=None, method="linear")["Temperatur"][1], 4.5)
+
+    def test_invalid_and_empty(self):
+        # Tester ukjent metode og tomme data
+        df = station_frame()
+        with self.assertRaises(ValueError):
+            fill_gaps(df, ["Temperatur"], method="spline")
+        self.assertEqual(len(fill_gaps(df.iloc[:0], ["Temperatur"])), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import patch, Mock
+import os
+import sys
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.http_client import (
+    get_session,
+    http_get,
+    retry_delay,
+    get_http_stats,
+    reset_http_stats)
+
+
+def make_response(status_code, headers=None, content=b"{}"):
+    response = Mock(status_code=status_code, headers=headers or {}, content=content)
+    return response
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        reset_http_stats()
+        # Ingen reell venting mellom forsøk i testene
+        self.sleep_patch = patch("common.http_client.time.sleep")
+        self.mock_sleep = self.sleep_patch.start()
+
+    def tearDown(self):
+        self.sleep_patch.stop()
+
+    def test_session_is_reused(self):
+        # Tester at alle kall deler samme sesjon og dermed samme tilkoblingspool
+        self.assertIs(get_session(), get_session())
+
+    def test_retries_on_server_error(self):
+        # Tester at 503 prøves på nytt og at siste vellykkede respons returneres
+        with patch.object(get_session(), "get", side_effect=[make_response(503), make_response(200)]) as mock_get:
+            response = http_get("http://example.test/data", max_retries=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(get_http_stats()["retries"], 1)
+
+    def test_no_retry_on_client_error(self):
+        # Tester at 404 ikke prøves på nytt
+        with patch.object(get_session(), "get", return_value=make_response(404)) as mock_get:
+            response = http_get("http://example.test/data", max_retries=3)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_raises_after_last_connection_error(self):
+        # Tester at nettverksfeil kastes videre når alle forsøk er brukt opp
+        with patch.object(get_session(), "get", side_effect=requests.ConnectionError("brudd")) as mock_get:
+            with self.assertRaises(requests.RequestException):
+                http_get("http://example.test/data", max_retries=2)
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_retry_after_header_is_honoured(self):
+        # Tester at Retry-After brukes i stedet for eksponentiell backoff
+        self.assertEqual(retry_delay(0, make_response(429, {"Retry-After": "7"})), 7.0)
+        self.assertEqual(retry_delay(3, backoff_factor=0.5, max_backoff=30), 4.0)
+
+    def test_stats_count_requests_and_bytes(self):
+        # Tester at tellerne registrerer forespørsler og overførte bytes
+        with patch.object(get_session(), "get", return_value=make_response(200, content=b"12345")):
+            http_get("http://example.test/data")
+            http_get("http://example.test/data")
+        stats = get_http_stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["bytes"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+
+ENTRY_MODULES = [
+    "frostAPI.fetch_frostapi", "frostAPI.main_frost", "niluAPI.main_nilu",
+    "SQL.sql_analysis", "combined.combined_analysis", "combined.full_pipeline",
+]
+HEAVY_PACKAGES = ["matplotlib", "seaborn", "missingno", "scipy", "sklearn", "plotly", "lightgbm"]
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_entry_modules_do_not_import_heavy_packages(self):
+        # Tester i en ny prosess at inngangsmodulene kan importeres uten plotte- og ML-bibliotekene
+        code = (
+            "import sys\n"
+            + "".join(f"import {module}\n" for module in ENTRY_MODULES)
+            + f"print(' '.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_heavy_packages_load_on_first_use(self):
+        # Tester at scikit-learn lastes først når transformasjonen faktisk kjøres
+        code = (
+            "import sys, pandas as pd\n"
+            "from frostAPI.analyze_data_frost import fix_skewness\n"
+            "print('sklearn' in sys.modules)\n"
+            "fix_skewness(pd.DataFrame({'A': [1.0, 2.0, 10.0]}), 1.0, ['A'])\n"
+            "print('sklearn' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        lines = result.stdout.strip().splitlines()
+        self.assertEqual([lines[0], lines[-1]], ["False", "True"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.outliers import outlier_limits, outlier_mask, METHODS
+from common.diagnostics import diagnostics_mode
+from niluAPI.clean_data_nilu import remove_outliers
+
+
+def seasonal_frame(years=4, stations=("SN18700:0", "SN50540:0")):
+    # Temperatur med årstidsvariasjon (±15 grader) og litt støy, og én tydelig feilmåling per stasjon
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2010-01-01", periods=365 * years)
+    frames = []
+    for i, station in enumerate(stations):
+        season = -15 * np.cos(2 * np.pi * dates.dayofyear.to_numpy() / 365.25) + 10 * i
+        temperature = season + rng.normal(0, 1.5, len(dates))
+        temperature[400] += 12
+        frames.append(pd.DataFrame({"Dato": dates.strftime("%Y-%m-%d"), "Stasjon": station, "Temperatur": temperature}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def reference_rolling(series, window, threshold):
+    # Glidende vindu rundt hver rad uten raden selv, regnet ut rett frem for sammenligning
+    values = series.to_numpy()
+    half = window // 2
+    lower = []
+    for i in range(len(values)):
+        neighbours = np.r_[values[max(0, i - half):i], values[i + 1:i + half + 1]]
+        neighbours = neighbours[~np.isnan(neighbours)]
+        lower.append(neighbours.mean() - threshold * neighbours.std(ddof=1) if len(neighbours) >= half else np.nan)
+    return pd.Series(lower, index=series.index)
+
+
+class TestOutlierLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.df = seasonal_frame()
+        self.grouped = self.df.groupby("Stasjon")["Temperatur"]
+
+    def test_global_per_station(self):
+        # Tester at "global" gir gjennomsnitt ± threshold · standardavvik per stasjon
+        lower, upper = outlier_limits(self.df, "Temperatur", "global", threshold=3)
+        expected = self.grouped.transform("mean") + 3 * self.grouped.transform("std")
+        np.testing.assert_allclose(upper, expected)
+
+    def test_rolling_matches_reference(self):
+        # Tester de kumulative summene mot et vindu regnet ut direkte, også med manglende verdier og usortert input
+        df = self.df.copy()
+        df.loc[10:20, "Temperatur"] = np.nan
+        expected = df.groupby("Stasjon")["Temperatur"].transform(lambda s: reference_rolling(s, 15, 3))
+        shuffled = df.sample(frac=1, random_state=0)
+        lower, _ = outlier_limits(shuffled, "Temperatur", "rolling", threshold=3, window=15)
+        np.testing.assert_allclose(lower, expected.loc[shuffled.index], atol=1e-9)
+
+    def test_robust_methods(self):
+        # Tester MAD og IQR mot pandas sine medianer og kvartiler
+        median = self.grouped.transform("median")
+        mad = (self.df["Temperatur"] - median).abs().groupby(self.df["Stasjon"]).transform("median")
+        lower, _ = outlier_limits(self.df, "Temperatur", "mad", threshold=3)
+        np.testing.assert_allclose(lower, median - 3 * 1.4826 * mad)
+
+        q1 = self.grouped.transform(lambda s: s.quantile(0.25))
+        q3 = self.grouped.transform(lambda s: s.quantile(0.75))
+        _, upper = outlier_limits(self.df, "Temperatur", "iqr", threshold=1.5)
+        np.testing.assert_allclose(upper, q3 + 1.5 * (q3 - q1))
+
+    def test_seasonal_values_are_kept(self):
+        # Global grense for hele året treffer ikke feilmålingen midt i en sesong, mens klimatologi og
+        # glidende vindu finner den uten å flagge vanlige sommer- og vinterdager
+        spikes = self.df.index[self.df.groupby("Stasjon").cumcount() == 400]
+        self.assertFalse(outlier_mask(self.df, ["Temperatur"], "global")["Temperatur"][spikes].any())
+        for method in ("climatology", "rolling"):
+            mask = outlier_mask(self.df, ["Temperatur"], method, threshold=4)["Temperatur"]
+            self.assertTrue(mask[spikes].all(), method)
+            self.assertLessEqual(mask.sum(), 2 * len(spikes), method)
+
+    def test_no_spread_gives_no_limits(self):
+        # Nedbør med mest tørre dager har MAD 0, og da skal ingenting flagges
+        df = pd.DataFrame({"Dato": pd.date_range("2010-01-01", periods=100), "Nedbør": [0.0] * 90 + [5.0] * 10})
+        self.assertFalse(outlier_mask(df, ["Nedbør"], "mad")["Nedbør"].any())
+
+    def test_invalid_and_empty(self):
+        # Tester ukjent metode og tomme data
+        with self.assertRaises(ValueError):
+            outlier_limits(self.df, "Temperatur", "zscore")
+        for method in METHODS:
+            self.assertEqual(outlier_mask(self.df.iloc[:0], ["Temperatur"], method).shape, (0, 1))
+
+    def test_remove_outliers_with_method(self):
+        # Tester at remove_outliers bruker valgt metode og setter outliers til NaN
+        with diagnostics_mode("headless"), contextlib.redirect_stdout(io.StringIO()):
+            cleaned = remove_outliers(self.df, ["Temperatur"], threshold=4, method="climatology")
+        expected = outlier_mask(self.df, ["Temperatur"], "climatology", threshold=4)["Temperatur"]
+        self.assertTrue(cleaned["Temperatur"][expected].isna().all())
+        self.assertEqual(cleaned["Temperatur"].isna().sum(), expected.sum())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.partitions import (
+    partition_name,
+    partition_file,
+    write_partitions,
+    list_partitions,
+    read_partitions)
+from common.storage import load_dataset
+from SQL.sql_analysis import load_clean_data
+
+
+def sample_frame():
+    dates = pd.date_range("2010-12-30", "2012-01-02").strftime("%Y-%m-%d")
+    return pd.concat([
+        pd.DataFrame({"Dato": dates, "Stasjon": station, "Temperatur": range(len(dates))})
+        for station in ["SN18700:0", "SN50540:0"]
+    ], ignore_index=True)
+
+
+class TestPartitions(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "frostAPI")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_layout_is_station_then_year(self):
+        # Tester at partisjonene havner under <stasjon>/<år> med gyldige mappenavn
+        written = write_partitions(sample_frame(), self.root)
+        self.assertEqual(len(written), 6)
+        self.assertEqual(partition_name("SN18700:0"), "SN18700_0")
+        self.assertTrue(os.path.exists(partition_file(self.root, "SN18700:0", 2011)))
+
+    def test_read_opens_only_matching_partitions(self):
+        # Tester at bare partisjonene for valgt stasjon og år åpnes, og at radene filtreres på dato
+        write_partitions(sample_frame(), self.root)
+        with patch("common.partitions.load_dataset", wraps=load_dataset) as mock_load:
+            df = read_partitions(self.root, stations=["SN50540:0"], start="2011-03-01", end="2011-03-31")
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(len(df), 31)
+        self.assertEqual(set(df["Stasjon"]), {"SN50540:0"})
+
+    def test_list_partitions_prunes_years(self):
+        # Tester at årsfilteret beregnes fra filnavnene
+        write_partitions(sample_frame(), self.root)
+        files = list_partitions(self.root, start="2011-06-01")
+        self.assertEqual([os.path.basename(f) for f in files], ["2011.parquet", "2012.parquet"] * 2)
+        self.assertEqual(list_partitions(os.path.join(self.tmp.name, "mangler")), [])
+
+    def test_merge_keeps_history_and_prefers_new_rows(self):
+        # Tester at nye rader erstatter gamle ved lik dato og stasjon uten at resten går tapt
+        write_partitions(sample_frame(), self.root)
+        update = pd.DataFrame({"Dato": ["2011-05-01"], "Stasjon": ["SN18700:0"], "Temperatur": [99]})
+        self.assertEqual(len(write_partitions(update, self.root)), 1)
+        df = read_partitions(self.root, stations=["SN18700:0"], start="2011-01-01", end="2011-12-31")
+        self.assertEqual(len(df), 365)
+        self.assertEqual(df.loc[df["Dato"] == "2011-05-01", "Temperatur"].item(), 99)
+
+    def test_fixed_station_for_area_data(self):
+        # Tester datasett uten stasjonskolonne, der området brukes som stasjonsnavn
+        df = sample_frame().drop(columns="Stasjon").drop_duplicates("Dato")
+        write_partitions(df, self.root, station="oslo_20km")
+        self.assertEqual(len(read_partitions(self.root, start="2012-01-01")), 2)
+
+    def test_station_per_row(self):
+        # Tester at stasjons-ID per rad brukes når stasjonskolonnen er label-kodet
+        df = sample_frame()
+        sources = df["Stasjon"].copy()
+        df["Stasjon"] = (sources == "SN50540:0").astype(int)
+        write_partitions(df, self.root, station=sources)
+        self.assertEqual(sorted(os.listdir(self.root)), ["SN18700_0", "SN50540_0"])
+        self.assertEqual(set(read_partitions(self.root, stations=["SN50540:0"])["Stasjon"]), {1})
+
+    def test_replace_removes_stale_partitions(self):
+        # Tester at merge=False sletter partisjoner for stasjoner og år som ikke lenger finnes i datasettet
+        write_partitions(sample_frame(), self.root)
+        df = sample_frame()
+        df = df[(df["Stasjon"] == "SN18700:0") & (df["Dato"] < "2012-01-01")]
+        self.assertEqual(len(write_partitions(df, self.root, merge=False)), 2)
+        self.assertEqual(os.listdir(self.root), ["SN18700_0"])
+        self.assertEqual(len(list_partitions(self.root)), 2)
+
+    def test_load_clean_data_reads_partitions(self):
+        # Tester at analysene gir samme utvalg fra partisjoner som fra hele filen
+        df = sample_frame()
+        file = os.path.join(self.tmp.name, "data.parquet")
+        df.to_parquet(file, index=False)
+        write_partitions(df, self.root)
+        from_file = load_clean_data(file, start="2011-12-25", end="2012-01-01")
+        from_partitions = load_clean_data(self.root, start="2011-12-25", end="2012-01-01")
+        self.assertEqual(len(from_file), 16)
+        pd.testing.assert_frame_equal(
+            from_file.sort_values(["Stasjon", "Dato"]).reset_index(drop=True), from_partitions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.pipeline import stage, topological_order, run_pipeline
+
+
+def slow_value(value, delay=0.2):
+    time.sleep(delay)
+    return value
+
+
+def fail():
+    raise RuntimeError("nettverksfeil")
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_topological_order(self):
+        # Tester at trinnene sorteres etter avhengighetene, og at ukjente og sirkulære avhengigheter avvises
+        stages = [stage("c", max, ("a", "b")), stage("a", int), stage("b", int)]
+        order = topological_order(stages)
+        self.assertLess(order.index("a"), order.index("c"))
+        self.assertLess(order.index("b"), order.index("c"))
+        with self.assertRaises(ValueError):
+            topological_order([stage("a", int, ("x",))])
+        with self.assertRaises(ValueError):
+            topological_order([stage("a", int, ("b",)), stage("b", int, ("a",))])
+        with self.assertRaises(ValueError):
+            topological_order([stage("a", int), stage("a", int)])
+
+    def test_results_are_passed_to_dependents(self):
+        # Tester at resultatene sendes videre i rekkefølgen avhengighetene er oppgitt
+        stages = [
+            stage("frost", slow_value, value=[1, 2], delay=0),
+            stage("nilu", slow_value, value=[3], delay=0),
+            stage("kombinert", lambda a, b: a + b, ("frost", "nilu")),
+        ]
+        results, timings = run_pipeline(stages)
+        self.assertEqual(results["kombinert"], [1, 2, 3])
+        self.assertEqual(timings["Trinn"].iloc[-1], "kombinert")
+        self.assertTrue((timings["Status"] == "ok").all())
+
+    def test_independent_branches_run_in_parallel(self):
+        # Tester at uavhengige grener kjøres samtidig i hver sin tråd
+        stages = [stage(f"stasjon_{i}", slow_value, value=i) for i in range(4)]
+        start = time.perf_counter()
+        results, timings = run_pipeline(stages, max_workers=4)
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(timings["Tråd"].nunique(), 4)
+        self.assertEqual(sorted(results.values()), [0, 1, 2, 3])
+
+    def test_failed_stage_skips_dependents(self):
+        # Tester at trinn som avhenger av et feilet trinn hoppes over, mens andre grener fullføres
+        stages = [
+            stage("frost_rådata", fail),
+            stage("frost_renset", slow_value, ("frost_rådata",)),
+            stage("nilu_rådata", slow_value, value="nilu", delay=0),
+        ]
+        results, timings = run_pipeline(stages)
+        status = dict(zip(timings["Trinn"], timings["Status"]))
+        self.assertEqual(status, {"frost_rådata": "feilet", "frost_renset": "hoppet over", "nilu_rådata": "ok"})
+        self.assertEqual(results, {"nilu_rådata": "nilu"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.stage_cache import content_digest, manifest_file, stage_is_current, record_stage
+from common.storage import save_dataset
+from frostAPI import main_frost
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "Dato": ["2020-01-01", "2020-01-02", "2020-01-03"],
+        "Stasjon": [0, 0, 0],
+        "Nedbør": [0.0, 4.2, 1.1],
+        "Temperatur": [-1.0, 2.5, 3.0],
+        "Vindhastighet": [3.1, 2.0, 5.5],
+    })
+
+
+class TestStageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.tmp.name, "inn.parquet")
+        self.output = os.path.join(self.tmp.name, "ut.parquet")
+        self.manifest = manifest_file(self.output)
+        save_dataset(sample_frame(), self.input)
+        save_dataset(sample_frame(), self.output)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stage_is_current(self):
+        # Tester at trinnet er oppdatert etter kjøring, og ikke når parameterne, inndataene eller utdataene endres
+        params = {"threshold": 3, "cols": ["Temperatur"]}
+        self.assertFalse(stage_is_current(self.manifest, [self.input], params, [self.output]))
+        record_stage(self.manifest, "test", [self.input], params, [self.output])
+        self.assertTrue(stage_is_current(self.manifest, [self.input], params, [self.output]))
+        self.assertFalse(stage_is_current(self.manifest, [self.input], {**params, "threshold": 2}, [self.output]))
+
+        # Samme innhold med ny endringstid regnes som uendret
+        os.utime(self.input, (0, 0))
+        self.assertTrue(stage_is_current(self.manifest, [self.input], params, [self.output]))
+
+        save_dataset(sample_frame().head(2), self.input)
+        self.assertFalse(stage_is_current(self.manifest, [self.input], params, [self.output]))
+        record_stage(self.manifest, "test", [self.input], params, [self.output])
+        os.remove(self.output)
+        self.assertFalse(stage_is_current(self.manifest, [self.input], params, [self.output]))
+
+    def test_directory_digest(self):
+        # Tester at sjekksummen for en mappe endres når en fil i mappen endres
+        directory = os.path.join(self.tmp.name, "partisjoner")
+        save_dataset(sample_frame(), os.path.join(directory, "0", "2020.parquet"))
+        before = content_digest(directory)
+        save_dataset(sample_frame().head(1), os.path.join(directory, "0", "2020.parquet"))
+        self.assertNotEqual(content_digest(directory), before)
+
+    def test_save_dataset_is_atomic(self):
+        # Tester at en mislykket lagring verken etterlater midlertidige filer eller ødelegger den gamle filen
+        before = content_digest(self.output)
+        with patch("pandas.DataFrame.to_parquet", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                save_dataset(sample_frame(), self.output)
+        self.assertEqual(content_digest(self.output), before)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["inn.parquet", "ut.parquet"])
+
+    def test_unchanged_stage_is_skipped(self):
+        # Tester at transformasjonstrinnet for Frost hoppes over når de rensede dataene ikke er endret
+        analyzed = os.path.join(self.tmp.name, "analysert.parquet")
+        partitions = os.path.join(self.tmp.name, "analysert")
+        labels = os.path.join(self.tmp.name, "stasjoner.json")
+        main_frost.save_station_labels(pd.Series([0]), pd.Series(["SN18700:0"]), labels)
+        with patch.object(main_frost, "FROST_CLEAN_FILE", self.input), \
+                patch.object(main_frost, "FROST_STATION_LABELS", labels), \
+                patch.object(main_frost, "FROST_ANALYZED_FILE", analyzed), \
+                patch.object(main_frost, "FROST_ANALYZED_PARTITIONS", partitions), \
+                patch("frostAPI.main_frost.fix_skewness", side_effect=lambda df, threshold, cols: df) as mock_fix:
+            main_frost.fix_skewness_data_frostAPI()
+            main_frost.fix_skewness_data_frostAPI()
+            self.assertEqual(mock_fix.call_count, 1)
+            main_frost.fix_skewness_data_frostAPI(force=True)
+            self.assertEqual(mock_fix.call_count, 2)
+        self.assertTrue(os.path.exists(manifest_file(analyzed)))
+        self.assertEqual(os.listdir(partitions), ["SN18700_0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
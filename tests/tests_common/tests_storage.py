@@ -0,0 +1,105 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.storage import (
+    save_dataset,
+    load_dataset,
+    dataset_path,
+    detect_format,
+    apply_schema,
+    register_backend,
+    export_json,
+    current_copy,
+    DATASET_FORMAT)
+
+SCHEMA = {"Dato": "object", "Temperatur": "float64", "Interpolert_Temperatur": "bool"}
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "Dato": ["2023-01-01", "2023-01-02", "2023-01-03"],
+        "Stasjon": pd.Categorical(["SN18700:0", "SN18700:0", "SN50540:0"]),
+        "Temperatur": [1.5, np.nan, -3.0],
+        "Interpolert_Temperatur": [False, True, False],
+        "Nedbør": [0.0, 2.5, 1.0],
+    })
+
+
+class TestStorage(unittest.TestCase):
+
+    def test_roundtrip_all_formats(self):
+        # Tester at data og kolonnetyper bevares i alle innebygde formater
+        df = sample_frame()
+        with tempfile.TemporaryDirectory() as tmp:
+            for extension in (".parquet", ".arrow", ".json"):
+                path = os.path.join(tmp, f"data{extension}")
+                save_dataset(df, path)
+                loaded = load_dataset(path, schema={**SCHEMA, "Stasjon": "category"})
+                pd.testing.assert_frame_equal(loaded, df, check_categorical=False, obj=extension)
+
+    def test_default_format_and_paths(self):
+        # Tester at standardformatet er kolonnebasert og at filendelsen byttes riktig
+        self.assertEqual(DATASET_FORMAT, "parquet")
+        self.assertEqual(dataset_path("../data/frostAPI_data"), "../data/frostAPI_data.parquet")
+        self.assertEqual(dataset_path("../data/frostAPI_data.json"), "../data/frostAPI_data.parquet")
+        self.assertEqual(dataset_path("../data/frostAPI_data.parquet", "json"), "../data/frostAPI_data.json")
+        self.assertEqual(detect_format("fil.feather"), "arrow")
+        with self.assertRaises(ValueError):
+            detect_format("fil.json", format="xml")
+
+    def test_current_copy_skips_stale_cube(self):
+        # Tester at kuben bare velges når den finnes og ikke er eldre enn kildefilen
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "data.parquet")
+            cube = dataset_path(source, "cube")
+            save_dataset(sample_frame(), source)
+            self.assertEqual(current_copy(cube, source), source)
+            save_dataset(sample_frame(), cube)
+            self.assertEqual(current_copy(cube, source), cube)
+            os.utime(source, (os.path.getmtime(cube) + 10,) * 2)
+            self.assertEqual(current_copy(cube, source), source)
+
+    def test_schema_only_touches_known_columns(self):
+        # Tester at skjemaet setter typer for kjente kolonner og lar resten være
+        df = apply_schema(pd.DataFrame({"Temperatur": [1, 2], "Annet": ["a", "b"]}), SCHEMA)
+        self.assertEqual(df["Temperatur"].dtype, np.float64)
+        self.assertEqual(df["Annet"].dtype, object)
+
+    def test_read_selected_columns_and_missing_file(self):
+        # Tester kolonneutvalg og at manglende fil gir FileNotFoundError med filnavn
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.parquet")
+            save_dataset(sample_frame(), path)
+            self.assertEqual(list(load_dataset(path, columns=["Dato", "Nedbør"]).columns), ["Dato", "Nedbør"])
+            with self.assertRaises(FileNotFoundError) as context:
+                load_dataset(os.path.join(tmp, "mangler.parquet"))
+        self.assertTrue(context.exception.filename.endswith("mangler.parquet"))
+
+    def test_export_json(self):
+        # Tester at et Parquet-datasett kan eksporteres til lesbar JSON
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.parquet")
+            save_dataset(sample_frame(), path)
+            json_path = export_json(path)
+            self.assertTrue(json_path.endswith("data.json"))
+            with open(json_path, encoding="utf-8") as f:
+                self.assertIn('"Nedbør":2.5', f.read())
+
+    def test_register_backend(self):
+        # Tester at nye formater kan legges til
+        register_backend("csv", lambda df, path: df.to_csv(path, index=False),
+                         lambda path, columns=None: pd.read_csv(path, usecols=columns), (".csv",))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.csv")
+            save_dataset(pd.DataFrame({"a": [1, 2]}), path)
+            self.assertEqual(load_dataset(path)["a"].tolist(), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import shutil
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.watermarks import (
+    load_watermarks,
+    save_watermarks,
+    next_start_date,
+    update_watermarks,
+    merge_into_store)
+from frostAPI.main_frost import data_frostAPI_incremental
+from common.http_client import IncompleteFetchError
+
+
+def fake_fetch(endpoint, parameters, client_id):
+    # Returnerer én observasjon per dag i referencetime (sluttdato eksklusiv)
+    start, end = (pd.Timestamp(d) for d in parameters["referencetime"].split("/"))
+    return [{
+        "referenceTime": f"{day.date().isoformat()}T00:00:00Z",
+        "sourceId": "SN18700:0",
+        "observations": [
+            {"elementId": "mean(air_temperature P1D)", "value": 1.0},
+            {"elementId": "sum(precipitation_amount P1D)", "value": 2.0},
+            {"elementId": "mean(wind_speed P1D)", "value": 3.0},
+        ]
+    } for day in pd.date_range(start, end - pd.Timedelta(days=1))]
+
+
+class TestWatermarks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.watermark_file = os.path.join(self.tmp_dir, "watermarks.json")
+        self.store_file = os.path.join(self.tmp_dir, "raw.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_and_load_roundtrip(self):
+        # Tester at vannmerker kan lagres og leses inn igjen
+        save_watermarks({"a": "2020-01-01"}, self.watermark_file)
+        self.assertEqual(load_watermarks(self.watermark_file), {"a": "2020-01-01"})
+
+    def test_next_start_date_uses_oldest_watermark(self):
+        # Tester at henting starter dagen etter det eldste vannmerket
+        watermarks = {"a": "2020-01-05", "b": "2020-01-03"}
+        self.assertEqual(next_start_date(watermarks, ["a", "b"], "2010-01-01"), "2020-01-04")
+
+    def test_next_start_date_without_watermark(self):
+        # Tester at standard startdato brukes når en nøkkel mangler vannmerke
+        self.assertEqual(next_start_date({"a": "2020-01-05"}, ["a", "b"], "2010-01-01"), "2010-01-01")
+
+    def test_update_watermarks_ignores_missing_values(self):
+        # Tester at vannmerket settes til siste dato med faktisk måling
+        df = pd.DataFrame({"Dato": ["2020-01-01", "2020-01-02"], "Temp": [1.0, None]})
+        self.assertEqual(update_watermarks({}, df, {"t": "Temp"}), {"t": "2020-01-01"})
+
+    def test_update_watermarks_unreported_key(self):
+        # Tester at en nøkkel uten målinger regnes som hentet til fetched_to, men aldri flyttes bakover
+        df = pd.DataFrame({"Dato": ["2020-01-01", "2020-01-02"], "Temp": [1.0, 2.0], "Vind": [None, None]})
+        keys = {"t": "Temp", "v": "Vind", "n": "Nedbør"}
+        self.assertEqual(update_watermarks({}, df, keys), {"t": "2020-01-02"})
+        watermarks = update_watermarks({"v": "2020-02-01"}, df, keys, fetched_to="2020-01-05", lag_days=0)
+        self.assertEqual(watermarks, {"t": "2020-01-02", "v": "2020-02-01", "n": "2020-01-05"})
+        self.assertEqual(next_start_date(watermarks, keys, "2010-01-01"), "2020-01-03")
+        watermarks = update_watermarks({}, df, keys, fetched_to="2020-01-05", lag_days=7)
+        self.assertEqual(watermarks["n"], "2019-12-29")
+
+    def test_update_watermarks_late_element(self):
+        # Tester at et element som publiseres senere enn de andre ikke mister dager innenfor forsinkelsesgrensen
+        watermarks = {"t": "2024-05-01", "p": "2024-05-01"}
+        keys = {"t": "Temperatur", "p": "Nedbør"}
+        df = pd.DataFrame({"Dato": ["2024-05-02"], "Temperatur": [12.0]})
+        update_watermarks(watermarks, df, keys, fetched_to="2024-05-02", lag_days=7)
+        self.assertEqual(watermarks, {"t": "2024-05-02", "p": "2024-05-01"})
+        self.assertEqual(next_start_date(watermarks, keys, "2010-01-01"), "2024-05-02")
+
+        # Kommer det fortsatt ikke noe etter grensen, regnes dagene som hentet
+        update_watermarks(watermarks, df.iloc[:0], keys, fetched_to="2024-05-20", lag_days=7)
+        self.assertEqual(watermarks["p"], "2024-05-13")
+
+    def test_merge_into_store_prefers_new_rows(self):
+        # Tester at nye rader erstatter gamle ved overlapp
+        pd.DataFrame({"Dato": ["2020-01-01", "2020-01-02"], "Temp": [1.0, 2.0]}).to_json(
+            self.store_file, orient="records")
+        new_df = pd.DataFrame({"Dato": ["2020-01-02", "2020-01-03"], "Temp": [5.0, 6.0]})
+        merged = merge_into_store(self.store_file, new_df, ["Dato"])
+        self.assertEqual(list(merged["Temp"]), [1.0, 5.0, 6.0])
+
+    @patch("frostAPI.main_frost.fetch_data_from_frostAPI", side_effect=fake_fetch)
+    def test_frost_incremental_fetches_only_new_dates(self, mock_fetch):
+        # Tester at andre kjøring bare etterspør datoer etter vannmerket
+        args = dict(file=self.store_file, watermark_file=self.watermark_file, from_date="2020-01-01")
+        self.assertEqual(data_frostAPI_incremental("client", to_date="2020-01-10", **args), 10)
+        self.assertEqual(data_frostAPI_incremental("client", to_date="2020-01-12", **args), 2)
+        self.assertEqual(mock_fetch.call_args[0][1]["referencetime"], "2020-01-11/2020-01-13")
+        self.assertEqual(len(pd.read_json(self.store_file)), 12)
+        self.assertEqual(data_frostAPI_incremental("client", to_date="2020-01-12", **args), 0)
+
+    @patch("frostAPI.main_frost.fetch_data_from_frostAPI")
+    def test_frost_incremental_element_without_data(self, mock_fetch):
+        # Tester at et element stasjonen ikke måler bare gir ny henting av de siste lag_days dagene, ikke fra from_date
+        def fetch(endpoint, parameters, client_id):
+            data = fake_fetch(endpoint, parameters, client_id)
+            for måling in data:
+                måling["observations"] = måling["observations"][:2]
+            return data
+        mock_fetch.side_effect = fetch
+        args = dict(file=self.store_file, watermark_file=self.watermark_file, from_date="2020-01-01", lag_days=3)
+        self.assertEqual(data_frostAPI_incremental("client", to_date="2020-01-10", **args), 10)
+        self.assertEqual(data_frostAPI_incremental("client", to_date="2020-01-12", **args), 5)
+        self.assertEqual(mock_fetch.call_args[0][1]["referencetime"], "2020-01-08/2020-01-13")
+
+    @patch("frostAPI.main_frost.fetch_data_from_frostAPI", side_effect=fake_fetch)
+    def test_frost_incremental_defaults_follow_constants(self, mock_fetch):
+        # Tester at kilde, startdato og filstier leses fra FROST_*-konstantene ved kall, ikke ved import
+        with patch.multiple("frostAPI.main_frost", FROST_SOURCE="SN99999", FROST_FROM_DATE="2020-01-05",
+                            FROST_RAW_FILE=self.store_file, FROST_WATERMARK_FILE=self.watermark_file):
+            self.assertEqual(data_frostAPI_incremental("client", to_date="2020-01-10"), 6)
+        self.assertEqual(mock_fetch.call_args[0][1]["sources"], "SN99999")
+        self.assertEqual(mock_fetch.call_args[0][1]["referencetime"], "2020-01-05/2020-01-11")
+        self.assertTrue(os.path.exists(self.watermark_file))
+
+    @patch("frostAPI.main_frost.fetch_data_parallel_frostAPI")
+    def test_frost_incremental_incomplete_keeps_watermarks(self, mock_fetch):
+        # Tester at et feilet vindu verken lagrer rådata eller flytter vannmerkene
+        mock_fetch.side_effect = IncompleteFetchError("1 av 2 vinduer feilet", ["2020-01-01/2020-01-06"], [])
+        with self.assertRaises(IncompleteFetchError):
+            data_frostAPI_incremental("client", from_date="2020-01-01", to_date="2020-01-10", window_days=5,
+                                      file=self.store_file, watermark_file=self.watermark_file)
+        self.assertFalse(os.path.exists(self.store_file))
+        self.assertFalse(os.path.exists(self.watermark_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,6 +18,7 @@ from frostAPI.main_frost import (
     get_elements_frostAPI,
     get_stations_frostAPI,
     data_frostAPI)
+from common.http_client import IncompleteFetchError
 
 class TestFetchFunctions(unittest.TestCase):
 
@@ -25,7 +26,7 @@ class TestFetchFunctions(unittest.TestCase):
         #Tester at data hentes riktig fra API når responsen er vellykket
         mock_response = Mock(status_code=200)
         mock_response.json.return_value = {"data": [{"mock": "value"}]}
-        with patch("frostAPI.fetch_frostapi.requests.get", return_value=mock_response):
+        with patch("frostAPI.fetch_frostapi.http_get", return_value=mock_response):
             result = fetch_data_from_frostAPI("test_endpoint", "test_id", ["air_temperature"])
             self.assertEqual(result, [{"mock": "value"}])
 
@@ -33,11 +34,11 @@ class TestFetchFunctions(unittest.TestCase):
         #Tester at funksjonen returnerer tom liste ved HTTP-feil (f.eks. 404)
         mock_response = Mock(status_code=404, text="Not Found")
         mock_response.json.return_value = {}
-        with patch("frostAPI.fetch_frostapi.requests.get", return_value=mock_response):
+        with patch("frostAPI.fetch_frostapi.http_get", return_value=mock_response):
             result = fetch_data_from_frostAPI("test_endpoint", {}, "test_id")
             self.assertEqual(result, [])
 
-    @patch("frostAPI.fetch_frostapi.requests.get")
+    @patch("frostAPI.fetch_frostapi.http_get")
     def test_get_info_success(self, mock_get):
         #Tester at get_info_frostAPI returnerer elementer og skriver navn til konsoll
         mock_get.return_value = Mock(status_code=200)
@@ -107,7 +108,21 @@ class TestFetchFunctions(unittest.TestCase):
         data_frostAPI("test_client")
         self.assertTrue(mock_save.called)
 
-    @patch("frostAPI.fetch_frostapi.requests.get")
+    @patch("frostAPI.main_frost.fetch_data_parallel_frostAPI")
+    @patch("frostAPI.main_frost.save_data_as_json")
+    def test_data_frostAPI_incomplete_is_not_saved(self, mock_save, mock_fetch):
+        # Tester at ufullstendig vindusvis henting ikke lagres
+        mock_fetch.side_effect = IncompleteFetchError("1 av 7 vinduer feilet", ["2011-04-02/2012-04-01"], [])
+        with patch("sys.stdout", new_callable=StringIO):
+            self.assertIsNone(data_frostAPI("test_client", window_days=365))
+        self.assertFalse(mock_save.called)
+
+    def test_data_frostAPI_stream_with_windows(self):
+        # Forventer ValueError når strømming kombineres med vindusvis henting, som ellers ville blitt ignorert
+        with self.assertRaises(ValueError):
+            data_frostAPI("test_client", window_days=365, stream=True)
+
+    @patch("frostAPI.fetch_frostapi.http_get")
     def test_get_info_error(self, mock_get):
         #Tester at funksjonen håndterer forespørselsfeil (f.eks. timeout) riktig
         mock_get.side_effect = requests.RequestException("Timeout")
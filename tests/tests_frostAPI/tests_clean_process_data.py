@@ -75,5 +75,18 @@ class TestCleanProcessData(unittest.TestCase):
         self.assertIn("Interpolert_Temperatur", result.columns)  # Ny kolonne skal finnes
         self.assertTrue(result.loc[result["Dato"] == "2023-01-02", "Interpolert_Temperatur"].iloc[0])  # Skal være True for interpolert dag
 
+    def test_interpolate_data_multiple_stations(self):
+        # Tester at hver stasjon får alle datoene, og at verdiene ikke interpoleres på tvers av stasjoner
+        df = pd.DataFrame({
+            "Dato": ["2023-01-01", "2023-01-03", "2023-01-01", "2023-01-02", "2023-01-03"],
+            "Stasjon": ["A", "A", "B", "B", "B"],
+            "Temperatur": [1.0, 3.0, 10.0, 20.0, 30.0]
+        })
+        result = interpolate_data(df, "2023-01-01", "2023-01-03", ["Temperatur"])
+        self.assertEqual(len(result), 6)
+        self.assertEqual(list(result["Stasjon"]), ["A", "A", "A", "B", "B", "B"])
+        self.assertEqual(list(result["Temperatur"]), [1.0, 2.0, 3.0, 10.0, 20.0, 30.0])
+        self.assertEqual(list(result["Interpolert_Temperatur"]), [False, True, False, False, False, False])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from frostAPI.fetch_frostapi import (
+    process_weather_data,
+    process_weather_data_columnar,
+    aggregate_mean_columns,
+    pivot_weather_data)
+
+ELEMENTS = {"temp": "Temperatur", "rain": "Nedbør", "wind": "Vind", "sourceId": "Stasjon"}
+
+RAW = [
+    {"sourceId": "SN2:0", "referenceTime": "2023-01-02T00:00:00.000Z",
+     "observations": [{"elementId": "temp", "value": 1.0}, {"elementId": "rain", "value": 0.5}]},
+    {"sourceId": "SN1:0", "referenceTime": "2023-01-01T00:00:00.000Z",
+     "observations": [{"elementId": "temp", "value": 2.0}, {"elementId": "ukjent", "value": 99.0}]},
+    {"sourceId": "SN1:0", "referenceTime": "2023-01-01T12:00:00.000Z",
+     "observations": [{"elementId": "temp", "value": 4.0}, {"elementId": "temp", "value": 6.0}]},
+    {"sourceId": "SN3:0", "referenceTime": "2023-01-01T00:00:00.000Z", "observations": []},
+]
+
+
+class TestColumnarProcessing(unittest.TestCase):
+
+    def test_columns_match_process_weather_data(self):
+        # Tester at kolonneutgaven har samme innhold som den radvise prosesseringen
+        expected = pd.DataFrame(process_weather_data(RAW, ELEMENTS))
+        result = pd.DataFrame(process_weather_data_columnar(RAW, ELEMENTS))
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_exact=True)
+
+    def test_duplicate_element_keeps_last_value(self):
+        # Tester at siste verdi gjelder når samme element forekommer flere ganger
+        result = process_weather_data_columnar(RAW, ELEMENTS)
+        self.assertEqual(result["Temperatur"][2], 6.0)
+
+    def test_unmeasured_elements_are_left_out(self):
+        # Tester at elementer uten målinger ikke blir egne kolonner
+        result = process_weather_data_columnar(RAW, ELEMENTS)
+        self.assertNotIn("Vind", result)
+        self.assertNotIn("ukjent", result)
+
+
+class TestAggregateMeanColumns(unittest.TestCase):
+
+    def test_matches_pivot_table(self):
+        # Tester at den vektoriserte aggregeringen gir nøyaktig samme tabell som pivot_table
+        rows = process_weather_data(RAW, ELEMENTS)
+        expected = pd.DataFrame(rows).pivot_table(
+            index=["Dato", "Stasjon"], values=["Temperatur", "Nedbør"], aggfunc="mean").reset_index()
+        result = pivot_weather_data(process_weather_data_columnar(RAW, ELEMENTS),
+                                    ["Dato", "Stasjon"], ["Temperatur", "Nedbør"])
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+    def test_random_data_matches_pivot_table(self):
+        # Tester sparsomme nøkler, duplikater og manglende verdier mot pivot_table
+        rng = np.random.default_rng(1)
+        n = 2000
+        df = pd.DataFrame({
+            "Dato": rng.choice(["2023-01-01", "2023-01-02", "2022-12-31"], n),
+            "Stasjon": rng.choice([f"SN{i}:0" for i in range(40)], n),
+            "b": np.where(rng.random(n) < 0.3, np.nan, rng.normal(size=n)),
+            "a": np.where(rng.random(n) < 0.6, np.nan, rng.normal(size=n)),
+        })
+        expected = df.pivot_table(index=["Dato", "Stasjon"], values=["b", "a"], aggfunc="mean").reset_index()
+        result = aggregate_mean_columns(df, ["Dato", "Stasjon"], ["b", "a"])
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-12)
+
+    def test_missing_column_raises(self):
+        # Tester at en manglende kolonne gir KeyError, slik som pivot_table
+        with self.assertRaises(KeyError):
+            aggregate_mean_columns({"Dato": ["2023-01-01"]}, ["Dato", "Stasjon"], ["Temperatur"])
+
+    def test_list_input_uses_pivot_table(self):
+        # Tester at lister og andre aggregeringsfunksjoner fortsatt går via pivot_table
+        rows = process_weather_data(RAW, ELEMENTS)
+        result = pivot_weather_data(rows, ["Dato", "Stasjon"], ["Temperatur"], aggfunc="sum")
+        self.assertEqual(result.loc[result["Stasjon"] == "SN1:0", "Temperatur"].iloc[0], 8.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import shutil
+from io import StringIO
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from frostAPI.main_frost import (
+    data_frostAPI_stations,
+    load_station_partitions,
+    station_partition_file,
+    station_marker_file)
+
+
+def fake_fetch(endpoint, parameters, client_id):
+    # Returnerer én observasjon for stasjonen som etterspørres
+    return [{
+        "referenceTime": "2023-01-01T00:00:00Z",
+        "sourceId": f"{parameters['sources']}:0",
+        "observations": [{"elementId": "mean(air_temperature P1D)", "value": 5.0}]
+    }]
+
+
+class TestMultiStationIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    @patch("frostAPI.main_frost.fetch_window_frostAPI", side_effect=fake_fetch)
+    def test_one_partition_per_station(self, mock_fetch):
+        # Tester at hver stasjon får sin egen fil
+        status = data_frostAPI_stations("client", ["SN1", "SN2"], output_dir=self.output_dir)
+        self.assertEqual(status, {"SN1": "lagret", "SN2": "lagret"})
+        for source in ["SN1", "SN2"]:
+            self.assertTrue(os.path.exists(station_partition_file(self.output_dir, source)))
+
+    @patch("frostAPI.main_frost.fetch_window_frostAPI", side_effect=fake_fetch)
+    def test_existing_partitions_are_skipped(self, mock_fetch):
+        # Tester at en ny kjøring bare henter stasjoner som mangler
+        data_frostAPI_stations("client", ["SN1"], output_dir=self.output_dir)
+        mock_fetch.reset_mock()
+        status = data_frostAPI_stations("client", ["SN1", "SN2"], output_dir=self.output_dir)
+        self.assertEqual(status["SN1"], "hoppet over")
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch("frostAPI.main_frost.fetch_window_frostAPI", side_effect=fake_fetch)
+    def test_partition_without_marker_is_fetched_again(self, mock_fetch):
+        # Tester at en partisjon uten fullføringsmerke (f.eks. etter et avbrudd) hentes på nytt,
+        # og at en annen periode enn den som er hentet også gir ny henting
+        data_frostAPI_stations("client", ["SN1"], output_dir=self.output_dir)
+        os.remove(station_marker_file(self.output_dir, "SN1"))
+        self.assertEqual(data_frostAPI_stations("client", ["SN1"], output_dir=self.output_dir)["SN1"], "lagret")
+        status = data_frostAPI_stations("client", ["SN1"], output_dir=self.output_dir, referencetime="2020-01-01/2021-01-01")
+        self.assertEqual(status["SN1"], "lagret")
+        self.assertEqual(mock_fetch.call_count, 3)
+
+    @patch("frostAPI.main_frost.fetch_window_frostAPI")
+    def test_failed_station_does_not_stop_others(self, mock_fetch):
+        # Tester at en feil for én stasjon gir status "feilet" uten partisjon, mens de andre lagres
+        def fetch(endpoint, parameters, client_id):
+            if parameters["sources"] == "SN1":
+                raise requests.ConnectionError("brudd")
+            return fake_fetch(endpoint, parameters, client_id)
+        mock_fetch.side_effect = fetch
+        with patch("sys.stdout", new_callable=StringIO):
+            status = data_frostAPI_stations("client", ["SN1", "SN2"], output_dir=self.output_dir)
+        self.assertEqual(status, {"SN1": "feilet", "SN2": "lagret"})
+        self.assertFalse(os.path.exists(station_marker_file(self.output_dir, "SN1")))
+        self.assertTrue(os.path.exists(station_marker_file(self.output_dir, "SN2")))
+
+    @patch("frostAPI.fetch_frostapi.http_get")
+    def test_http_failure_without_windows_is_failed(self, mock_get):
+        # Tester at en HTTP-feil uten vinduer gir "feilet", mens et svar uten data (404) gir "ingen data"
+        def get(endpoint, params=None, **kwargs):
+            response = requests.Response()
+            response.status_code = 500 if params["sources"] == "SN1" else 404
+            response.url = endpoint
+            return response
+        mock_get.side_effect = get
+        with patch("sys.stdout", new_callable=StringIO):
+            status = data_frostAPI_stations("client", ["SN1", "SN2"], output_dir=self.output_dir)
+        self.assertEqual(status, {"SN1": "feilet", "SN2": "ingen data"})
+        self.assertFalse(os.path.exists(station_marker_file(self.output_dir, "SN1")))
+
+    @patch("frostAPI.main_frost.fetch_window_frostAPI", side_effect=fake_fetch)
+    def test_overwrite_single_station(self, mock_fetch):
+        # Tester at én stasjon kan hentes på nytt uten å røre de andre
+        data_frostAPI_stations("client", ["SN1", "SN2"], output_dir=self.output_dir)
+        other_file = station_partition_file(self.output_dir, "SN2")
+        mtime_before = os.path.getmtime(other_file)
+        data_frostAPI_stations("client", ["SN1"], output_dir=self.output_dir, overwrite=True)
+        self.assertEqual(os.path.getmtime(other_file), mtime_before)
+
+    @patch("frostAPI.main_frost.fetch_window_frostAPI", side_effect=fake_fetch)
+    def test_load_station_partitions(self, mock_fetch):
+        # Tester at partisjonene kan leses inn samlet eller for én stasjon
+        data_frostAPI_stations("client", ["SN1", "SN2"], output_dir=self.output_dir)
+        self.assertEqual(len(load_station_partitions(self.output_dir)), 2)
+        only_one = load_station_partitions(self.output_dir, sources=["SN2"])
+        self.assertEqual(list(only_one["Stasjon"]), ["SN2:0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch, Mock
+import os
+import sys
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from frostAPI.fetch_frostapi import (
+    split_reference_time,
+    fetch_data_parallel_frostAPI)
+from common.http_client import IncompleteFetchError
+
+
+def fake_frost_get(endpoint, params=None, auth=None, max_retries=None):
+    # Lager én observasjon per dag i vinduet, slik en ekte Frost-respons ville gjort
+    from datetime import date, timedelta
+    start_str, end_str = params["referencetime"].split("/")
+    start, end = date.fromisoformat(start_str), date.fromisoformat(end_str)
+    data = []
+    while start < end:
+        data.append({"referenceTime": f"{start.isoformat()}T00:00:00.000Z", "sourceId": "SN18700:0"})
+        start += timedelta(days=1)
+    response = Mock(status_code=200)
+    response.json.return_value = {"data": data}
+    return response
+
+
+class TestSplitReferenceTime(unittest.TestCase):
+
+    def test_windows_are_contiguous(self):
+        # Tester at vinduene dekker hele intervallet uten hull eller overlapp
+        windows = split_reference_time("2010-04-02/2011-01-01", window_days=100)
+        self.assertEqual(windows[0].split("/")[0], "2010-04-02")
+        self.assertEqual(windows[-1].split("/")[1], "2011-01-01")
+        for current, following in zip(windows, windows[1:]):
+            self.assertEqual(current.split("/")[1], following.split("/")[0])
+
+    def test_single_window_when_interval_is_short(self):
+        # Tester at et kort intervall gir ett vindu
+        self.assertEqual(split_reference_time("2010-04-02/2010-04-10", 365), ["2010-04-02/2010-04-10"])
+
+    def test_invalid_interval(self):
+        # Forventer ValueError når sluttdato er før startdato
+        with self.assertRaises(ValueError):
+            split_reference_time("2011-01-01/2010-01-01")
+
+
+class TestFetchDataParallel(unittest.TestCase):
+
+    @patch("frostAPI.fetch_frostapi.http_get", side_effect=fake_frost_get)
+    def test_same_records_as_single_request(self, mock_get):
+        # Tester at vindusvis henting gir samme rader i samme rekkefølge som én samlet henting
+        parameters = {"sources": "SN18700", "referencetime": "2010-04-02/2012-06-30"}
+        single = fake_frost_get("endpoint", params=parameters).json()["data"]
+        parallel = fetch_data_parallel_frostAPI("endpoint", parameters, "client", window_days=90, max_workers=4)
+        self.assertEqual(parallel, single)
+        self.assertGreater(mock_get.call_count, 1)
+
+    @patch("frostAPI.fetch_frostapi.http_get")
+    def test_failed_window_raises(self, mock_get):
+        # Tester at et vindu som feiler etter alle forsøk ikke stopper de andre vinduene,
+        # men at hentingen meldes som ufullstendig i stedet for å returnere data med hull
+        def get(endpoint, params=None, auth=None, max_retries=None):
+            if params["referencetime"].startswith("2010-04-04"):
+                raise requests.ConnectionError("brudd")
+            return fake_frost_get(endpoint, params=params)
+        mock_get.side_effect = get
+        with self.assertRaises(IncompleteFetchError) as context:
+            fetch_data_parallel_frostAPI(
+                "endpoint", {"referencetime": "2010-04-02/2010-04-08"}, "client", window_days=2)
+        self.assertEqual(context.exception.failed, ["2010-04-04/2010-04-06"])
+        self.assertEqual(len(context.exception.data), 4)
+        self.assertEqual(mock_get.call_count, 3)
+
+if __name__ == "__main__":
+    unittest.main()
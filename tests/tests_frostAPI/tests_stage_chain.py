@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.storage import dataset_path
+from frostAPI import main_frost
+
+RAW_FILE = os.path.join(os.path.dirname(__file__), "../../data/raw_data/frostAPI_data.parquet")
+
+
+class TestStageChain(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = {
+            "FROST_RAW_FILE": RAW_FILE,
+            "FROST_CLEAN_FILE": dataset_path(os.path.join(self.tmp.name, "renset")),
+            "FROST_CLEAN_CUBE": dataset_path(os.path.join(self.tmp.name, "renset"), "cube"),
+            "FROST_CLEAN_PARTITIONS": os.path.join(self.tmp.name, "renset_partisjoner"),
+            "FROST_ANALYZED_FILE": dataset_path(os.path.join(self.tmp.name, "transformert")),
+            "FROST_ANALYZED_PARTITIONS": os.path.join(self.tmp.name, "transformert_partisjoner"),
+            "FROST_STATION_LABELS": os.path.join(self.tmp.name, "stasjoner.json"),
+        }
+        self.patches = [patch.object(main_frost, name, value) for name, value in self.paths.items()]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_in_memory_matches_files(self):
+        # Tester at trinnene gir samme resultat i minnet som via filer, og at ingenting lagres med save=False
+        with patch("frostAPI.main_frost.save_dataset") as mock_save, patch("frostAPI.main_frost.write_partitions"):
+            frames = main_frost.run_pipeline_frostAPI()
+            mock_save.assert_not_called()
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+        main_frost.clean_data_frostAPI()
+        main_frost.fix_skewness_data_frostAPI()
+        from_files = pd.read_parquet(self.paths["FROST_ANALYZED_FILE"])
+        pd.testing.assert_frame_equal(frames["transformert"].reset_index(drop=True), from_files, check_dtype=False)
+        self.assertEqual(len(frames["renset"]), len(from_files))
+
+    def test_partitions_use_station_id(self):
+        # Tester at partisjonene navngis etter stasjons-ID-en, ikke stasjonskoden fra label_station
+        main_frost.clean_data_frostAPI()
+        main_frost.fix_skewness_data_frostAPI()
+        for name in ("FROST_CLEAN_PARTITIONS", "FROST_ANALYZED_PARTITIONS"):
+            self.assertEqual(os.listdir(self.paths[name]), ["SN18700_0"])
+
+    def test_extra_element_is_cleaned(self):
+        # Tester at et element lagt til i FROST_ELEMENTS (f.eks. av en batchjobb) også blir renset og interpolert
+        raw = pd.read_parquet(RAW_FILE)
+        raw["Snødybde"] = raw["Temperatur"].abs()
+        raw.loc[5, "Snødybde"] = None
+        elements = {**main_frost.FROST_ELEMENTS, "surface_snow_thickness": "Snødybde"}
+        with patch.object(main_frost, "FROST_ELEMENTS", elements):
+            self.assertIn("Snødybde", main_frost.value_columns())
+            self.assertEqual(main_frost.schema()["Interpolert_Snødybde"], "bool")
+            clean = main_frost.clean_data_frostAPI(df=raw, save=False)
+        self.assertIn("Interpolert_Snødybde", clean.columns)
+        self.assertEqual(clean["Snødybde"].isna().sum(), 0)
+
+    def test_raw_frame_is_not_modified(self):
+        # Tester at rensingen ikke endrer DataFrame-en fra forrige trinn
+        raw = pd.read_parquet(RAW_FILE)
+        before = raw.copy()
+        main_frost.clean_data_frostAPI(df=raw, save=False)
+        pd.testing.assert_frame_equal(raw, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
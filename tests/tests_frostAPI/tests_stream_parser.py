@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import sys
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from frostAPI.fetch_frostapi import process_weather_data
+from frostAPI.stream_frostapi import (
+    iter_json_array_items,
+    new_observation_columns,
+    append_observation,
+    columns_to_dataframe,
+    stream_data_from_frostAPI)
+
+ELEMENTS = {"temp": "Temperatur", "wind": "Vind", "sourceId": "Stasjon"}
+
+PAYLOAD = {
+    "@context": "https://frost.met.no/schema",
+    "currentLink": "https://frost.met.no/observations/v0.jsonld?sources=SN1",
+    "data": [
+        {"sourceId": "SN1:0", "referenceTime": "2023-01-01T00:00:00.000Z",
+         "observations": [{"elementId": "temp", "value": 1.5}, {"elementId": "wind", "value": 3.0}]},
+        {"sourceId": "SN2:0", "referenceTime": "2023-01-01T00:00:00.000Z",
+         "observations": [{"elementId": "temp", "value": -2.0, "note": "Blåmyra ø"}]},
+        {"sourceId": "SN1:0", "referenceTime": "2023-01-02T00:00:00.000Z", "observations": []},
+    ]
+}
+
+
+def chunked(payload, size):
+    # Deler den serialiserte responsen i små byte-biter for å simulere en nettverksstrøm
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestStreamParser(unittest.TestCase):
+
+    def test_items_match_full_parse(self):
+        # Tester at strømmet parsing gir samme elementer som json.loads, også ved oppdelte tegn
+        for size in [1, 7, 1000]:
+            items = list(iter_json_array_items(chunked(PAYLOAD, size)))
+            self.assertEqual(items, PAYLOAD["data"])
+
+    def test_truncated_stream_raises(self):
+        # Tester at en avkuttet respons gir ValueError
+        body = json.dumps(PAYLOAD).encode("utf-8")[:-20]
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items([body]))
+
+    def test_columns_match_process_weather_data(self):
+        # Tester at kolonnebufferne gir samme tabell som den radvise prosesseringen
+        columns = new_observation_columns(ELEMENTS)
+        for item in PAYLOAD["data"]:
+            append_observation(columns, item)
+        streamed = columns_to_dataframe(columns)
+        expected = pd.DataFrame(process_weather_data(PAYLOAD["data"], ELEMENTS))
+        pd.testing.assert_frame_equal(streamed[expected.columns], expected)
+
+    @patch("frostAPI.stream_frostapi.http_get")
+    def test_stream_data_from_frostAPI(self, mock_get):
+        # Tester at hele kjeden fra HTTP-strøm til kolonner fungerer
+        response = MagicMock(status_code=200)
+        response.__enter__.return_value = response
+        response.iter_content.return_value = chunked(PAYLOAD, 16)
+        mock_get.return_value = response
+        columns = stream_data_from_frostAPI("endpoint", {}, "client", ELEMENTS)
+        df = columns_to_dataframe(columns)
+        self.assertEqual(len(df), 3)
+        self.assertEqual(list(df["Stasjon"]), ["SN1:0", "SN2:0", "SN1:0"])
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,7 +13,7 @@ from niluAPI.fetch_niluAPI import fetch_raw_data_niluAPI, process_raw_data, save
 
 class TestNILUFunctions(unittest.TestCase):
 
-    @patch("niluAPI.fetch_niluAPI.requests.get")
+    @patch("niluAPI.fetch_niluAPI.http_get")
     def test_fetch_raw_data_success(self, mock_get):
         # Tester at data returneres korrekt ved gyldig respons
         mock_response = Mock()
@@ -25,13 +25,13 @@ class TestNILUFunctions(unittest.TestCase):
         self.assertIsInstance(result, list)
         self.assertGreater(len(result), 0)
 
-    @patch("niluAPI.fetch_niluAPI.requests.get")
+    @patch("niluAPI.fetch_niluAPI.http_get")
     def test_fetch_raw_data_http_error(self, mock_get):
         mock_get.side_effect = RequestException("Network error")
         result = fetch_raw_data_niluAPI("http://fake-endpoint")
         self.assertEqual(result, [])
 
-    @patch("niluAPI.fetch_niluAPI.requests.get")
+    @patch("niluAPI.fetch_niluAPI.http_get")
     def test_fetch_raw_data_invalid_json(self, mock_get):
         # Tester at funksjonen håndterer feil JSON-format
         mock_response = Mock()
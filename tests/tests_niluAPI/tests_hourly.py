@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import patch, Mock
+import os
+import sys
+import tempfile
+import requests
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from niluAPI.hourly_niluAPI import (
+    process_hourly_data,
+    ingest_hourly_niluAPI,
+    daily_rollup,
+    daily_rollup_store,
+    NILU_HOURLY_DTYPES)
+from common.column_store import list_chunks, read_store
+
+RAW = [
+    {"station": "Alnabru", "eoi": "NO0057A", "component": "NO2",
+     "values": [{"fromTime": f"2023-01-0{d}T{h:02d}:00:00+01:00", "value": float(h), "coverage": 100}
+                for d in (1, 2) for h in range(24) if d == 1 or h < 12]},
+    {"station": "Kirkeveien", "eoi": "NO0083A", "component": "NO2",
+     "values": [{"fromTime": f"2023-01-01T{h:02d}:00:00+01:00", "value": 10.0} for h in range(24)]},
+    {"station": "Kirkeveien", "eoi": "NO0083A", "component": "O3",
+     "values": [{"fromTime": f"2023-01-01T{h:02d}:00:00+01:00", "value": 1.0} for h in range(12)]
+               + [{"fromTime": "2023-01-01T13:00:00+01:00"}]},
+]
+
+
+def fake_hourly_get(endpoint, max_retries=None):
+    # Returnerer samme timeverdier flyttet til måneden i endepunktet
+    month = endpoint.split("/")[5][:7]
+    data = [{**record, "values": [{**m, "fromTime": m["fromTime"].replace("2023-01", month)} for m in record["values"]]}
+            for record in RAW]
+    response = Mock(status_code=200)
+    response.json.return_value = data
+    return response
+
+
+class TestHourlyProcessing(unittest.TestCase):
+
+    def test_process_hourly_data(self):
+        # Tester at hver timeverdi blir én rad med faste kolonnetyper og lokal tid
+        df = process_hourly_data(RAW)
+        self.assertEqual(len(df), 36 + 24 + 12)
+        self.assertEqual(dict(df.dtypes.astype(str)), NILU_HOURLY_DTYPES)
+        self.assertEqual(str(df["Tid"].iloc[0]), "2023-01-01 00:00:00")
+
+    def test_daily_rollup(self):
+        # Tester døgnmiddel per stasjon, dekningsgrad av 24 timer og snitt over stasjonene
+        daily = daily_rollup(process_hourly_data(RAW))
+        self.assertEqual(list(daily.columns), ["Dato", "Dekningsgrad_NO2", "Dekningsgrad_O3", "Verdi_NO2", "Verdi_O3"])
+        first = daily.iloc[0]
+        self.assertEqual(first["Dato"], "2023-01-01")
+        self.assertAlmostEqual(first["Verdi_NO2"], (11.5 + 10.0) / 2)
+        self.assertEqual(first["Dekningsgrad_O3"], 50.0)
+        self.assertEqual(daily.iloc[1]["Dekningsgrad_NO2"], 50.0)
+        self.assertTrue(pd.isna(daily.iloc[1]["Verdi_O3"]))
+
+    def test_daily_rollup_empty(self):
+        # Tester at en tom tabell gir tom DataFrame
+        self.assertTrue(daily_rollup(process_hourly_data([])).empty)
+
+
+class TestHourlyIngestion(unittest.TestCase):
+
+    @patch("niluAPI.fetch_niluAPI.http_get", side_effect=fake_hourly_get)
+    def test_ingest_writes_one_chunk_per_month_and_resumes(self, mock_get):
+        # Tester at hver måned lagres for seg, og at lagrede måneder hoppes over neste gang
+        with tempfile.TemporaryDirectory() as tmp:
+            status = ingest_hourly_niluAPI("2023-01-01", "2023-03-31", 59.9, 10.7, 20, tmp, max_workers=2)
+            self.assertEqual(status, {"2023-01": "lagret", "2023-02": "lagret", "2023-03": "lagret"})
+            self.assertEqual(list_chunks(tmp), ["2023-01", "2023-02", "2023-03"])
+            self.assertEqual(len(read_store(tmp)), 3 * 72)
+
+            status = ingest_hourly_niluAPI("2023-01-01", "2023-04-30", 59.9, 10.7, 20, tmp)
+            self.assertEqual(status["2023-01"], "hoppet over")
+            self.assertEqual(status["2023-04"], "lagret")
+            self.assertEqual(mock_get.call_count, 4)
+
+            daily = daily_rollup_store(tmp)
+        self.assertEqual(list(daily["Dato"]), ["2023-01-01", "2023-01-02", "2023-02-01", "2023-02-02",
+                                               "2023-03-01", "2023-03-02", "2023-04-01", "2023-04-02"])
+
+    @patch("niluAPI.fetch_niluAPI.http_get", return_value=Mock(status_code=404))
+    def test_month_without_data_is_not_fetched_again(self, mock_get):
+        # Tester at en avsluttet måned uten data lagres som en tom bit og hoppes over neste gang,
+        # mens en måned som ikke er over ennå hentes på nytt
+        current = pd.Timestamp.today()
+        with tempfile.TemporaryDirectory() as tmp:
+            status = ingest_hourly_niluAPI("2023-01-01", "2023-01-31", 59.9, 10.7, 20, tmp)
+            self.assertEqual(status, {"2023-01": "ingen data"})
+            self.assertEqual(ingest_hourly_niluAPI("2023-01-01", "2023-01-31", 59.9, 10.7, 20, tmp),
+                             {"2023-01": "hoppet over"})
+            self.assertTrue(daily_rollup_store(tmp).empty)
+
+            month_start = current.replace(day=1).strftime("%Y-%m-%d")
+            ingest_hourly_niluAPI(month_start, current.strftime("%Y-%m-%d"), 59.9, 10.7, 20, tmp)
+            self.assertEqual(list_chunks(tmp), ["2023-01"])
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("niluAPI.fetch_niluAPI.http_get", side_effect=requests.ConnectionError("Nede"))
+    def test_failed_month_is_not_stored(self, mock_get):
+        # Tester at en måned som feiler, ikke lagres og dermed hentes neste gang
+        with tempfile.TemporaryDirectory() as tmp:
+            status = ingest_hourly_niluAPI("2023-01-01", "2023-01-31", 59.9, 10.7, 20, tmp)
+            self.assertEqual(status, {"2023-01": "feilet"})
+            self.assertEqual(list_chunks(tmp), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import patch, Mock
+import os
+import sys
+import threading
+import requests
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from niluAPI.fetch_niluAPI import (
+    split_period,
+    build_stats_endpoint,
+    merge_station_records,
+    fetch_raw_data_parallel_niluAPI)
+from niluAPI.main_nilu import get_raw_data_niluAPI
+from common.http_client import IncompleteFetchError
+
+
+def fake_nilu_get(endpoint, max_retries=None):
+    # Lager én døgnverdi per dag for to stasjoner, slik en ekte NILU-respons ville gjort
+    from_str, to_str = endpoint.split("/")[5:7]
+    start, end = date.fromisoformat(from_str), date.fromisoformat(to_str)
+    days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+    data = [
+        {"station": station, "eoi": eoi, "component": "NO2",
+         "values": [{"dateTime": f"{day}T00:00:00+01:00", "value": float(len(day) + i)} for day in days]}
+        for i, (station, eoi) in enumerate([("Alnabru", "NO0057A"), ("Kirkeveien", "NO0083A")])
+    ]
+    response = Mock(status_code=200)
+    response.json.return_value = data
+    return response
+
+
+class TestSplitPeriod(unittest.TestCase):
+
+    def test_year_chunks_follow_calendar(self):
+        # Tester at årsbitene følger kalenderåret og dekker hele perioden uten overlapp
+        chunks = split_period("2010-04-02", "2012-03-01", "year")
+        self.assertEqual(chunks, [("2010-04-02", "2010-12-31"), ("2011-01-01", "2011-12-31"), ("2012-01-01", "2012-03-01")])
+
+    def test_month_chunks_across_new_year(self):
+        # Tester månedsbiter over et årsskifte
+        chunks = split_period("2010-11-15", "2011-01-10", "month")
+        self.assertEqual(chunks, [("2010-11-15", "2010-11-30"), ("2010-12-01", "2010-12-31"), ("2011-01-01", "2011-01-10")])
+
+    def test_invalid_input(self):
+        # Forventer ValueError ved ukjent inndeling eller sluttdato før startdato
+        with self.assertRaises(ValueError):
+            split_period("2011-01-01", "2010-01-01")
+        with self.assertRaises(ValueError):
+            split_period("2010-01-01", "2011-01-01", "week")
+
+    def test_build_stats_endpoint(self):
+        # Tester at komponenter legges til som spørreparameter
+        endpoint = build_stats_endpoint("2010-01-01", "2010-12-31", 59.9, 10.7, 20, ["NO2", "O3"])
+        self.assertEqual(endpoint, "https://api.nilu.no/stats/day/2010-01-01/2010-12-31/59.9/10.7/20?components=NO2;O3")
+
+
+class TestFetchDataParallel(unittest.TestCase):
+
+    @patch("niluAPI.fetch_niluAPI.http_get", side_effect=fake_nilu_get)
+    def test_same_records_as_single_request(self, mock_get):
+        # Tester at oppdelt henting gir samme stasjonsposter som én samlet henting
+        single = fake_nilu_get(build_stats_endpoint("2010-04-02", "2012-06-30", 59.9, 10.7, 20)).json()
+        parallel = fetch_raw_data_parallel_niluAPI("2010-04-02", "2012-06-30", 59.9, 10.7, 20, chunk="month")
+        self.assertEqual(parallel, single)
+        self.assertEqual(mock_get.call_count, 27)
+
+    @patch("niluAPI.fetch_niluAPI.http_get")
+    def test_failed_chunk_is_retried_alone(self, mock_get):
+        # Tester at bare perioden som feilet hentes på nytt, og at resultatet blir komplett
+        failed_once = set()
+        lock = threading.Lock()
+
+        def flaky_get(endpoint, max_retries=None):
+            with lock:
+                if "/2011-01-01/" in endpoint and endpoint not in failed_once:
+                    failed_once.add(endpoint)
+                    raise requests.ConnectionError("Tidsavbrudd")
+            return fake_nilu_get(endpoint)
+
+        mock_get.side_effect = flaky_get
+        result = fetch_raw_data_parallel_niluAPI("2010-01-01", "2012-12-31", 59.9, 10.7, 20, chunk="year")
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertEqual(len(result[0]["values"]), 365 + 365 + 366)
+
+    @patch("niluAPI.fetch_niluAPI.http_get")
+    def test_chunk_failing_every_round_raises(self, mock_get):
+        # Tester at en periode som alltid feiler gir IncompleteFetchError med perioden og resten av dataene
+        def failing_get(endpoint, max_retries=None):
+            if "/2011-01-01/" in endpoint:
+                raise requests.ConnectionError("Nede")
+            return fake_nilu_get(endpoint)
+
+        mock_get.side_effect = failing_get
+        with self.assertRaises(IncompleteFetchError) as context:
+            fetch_raw_data_parallel_niluAPI("2010-01-01", "2012-12-31", 59.9, 10.7, 20, retry_rounds=2)
+        self.assertEqual(context.exception.failed, [("2011-01-01", "2011-12-31")])
+        dates = [m["dateTime"][:10] for m in context.exception.data[0]["values"]]
+        self.assertFalse(any(d.startswith("2011") for d in dates))
+        self.assertEqual(len(dates), 365 + 366)
+
+    @patch("niluAPI.main_nilu.save_to_json")
+    @patch("niluAPI.main_nilu.fetch_raw_data_parallel_niluAPI")
+    def test_incomplete_fetch_is_not_saved(self, mock_fetch, mock_save):
+        # Tester at get_raw_data_niluAPI ikke lagrer data med hull
+        mock_fetch.side_effect = IncompleteFetchError("1 av 7 perioder feilet", [("2011-01-01", "2011-12-31")], [])
+        with patch("sys.stdout"):
+            self.assertTrue(get_raw_data_niluAPI(chunk="year").empty)
+        self.assertFalse(mock_save.called)
+
+    def test_merge_sorts_and_deduplicates_by_date(self):
+        # Tester at målinger slås sammen per stasjon og komponent, sortert og uten doble datoer
+        first = [{"eoi": "A", "component": "NO2", "values": [{"dateTime": "2011-01-02", "value": 2}]}]
+        second = [{"eoi": "A", "component": "NO2", "values": [{"dateTime": "2011-01-01", "value": 1},
+                                                               {"dateTime": "2011-01-02", "value": 3}]},
+                  {"eoi": "A", "component": "O3", "values": [{"dateTime": "2011-01-01", "value": 5}]}]
+        merged = merge_station_records([first, second])
+        self.assertEqual(len(merged), 2)
+        self.assertEqual([m["value"] for m in merged[0]["values"]], [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
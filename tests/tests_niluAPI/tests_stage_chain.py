@@ -0,0 +1,41 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from common.storage import dataset_path
+from niluAPI import main_nilu
+
+RAW_FILE = os.path.join(os.path.dirname(__file__), "../../data/raw_data/niluAPI_data.parquet")
+
+
+class TestStageChain(unittest.TestCase):
+
+    def test_in_memory_matches_files(self):
+        # Tester at rensing og transformasjon gir samme resultat i minnet som via filer
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {
+                "NILU_CLEAN_FILE": dataset_path(os.path.join(tmp, "renset")),
+                "NILU_CLEAN_CUBE": dataset_path(os.path.join(tmp, "renset"), "cube"),
+                "NILU_CLEAN_PARTITIONS": os.path.join(tmp, "renset_partisjoner"),
+                "NILU_ANALYZED_FILE": dataset_path(os.path.join(tmp, "transformert")),
+                "NILU_ANALYZED_PARTITIONS": os.path.join(tmp, "transformert_partisjoner"),
+            }
+            with patch.multiple(main_nilu, **paths):
+                frames = main_nilu.run_pipeline_niluAPI(raw_data_file=RAW_FILE)
+                self.assertEqual(os.listdir(tmp), [])
+
+                main_nilu.clean_raw_data(RAW_FILE)
+                main_nilu.fix_skewness_data_niluAPI()
+                from_files = pd.read_parquet(paths["NILU_ANALYZED_FILE"])
+
+        self.assertEqual(list(frames), ["rådata", "renset", "transformert"])
+        pd.testing.assert_frame_equal(frames["transformert"].reset_index(drop=True), from_files, check_dtype=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+
+from niluAPI.fetch_niluAPI import (
+    process_raw_data_long,
+    radius_average_view,
+    select_stations,
+    load_long_table,
+    save_to_json,
+    NILU_LONG_DTYPES)
+from niluAPI.main_nilu import get_raw_data_niluAPI_stations, load_nilu_stations
+
+RAW = [
+    {"station": "Alnabru", "eoi": "NO0057A", "latitude": 59.927, "longitude": 10.846,
+     "component": "NO2", "unit": "µg/m³",
+     "values": [{"dateTime": "2023-01-01T00:00:00+01:00", "value": 20, "coverage": 90},
+                {"dateTime": "2023-01-02T00:00:00+01:00", "value": 30, "coverage": 100}]},
+    {"station": "Kirkeveien", "eoi": "NO0083A", "latitude": 59.932, "longitude": 10.724,
+     "component": "NO2", "unit": "µg/m³",
+     "values": [{"dateTime": "2023-01-01T00:00:00+01:00", "value": 40, "coverage": 80},
+                {"dateTime": "2023-01-02T00:00:00+01:00"}]},
+    {"station": "Kirkeveien", "eoi": "NO0083A", "latitude": 59.932, "longitude": 10.724,
+     "component": "O3", "unit": "µg/m³",
+     "values": [{"dateTime": "2023-01-01T00:00:00+01:00", "value": 50}]},
+]
+
+
+class TestStationTable(unittest.TestCase):
+
+    def test_long_table_keeps_station_and_types(self):
+        # Tester at hver måling beholder stasjon og koordinater, og at kolonnene har faste typer
+        df = process_raw_data_long(RAW)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(dict(df.dtypes.astype(str)), NILU_LONG_DTYPES)
+        row = df[(df["Stasjon"] == "Kirkeveien") & (df["Komponent"] == "NO2")].iloc[0]
+        self.assertEqual(row["EoI"], "NO0083A")
+        self.assertEqual(row["Verdi"], 40.0)
+        self.assertAlmostEqual(row["Breddegrad"], 59.932)
+        self.assertTrue(pd.isna(df[df["Komponent"] == "O3"]["Dekningsgrad"].iloc[0]))
+
+    def test_radius_average_view(self):
+        # Tester at radiusgjennomsnittet blir det samme brede formatet som før
+        view = radius_average_view(process_raw_data_long(RAW))
+        self.assertEqual(list(view["Dato"]), ["2023-01-01", "2023-01-02"])
+        self.assertEqual(view["Verdi_NO2"].tolist(), [30.0, 30.0])
+        self.assertEqual(view["Dekningsgrad_NO2"].tolist(), [85.0, 100.0])
+        self.assertEqual(view["Verdi_O3"].iloc[0], 50.0)
+
+    def test_radius_average_view_filter_and_empty(self):
+        # Tester komponentfilter og at tom tabell gir tom DataFrame
+        view = radius_average_view(process_raw_data_long(RAW), components=["O3"])
+        self.assertNotIn("Verdi_NO2", view.columns)
+        self.assertTrue(radius_average_view(process_raw_data_long([])).empty)
+
+    def test_select_stations_by_name_or_eoi(self):
+        # Tester at enkeltstasjoner kan hentes ut både med navn og EoI-kode
+        df = process_raw_data_long(RAW)
+        self.assertEqual(len(select_stations(df, stations=["Alnabru"])), 2)
+        self.assertEqual(len(select_stations(df, stations=["NO0083A"], components=["O3"])), 1)
+
+    def test_save_and_load_roundtrip(self):
+        # Tester at lagret tabell leses inn igjen med samme innhold og typer
+        df = process_raw_data_long(RAW)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stasjoner.json")
+            save_to_json(df, path)
+            loaded = load_long_table(path)
+        pd.testing.assert_frame_equal(loaded, df, check_categorical=False)
+
+    @patch("niluAPI.main_nilu.fetch_raw_data_niluAPI", return_value=RAW)
+    def test_get_raw_data_stations_writes_both_files(self, mock_fetch):
+        # Tester at lang tabell og valgfritt radiusgjennomsnitt lagres, og at lagrede data kan filtreres
+        with tempfile.TemporaryDirectory() as tmp:
+            long_file = os.path.join(tmp, "stasjoner.json")
+            average_file = os.path.join(tmp, "snitt.json")
+            get_raw_data_niluAPI_stations(output_file=long_file, average_file=average_file)
+            self.assertTrue(os.path.exists(average_file))
+            result = load_nilu_stations(stations=["Alnabru"], input_file=long_file)
+        self.assertEqual(set(result["Stasjon"]), {"Alnabru"})
+
+
+if __name__ == "__main__":
+    unittest.main()